@@ -3,6 +3,8 @@
 실장석 공원 제국 - Flask 앱 팩토리 (__init__.py)
 [v0.1.0] Flask 앱 생성, 확장 초기화, 블루프린트 등록.
 """
+import multiprocessing
+
 from flask import Flask
 from flask_login import LoginManager
 from flask_wtf.csrf import CSRFProtect
@@ -26,12 +28,20 @@ def load_user(user_id):
     return User.query.get(int(user_id))
 
 
-def create_app():
-    """Flask 앱 팩토리 패턴"""
+def create_app(start_scheduler=True):
+    """
+    Flask 앱 팩토리 패턴
+    [v1.7.0] start_scheduler=False: 스케줄러 없이 생성 (샤딩 틱 워커 프로세스 등)
+    [v1.7.0] multiprocessing 자식 프로세스에서는 start_scheduler와 상관없이 스케줄러를 띄우지 않는다
+             (워커가 실수로 앱을 만들어도 월드 틱이 중복 실행되지 않도록)
+    """
     app = Flask(__name__)
     app.config.from_object(Config)
 
     # === 확장 초기화 ===
+    # [v1.7.0] DB 엔진 프로필 (PRAGMA/풀 옵션) - 엔진이 만들어지기 전에 적용
+    from app.db_profile import init_db_profile
+    init_db_profile(app)
     db.init_app(app)
     login_manager.init_app(app)
     csrf.init_app(app)  # [v0.3.0] CSRF 보호 활성화
@@ -40,6 +50,14 @@ def create_app():
     from app.i18n import init_i18n
     init_i18n(app)
 
+    # [v1.7.0] 요청 단위 트랜잭션 경계 + 커밋 횟수 계측
+    from app.unit_of_work import init_unit_of_work
+    init_unit_of_work(app)
+
+    # [v1.7.0] 요청별 SQL 실행 수/시간 프로파일러
+    from app.profiler import init_profiler
+    init_profiler(app)
+
     # === 블루프린트 등록 ===
     from app.routes.auth_routes import auth_bp
     from app.routes.game_routes import game_bp
@@ -61,8 +79,11 @@ def create_app():
         _init_npc_parks()
 
     # === 턴 스케줄러 시작 ===
-    from app.turn_scheduler import init_scheduler
-    init_scheduler(app)
+    if start_scheduler and multiprocessing.parent_process() is not None:
+        app.logger.warning("[스케줄러] 자식 프로세스에서는 턴 스케줄러를 시작하지 않습니다")
+    elif start_scheduler:
+        from app.turn_scheduler import init_scheduler
+        init_scheduler(app)
 
     return app
 
@@ -71,7 +92,7 @@ def _init_npc_parks():
     """서버 시작 시 NPC 공원이 없으면 자동 생성"""
     from app.models import Park
     from app.config import GameConfig as GC
-    import random
+    from app import rng as RNG
 
     # 이미 NPC가 있으면 스킵
     existing_npcs = Park.query.filter_by(is_npc=True).count()
@@ -82,27 +103,27 @@ def _init_npc_parks():
     needed = GC.NPC_INITIAL_COUNT - existing_npcs
     available_names = [n for n in GC.NPC_PARK_NAMES
                        if not Park.query.filter_by(name=n).first()]
-    random.shuffle(available_names)
+    RNG.shuffle(available_names)
 
     for i in range(min(needed, len(available_names))):
-        personality = random.choice(GC.NPC_PERSONALITIES)
+        personality = RNG.choice(GC.NPC_PERSONALITIES)
         npc = Park(
             name=available_names[i],
             is_npc=True,
             npc_personality=personality,
             boss_hp=GC.INITIAL_BOSS_HP,
-            guard_count=random.randint(1, 3),
-            adult_count=random.randint(3, 8),
-            child_count=random.randint(5, 15),
-            baby_count=random.randint(3, 10),
-            konpeito=random.randint(2, 8),
-            trash_food=random.randint(20, 50),
-            meat_stock=random.randint(0, 5),
-            material=random.randint(30, 80),
-            morale=random.randint(40, 70),
-            cardboard_houses=random.randint(1, 2),
-            unchi_holes=random.randint(0, 2),
-            walls=random.randint(0, 1),
+            guard_count=RNG.randint(1, 3),
+            adult_count=RNG.randint(3, 8),
+            child_count=RNG.randint(5, 15),
+            baby_count=RNG.randint(3, 10),
+            konpeito=RNG.randint(2, 8),
+            trash_food=RNG.randint(20, 50),
+            meat_stock=RNG.randint(0, 5),
+            material=RNG.randint(30, 80),
+            morale=RNG.randint(40, 70),
+            cardboard_houses=RNG.randint(1, 2),
+            unchi_holes=RNG.randint(0, 2),
+            walls=RNG.randint(0, 1),
         )
         db.session.add(npc)
 
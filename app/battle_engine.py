@@ -13,17 +13,22 @@
 5. 보스 참전 시 패배하면 보스 HP 감소
 6. 전투 로그 + 대사 기록
 """
-import random
-import json
 import math
 
 from app.models import db, Park, BattleLog, EventLog
-from app.config import GameConfig as GC
 from app import dialogues as DLG
 from app.game_engine import add_event
+from app import event_text
+from app import unit_of_work as UOW
+from app import park_stats
+from app import target_index
+from app import row_lock
+from app import rng as RNG
+from app import battle_sim
 
 
-def execute_battle(attacker, defender, send_guards=None, send_adults=None, boss_joins=False):
+def execute_battle(attacker, defender, send_guards=None, send_adults=None, boss_joins=False,
+                   lang=None):
     """
     전투 실행.
     매개변수:
@@ -31,24 +36,28 @@ def execute_battle(attacker, defender, send_guards=None, send_adults=None, boss_
       - send_adults: 출정 성체실장 수 (None이면 방어 배치 제외 전원)
       - boss_joins: 보스실장 참전 여부
     반환: (승리여부, 전투로그 딕셔너리, 대사 리스트)
+    [v1.7.0] 난수는 (공격자, 턴, 'battle', 방어자, 남은 AP) 스트림에서 추출 (같은 턴의 다음 전투와 구분)
+    [v1.7.0] lang: 대사 언어 (None이면 요청 세션 언어, 스케줄러에서는 기본 언어)
+    [v1.7.0] 양측 공원 행을 잠그고 최신 값으로 전투 (PostgreSQL, app/row_lock.py)
+      이전에는 SQLite 쓰기 락이 전투 전체를 직렬화하는 데 기댔음
     """
-    messages = []
+    row_lock.lock_parks(attacker.id, defender.id)
+    with RNG.stream(attacker.id, attacker.turn_count, 'battle',
+                    defender.id, attacker.action_points):
+        return _execute_battle(attacker, defender, send_guards, send_adults, boss_joins, lang)
 
-    # === 0. 출정 인원 결정 ===
-    # 방어 배치 인원을 제외한 가용 인원
-    avail_guards = max(0, attacker.guard_count - attacker.defending_guards)
-    avail_adults = max(0, attacker.adult_count - attacker.defending_adults)
 
-    # 출정 수 결정 (지정값이 없으면 전원, 가용 인원 초과 불가)
-    if send_guards is None:
-        send_guards = avail_guards
-    else:
-        send_guards = max(0, min(send_guards, avail_guards))
+def _execute_battle(attacker, defender, send_guards, send_adults, boss_joins, lang):
+    """전투 실행 본체 (execute_battle 참고)"""
+    dlg = DLG.table(lang)
+    messages = []
 
-    if send_adults is None:
-        send_adults = avail_adults
-    else:
-        send_adults = max(0, min(send_adults, avail_adults))
+    # === 0. 출정 인원 결정 ===
+    # 방어 배치 인원을 제외한 가용 인원 안에서 (지정값이 없으면 전원)
+    send_guards, send_adults = battle_sim.resolve_sortie(
+        attacker.guard_count, attacker.defending_guards,
+        attacker.adult_count, attacker.defending_adults,
+        send_guards, send_adults)
 
     # 최소 1명은 보내야 함
     if send_guards + send_adults == 0 and not boss_joins:
@@ -60,8 +69,8 @@ def execute_battle(attacker, defender, send_guards=None, send_adults=None, boss_
     def_power = _calc_defense_power(defender)
 
     # 랜덤 요소 (±20% 변동)
-    atk_roll = atk_power * random.uniform(0.8, 1.2)
-    def_roll = def_power * random.uniform(0.8, 1.2)
+    atk_roll = atk_power * RNG.uniform(*battle_sim.ROLL_RANGE)
+    def_roll = def_power * RNG.uniform(*battle_sim.ROLL_RANGE)
 
     # === 2. 승패 판정 ===
     attacker_wins = atk_roll > def_roll
@@ -71,9 +80,9 @@ def execute_battle(attacker, defender, send_guards=None, send_adults=None, boss_
     if boss_joins:
         messages.append("👑 보스실장이 직접 출전하는 데스!! 전투력이 폭발적인 데스!!")
     if send_guards > 0:
-        messages.append(DLG.get_random_dialogue(DLG.BATTLE_DEPART['guard']))
+        messages.append(DLG.get_random_dialogue(dlg.BATTLE_DEPART['guard']))
     elif send_adults > 0:
-        messages.append(DLG.get_random_dialogue(DLG.BATTLE_DEPART['adult']))
+        messages.append(DLG.get_random_dialogue(dlg.BATTLE_DEPART['adult']))
 
     # === 3. 피해 계산 (출정 유닛에서만) ===
     atk_losses = _calc_losses_selected(send_guards, send_adults, power_ratio, is_winner=attacker_wins)
@@ -92,16 +101,16 @@ def execute_battle(attacker, defender, send_guards=None, send_adults=None, boss_
         _apply_loot(attacker, defender, loot)
 
         # 승리 대사
-        messages.extend(DLG.get_random_dialogues(DLG.BATTLE_WIN, 2))
+        messages.extend(DLG.get_random_dialogues(dlg.BATTLE_WIN, 2))
         if loot['children'] > 0:
-            messages.append(DLG.get_random_dialogue(DLG.BATTLE_WIN_CAPTURED_CHILD))
+            messages.append(DLG.get_random_dialogue(dlg.BATTLE_WIN_CAPTURED_CHILD))
 
         # 승리 시 사기 상승
         attacker.morale = min(100, attacker.morale + 8)
         defender.morale = max(0, defender.morale - 12)
     else:
         # 패배 대사
-        messages.extend(DLG.get_random_dialogues(DLG.BATTLE_LOSE, 2))
+        messages.extend(DLG.get_random_dialogues(dlg.BATTLE_LOSE, 2))
 
         # 패배 시 사기 변동
         attacker.morale = max(0, attacker.morale - 8)
@@ -112,7 +121,7 @@ def execute_battle(attacker, defender, send_guards=None, send_adults=None, boss_
     boss_solo = boss_joins and (send_guards + send_adults == 0)
     if boss_joins and not attacker_wins:
         # 보스가 참전했는데 졌으면 확정 피해
-        boss_dmg = random.randint(10, 25)
+        boss_dmg = RNG.randint(*battle_sim.BOSS_DMG_JOIN_LOSE)
         attacker.boss_hp = max(0, attacker.boss_hp - boss_dmg)
         messages.append(f"👑 보스실장이 전투에서 {boss_dmg} 피해를 입은 데스!!")
         if attacker.boss_hp <= 0:
@@ -120,15 +129,15 @@ def execute_battle(attacker, defender, send_guards=None, send_adults=None, boss_
             messages.append("💀 보스실장이 죽었는 데스... 공원은 멸망한 데스...")
     elif boss_solo and attacker_wins:
         # [v1.5.1] 보스 단독 승리: 호위 없이 전투하므로 경미한 피해 (3~8)
-        boss_dmg = random.randint(3, 8)
+        boss_dmg = RNG.randint(*battle_sim.BOSS_DMG_SOLO_WIN)
         attacker.boss_hp = max(0, attacker.boss_hp - boss_dmg)
         messages.append(f"👑 호위 없이 싸워서 보스실장이 {boss_dmg} 피해를 입은 데스!")
         if attacker.boss_hp <= 0:
             attacker.is_destroyed = True
             messages.append("💀 무모한 단독 출전... 보스실장이 쓰러진 데스...")
-    elif not attacker_wins and power_ratio < 0.3:
+    elif not attacker_wins and power_ratio < battle_sim.ROUT_RATIO:
         # 보스 미참전이라도 대패 시 소량 피해
-        boss_dmg = random.randint(3, 10)
+        boss_dmg = RNG.randint(*battle_sim.BOSS_DMG_ROUT)
         attacker.boss_hp = max(0, attacker.boss_hp - boss_dmg)
         messages.append(f"👑 대패! 보스실장이 간접 피해 {boss_dmg}를 입은 데스!")
         if attacker.boss_hp <= 0:
@@ -136,93 +145,75 @@ def execute_battle(attacker, defender, send_guards=None, send_adults=None, boss_
             messages.append("💀 보스실장이 죽었는 데스... 공원은 멸망한 데스...")
 
     # 방어자 보스 피해 (대승 시)
-    if attacker_wins and power_ratio > 2.0:
-        boss_dmg = random.randint(5, 15)
+    if attacker_wins and power_ratio > battle_sim.CRUSH_RATIO:
+        boss_dmg = RNG.randint(*battle_sim.DEFENDER_BOSS_DMG)
         defender.boss_hp = max(0, defender.boss_hp - boss_dmg)
         if defender.boss_hp <= 0:
             defender.is_destroyed = True
 
     # === 6. 전투 로그 저장 ===
+    # [v1.7.0] 본문은 저장하지 않고 숫자만 기록 (조회 시 BattleLog.text()가 format_battle_log로 생성)
     result_text = 'win' if attacker_wins else 'lose'
-    log_text = _format_battle_log(attacker, defender, attacker_wins,
-                                   atk_losses, def_losses, loot,
-                                   send_guards, send_adults, boss_joins)
-
     battle_log = BattleLog(
         attacker_id=attacker.id,
         defender_id=defender.id,
         result=result_text,
-        log_text=log_text,
         loot_konpeito=loot['konpeito'],
         loot_trash=loot['trash'],
         loot_material=loot['material'],
         loot_babies=loot['babies'],
         loot_children=loot['children'],
-        attacker_losses=json.dumps(atk_losses),
-        defender_losses=json.dumps(def_losses),
+        sent_guards=send_guards,
+        sent_adults=send_adults,
+        boss_joined=bool(boss_joins),
+        atk_lost_guards=atk_losses['guards'],
+        atk_lost_adults=atk_losses['adults'],
+        def_lost_guards=def_losses['guards'],
+        def_lost_adults=def_losses['adults'],
+        def_lost_children=def_losses['children'],
     )
     db.session.add(battle_log)
 
-    # 이벤트 로그 (양측)
-    boss_tag = " (👑보스 출전)" if boss_joins else ""
+    # [v1.7.0] 전투 통계 카운터 (BattleLog와 같은 트랜잭션)
+    park_stats.record_battle(attacker.id, defender.id, attacker_wins, sum(loot.values()))
+    # [v1.7.0] 월드 틱 중이면 NPC 대상 인덱스에 양측 전투력/보호 상태 반영
+    target_index.touch(attacker, defender)
+
+    # 이벤트 로그 (양측) [v1.7.0] 코드 + 파라미터로 기록, 보는 사람 언어로 렌더링 (app/event_text.py)
     if attacker_wins:
         add_event(attacker, 'battle',
-                  f"⚔️ {defender.name} 침공 승리!{boss_tag} "
-                  f"🍬{loot['konpeito']} 🗑️{loot['trash']} "
-                  f"🧱{loot['material']} 🐛{loot['babies']} 👶{loot['children']} 약탈!")
-        add_event(defender, 'battle',
-                  f"⚔️ {attacker.name}의 침공을 당했는 데스! 자원을 빼앗겼는 데스!!")
+                  event_text.msg('battle_win_boss' if boss_joins else 'battle_win',
+                                 target=defender.name, konpeito=loot['konpeito'],
+                                 trash=loot['trash'], material=loot['material'],
+                                 babies=loot['babies'], children=loot['children']))
+        add_event(defender, 'battle', event_text.msg('battle_invaded', target=attacker.name))
     else:
         add_event(attacker, 'battle',
-                  f"⚔️ {defender.name} 침공 실패...{boss_tag} 피해를 입은 데스...")
-        add_event(defender, 'battle',
-                  f"⚔️ {attacker.name}의 침공을 막아냈는 데스!! "
-                  + DLG.get_random_dialogue(DLG.BATTLE_DEFEND_WIN))
+                  event_text.msg('battle_lose_boss' if boss_joins else 'battle_lose',
+                                 target=defender.name))
+        add_event(defender, 'battle', event_text.msg('battle_defended', target=attacker.name))
 
-    db.session.commit()
+    UOW.commit()
     return attacker_wins, loot, messages
 
 
 def _calc_attack_power_selected(send_guards, send_adults, morale, boss_joins):
-    """출정 유닛 기반 공격력 계산"""
-    base = (send_guards * GC.POWER_GUARD +
-            send_adults * GC.POWER_ADULT)
-
-    # 보스 참전 보너스
-    if boss_joins:
-        base += GC.POWER_BOSS
-        # [v1.5.1] 보스 단독 출전 패널티: 호위 없이 싸우면 전투력 30% 감소
-        if send_guards + send_adults == 0:
-            base = int(base * 0.7)
-
-    # 사기 보정
-    morale_mult = 1.0 + (morale - 50) * GC.MORALE_COMBAT_EFFECT / 50
-    return max(1, int(base * morale_mult))
+    """출정 유닛 기반 공격력 계산 [v1.7.0] 공식은 battle_sim"""
+    return battle_sim.attack_power(send_guards, send_adults, morale, boss_joins)
 
 
 def _calc_defense_power(park):
-    """방어자 전투력 (전체 병력 + 방벽 보너스)"""
-    base = (park.guard_count * GC.POWER_GUARD +
-            park.adult_count * GC.POWER_ADULT +
-            park.child_count * GC.POWER_CHILD)
-
-    # 방벽 보너스 (개당 20%)
-    wall_bonus = 1.0 + park.walls * 0.2
-    # 감시탑 보너스 (기습 방지 = 10%)
-    tower_bonus = 1.0 + (0.1 if park.watchtowers > 0 else 0)
-
-    morale_mult = 1.0 + (park.morale - 50) * GC.MORALE_COMBAT_EFFECT / 50
-    return max(1, int(base * wall_bonus * tower_bonus * morale_mult))
+    """방어자 전투력 (전체 병력 + 방벽 보너스) [v1.7.0] 공식은 battle_sim"""
+    return battle_sim.defense_power(park.guard_count, park.adult_count, park.child_count,
+                                    park.walls, park.watchtowers, park.morale)
 
 
 def _calc_losses_selected(send_guards, send_adults, power_ratio, is_winner):
     """출정 유닛에서의 피해 계산"""
     losses = {'guards': 0, 'adults': 0, 'children': 0}
 
-    if is_winner:
-        loss_rate = random.uniform(0.05, 0.2)   # 승자: 5~20% 손실
-    else:
-        loss_rate = random.uniform(0.2, 0.5)     # 패자: 20~50% 손실
+    # 승자: 5~20% 손실, 패자: 20~50% 손실
+    loss_rate = RNG.uniform(*battle_sim.loss_rate_range(is_winner))
 
     # [v1.6.2] 소수점 불사 부대 Exploit 방지
     # int() 절사 대신 확률적 올림: fractional part를 확률로 처리
@@ -231,7 +222,7 @@ def _calc_losses_selected(send_guards, send_adults, power_ratio, is_winner):
         """확률적 반올림: 소수부를 확률로 처리하여 int 절사 Exploit 방지"""
         base = int(value)
         frac = value - base
-        if frac > 0 and random.random() < frac:
+        if frac > 0 and RNG.random() < frac:
             base += 1
         return base
 
@@ -251,15 +242,13 @@ def _calc_losses(park, power_ratio, is_attacker):
     """
     losses = {'guards': 0, 'adults': 0, 'children': 0}
 
-    # 패배 시 피해가 더 큼
-    if power_ratio < 1:
-        loss_rate = random.uniform(0.2, 0.5)  # 패자: 20~50% 손실
-    else:
-        loss_rate = random.uniform(0.05, 0.2)  # 승자: 5~20% 손실
+    # 패배 시 피해가 더 큼 (패자 20~50%, 승자 5~20% 손실)
+    loss_rate = RNG.uniform(*battle_sim.loss_rate_range(power_ratio >= 1))
 
     losses['guards'] = min(park.guard_count, int(park.guard_count * loss_rate))
     losses['adults'] = min(park.adult_count, int(park.adult_count * loss_rate))
-    losses['children'] = min(park.child_count, int(park.child_count * loss_rate * 0.5))
+    losses['children'] = min(park.child_count, int(park.child_count * loss_rate
+                                                   * battle_sim.DEFENDER_CHILD_LOSS_FACTOR))
 
     return losses
 
@@ -272,13 +261,10 @@ def _apply_losses(park, losses):
 
 
 def _calculate_loot(defender):
-    """약탈량 계산 (spec.md 기준 비율)"""
+    """약탈량 계산 (spec.md 기준 비율, [v1.7.0] 항목/비율은 battle_sim.LOOT_TABLE)"""
     loot = {
-        'konpeito': int(defender.konpeito * random.uniform(*GC.LOOT_KONPEITO_RATIO)),
-        'trash': int(defender.trash_food * random.uniform(*GC.LOOT_TRASH_RATIO)),
-        'material': int(defender.material * random.uniform(*GC.LOOT_MATERIAL_RATIO)),
-        'babies': int(defender.baby_count * random.uniform(*GC.LOOT_BABY_RATIO)),
-        'children': int(defender.child_count * random.uniform(*GC.LOOT_CHILD_RATIO)),
+        key: int(getattr(defender, field) * RNG.uniform(*ratio))
+        for key, field, ratio in battle_sim.LOOT_TABLE
     }
     return loot
 
@@ -300,11 +286,14 @@ def _apply_loot(attacker, defender, loot):
     attacker.child_count += loot['children']
 
 
-def _format_battle_log(attacker, defender, attacker_wins, atk_losses, def_losses, loot,
-                       send_guards=0, send_adults=0, boss_joins=False):
-    """전투 결과를 텍스트 로그로 포맷"""
+def format_battle_log(attacker_name, defender_name, attacker_wins, atk_losses, def_losses, loot,
+                      send_guards=0, send_adults=0, boss_joins=False):
+    """
+    전투 결과를 텍스트 로그로 포맷
+    [v1.7.0] 저장된 숫자에서 조회 시 생성 (BattleLog.text) - 무작위 요소가 없어 같은 숫자면 같은 문장
+    """
     lines = []
-    lines.append(f"⚔️ {attacker.name} vs {defender.name}")
+    lines.append(f"⚔️ {attacker_name} vs {defender_name}")
     lines.append(f"결과: {'🏆 공격자 승리!' if attacker_wins else '🛡️ 방어자 승리!'}")
     lines.append("")
 
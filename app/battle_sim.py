@@ -0,0 +1,217 @@
+# -*- coding: utf-8 -*-
+"""
+실장석 공원 제국 - 전투 커널/예측 (battle_sim.py)
+[v1.7.0] battle_engine의 전투 공식을 ORM·DB·이벤트와 분리한 순수 함수 모음 + 몬테카를로 예측.
+
+- 전투력/출정 인원/피해율/보스 피해 범위: battle_engine.execute_battle이 그대로 사용 (공식은 이 모듈 한 곳)
+- simulate(): 같은 판정 순서를 NumPy 배열로 표본 수천 개에 대해 한 번에 계산
+  → 승률, 양측 피해·약탈·보스 피해 분포 (수 ms, 상태 변경 없음)
+- forecast(): 공원 객체에서 필요한 값만 읽어 simulate() 호출 (/api/battle-forecast, 교활 NPC 대상 선택)
+
+적대 관계 약탈 보너스(라우트에서 추가 적용)와 전투 후 사기 변동은 예측에 포함하지 않는다.
+NumPy는 simulate() 안에서 불러온다 (numpy가 없어도 battle_engine은 동작, 예측만 ImportError).
+"""
+from app.config import GameConfig as GC
+
+# 전투력 변동 (±20%)
+ROLL_RANGE = (0.8, 1.2)
+# 피해율: 승자 5~20%, 패자 20~50% 손실
+LOSS_RATE_WINNER = (0.05, 0.2)
+LOSS_RATE_LOSER = (0.2, 0.5)
+DEFENDER_CHILD_LOSS_FACTOR = 0.5    # 방어측 자실장은 피해율의 절반
+# 보스 피해 (randint 범위)
+BOSS_DMG_JOIN_LOSE = (10, 25)       # 보스 참전 패배
+BOSS_DMG_SOLO_WIN = (3, 8)          # [v1.5.1] 보스 단독 출전 승리
+BOSS_DMG_ROUT = (3, 10)             # 보스 미참전 대패 (간접 피해)
+ROUT_RATIO = 0.3                    # 대패 기준 전투력 비
+DEFENDER_BOSS_DMG = (5, 15)         # 방어측 보스 (공격자 대승 시)
+CRUSH_RATIO = 2.0                   # 대승 기준 전투력 비
+
+# 약탈 항목 → (방어자 보유량 키, 비율 범위)
+LOOT_TABLE = (
+    ('konpeito', 'konpeito', GC.LOOT_KONPEITO_RATIO),
+    ('trash', 'trash_food', GC.LOOT_TRASH_RATIO),
+    ('material', 'material', GC.LOOT_MATERIAL_RATIO),
+    ('babies', 'baby_count', GC.LOOT_BABY_RATIO),
+    ('children', 'child_count', GC.LOOT_CHILD_RATIO),
+)
+
+# forecast()가 공원에서 읽는 컬럼
+_SNAPSHOT_FIELDS = (
+    'guard_count', 'adult_count', 'child_count', 'baby_count',
+    'defending_guards', 'defending_adults',
+    'konpeito', 'trash_food', 'material',
+    'walls', 'watchtowers', 'morale', 'boss_hp',
+)
+
+
+# ========================================
+# 전투 공식 (스칼라, 부작용 없음)
+# ========================================
+
+def resolve_sortie(guard_count, defending_guards, adult_count, defending_adults,
+                   send_guards=None, send_adults=None):
+    """출정 인원 결정: 방어 배치 제외 가용 인원 안으로 제한 (None이면 가용 전원). 반환: (경호, 성체)"""
+    avail_guards = max(0, guard_count - defending_guards)
+    avail_adults = max(0, adult_count - defending_adults)
+    guards = avail_guards if send_guards is None else max(0, min(send_guards, avail_guards))
+    adults = avail_adults if send_adults is None else max(0, min(send_adults, avail_adults))
+    return guards, adults
+
+
+def morale_multiplier(morale):
+    """사기 보정 배율 (50 기준)"""
+    return 1.0 + (morale - 50) * GC.MORALE_COMBAT_EFFECT / 50
+
+
+def attack_power(send_guards, send_adults, morale, boss_joins):
+    """출정 유닛 기반 공격력"""
+    base = (send_guards * GC.POWER_GUARD +
+            send_adults * GC.POWER_ADULT)
+
+    # 보스 참전 보너스
+    if boss_joins:
+        base += GC.POWER_BOSS
+        # [v1.5.1] 보스 단독 출전 패널티: 호위 없이 싸우면 전투력 30% 감소
+        if send_guards + send_adults == 0:
+            base = int(base * 0.7)
+
+    return max(1, int(base * morale_multiplier(morale)))
+
+
+def defense_power(guard_count, adult_count, child_count, walls, watchtowers, morale):
+    """방어자 전투력 (전체 병력 + 방벽 보너스)"""
+    base = (guard_count * GC.POWER_GUARD +
+            adult_count * GC.POWER_ADULT +
+            child_count * GC.POWER_CHILD)
+
+    # 방벽 보너스 (개당 20%)
+    wall_bonus = 1.0 + walls * 0.2
+    # 감시탑 보너스 (기습 방지 = 10%)
+    tower_bonus = 1.0 + (0.1 if watchtowers > 0 else 0)
+
+    return max(1, int(base * wall_bonus * tower_bonus * morale_multiplier(morale)))
+
+
+def loss_rate_range(is_winner):
+    """피해율 범위 (uniform 인자)"""
+    return LOSS_RATE_WINNER if is_winner else LOSS_RATE_LOSER
+
+
+# ========================================
+# 몬테카를로 예측 (NumPy)
+# ========================================
+
+def snapshot(park):
+    """공원에서 전투 계산에 쓰는 값만 복사 (이후 계산은 ORM과 무관)"""
+    return {field: getattr(park, field) for field in _SNAPSHOT_FIELDS}
+
+
+def simulate(attacker, defender, send_guards, send_adults, boss_joins=False,
+             samples=None, rng=None):
+    """
+    전투 표본 samples개를 한 번에 계산 (execute_battle과 같은 판정 순서·절사·상한).
+    attacker/defender: snapshot() 딕셔너리, send_*: resolve_sortie()로 정한 출정 인원.
+    rng: numpy Generator (없으면 비결정 생성기).
+    반환: 승률과 각 수치의 분포 요약 {'mean', 'p10', 'p50', 'p90'} (패배 표본의 약탈은 0)
+    """
+    import numpy as np
+
+    n = max(1, int(samples or GC.FORECAST_SAMPLES))
+    gen = rng if rng is not None else np.random.default_rng()
+
+    atk_power = attack_power(send_guards, send_adults, attacker['morale'], boss_joins)
+    def_power = defense_power(defender['guard_count'], defender['adult_count'],
+                              defender['child_count'], defender['walls'],
+                              defender['watchtowers'], defender['morale'])
+
+    # 1~2. 전투력 변동 + 승패
+    atk_roll = atk_power * gen.uniform(*ROLL_RANGE, n)
+    def_roll = def_power * gen.uniform(*ROLL_RANGE, n)
+    wins = atk_roll > def_roll
+    ratio = atk_roll / np.maximum(def_roll, 1)
+
+    def loss_rates(is_winner):
+        low = np.where(is_winner, LOSS_RATE_WINNER[0], LOSS_RATE_LOSER[0])
+        high = np.where(is_winner, LOSS_RATE_WINNER[1], LOSS_RATE_LOSER[1])
+        return gen.uniform(low, high)
+
+    # 3. 피해 - 공격측은 확률적 반올림, 방어측은 절사 (방어자는 1/ratio >= 1 이면 승자 피해율)
+    atk_rate = loss_rates(wins)
+    atk_losses = {}
+    for key, sent in (('guards', send_guards), ('adults', send_adults)):
+        raw = sent * atk_rate
+        base = np.floor(raw)
+        rounded = base + (gen.random(n) < raw - base)
+        atk_losses[key] = np.minimum(sent, rounded).astype(np.int64)
+
+    def_rate = loss_rates(ratio <= 1)
+    def_losses = {
+        'guards': np.minimum(defender['guard_count'],
+                             (defender['guard_count'] * def_rate).astype(np.int64)),
+        'adults': np.minimum(defender['adult_count'],
+                             (defender['adult_count'] * def_rate).astype(np.int64)),
+        'children': np.minimum(defender['child_count'],
+                               (defender['child_count'] * def_rate
+                                * DEFENDER_CHILD_LOSS_FACTOR).astype(np.int64)),
+    }
+
+    # 4. 약탈 (피해 적용 후 남은 자실장 기준)
+    remaining_children = np.maximum(0, defender['child_count'] - def_losses['children'])
+    loot = {}
+    for key, field, ratio_range in LOOT_TABLE:
+        stock = remaining_children if field == 'child_count' else defender[field]
+        amount = (stock * gen.uniform(*ratio_range, n)).astype(np.int64)
+        loot[key] = np.where(wins, amount, 0)
+
+    # 5. 보스 피해
+    boss_solo = boss_joins and (send_guards + send_adults == 0)
+    if boss_joins:
+        atk_boss = np.where(wins, 0, gen.integers(BOSS_DMG_JOIN_LOSE[0], BOSS_DMG_JOIN_LOSE[1] + 1, n))
+        if boss_solo:
+            atk_boss = np.where(wins, gen.integers(BOSS_DMG_SOLO_WIN[0], BOSS_DMG_SOLO_WIN[1] + 1, n),
+                                atk_boss)
+    else:
+        atk_boss = np.where(~wins & (ratio < ROUT_RATIO),
+                            gen.integers(BOSS_DMG_ROUT[0], BOSS_DMG_ROUT[1] + 1, n), 0)
+    def_boss = np.where(wins & (ratio > CRUSH_RATIO),
+                        gen.integers(DEFENDER_BOSS_DMG[0], DEFENDER_BOSS_DMG[1] + 1, n), 0)
+
+    def summary(values):
+        p10, p50, p90 = np.percentile(values, (10, 50, 90), method='lower')
+        return {'mean': round(float(values.mean()), 2),
+                'p10': int(p10), 'p50': int(p50), 'p90': int(p90)}
+
+    return {
+        'samples': n,
+        'send_guards': send_guards,
+        'send_adults': send_adults,
+        'boss_joins': bool(boss_joins),
+        'attack_power': atk_power,
+        'defense_power': def_power,
+        'win_probability': round(float(wins.mean()), 4),
+        'attacker_losses': {key: summary(v) for key, v in atk_losses.items()},
+        'defender_losses': {key: summary(v) for key, v in def_losses.items()},
+        'loot': {key: summary(v) for key, v in loot.items()},
+        'expected_loot_total': round(float(sum(v.mean() for v in loot.values())), 2),
+        'attacker_boss_damage': summary(atk_boss),
+        'attacker_boss_death_probability': round(float((atk_boss >= attacker['boss_hp']).mean()), 4)
+                                           if attacker['boss_hp'] > 0 else 1.0,
+        'defender_boss_damage': summary(def_boss),
+    }
+
+
+def forecast(attacker, defender, send_guards=None, send_adults=None, boss_joins=False,
+             samples=None, rng=None):
+    """
+    공원 두 개로 전투 예측 (출정 인원 제한은 execute_battle과 동일, 상태 변경 없음).
+    출정 인원이 없으면 (보스 미참전 시) None.
+    """
+    atk = snapshot(attacker)
+    send_guards, send_adults = resolve_sortie(
+        atk['guard_count'], atk['defending_guards'], atk['adult_count'], atk['defending_adults'],
+        send_guards, send_adults)
+    if send_guards + send_adults == 0 and not boss_joins:
+        return None
+    return simulate(atk, snapshot(defender), send_guards, send_adults, boss_joins,
+                    samples=samples, rng=rng)
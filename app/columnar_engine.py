@@ -0,0 +1,612 @@
+# -*- coding: utf-8 -*-
+"""
+실장석 공원 제국 - 컬럼형 턴 엔진 (columnar_engine.py)
+[v1.7.0] 월드 틱 전용 벡터화 엔진 (NumPy).
+
+game_engine.process_turn의 공원 로컬 단계를 전 공원에 대해 한 번에 처리한다.
+1. 활성 공원 전체를 SELECT 1회로 읽어 컬럼별 NumPy 배열로 적재
+2. 각 단계를 마스크/where 연산 + 배치 난수로 계산 (공원 루프 없음)
+3. parks는 executemany UPDATE 1회, 대기열은 집합 UPDATE/DELETE, 이벤트는 버퍼 → bulk INSERT로 반영
+
+스칼라 엔진과 결과 분포가 같도록 각 단계의 판정 순서·상한·클램핑을 그대로 따른다.
+(개별 난수 소비 순서는 다르므로 같은 시드라도 값 단위로 일치하지는 않음)
+
+공원 간 상호작용이 있는 단계는 스칼라 엔진으로 처리한다.
+- 밀사 임무(12단계): 벡터 단계 반영 후, 진행 중 밀사가 있는 공원만 ORM으로 처리
+  이 공원들은 수용 초과(13단계)도 벡터 단계에서 빼고 밀사 다음에 판정 (스칼라 엔진과 같은 단계 순서)
+- NPC AI 행동(침공 포함): 벡터 단계 반영 후 process_npc_turn
+
+적재 SELECT는 FOR UPDATE (PostgreSQL): 틱 트랜잭션이 끝날 때까지 요청의 공원 쓰기를 막아
+일괄 UPDATE가 적재 이후 커밋된 변경(교역/전투 등)을 덮어쓰지 않는다.
+SQLite에서는 구문이 생략되고, 쓰기 트랜잭션(BEGIN IMMEDIATE)이 데이터베이스 전체를 잠근다.
+"""
+import numpy as np
+from sqlalchemy import select, update, bindparam
+
+from app.models import db, Park, BuildQueue, TrainQueue, SpyMission
+from app.config import GameConfig as GC
+from app import event_text
+from app.game_engine import _starvation_summary
+from app import event_buffer
+from app import target_index
+from app import rng as RNG
+
+
+# 엔진이 읽고 쓰는 Park 컬럼 (이 순서대로 SELECT)
+_INT_COLUMNS = (
+    'turn_count', 'action_points',
+    'gathering_adults', 'gathering_children', 'defending_guards', 'defending_adults',
+    'boss_hp', 'guard_count', 'adult_count', 'child_count', 'baby_count',
+    'konpeito', 'trash_food', 'meat_stock', 'material',
+    'konpeito_cap', 'trash_food_cap', 'material_cap', 'population_cap',
+    'morale', 'consecutive_trash_turns',
+    'cardboard_houses', 'unchi_holes', 'storage_holes', 'walls', 'watchtowers',
+    'disease_turns', 'konpeito_consecutive', 'addiction_clean_turns',
+    'gather_penalty_turns', 'strike_turns',
+)
+_BOOL_COLUMNS = ('is_destroyed', 'is_addicted')
+
+# 음식 소비(NP_PER_BABY=0.5)에서 소수가 생기므로 식량 컬럼은 실수로 계산
+_FLOAT_COLUMNS = ('konpeito', 'trash_food', 'meat_stock')
+
+
+class _EventSink:
+    """
+    벡터 단계에서 발생한 이벤트를 모아 두었다가 이벤트 버퍼로 전달.
+    대사 번호(event_text.msg)는 (공원, 턴, 공원 내 이벤트 순번) 스트림에서 뽑는다 → 같은 DB 상태면 같은 대사
+    """
+
+    def __init__(self, park_ids, turns):
+        self.park_ids = park_ids
+        self.turns = turns
+        self.rows = []
+        self._seq = {}
+
+    def stream(self, i):
+        """공원 i의 다음 이벤트용 난수 스트림 (with 블록 안에서 event_text.msg 호출)"""
+        park_id = int(self.park_ids[i])
+        seq = self._seq.get(park_id, 0)
+        self._seq[park_id] = seq + 1
+        return RNG.stream('columnar', int(self.turns[i]), park_id, 'events', seq)
+
+    def msg(self, i, code, **params):
+        """공원 i의 이벤트 메시지 (event_text.msg를 공원별 스트림 안에서)"""
+        with self.stream(i):
+            return event_text.msg(code, **params)
+
+    def add(self, i, event_type, message):
+        self.rows.append({
+            'park_id': int(self.park_ids[i]),
+            'event_type': event_type,
+            'message': message,
+            'turn_number': int(self.turns[i]),
+        })
+
+
+def process_world_turn(rng=None):
+    """
+    [v1.7.0] 전 공원 1턴 처리 (벡터 단계 + 밀사/NPC 스칼라 단계).
+    커밋은 호출자(turn_scheduler)가 한다.
+    반환: {'player': n, 'npc': n}
+    """
+    c = _load_columns()
+    if c['id'].size == 0:
+        return {'player': 0, 'npc': 0}
+
+    # [v1.7.0] 월드 시드 + 턴 번호로 유도한 결정적 Philox 생성기 (같은 DB 상태 → 같은 결과)
+    if rng is None:
+        rng = RNG.numpy_generator('columnar', int(c['turn_count'].max()) + 1)
+
+    # 배치 인원 조정 (process_turn 앞부분과 동일)
+    c['turn_count'] += 1
+    c['action_points'][:] = GC.ACTION_POINTS_PER_TURN
+    np.minimum(c['gathering_adults'], c['adult_count'], out=c['gathering_adults'])
+    np.minimum(c['gathering_children'], c['child_count'], out=c['gathering_children'])
+    np.minimum(c['defending_guards'], c['guard_count'], out=c['defending_guards'])
+    np.minimum(c['defending_adults'], c['adult_count'], out=c['defending_adults'])
+
+    ev = _EventSink(c['id'], c['turn_count'])
+
+    _stage_food(c, ev)                  # 1. 식량 소비 + 기아
+    _stage_cannibalism(c, rng, ev)      # 2. 자동 카니발리즘
+    _stage_building(c, ev)              # 3. 건설 진행
+    _stage_training(c, rng, ev)         # 4. 훈련 진행
+    _stage_growth(c, rng, ev)           # 5. 성장
+    _stage_unchi_breeding(c, rng, ev)   # 6. 운치굴 번식
+    _stage_disasters(c, rng, ev)        # 7. 재해
+    _stage_disease(c, rng, ev)          # 8. 질병
+    _stage_human_events(c, rng, ev)     # 9. 인간 이벤트
+    _stage_rebellion(c, rng, ev)        # 10. 반란 & 태업
+    _stage_addiction(c, ev)             # 11. 콘페이토 중독
+    _stage_overcrowding(c, ev)          # 13. 수용 초과 (밀사 공원은 스칼라 단계에서)
+
+    # 채집 패널티/태업 턴 감소
+    c['gather_penalty_turns'] -= c['gather_penalty_turns'] > 0
+    c['strike_turns'] -= c['strike_turns'] > 0
+
+    _write_back(c, ev)
+
+    return _run_scalar_phase(c)
+
+
+# ========================================
+# 적재 / 반영
+# ========================================
+
+def _load_columns():
+    """활성 공원 전체를 컬럼 배열로 적재 (행 잠금 SELECT 1회 + 밀사 발송 공원 조회)"""
+    names = ('id', 'is_npc') + _INT_COLUMNS + _BOOL_COLUMNS
+    stmt = (select(*[getattr(Park, n) for n in names])
+            .where(Park.is_destroyed == False)
+            .order_by(Park.id)
+            .with_for_update())
+    rows = db.session.execute(stmt).all()
+
+    columns = list(zip(*rows)) if rows else [()] * len(names)
+    c = {}
+    for name, values in zip(names, columns):
+        if name in _BOOL_COLUMNS or name == 'is_npc':
+            c[name] = np.array([bool(v) for v in values], dtype=bool)
+        elif name in _FLOAT_COLUMNS:
+            c[name] = np.array([v or 0 for v in values], dtype=np.float64)
+        else:
+            c[name] = np.array([v or 0 for v in values], dtype=np.int64)
+    c['index'] = {pid: i for i, pid in enumerate(c['id'].tolist())}
+
+    # 진행 중 밀사가 있는 공원 (12~13단계는 스칼라 단계에서 처리)
+    sender_ids = db.session.execute(
+        select(SpyMission.sender_id).where(SpyMission.status == 'active').distinct()
+    ).scalars().all()
+    c['spy'] = np.isin(c['id'], np.array(sender_ids, dtype=np.int64))
+    return c
+
+
+def _write_back(c, ev):
+    """대기열 집합 UPDATE/DELETE → parks executemany UPDATE → 이벤트 버퍼 적재"""
+    active = select(Park.id).where(Park.is_destroyed == False).scalar_subquery()
+
+    # 대기열: 턴 감소 후 완료분 삭제 (parks 갱신 전에 실행해야 이번 틱 대상과 일치)
+    for model in (BuildQueue, TrainQueue):
+        db.session.execute(
+            update(model)
+            .where(model.park_id.in_(active))
+            .values(turns_remaining=model.turns_remaining - 1)
+            .execution_options(synchronize_session=False))
+        db.session.execute(
+            model.__table__.delete()
+            .where(model.park_id.in_(active), model.turns_remaining <= 0))
+
+    # 식량 컬럼은 정수로 되돌리고, @validates와 같은 규칙으로 음수 클램핑
+    for name in _FLOAT_COLUMNS:
+        c[name] = np.floor(c[name]).astype(np.int64)
+    for name in ('guard_count', 'adult_count', 'child_count', 'baby_count',
+                 'konpeito', 'trash_food', 'meat_stock', 'material',
+                 'boss_hp', 'morale', 'action_points'):
+        np.maximum(c[name], 0, out=c[name])
+
+    names = _INT_COLUMNS + _BOOL_COLUMNS
+    table = Park.__table__
+    stmt = (update(table)
+            .where(table.c.id == bindparam('b_id'))
+            .values(dict({n: bindparam(f'b_{n}') for n in names},
+                         # [v1.7.0] 상태 버전 증가 (대시보드 캐시 무효화)
+                         state_version=table.c.state_version + 1)))
+    lists = {n: c[n].tolist() for n in names}
+    ids = c['id'].tolist()
+    params = [dict({'b_id': pid}, **{f'b_{n}': lists[n][i] for n in names})
+              for i, pid in enumerate(ids)]
+    db.session.execute(stmt, params)
+
+    # 이벤트는 세션 버퍼로 넘겨 커밋 시 bulk INSERT (병합 모드도 동일하게 적용)
+    event_buffer.extend(ev.rows)
+
+
+def _run_scalar_phase(c):
+    """
+    공원 간 상호작용 단계 (ORM).
+    - 진행 중 밀사가 있는 공원: 밀사 → 수용 초과 (process_spy_stage)
+    - NPC 공원: process_npc_turn (침공 포함)
+    """
+    from app.game_engine import process_spy_stage
+    from app.npc_engine import process_npc_turn
+
+    # Core UPDATE로 바뀐 행을 ORM이 다시 읽도록 identity map 만료
+    db.session.expire_all()
+
+    for pid in c['id'][c['spy']].tolist():
+        process_spy_stage(db.session.get(Park, pid))
+
+    # 이번 틱 도중 멸망한 NPC도 스칼라 엔진과 같이 AI 단계를 거친다
+    npc_ids = c['id'][c['is_npc']].tolist()
+    npc_parks = (Park.query.filter(Park.id.in_(npc_ids)).order_by(Park.id).all()
+                 if npc_ids else [])
+    # 벡터 단계·밀사 반영 후 상태로 공격 대상 인덱스 생성 (전투마다 증분 갱신)
+    with target_index.activate():
+        for park in npc_parks:
+            process_npc_turn(park)
+
+    return {'player': int((~c['is_npc']).sum()), 'npc': len(npc_ids)}
+
+
+# ========================================
+# 벡터 단계 (game_engine의 _process_* 와 1:1 대응)
+# ========================================
+
+def _total_population(c):
+    return c['guard_count'] + c['adult_count'] + c['child_count']
+
+
+def _stage_food(c, ev):
+    """_process_food_consumption + _consume_np + _process_starvation"""
+    remaining = (c['guard_count'] * GC.NP_PER_GUARD +
+                 c['adult_count'] * GC.NP_PER_ADULT +
+                 c['child_count'] * GC.NP_PER_CHILD +
+                 c['baby_count'] * GC.NP_PER_BABY).astype(np.float64)
+
+    # 1순위 음쓰 → 2순위 고기 → 3순위 콘페이토
+    use = np.minimum(c['trash_food'], remaining)
+    c['trash_food'] -= use
+    remaining -= use
+
+    need = remaining > 0
+    use = np.where(need, np.minimum(c['meat_stock'], np.ceil(remaining / GC.NP_MEAT)), 0)
+    c['meat_stock'] -= use
+    remaining -= use * GC.NP_MEAT
+
+    need = remaining > 0
+    use = np.where(need, np.minimum(c['konpeito'], np.ceil(remaining / GC.NP_KONPEITO)), 0)
+    c['konpeito'] -= use
+    remaining -= use * GC.NP_KONPEITO
+
+    # 쓰레기만 먹은 턴 카운트 + 사기 패널티
+    trash_only = (c['konpeito'] <= 0) & (c['meat_stock'] <= 0)
+    c['consecutive_trash_turns'] = np.where(trash_only, c['consecutive_trash_turns'] + 1, 0)
+    penalty = c['consecutive_trash_turns'] >= 3
+    c['morale'] = np.where(penalty, np.maximum(0, c['morale'] + GC.MORALE_TRASH_PENALTY), c['morale'])
+    for i in np.flatnonzero(penalty):
+        ev.add(i, 'morale', ev.msg(i, 'food_trash_only'))
+
+    # 기아: 저실장(1NP) → 자실장(2NP) → 성체(5NP) 순서로 사망, 그래도 부족하면 보스 피해
+    starving = remaining > 0
+    if not starving.any():
+        return
+    short = np.where(starving, remaining, 0)
+
+    dead_baby = np.minimum(c['baby_count'], np.ceil(short)).astype(np.int64)
+    short = short - dead_baby
+    dead_child = np.where(short > 0, np.minimum(c['child_count'], np.ceil(short / 2)), 0).astype(np.int64)
+    short = short - dead_child * 2
+    dead_adult = np.where(short > 0, np.minimum(c['adult_count'], np.ceil(short / 5)), 0).astype(np.int64)
+    short = short - dead_adult * 5
+    boss_hit = short > 0
+
+    c['baby_count'] -= dead_baby
+    c['child_count'] -= dead_child
+    c['adult_count'] -= dead_adult
+    c['boss_hp'] = np.where(boss_hit, np.maximum(0, c['boss_hp'] - 10), c['boss_hp'])
+    destroyed = boss_hit & (c['boss_hp'] <= 0)
+    c['is_destroyed'] |= destroyed
+
+    for i in np.flatnonzero(starving):
+        with ev.stream(i):
+            summary = _starvation_summary(int(dead_baby[i]), int(dead_child[i]), int(dead_adult[i]))
+        ev.add(i, 'starve', summary)
+        if destroyed[i]:
+            ev.add(i, 'gameover', ev.msg(i, 'starve_gameover'))
+
+
+def _stage_cannibalism(c, rng, ev):
+    """_process_cannibalism: 경호 1마리당 확률 판정 = 이항분포"""
+    if not GC.CANNIBALISM_AUTO_ENABLED:
+        return
+    active = (~c['is_destroyed'] & (c['trash_food'] <= 0) &
+              (c['meat_stock'] <= 0) & (c['konpeito'] <= 0))
+    if not active.any():
+        return
+    eaten = np.minimum(rng.binomial(c['guard_count'], GC.CANNIBALISM_GUARD_FEED_CHANCE),
+                       c['child_count'])
+    eaten = np.where(active, eaten, 0)
+    hit = eaten > 0
+
+    c['child_count'] -= eaten
+    c['meat_stock'] += eaten
+    c['morale'] = np.where(hit, np.maximum(0, c['morale'] + GC.CANNIBALISM_MORALE_PENALTY), c['morale'])
+    for i in np.flatnonzero(hit):
+        ev.add(i, 'cannibalism', ev.msg(i, 'cannibal_predation', n=int(eaten[i])))
+        ev.add(i, 'morale', ev.msg(i, 'cannibal_witness'))
+
+
+def _load_queue(model, c):
+    """대기열 행을 (행 인덱스 → 공원 인덱스) 배열로 적재"""
+    cols = [model.park_id, model.turns_remaining]
+    if model is BuildQueue:
+        cols.append(model.building_type)
+    rows = db.session.execute(
+        select(*cols).join(Park, Park.id == model.park_id)
+        .where(Park.is_destroyed == False)).all()
+    index = c['index']
+    park_idx = np.array([index[r[0]] for r in rows], dtype=np.int64)
+    turns = np.array([r[1] for r in rows], dtype=np.int64) - 1
+    types = [r[2] for r in rows] if model is BuildQueue else None
+    return park_idx, turns, types
+
+
+def _stage_building(c, ev):
+    """_process_building: 완료된 건설을 공원별로 집계 (행 삭제는 _write_back에서 일괄)"""
+    park_idx, turns, types = _load_queue(BuildQueue, c)
+    for j in np.flatnonzero(turns <= 0):
+        i = park_idx[j]
+        btype = types[j]
+        bldg = GC.BUILDINGS.get(btype, {})
+        effect = bldg.get('effect', {})
+        if btype == 'cardboard_house':
+            c['cardboard_houses'][i] += 1
+            c['population_cap'][i] += effect.get('population_cap', 0)
+        elif btype == 'unchi_hole':
+            c['unchi_holes'][i] += 1
+        elif btype == 'storage_hole':
+            c['storage_holes'][i] += 1
+            c['konpeito_cap'][i] += effect.get('konpeito_cap', 0)
+            c['trash_food_cap'][i] += effect.get('trash_food_cap', 0)
+            c['material_cap'][i] += effect.get('material_cap', 0)
+        elif btype == 'wall':
+            c['walls'][i] += 1
+        elif btype == 'watchtower':
+            c['watchtowers'][i] += 1
+        ev.add(i, 'build', ev.msg(i, 'build_complete', building=btype))
+
+
+def _stage_training(c, rng, ev):
+    """_process_training: 완료된 훈련 성공/실패를 공원별 집계"""
+    park_idx, turns, _ = _load_queue(TrainQueue, c)
+    done = np.flatnonzero(turns <= 0)
+    if done.size == 0:
+        return
+    success = rng.random(done.size) < GC.TRAIN_SUCCESS_RATE
+    np.add.at(c['guard_count'], park_idx[done[success]], 1)
+    np.add.at(c['adult_count'], park_idx[done[~success]], 1)
+    for j, ok in zip(done, success):
+        if ok:
+            ev.add(park_idx[j], 'train', ev.msg(park_idx[j], 'train_success'))
+        else:
+            ev.add(park_idx[j], 'train', ev.msg(park_idx[j], 'train_fail'))
+
+
+def _stage_growth(c, rng, ev):
+    """_process_growth: 자실장마다 5% 판정 = 이항분포 (루프 중 인구 상한 판정값은 고정)"""
+    room = _total_population(c) < c['population_cap']
+    grown = np.where(room, rng.binomial(c['child_count'], GC.CHILD_TO_ADULT_CHANCE), 0)
+    c['child_count'] -= grown
+    c['adult_count'] += grown
+    for i in np.flatnonzero(grown > 0):
+        ev.add(i, 'growth', ev.msg(i, 'growth', n=int(grown[i])))
+
+
+def _stage_unchi_breeding(c, rng, ev):
+    """_process_unchi_breeding: 운치굴마다 1~2마리 = 운치굴 수 + 이항분포(0.5)"""
+    holes = c['unchi_holes']
+    new_babies = np.where(holes > 0, holes + rng.binomial(np.maximum(holes, 0), 0.5), 0)
+    space = np.maximum(0, holes * 10 - c['baby_count'])
+    actual = np.minimum(new_babies, space)
+    c['baby_count'] += actual
+    for i in np.flatnonzero(actual > 0):
+        ev.add(i, 'breeding', ev.msg(i, 'breeding', n=int(actual[i])))
+
+
+def _stage_disasters(c, rng, ev):
+    """_process_disasters: 6종 재해를 순서대로 판정"""
+    n = c['id'].size
+    alive = ~c['is_destroyed']
+    r = rng.random((6, n))
+
+    # 1. 폭우
+    hit = alive & (r[0] < GC.DISASTER_RAIN_CHANCE) & (c['cardboard_houses'] > 0)
+    c['cardboard_houses'] -= hit
+    c['population_cap'] = np.where(hit, np.maximum(5, c['population_cap'] - 15), c['population_cap'])
+    for i in np.flatnonzero(hit):
+        ev.add(i, 'disaster', ev.msg(i, 'disaster_rain'))
+
+    # 2. 한파 (방벽이 있으면 피해 절반)
+    hit = alive & (r[1] < GC.DISASTER_COLD_CHANCE)
+    baby_dead = (c['baby_count'] * 0.3).astype(np.int64)
+    child_dead = (c['child_count'] * 0.1).astype(np.int64)
+    walled = c['walls'] > 0
+    baby_dead = np.where(hit, np.where(walled, baby_dead // 2, baby_dead), 0)
+    child_dead = np.where(hit, np.where(walled, child_dead // 2, child_dead), 0)
+    c['baby_count'] -= baby_dead
+    c['child_count'] -= child_dead
+    for i in np.flatnonzero(baby_dead + child_dead > 0):
+        ev.add(i, 'disaster',
+               ev.msg(i, 'disaster_cold', baby=int(baby_dead[i]), child=int(child_dead[i])))
+
+    # 3. 살충제
+    hit = alive & (r[2] < GC.DISASTER_PESTICIDE_CHANCE) & (c['unchi_holes'] > 0)
+    baby_dead = np.where(hit, (c['baby_count'] * 0.5).astype(np.int64), 0)
+    c['baby_count'] -= baby_dead
+    for i in np.flatnonzero(baby_dead > 0):
+        ev.add(i, 'disaster', ev.msg(i, 'disaster_pesticide', baby=int(baby_dead[i])))
+
+    # 4. 쥐떼
+    hit = alive & (r[3] < GC.DISASTER_RATS_CHANCE)
+    food_lost = np.where(hit, np.floor(c['trash_food'] * 0.3), 0)
+    baby_dead = np.where(hit, (c['baby_count'] * 0.2).astype(np.int64), 0)
+    c['trash_food'] = np.maximum(0, c['trash_food'] - food_lost)
+    c['baby_count'] -= baby_dead
+    for i in np.flatnonzero(food_lost + baby_dead > 0):
+        ev.add(i, 'disaster',
+               ev.msg(i, 'disaster_rats', food=int(food_lost[i]), baby=int(baby_dead[i])))
+
+    # 5. 고양이
+    hit = alive & (r[4] < GC.DISASTER_CAT_CHANCE) & (c['child_count'] > 0)
+    killed = np.where(hit, np.minimum(rng.integers(1, 4, n), c['child_count']), 0)
+    c['child_count'] -= killed
+    for i in np.flatnonzero(hit):
+        ev.add(i, 'disaster', ev.msg(i, 'disaster_cat', child=int(killed[i])))
+
+    # 6. 쓰레기장 철거
+    hit = alive & (r[5] < GC.DISASTER_DUMP_REMOVAL_CHANCE) & (c['gather_penalty_turns'] <= 0)
+    c['gather_penalty_turns'][hit] = 3
+    for i in np.flatnonzero(hit):
+        ev.add(i, 'disaster', ev.msg(i, 'disaster_dump'))
+
+
+def _stage_disease(c, rng, ev):
+    """_process_disease: 진행 중이면 피해, 아니면 과밀 조건에서 발병 판정"""
+    n = c['id'].size
+    alive = ~c['is_destroyed']
+
+    sick = alive & (c['disease_turns'] > 0)
+    c['disease_turns'] -= sick
+    baby_dead = np.where(sick, np.maximum(1, (c['baby_count'] * GC.DISEASE_BABY_DEATH_RATE).astype(np.int64)), 0)
+    child_dead = np.where(sick, (c['child_count'] * GC.DISEASE_CHILD_DEATH_RATE).astype(np.int64), 0)
+    c['baby_count'] = np.maximum(0, c['baby_count'] - baby_dead)
+    c['child_count'] = np.maximum(0, c['child_count'] - child_dead)
+    for i in np.flatnonzero(sick):
+        if c['disease_turns'][i] > 0:
+            ev.add(i, 'disease',
+                   ev.msg(i, 'disease_progress', baby=int(baby_dead[i]), child=int(child_dead[i]),
+                          turns=int(c['disease_turns'][i])))
+        else:
+            ev.add(i, 'disease', ev.msg(i, 'disease_end'))
+
+    # 새 발병 판정 (이번 턴에 진행 처리된 공원 제외)
+    pop = _total_population(c)
+    occupancy = pop / np.maximum(1, c['population_cap'])
+    outbreak = (alive & ~sick & (pop > 0) &
+                (occupancy >= GC.DISEASE_OVERCROWD_THRESHOLD) & (c['unchi_holes'] >= 3) &
+                (rng.random(n) < GC.DISEASE_CHANCE_PER_TURN))
+    lo, hi = GC.DISEASE_DURATION
+    c['disease_turns'] = np.where(outbreak, rng.integers(lo, hi + 1, n), c['disease_turns'])
+    for i in np.flatnonzero(outbreak):
+        ev.add(i, 'disease', ev.msg(i, 'disease_outbreak', turns=int(c['disease_turns'][i])))
+
+
+def _stage_human_events(c, rng, ev):
+    """_process_human_events: 5종 중 먼저 당첨된 1개만 발생"""
+    n = c['id'].size
+    r = rng.random((6, n))
+    pending = ~c['is_destroyed']
+
+    # 1. 학대자
+    hit = pending & (r[0] < GC.NPC_EVENT_ABUSER_CHANCE) & (c['child_count'] > 0)
+    taken = np.where(hit, np.minimum(rng.integers(3, 6, n), c['child_count']), 0)
+    c['child_count'] -= taken
+    c['morale'] = np.where(hit, np.maximum(0, c['morale'] - 8), c['morale'])
+    for i in np.flatnonzero(hit):
+        ev.add(i, 'human_evil', ev.msg(i, 'human_abuser', n=int(taken[i])))
+    pending &= ~hit
+
+    # 2. 실험체 포획
+    hit = pending & (r[1] < GC.NPC_EVENT_EXPERIMENT_CHANCE) & (c['adult_count'] > 1)
+    c['adult_count'] -= hit
+    c['morale'] = np.where(hit, np.maximum(0, c['morale'] - 10), c['morale'])
+    for i in np.flatnonzero(hit):
+        ev.add(i, 'human_evil', ev.msg(i, 'human_experiment'))
+    pending &= ~hit
+
+    # 3. 어린이 장난 (50%: 골판지집 파괴 / 50%: 사기 하락)
+    hit = pending & (r[2] < GC.NPC_EVENT_KIDS_CHANCE) & (c['cardboard_houses'] > 0)
+    wreck = hit & (r[3] < 0.5)
+    splash = hit & ~wreck
+    c['cardboard_houses'] -= wreck
+    c['population_cap'] = np.where(wreck, np.maximum(5, c['population_cap'] - 15), c['population_cap'])
+    c['morale'] = np.where(splash, np.maximum(0, c['morale'] - 5), c['morale'])
+    for i in np.flatnonzero(wreck):
+        ev.add(i, 'human_evil', ev.msg(i, 'human_kids_house'))
+    for i in np.flatnonzero(splash):
+        ev.add(i, 'human_evil', ev.msg(i, 'human_kids_splash'))
+    pending &= ~hit
+
+    # 4. 착한 인간
+    hit = pending & (r[4] < GC.NPC_EVENT_KINDNESS_CHANCE)
+    gift_k = rng.integers(3, 6, n)
+    gift_t = rng.integers(10, 21, n)
+    c['konpeito'] = np.where(hit, np.minimum(c['konpeito_cap'], c['konpeito'] + gift_k), c['konpeito'])
+    c['trash_food'] = np.where(hit, np.minimum(c['trash_food_cap'], c['trash_food'] + gift_t), c['trash_food'])
+    c['morale'] = np.where(hit, np.minimum(100, c['morale'] + 10), c['morale'])
+    for i in np.flatnonzero(hit):
+        ev.add(i, 'human_good',
+               ev.msg(i, 'human_kindness', konpeito=int(gift_k[i]), trash=int(gift_t[i])))
+    pending &= ~hit
+
+    # 5. 펫샵 포획
+    hit = pending & (r[5] < GC.NPC_EVENT_PETSHOP_CHANCE) & (c['child_count'] >= 2)
+    c['child_count'] -= hit * 2
+    for i in np.flatnonzero(hit):
+        ev.add(i, 'human_evil', ev.msg(i, 'human_petshop'))
+
+
+def _stage_rebellion(c, rng, ev):
+    """_process_rebellion: 탈주 → 태업 → 쿠데타"""
+    n = c['id'].size
+    alive = ~c['is_destroyed']
+    r = rng.random((3, n))
+
+    # 1. 자실장 탈주
+    hit = alive & (c['morale'] <= GC.REBELLION_MORALE_THRESHOLD) & (r[0] < GC.REBELLION_CHANCE)
+    fled = np.minimum(np.maximum(1, (c['child_count'] * GC.REBELLION_DESERTION_RATE).astype(np.int64)),
+                      c['child_count'])
+    fled = np.where(hit, fled, 0)
+    c['child_count'] -= fled
+    for i in np.flatnonzero(fled > 0):
+        ev.add(i, 'rebellion', ev.msg(i, 'rebellion_desertion', n=int(fled[i])))
+
+    # 2. 성체 태업
+    hit = alive & (c['morale'] <= 30) & (c['strike_turns'] <= 0) & (r[1] < GC.REBELLION_ADULT_STRIKE_CHANCE)
+    c['strike_turns'][hit] = 2
+    for i in np.flatnonzero(hit):
+        ev.add(i, 'rebellion', ev.msg(i, 'rebellion_strike'))
+
+    # 3. 경호 쿠데타
+    hit = (alive & (c['morale'] <= GC.REBELLION_MORALE_THRESHOLD) &
+           (c['boss_hp'] <= GC.REBELLION_BOSS_HP_THRESHOLD) & (c['guard_count'] > 0) &
+           (r[2] < GC.REBELLION_GUARD_COUP_CHANCE))
+    coup_guards = np.where(hit, np.maximum(1, c['guard_count'] // 2), 0)
+    c['boss_hp'] = np.where(hit, np.maximum(0, c['boss_hp'] - GC.REBELLION_GUARD_COUP_DAMAGE), c['boss_hp'])
+    c['guard_count'] -= coup_guards
+    destroyed = hit & (c['boss_hp'] <= 0)
+    c['is_destroyed'] |= destroyed
+    for i in np.flatnonzero(hit):
+        ev.add(i, 'rebellion',
+               ev.msg(i, 'rebellion_coup', damage=GC.REBELLION_GUARD_COUP_DAMAGE,
+                      guards=int(coup_guards[i])))
+        if destroyed[i]:
+            ev.add(i, 'gameover', ev.msg(i, 'coup_gameover'))
+
+
+def _stage_addiction(c, ev):
+    """_process_addiction: 연속 섭취 → 중독 → 금단 → 해독"""
+    alive = ~c['is_destroyed']
+
+    konpeito_only = alive & (c['konpeito'] > 0) & (c['trash_food'] <= 0) & (c['meat_stock'] <= 0)
+    mixed = alive & ~konpeito_only
+    c['konpeito_consecutive'] = np.where(konpeito_only, c['konpeito_consecutive'] + 1,
+                                         np.where(mixed, 0, c['konpeito_consecutive']))
+    c['addiction_clean_turns'] += mixed & c['is_addicted']
+
+    onset = alive & (c['konpeito_consecutive'] >= GC.ADDICTION_TRIGGER_TURNS) & ~c['is_addicted']
+    c['is_addicted'] |= onset
+    c['addiction_clean_turns'][onset] = 0
+    for i in np.flatnonzero(onset):
+        ev.add(i, 'addiction', ev.msg(i, 'addiction_onset'))
+
+    withdrawal = alive & c['is_addicted'] & (c['konpeito'] <= 0)
+    c['morale'] = np.where(withdrawal, np.maximum(0, c['morale'] + GC.ADDICTION_MORALE_PENALTY), c['morale'])
+    for i in np.flatnonzero(withdrawal):
+        ev.add(i, 'addiction', ev.msg(i, 'addiction_withdrawal'))
+
+    cured = alive & c['is_addicted'] & (c['addiction_clean_turns'] >= GC.ADDICTION_CURE_TURNS)
+    c['is_addicted'] &= ~cured
+    c['addiction_clean_turns'][cured] = 0
+    c['konpeito_consecutive'][cured] = 0
+    for i in np.flatnonzero(cured):
+        ev.add(i, 'addiction', ev.msg(i, 'addiction_cured'))
+
+
+def _stage_overcrowding(c, ev):
+    """_process_overcrowding: 초과 인원만큼 자실장 탈주 (밀사 공원 제외 - 밀사 단계 뒤에 판정)"""
+    excess = np.where(c['spy'], 0, np.maximum(0, _total_population(c) - c['population_cap']))
+    fled = np.minimum(excess, c['child_count'])
+    c['child_count'] -= fled
+    for i in np.flatnonzero(fled > 0):
+        ev.add(i, 'overcrowd', ev.msg(i, 'overcrowd', n=int(fled[i])))
@@ -9,18 +9,44 @@
 import os
 
 
+def _database_url(url):
+    """[v1.7.0] postgres:// / postgresql:// (호스팅 서비스 기본 형식) → psycopg 3 드라이버 URL"""
+    for prefix in ('postgres://', 'postgresql://'):
+        if url.startswith(prefix):
+            return 'postgresql+psycopg://' + url[len(prefix):]
+    return url
+
+
 class Config:
     """Flask 기본 설정"""
     # Flask 시크릿 키 (세션 암호화용)
     SECRET_KEY = os.environ.get('FLASK_SECRET_KEY', 'jissou-park-secret-desu-2026')
 
-    # SQLite 데이터베이스 경로
-    SQLALCHEMY_DATABASE_URI = 'sqlite:///game.db'
+    # 데이터베이스 (기본: SQLite 파일)
+    # [v1.7.0] DATABASE_URL로 교체 가능 (예: postgresql://user:pw@host/jissou - psycopg 필요)
+    SQLALCHEMY_DATABASE_URI = _database_url(os.environ.get('DATABASE_URL', 'sqlite:///game.db'))
     SQLALCHEMY_TRACK_MODIFICATIONS = False
 
+    # [v1.7.0] DB 엔진 프로필 (app/db_profile.py): production = WAL + PRAGMA + 쓰기 BEGIN IMMEDIATE, legacy = 이전 동작
+    DB_PROFILE = os.environ.get('DB_PROFILE', 'production')
+    SQLITE_BUSY_TIMEOUT_MS = int(os.environ.get('SQLITE_BUSY_TIMEOUT_MS', 5000))   # 쓰기 락 대기 상한
+    SQLITE_CACHE_SIZE_KB = int(os.environ.get('SQLITE_CACHE_SIZE_KB', 20000))      # 연결당 페이지 캐시
+    SQLITE_MMAP_SIZE_MB = int(os.environ.get('SQLITE_MMAP_SIZE_MB', 256))          # 메모리 맵 읽기 (0=끔)
+    DB_POOL_SIZE = int(os.environ.get('DB_POOL_SIZE', 10))                         # 프로세스당 유지 연결 수
+    DB_MAX_OVERFLOW = int(os.environ.get('DB_MAX_OVERFLOW', 20))                   # 초과 허용 연결 수
+    DB_POOL_TIMEOUT = int(os.environ.get('DB_POOL_TIMEOUT', 30))                   # 풀 대기 상한 (초)
+    DB_POOL_PRE_PING = os.environ.get('DB_POOL_PRE_PING', '0') == '1'              # 대여 시 연결 확인 (SQLite 파일은 불필요, PostgreSQL은 항상 켬)
+    PG_LOCK_TIMEOUT_MS = int(os.environ.get('PG_LOCK_TIMEOUT_MS', 5000))           # PostgreSQL 행 잠금 대기 상한 (0=무제한)
+
     # 디버그 모드
     DEBUG = os.environ.get('DEBUG', 'true').lower() == 'true'
 
+    # [v1.7.0] SQL 프로파일러 (app/profiler.py)
+    PROFILER_ENABLED = os.environ.get('PROFILER_ENABLED', '1') == '1'
+    PROFILER_HEADER = os.environ.get('PROFILER_HEADER', '0') == '1'      # X-Query-Count / X-SQL-Time 헤더
+    PROFILER_SLOW_MS = int(os.environ.get('PROFILER_SLOW_MS', 100))     # 느린 쿼리 기준 (ms, 0=끔)
+    PROFILER_STRICT = os.environ.get('PROFILER_STRICT', '0') == '1'      # 쿼리 예산 초과 시 예외 (테스트/CI)
+
 
 class GameConfig:
     """게임 밸런스 상수 - spec.md 섹션 8 기반"""
@@ -34,6 +60,27 @@ class GameConfig:
     TURN_QUOTA_INITIAL = 3             # 초기 턴 (가입 시)
     TURN_REGEN_SECONDS = 1200          # 1턴 충전 시간 (20분 = 1200초)
     TURN_NPC_SYNC = True               # 플레이어 턴 소비 시 NPC도 동기 처리
+    # [v1.7.0] NPC 동기 처리를 요청 경로 밖(스케줄러 워커)으로 분리
+    NPC_SYNC_ASYNC = os.environ.get('NPC_SYNC_ASYNC', '1') == '1'   # 0이면 요청 안에서 즉시 처리 (이전 방식)
+    NPC_SYNC_INTERVAL = int(os.environ.get('NPC_SYNC_INTERVAL', 5))  # 워커 실행 간격 (초)
+    NPC_SYNC_MAX_TICKS = int(os.environ.get('NPC_SYNC_MAX_TICKS', 10))  # 워커 1회당 최대 NPC 틱 수
+
+    # [v1.7.0] 배치 월드 틱 (청크 단위 트랜잭션)
+    TICK_CHUNK_SIZE = int(os.environ.get('TICK_CHUNK_SIZE', 200))  # 청크당 공원 수 (= 커밋 1회)
+    # 'scalar': 공원별 process_turn / 'columnar': NumPy 벡터 엔진 (app/columnar_engine.py)
+    # 'sharded': 공원 id 구간별 멀티프로세스 (app/sharded_tick.py)
+    TICK_ENGINE = os.environ.get('TICK_ENGINE', 'scalar')
+    TICK_WORKERS = int(os.environ.get('TICK_WORKERS', os.cpu_count() or 2))  # sharded 모드 워커 프로세스 수
+    # [v1.7.0] 결정적 난수 (app/rng.py) - 비우면 프로세스마다 무작위 시드
+    WORLD_SEED = os.environ.get('WORLD_SEED', '')
+    # [v1.7.0] 랭킹 스냅샷 최대 수명 (초) - 월드 틱마다 갱신, 이보다 오래되면 요청 시 재생성
+    LEADERBOARD_MAX_AGE = int(os.environ.get('LEADERBOARD_MAX_AGE', TURN_INTERVAL))
+    # [v1.7.0] 대시보드 조각 캐시 슬롯 수 (공원당 본문 + 다른 공원 목록 2슬롯, app/fragment_cache.py)
+    FRAGMENT_CACHE_SIZE = int(os.environ.get('FRAGMENT_CACHE_SIZE', 1000))
+    # [v1.7.0] 전투 기록/이벤트 기록 페이지 크기 (키셋 페이지네이션, app/history.py)
+    HISTORY_PAGE_SIZE = int(os.environ.get('HISTORY_PAGE_SIZE', 20))
+    HISTORY_MAX_PAGE_SIZE = 100        # ?limit= 상한
+    HISTORY_MAX_EVENT_TYPES = 10       # /api/events ?type= 개수 상한 (타입마다 인덱스 조회 1회)
 
     # [v1.3.0] 보호 모드 시스템
     PROTECT_GUARD_MIN = 5              # 보호 해제 최소 경호실장
@@ -171,6 +218,14 @@ class GameConfig:
     LOOT_BABY_RATIO = (0.3, 0.5)       # 저실장 30~50% 포획
     LOOT_CHILD_RATIO = (0.1, 0.2)      # 자실장 10~20% 포획
 
+    # [v1.7.0] 전투 예측 (app/battle_sim.py 몬테카를로)
+    FORECAST_SAMPLES = int(os.environ.get('FORECAST_SAMPLES', 2000))  # /api/battle-forecast 기본 표본 수
+    FORECAST_MAX_SAMPLES = 20000     # 요청당 표본 수 상한
+    FORECAST_MAX_TARGETS = 10        # 요청당 예측 대상 공원 수 상한
+    NPC_FORECAST_CANDIDATES = 3      # 교활 NPC가 비교하는 후보 공원 수
+    NPC_FORECAST_SAMPLES = 256       # 후보당 표본 수
+    NPC_CUNNING_MIN_WIN = 0.7        # 교활 NPC가 침공하는 최소 예측 승률
+
     # === NPC 설정 ===
     NPC_INITIAL_COUNT = int(os.environ.get('NPC_INITIAL_COUNT', 8))
     NPC_TURN_GROWTH_RATE = 1.02  # 턴 당 자원 2% 성장
@@ -248,3 +303,36 @@ class GameConfig:
     ADDICTION_MORALE_PENALTY = -20      # 중독 상태에서 콘페이토 없으면 사기 -20
     ADDICTION_GATHER_PENALTY = 0.50     # 중독 실장석 채집 효율 50% 감소
     ADDICTION_CURE_TURNS = 3            # 3턴 콘페이토 미섭취 시 해독
+
+    # === 9. [v1.7.0] 이벤트 로그 기록/보존/아카이브 ===
+    EVENT_RETENTION_ENABLED = os.environ.get('EVENT_RETENTION_ENABLED', '1') == '1'
+    EVENT_RETENTION_INTERVAL = int(os.environ.get('EVENT_RETENTION_INTERVAL', 60))  # 실행 간격 (초)
+    EVENT_RETENTION_BATCH = int(os.environ.get('EVENT_RETENTION_BATCH', 500))       # 배치당 삭제 행 수 (= 트랜잭션 1개)
+    EVENT_RETENTION_MAX_BATCHES = 10    # 실행 1회당 최대 배치 수 (쓰기 락 점유 상한)
+    EVENT_RETENTION_PARKS_PER_RUN = 50  # 실행 1회당 보유 개수 상한을 점검할 공원 수 (순환)
+    EVENT_KEEP_LAST_PER_PARK = int(os.environ.get('EVENT_KEEP_LAST_PER_PARK', 300))  # 공원별 최근 N개만 보존
+    EVENT_TTL_DEFAULT_DAYS = 7          # 아래에 없는 타입의 보존 기간 (일)
+    EVENT_TTL_DAYS = {
+        # 매 턴 쏟아지는 잡음성 이벤트 - 짧게
+        'starve': 1, 'growth': 1, 'breeding': 1, 'morale': 1, 'overcrowd': 1,
+        'gather': 2, 'build': 2, 'train': 2, 'birth': 2, 'birth_death': 2,
+        'birth_fail': 2, 'cull': 2,
+        # 알림/기록성 이벤트 - 길게
+        'battle': 30, 'trade': 30, 'diplomacy': 30, 'spy': 30, 'sabotage': 30,
+        'gameover': 90,
+    }
+    # 이벤트 병합 모드: 지정 타입은 같은 공원·턴의 이벤트를 1행으로 합침 (쉼표 구분, 예: "starve,disaster")
+    EVENT_COALESCE_TYPES = frozenset(
+        t.strip() for t in os.environ.get('EVENT_COALESCE_TYPES', '').split(',') if t.strip())
+    # 코드로 기록한 이벤트의 표시 문장 메모이즈 크기 ((코드, 파라미터, 대사 번호, 언어) 조합 수, app/event_text.py)
+    EVENT_RENDER_CACHE_SIZE = int(os.environ.get('EVENT_RENDER_CACHE_SIZE', 4096))
+    # 실시간 알림 대상 타입 (SSE/롱폴링 푸시)
+    NOTIFY_TYPES = ('battle', 'trade', 'diplomacy')
+    NOTIFY_WAIT_SECONDS = int(os.environ.get('NOTIFY_WAIT_SECONDS', 25))      # 롱폴링/SSE keepalive 간격
+    NOTIFY_STREAM_SECONDS = int(os.environ.get('NOTIFY_STREAM_SECONDS', 300))  # SSE 연결 최대 유지 (이후 재연결)
+    # 동시 대기 연결(SSE + 롱폴링) 상한 - 연결마다 요청 스레드 1개를 점유하므로 gunicorn --threads보다 작게
+    # (초과분은 즉시 응답 → 클라이언트가 NOTIFY_POLL_SECONDS 간격 폴링으로 전환)
+    NOTIFY_MAX_WAITERS = int(os.environ.get('NOTIFY_MAX_WAITERS', 64))
+    NOTIFY_POLL_SECONDS = int(os.environ.get('NOTIFY_POLL_SECONDS', 10))
+    # 아카이브 경로 (비어 있으면 instance/event_archive) - <공원 id>/<YYYY-MM-DD>.jsonl.gz
+    EVENT_ARCHIVE_DIR = os.environ.get('EVENT_ARCHIVE_DIR', '')
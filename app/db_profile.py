@@ -0,0 +1,158 @@
+# -*- coding: utf-8 -*-
+"""
+실장석 공원 제국 - DB 엔진 프로필 (db_profile.py)
+[v1.7.0] SQLite 연결 PRAGMA + 커넥션 풀 옵션 + 쓰기 트랜잭션 BEGIN IMMEDIATE.
+
+프로필 (DB_PROFILE):
+- production (기본): journal_mode=WAL, synchronous=NORMAL, busy_timeout, cache_size, mmap_size,
+  temp_store=MEMORY + 쓰기 트랜잭션 BEGIN IMMEDIATE
+  WAL: 읽기와 쓰기가 서로 막지 않음, 커밋은 WAL 끝에 추가만 하고 fsync는 체크포인트 때
+  (synchronous=NORMAL: 프로세스가 죽어도 안전, 전원 장애 시에는 마지막 커밋 일부가 사라질 수 있음)
+- legacy: 이전 동작 그대로 (롤백 저널, 드라이버 기본 트랜잭션 처리, 풀 기본값)
+
+트랜잭션 시작 (production):
+- pysqlite의 암묵적 BEGIN을 끄고 엔진 begin 이벤트에서 직접 BEGIN을 보낸다
+- 쓰기 트랜잭션은 BEGIN IMMEDIATE: 시작할 때 쓰기 락을 잡고, 다른 쓰기 중이면 busy_timeout만큼 대기
+  (DEFERRED로 읽다가 쓰기로 올라가면, 그 사이 다른 쓰기가 커밋된 경우 대기 없이 바로 "database is locked")
+- 쓰기 판정: 요청 밖(스케줄러/틱 워커)은 모두 쓰기, 요청 안은 GET/HEAD/OPTIONS가 아니거나
+  뷰 함수에 writes_db 표시(@UOW.transactional)가 있으면 쓰기 (GET 대시보드도 턴 처리로 쓴다)
+- BEGIN은 DBAPI 연결에 직접 실행 → 프로파일러 쿼리 수/예산에 잡히지 않음 (이전 암묵적 BEGIN과 동일)
+
+PostgreSQL (DATABASE_URL=postgresql://...):
+- PRAGMA/BEGIN IMMEDIATE 없음 (드라이버 기본 트랜잭션, READ COMMITTED)
+- 쓰기 직렬화는 데이터베이스 락 대신 행 잠금 (app/row_lock.py의 SELECT ... FOR UPDATE)
+  → 서로 다른 공원을 다루는 요청은 동시에 커밋된다
+- 풀 설정은 production 프로필 그대로, pre_ping은 항상 켬 (서버 재시작/유휴 연결 끊김 대비)
+- 행 잠금 대기 상한: PG_LOCK_TIMEOUT_MS (SQLite busy_timeout에 해당, 연결 옵션 lock_timeout)
+"""
+import sqlite3
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine, make_url
+
+# 프로필 이름 → (PRAGMA 적용, 쓰기 트랜잭션 BEGIN IMMEDIATE, 풀 크기 설정)
+PROFILES = {
+    'production': {'pragmas': True, 'begin_immediate': True, 'pool': True},
+    'legacy': {'pragmas': False, 'begin_immediate': False, 'pool': False},
+}
+
+# 읽기 전용으로 보는 요청 메서드 (BEGIN DEFERRED)
+_READ_METHODS = frozenset(('GET', 'HEAD', 'OPTIONS'))
+
+# 현재 프로필 설정 (init_db_profile에서 채움)
+_settings = {'name': None, 'backend': None, 'pragmas': (), 'begin_immediate': False}
+
+
+def _pragmas(config):
+    """연결마다 실행할 PRAGMA (이름, 값) 목록"""
+    return (
+        ('journal_mode', 'WAL'),
+        ('synchronous', 'NORMAL'),
+        ('busy_timeout', config['SQLITE_BUSY_TIMEOUT_MS']),
+        ('cache_size', -config['SQLITE_CACHE_SIZE_KB']),          # 음수 = KiB 단위
+        ('mmap_size', config['SQLITE_MMAP_SIZE_MB'] * 1024 * 1024),
+        ('temp_store', 'MEMORY'),
+    )
+
+
+def _is_memory_db(uri):
+    return uri in ('sqlite://', 'sqlite:///:memory:') or 'mode=memory' in uri
+
+
+def backend_name(uri):
+    """DB URI → 백엔드 이름 ('sqlite', 'postgresql', ...)"""
+    return make_url(uri).get_backend_name()
+
+
+def engine_options(config, profile):
+    """Flask-SQLAlchemy SQLALCHEMY_ENGINE_OPTIONS 기본값"""
+    uri = config.get('SQLALCHEMY_DATABASE_URI', '')
+    backend = backend_name(uri)
+    options = {'pool_pre_ping': config['DB_POOL_PRE_PING'] or backend != 'sqlite'}
+    # 메모리 DB는 스레드별 단일 연결 풀 → 크기 옵션을 받지 않음
+    if profile['pool'] and not _is_memory_db(uri):
+        options.update(pool_size=config['DB_POOL_SIZE'],
+                       max_overflow=config['DB_MAX_OVERFLOW'],
+                       pool_timeout=config['DB_POOL_TIMEOUT'])
+    if backend == 'postgresql' and profile['pragmas']:
+        options['connect_args'] = {'options': f"-c lock_timeout={config['PG_LOCK_TIMEOUT_MS']}"}
+    return options
+
+
+def init_db_profile(app):
+    """
+    [v1.7.0] DB_PROFILE 적용. db.init_app(app)보다 먼저 호출한다 (엔진 옵션은 엔진 생성 시 읽힘).
+    명시한 SQLALCHEMY_ENGINE_OPTIONS 값이 있으면 그쪽이 우선.
+    """
+    name = app.config.get('DB_PROFILE', 'production')
+    if name not in PROFILES:
+        raise ValueError(f"unknown DB_PROFILE: {name!r} (choose from {', '.join(PROFILES)})")
+    profile = PROFILES[name]
+    backend = backend_name(app.config['SQLALCHEMY_DATABASE_URI'])
+    sqlite = backend == 'sqlite'
+
+    _settings.update(
+        name=name,
+        backend=backend,
+        pragmas=_pragmas(app.config) if profile['pragmas'] and sqlite else (),
+        begin_immediate=profile['begin_immediate'] and sqlite,
+    )
+
+    options = dict(engine_options(app.config, profile))
+    options.update(app.config.get('SQLALCHEMY_ENGINE_OPTIONS') or {})
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = options
+
+    if not event.contains(Engine, 'connect', _on_connect):
+        event.listen(Engine, 'connect', _on_connect)
+        event.listen(Engine, 'begin', _on_begin)
+
+
+def describe():
+    """현재 프로필 요약 (/debug/profile)"""
+    return {
+        'profile': _settings['name'],
+        'backend': _settings['backend'],
+        'pragmas': dict(_settings['pragmas']),
+        'begin_immediate': _settings['begin_immediate'],
+        'row_locks': row_locks(),
+    }
+
+
+def row_locks():
+    """행 잠금(SELECT ... FOR UPDATE) 사용 여부 - SQLite는 구문이 없고 쓰기 트랜잭션이 DB 전체를 잠근다"""
+    return _settings['backend'] not in (None, 'sqlite')
+
+
+# ========================================
+# 엔진 이벤트 리스너
+# ========================================
+
+def _on_connect(dbapi_connection, connection_record):
+    """새 SQLite 연결: PRAGMA 적용 + (BEGIN IMMEDIATE 사용 시) 드라이버 암묵적 트랜잭션 끄기"""
+    if not isinstance(dbapi_connection, sqlite3.Connection):
+        return
+    cursor = dbapi_connection.cursor()
+    for name, value in _settings['pragmas']:
+        cursor.execute(f"PRAGMA {name}={value}")
+    cursor.close()
+    if _settings['begin_immediate']:
+        dbapi_connection.isolation_level = None
+
+
+def _on_begin(conn):
+    """트랜잭션 시작: 쓰기면 BEGIN IMMEDIATE, 읽기면 BEGIN (DEFERRED)"""
+    if not _settings['begin_immediate'] or conn.dialect.name != 'sqlite':
+        return
+    statement = 'BEGIN IMMEDIATE' if _is_write() else 'BEGIN'
+    conn.connection.driver_connection.execute(statement)
+
+
+def _is_write():
+    """현재 트랜잭션을 쓰기로 볼지 (요청 밖이면 항상 쓰기, 읽기 메서드라도 쓰기 표시된 뷰면 쓰기)"""
+    from flask import current_app, has_request_context, request
+    if not has_request_context():
+        return True
+    if request.method not in _READ_METHODS:
+        return True
+    view = current_app.view_functions.get(request.endpoint)
+    return getattr(view, 'writes_db', False)
@@ -11,108 +11,139 @@
 
 대사 데이터는 app/lang/dialogues_{lang}.json 파일에 저장.
 키 구조: GATHER_DEPART, BUILD_START 등은 dict/list/str 타입.
+
+[v1.7.0] 대사 테이블 사전 컴파일:
+- import 시 언어별 JSON을 1회 읽어 불변 테이블로 변환 (list → tuple, dict → 읽기 전용 매핑)
+- 기본 언어(ko) 폴백은 컴파일 때 미리 병합 → 조회는 속성 1회 (폴백 탐색 없음)
+- 언어는 호출자가 lang으로 넘긴다: dlg = DLG.table(lang) → dlg.GATHER_DEPART
+  lang이 None이면 요청 컨텍스트의 세션 언어, 요청 밖(스케줄러 틱)이면 기본 언어 (세션 조회 없음)
+- 대사 선택은 tuple에서 RNG.choice/sample → O(1)
+- 기존 DLG.GATHER_SUCCESS_BIG 형태 접근도 유지 (현재 언어 테이블로 위임)
 """
 import json
 import os
-import random
+from types import MappingProxyType
+
+from flask import has_request_context, session
 
-# JSON 대사 캐시 (언어별)
-_dialogue_cache = {}
+from app import rng as RNG
 
 # 기본 언어 (폴백)
-_DEFAULT_LANG = 'ko'
+DEFAULT_LANG = 'ko'
+_DEFAULT_LANG = DEFAULT_LANG
+
+_LANG_DIR = os.path.join(os.path.dirname(__file__), 'lang')
 
 
-def _load_dialogues(lang_code):
+class DialogueTable:
     """
-    [v1.3.0] 지정 언어의 대사 JSON을 로드하여 캐시.
-    없는 언어면 기본 언어(ko)로 폴백.
+    [v1.7.0] 한 언어의 컴파일된 대사 테이블 (불변).
+    키는 인스턴스 속성 → dlg.GATHER_DEPART 조회는 딕셔너리 1회.
+    없는 키는 빈 tuple (이전 로더의 빈 리스트와 같은 의미).
     """
-    global _dialogue_cache
-    if lang_code in _dialogue_cache:
-        return _dialogue_cache[lang_code]
-
-    lang_dir = os.path.join(os.path.dirname(__file__), 'lang')
-    filepath = os.path.join(lang_dir, f'dialogues_{lang_code}.json')
-
-    if os.path.exists(filepath):
-        with open(filepath, 'r', encoding='utf-8') as f:
-            _dialogue_cache[lang_code] = json.load(f)
-    else:
-        # 해당 언어 파일 없으면 기본 언어 로드
-        fallback_path = os.path.join(lang_dir, f'dialogues_{_DEFAULT_LANG}.json')
-        if os.path.exists(fallback_path):
-            with open(fallback_path, 'r', encoding='utf-8') as f:
-                _dialogue_cache[lang_code] = json.load(f)
-        else:
-            _dialogue_cache[lang_code] = {}
-
-    return _dialogue_cache[lang_code]
-
-
-def _get_current_lang():
-    """Flask 세션에서 현재 언어 취득 (요청 컨텍스트 외에서는 기본값)"""
-    try:
-        from flask import session
-        return session.get('lang', _DEFAULT_LANG)
-    except RuntimeError:
-        # Flask 요청 컨텍스트 밖 (스케줄러 등)
-        return _DEFAULT_LANG
 
+    def __init__(self, lang, entries):
+        object.__setattr__(self, 'lang', lang)
+        self.__dict__.update(entries)
 
-def _get_data(key, lang=None):
-    """
-    [v1.3.0] 키에 해당하는 대사 데이터를 가져온다.
-    반환: list, dict, str 중 하나 (원본 그대로).
-    없으면 기본 언어에서 조회, 그래도 없으면 빈 리스트.
-    """
-    if lang is None:
-        lang = _get_current_lang()
+    def __getattr__(self, name):
+        # 정상 속성 조회에 실패했을 때만 호출됨
+        if name.startswith('_'):
+            raise AttributeError(name)
+        return ()
 
-    data = _load_dialogues(lang)
-    result = data.get(key)
+    def __setattr__(self, name, value):
+        raise AttributeError('DialogueTable is read-only')
 
-    # 해당 언어에 없으면 기본 언어에서 폴백
-    if result is None and lang != _DEFAULT_LANG:
-        fallback = _load_dialogues(_DEFAULT_LANG)
-        result = fallback.get(key)
+    def get(self, key, default=()):
+        return self.__dict__.get(key, default)
 
-    return result if result is not None else []
 
+def _freeze(value):
+    """JSON 값 → 불변 값 (list → tuple, dict → 읽기 전용 매핑)"""
+    if isinstance(value, list):
+        return tuple(_freeze(v) for v in value)
+    if isinstance(value, dict):
+        return MappingProxyType({k: _freeze(v) for k, v in value.items()})
+    return value
+
+
+def _read_json(lang_code):
+    """대사 JSON 로드 (파일이 없으면 빈 딕셔너리)"""
+    filepath = os.path.join(_LANG_DIR, f'dialogues_{lang_code}.json')
+    if not os.path.exists(filepath):
+        return {}
+    with open(filepath, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _merge_fallback(data, fallback):
+    """기본 언어에만 있는 키(딕셔너리 대사는 서브키까지)를 채운 새 딕셔너리"""
+    merged = dict(fallback)
+    for key, value in data.items():
+        base = fallback.get(key)
+        if isinstance(value, dict) and isinstance(base, dict):
+            value = dict(base, **value)
+        merged[key] = value
+    return merged
 
-# ========================================
-# 대사 상수 프로퍼티 (기존 코드 호환용)
-# ========================================
-# 기존 `DLG.GATHER_SUCCESS_BIG` 같은 접근 방식과 호환되도록
-# 모듈 레벨 속성으로 동적 로딩 지원
 
-class _DialogueProxy:
+def _compile():
+    """lang 디렉터리의 dialogues_*.json 전체를 언어별 DialogueTable로 컴파일"""
+    langs = sorted(
+        name[len('dialogues_'):-len('.json')]
+        for name in os.listdir(_LANG_DIR)
+        if name.startswith('dialogues_') and name.endswith('.json')
+    ) if os.path.isdir(_LANG_DIR) else []
+
+    fallback = _read_json(DEFAULT_LANG)
+    tables = {DEFAULT_LANG: DialogueTable(DEFAULT_LANG,
+                                          {k: _freeze(v) for k, v in fallback.items()})}
+    for lang_code in langs:
+        if lang_code == DEFAULT_LANG:
+            continue
+        merged = _merge_fallback(_read_json(lang_code), fallback)
+        tables[lang_code] = DialogueTable(lang_code, {k: _freeze(v) for k, v in merged.items()})
+    return MappingProxyType(tables)
+
+
+# 언어 코드 → 컴파일된 테이블 (지원하지 않는 언어는 table()에서 기본 언어로)
+_TABLES = _compile()
+
+
+def current_lang():
+    """요청 컨텍스트면 세션 언어, 아니면(스케줄러 등) 기본 언어"""
+    if not has_request_context():
+        return DEFAULT_LANG
+    return session.get('lang', DEFAULT_LANG)
+
+
+def table(lang=None):
     """
-    [v1.3.0] 모듈 속성 접근을 JSON 로더로 프록시.
-    기존 코드에서 DLG.GATHER_SUCCESS_BIG 같은 접근을 유지하면서
-    현재 세션 언어에 맞는 대사를 반환한다.
+    [v1.7.0] 언어별 대사 테이블.
+    lang이 None이면 current_lang(), 없는 언어면 기본 언어 테이블.
     """
-    def __getattr__(self, name):
-        # 내부 속성이나 함수는 무시
-        if name.startswith('_'):
-            raise AttributeError(name)
-        return _get_data(name)
+    if lang is None:
+        lang = current_lang()
+    return _TABLES.get(lang) or _TABLES[DEFAULT_LANG]
 
 
-# 프록시 인스턴스 (import 시 사용)
-_proxy = _DialogueProxy()
+def _get_data(key, lang=None):
+    """
+    [v1.3.0] 키에 해당하는 대사 데이터를 가져온다.
+    반환: tuple, 읽기 전용 dict, str 중 하나. 없으면 빈 tuple.
+    """
+    return table(lang).get(key)
 
 
 def __getattr__(name):
     """
     [v1.3.0] 모듈 레벨 __getattr__ (Python 3.7+)
-    DLG.GATHER_SUCCESS_BIG 같은 접근을 프록시로 위임.
+    DLG.GATHER_SUCCESS_BIG 같은 접근을 현재 언어 테이블로 위임.
+    (반복 호출 경로에서는 table(lang)을 한 번 받아 쓰는 쪽이 싸다)
     """
-    # random, os, json 등 실제 모듈 속성은 정상 반환
-    if name in ('random', 'os', 'json', '_dialogue_cache',
-                '_DEFAULT_LANG', '_proxy', '_DialogueProxy'):
+    if name.startswith('_'):
         raise AttributeError(name)
-
     return _get_data(name)
 
 
@@ -120,14 +151,14 @@ def __getattr__(name):
 # 유틸리티 함수 (기존 호환)
 # ========================================
 
-def get_random_dialogues(dialogue_data, count=2):
+def get_random_dialogues(dialogue_data, count=2, lang=None):
     """
     대사 데이터에서 랜덤으로 count개 선택하여 반환.
-    dialogue_data: list 또는 키 문자열.
+    dialogue_data: tuple/list 또는 키 문자열.
     """
     # 키 문자열이 들어오면 로드
     if isinstance(dialogue_data, str) and dialogue_data.isupper():
-        dialogue_data = _get_data(dialogue_data)
+        dialogue_data = _get_data(dialogue_data, lang)
 
     if isinstance(dialogue_data, str):
         return [dialogue_data]
@@ -136,24 +167,24 @@ def get_random_dialogues(dialogue_data, count=2):
         return []
 
     if len(dialogue_data) <= count:
-        return dialogue_data[:]
-    return random.sample(dialogue_data, count)
+        return list(dialogue_data)
+    return RNG.sample(dialogue_data, count)
 
 
-def get_random_dialogue(dialogue_data):
+def get_random_dialogue(dialogue_data, lang=None):
     """
     대사 데이터에서 랜덤 1개 선택.
-    dialogue_data: list, str, 또는 키 문자열.
+    dialogue_data: tuple/list, str, 또는 키 문자열.
     """
     # 키 문자열이 들어오면 로드
     if isinstance(dialogue_data, str) and dialogue_data.isupper():
-        dialogue_data = _get_data(dialogue_data)
+        dialogue_data = _get_data(dialogue_data, lang)
 
     if isinstance(dialogue_data, str):
         return dialogue_data
     if not dialogue_data:
         return ""
-    return random.choice(dialogue_data)
+    return RNG.choice(dialogue_data)
 
 
 def get_dialogue_dict(key, sub_key, lang=None):
@@ -163,7 +194,7 @@ def get_dialogue_dict(key, sub_key, lang=None):
     반환: list
     """
     data = _get_data(key, lang)
-    if isinstance(data, dict):
-        result = data.get(sub_key, data.get('default', []))
-        return result if isinstance(result, list) else [result]
-    return data if isinstance(data, list) else [str(data)]
+    if isinstance(data, MappingProxyType):
+        result = data.get(sub_key, data.get('default', ()))
+        return list(result) if isinstance(result, tuple) else [result]
+    return list(data) if isinstance(data, tuple) else [str(data)]
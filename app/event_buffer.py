@@ -0,0 +1,149 @@
+# -*- coding: utf-8 -*-
+"""
+실장석 공원 제국 - 이벤트 로그 버퍼 (event_buffer.py)
+[v1.7.0] add_event가 메시지마다 EventLog ORM 객체를 만들던 방식을 대체.
+
+- 트랜잭션 동안 이벤트를 세션별 리스트(session.info)에 모아 둔다 (ORM 객체/identity map 부담 없음)
+- 커밋 직전(before_commit) Core INSERT executemany 1회로 기록
+- 같은 트랜잭션 안에서 EventLog를 SELECT하면 그 전에 먼저 기록 (읽기 일관성 유지)
+- 롤백 시 버퍼도 버림
+
+선택 기능: 병합 모드 (EVENT_COALESCE_TYPES)
+  지정한 타입은 같은 공원·같은 턴의 같은 이벤트(문장/코드·파라미터까지 동일)를 1행으로 합치고 횟수를 붙인다.
+  예) 'starve' 지정 시 같은 기아 메시지 7건 → "...데스... (×7)"
+  내용이 다른 이벤트(disaster_rain ↔ disaster_cold, 사망 수가 다른 starve 등)는 따로 기록
+
+[v1.7.0] message 자리에 event_text.msg()가 만든 EventMessage를 넘기면 code/params/line 컬럼으로 기록
+  (문장은 읽을 때 렌더링, app/event_text.py)
+"""
+from datetime import datetime
+
+from sqlalchemy import event, insert
+from sqlalchemy.orm import Session
+
+from app.models import db, EventLog
+from app.config import GameConfig as GC
+from app import notify_hub
+from app import state_version
+from app import event_text
+
+_BUFFER_KEY = 'event_buffer'
+_INDEX_KEY = 'event_buffer_index'
+
+
+def add(park_id, event_type, message, turn_number):
+    """이벤트 1건을 현재 세션 버퍼에 추가 (message: 문자열 또는 EventMessage)"""
+    row = {
+        'park_id': park_id,
+        'event_type': event_type,
+        'turn_number': turn_number,
+        'created_at': datetime.utcnow(),
+    }
+    row.update(_message_columns(message))
+    _append(db.session(), row)
+
+
+def extend(rows):
+    """
+    이벤트 여러 건 추가 (벡터 엔진 등 dict 행을 직접 만드는 호출자용).
+    rows: park_id, event_type, message(문자열 또는 EventMessage), turn_number 키를 가진 dict
+    """
+    session = db.session()
+    now = datetime.utcnow()
+    for row in rows:
+        row.setdefault('created_at', now)
+        row.update(_message_columns(row['message']))
+        _append(session, row)
+
+
+def pending_count(session=None):
+    """아직 기록되지 않은 버퍼 행 수 (병합된 행은 1개로 셈)"""
+    session = session or db.session()
+    return len(session.info.get(_BUFFER_KEY, ()))
+
+
+def flush(session=None):
+    """버퍼를 Core INSERT 1회로 기록하고 비운다 (커밋은 하지 않음)"""
+    session = session or db.session()
+    rows = session.info.pop(_BUFFER_KEY, None)
+    session.info.pop(_INDEX_KEY, None)
+    if not rows:
+        return 0
+
+    for row in rows:
+        count = row.pop('_count', 1)
+        if row['code'] is None:
+            if count > 1:
+                row['message'] = f"{row['message']} (×{count})"
+            continue
+        if count > 1:
+            row['params'] = dict(row['params'], x=count)
+        row['params'] = event_text.encode_params(row['params'])
+    session.execute(insert(EventLog), rows)
+    # [v1.7.0] Core INSERT는 flush 리스너를 거치지 않으므로 소속 공원 상태 버전을 직접 올림
+    state_version.touch(session, {r['park_id'] for r in rows})
+
+    # [v1.7.0] 알림 대상 이벤트는 커밋 후 구독자에게 발행
+    notify_hub.stage(session, {r['park_id'] for r in rows
+                               if r['event_type'] in GC.NOTIFY_TYPES})
+    return len(rows)
+
+
+def discard(session=None):
+    """버퍼 폐기 (롤백 시)"""
+    session = session or db.session()
+    session.info.pop(_BUFFER_KEY, None)
+    session.info.pop(_INDEX_KEY, None)
+
+
+def _message_columns(message):
+    """message 인자 → 기록할 컬럼 값 (executemany 행마다 같은 키를 갖도록 항상 4개 모두)"""
+    if isinstance(message, event_text.EventMessage):
+        return {'message': '', 'code': message.code, 'params': message.params, 'line': message.line}
+    return {'message': message, 'code': None, 'params': None, 'line': None}
+
+
+def _append(session, row):
+    """버퍼에 추가 (병합 대상 타입이면 같은 공원·턴의 같은 이벤트 행의 횟수만 증가)"""
+    buffer = session.info.setdefault(_BUFFER_KEY, [])
+    if row['event_type'] in GC.EVENT_COALESCE_TYPES:
+        index = session.info.setdefault(_INDEX_KEY, {})
+        # 대사 번호(line)는 키에서 제외 - 같은 내용이면 첫 행의 대사로 표시
+        key = (row['park_id'], row['event_type'], row['turn_number'],
+               row['code'], event_text.encode_params(row['params']), row['message'])
+        merged = index.get(key)
+        if merged is not None:
+            merged['_count'] = merged.get('_count', 1) + 1
+            return
+        index[key] = row
+    buffer.append(row)
+
+
+# ========================================
+# 세션 이벤트 리스너
+# ========================================
+
+@event.listens_for(Session, 'before_commit')
+def _flush_before_commit(session):
+    """커밋 직전 버퍼 기록"""
+    if session.info.get(_BUFFER_KEY):
+        flush(session)
+
+
+@event.listens_for(Session, 'after_soft_rollback')
+def _discard_on_rollback(session, previous_transaction):
+    """롤백 시 버퍼 폐기 (가장 바깥 트랜잭션 롤백만)"""
+    if previous_transaction.parent is None:
+        discard(session)
+
+
+@event.listens_for(Session, 'do_orm_execute')
+def _flush_before_event_read(orm_execute_state):
+    """같은 트랜잭션 안에서 EventLog를 조회하면 버퍼를 먼저 기록"""
+    session = orm_execute_state.session
+    if not session.info.get(_BUFFER_KEY):
+        return
+    if not orm_execute_state.is_select:
+        return
+    if any(m.class_ is EventLog for m in orm_execute_state.all_mappers):
+        flush(session)
@@ -0,0 +1,197 @@
+# -*- coding: utf-8 -*-
+"""
+실장석 공원 제국 - 이벤트 로그 보존/아카이브 (event_retention.py)
+[v1.7.0] event_logs 무한 증가 방지.
+
+보존 규칙:
+1. 타입별 TTL (EVENT_TTL_DAYS, 나머지는 EVENT_TTL_DEFAULT_DAYS)
+2. 공원별 최근 EVENT_KEEP_LAST_PER_PARK개만 보존
+
+퇴출된 행은 삭제 전에 공원별·날짜별 gzip JSONL로 아카이브한다.
+  <아카이브 경로>/<공원 id>/<YYYY-MM-DD>.jsonl.gz  (gzip 멤버 이어쓰기 → gzip.open으로 순차 읽기 가능)
+
+스케줄러가 짧은 간격으로 호출하며, 한 배치(EVENT_RETENTION_BATCH행)가 곧 트랜잭션 1개다.
+실행 1회당 배치 수에도 상한이 있어 쓰기 락을 오래 잡지 않는다.
+(커밋 직전 실패 시 다음 실행에서 같은 행이 다시 아카이브될 수 있음 - 최소 1회 보장)
+"""
+import gzip
+import json
+import os
+from datetime import datetime, timedelta
+
+from sqlalchemy import select, delete
+
+from app.models import db, EventLog
+from app.config import GameConfig as GC
+from app import dialogues as DLG
+from app import event_text
+
+_COLUMNS = (EventLog.id, EventLog.park_id, EventLog.event_type,
+            EventLog.message, EventLog.code, EventLog.params, EventLog.line,
+            EventLog.turn_number, EventLog.created_at)
+
+# 보존 개수 점검 순환 커서 (마지막으로 점검한 공원 id)
+_park_cursor = {'last_id': 0}
+
+
+def run_retention(archive_dir=None, now=None):
+    """
+    보존 작업 1회 실행 (TTL → 공원별 보존 개수 순).
+    반환: {'ttl': 퇴출 수, 'cap': 퇴출 수, 'batches': 커밋 수}
+    """
+    archive_dir = archive_dir or _default_archive_dir()
+    now = now or datetime.utcnow()
+    stats = {'ttl': 0, 'cap': 0, 'batches': 0}
+
+    for event_types, days, exclude in _ttl_groups():
+        while stats['batches'] < GC.EVENT_RETENTION_MAX_BATCHES:
+            evicted = _evict_expired(event_types, exclude, now - timedelta(days=days), archive_dir)
+            if not evicted:
+                break
+            stats['ttl'] += evicted
+            stats['batches'] += 1
+
+    # 점검 라운드 수도 제한 (퇴출할 게 없어도 실행 1회당 최대 MAX_BATCHES × PARKS_PER_RUN 공원)
+    for _ in range(GC.EVENT_RETENTION_MAX_BATCHES):
+        if stats['batches'] >= GC.EVENT_RETENTION_MAX_BATCHES:
+            break
+        evicted, done = _evict_over_cap(archive_dir)
+        stats['cap'] += evicted
+        if evicted:
+            stats['batches'] += 1
+        if done:
+            break
+
+    return stats
+
+
+def _default_archive_dir():
+    """EVENT_ARCHIVE_DIR 또는 instance/event_archive"""
+    if GC.EVENT_ARCHIVE_DIR:
+        return GC.EVENT_ARCHIVE_DIR
+    from flask import current_app
+    return os.path.join(current_app.instance_path, 'event_archive')
+
+
+def _ttl_groups():
+    """
+    TTL이 같은 타입끼리 묶기.
+    반환: [(타입 리스트, 일수, exclude 여부)] - 마지막은 '목록에 없는 타입 전부'(기본 TTL)
+    """
+    by_days = {}
+    for event_type, days in GC.EVENT_TTL_DAYS.items():
+        by_days.setdefault(days, []).append(event_type)
+    groups = [(types, days, False) for days, types in sorted(by_days.items())]
+    groups.append((list(GC.EVENT_TTL_DAYS), GC.EVENT_TTL_DEFAULT_DAYS, True))
+    return groups
+
+
+def _first_id_after(cutoff):
+    """
+    created_at >= cutoff인 첫 행의 id.
+    id는 시간순으로 증가하므로 이보다 작은 id만 TTL 후보 → rowid 범위 검색으로 좁힌다.
+    (오래된 행은 이미 퇴출돼 있으므로 앞쪽에서 금방 찾음)
+    """
+    return db.session.execute(
+        select(EventLog.id).where(EventLog.created_at >= cutoff)
+        .order_by(EventLog.id).limit(1)
+    ).scalar()
+
+
+def _evict_expired(event_types, exclude, cutoff, archive_dir):
+    """TTL이 지난 행 1배치 퇴출. 반환: 퇴출 행 수"""
+    stmt = select(*_COLUMNS).where(EventLog.created_at < cutoff)
+    boundary = _first_id_after(cutoff)
+    if boundary is not None:
+        stmt = stmt.where(EventLog.id < boundary)
+    type_filter = EventLog.event_type.in_(event_types)
+    stmt = stmt.where(~type_filter if exclude else type_filter)
+
+    rows = db.session.execute(
+        stmt.order_by(EventLog.id).limit(GC.EVENT_RETENTION_BATCH)).all()
+    return _archive_and_delete(rows, archive_dir)
+
+
+def _evict_over_cap(archive_dir):
+    """
+    공원 EVENT_RETENTION_PARKS_PER_RUN개씩 순환하며 보존 개수 초과분 1배치 퇴출.
+    반환: (퇴출 행 수, 한 바퀴 다 돌았는지)
+    """
+    from app.models import Park
+
+    park_ids = db.session.execute(
+        select(Park.id).where(Park.id > _park_cursor['last_id'])
+        .order_by(Park.id).limit(GC.EVENT_RETENTION_PARKS_PER_RUN)
+    ).scalars().all()
+    if not park_ids:
+        _park_cursor['last_id'] = 0
+        return 0, True
+
+    rows = []
+    for park_id in park_ids:
+        # 최신순 N개 이후 = 퇴출 대상 (ix_event_logs_park_created 사용)
+        rows.extend(db.session.execute(
+            select(*_COLUMNS).where(EventLog.park_id == park_id)
+            .order_by(EventLog.created_at.desc(), EventLog.id.desc())
+            .offset(GC.EVENT_KEEP_LAST_PER_PARK)
+            .limit(GC.EVENT_RETENTION_BATCH - len(rows))
+        ).all())
+        if len(rows) >= GC.EVENT_RETENTION_BATCH:
+            # 배치가 찼으면 이 공원부터 다시 점검
+            _park_cursor['last_id'] = park_id - 1
+            break
+    else:
+        _park_cursor['last_id'] = park_ids[-1]
+
+    return _archive_and_delete(rows, archive_dir), False
+
+
+def _archive_and_delete(rows, archive_dir):
+    """행 삭제 → 아카이브 기록 → 커밋 (배치 1개 = 트랜잭션 1개)"""
+    if not rows:
+        return 0
+
+    try:
+        db.session.execute(delete(EventLog).where(EventLog.id.in_([r.id for r in rows])))
+        _write_archive(rows, archive_dir)
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+    return len(rows)
+
+
+def _write_archive(rows, archive_dir):
+    """공원별·날짜별로 묶어 gzip JSONL에 이어쓰기"""
+    groups = {}
+    for r in rows:
+        day = (r.created_at or datetime.utcnow()).strftime('%Y-%m-%d')
+        groups.setdefault((r.park_id, day), []).append(r)
+
+    for (park_id, day), group in groups.items():
+        park_dir = os.path.join(archive_dir, str(park_id))
+        os.makedirs(park_dir, exist_ok=True)
+        lines = ''.join(
+            json.dumps({
+                'id': r.id,
+                'type': r.event_type,
+                # 코드 기록 이벤트도 아카이브만으로 읽히도록 기본 언어 문장을 함께 보관
+                'message': event_text.render_row(r, DLG.DEFAULT_LANG),
+                'code': r.code,
+                'params': r.params,
+                'line': r.line,
+                'turn': r.turn_number,
+                'created_at': r.created_at.isoformat() if r.created_at else None,
+            }, ensure_ascii=False) + '\n'
+            for r in sorted(group, key=lambda r: r.id))
+        with gzip.open(os.path.join(park_dir, f'{day}.jsonl.gz'), 'at', encoding='utf-8') as f:
+            f.write(lines)
+
+
+def read_archive(park_id, day, archive_dir=None):
+    """아카이브 조회 (운영/디버그용). 반환: 이벤트 dict 리스트"""
+    path = os.path.join(archive_dir or _default_archive_dir(), str(park_id), f'{day}.jsonl.gz')
+    if not os.path.exists(path):
+        return []
+    with gzip.open(path, 'rt', encoding='utf-8') as f:
+        return [json.loads(line) for line in f if line.strip()]
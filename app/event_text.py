@@ -0,0 +1,167 @@
+# -*- coding: utf-8 -*-
+"""
+실장석 공원 제국 - 이벤트 메시지 (event_text.py)
+[v1.7.0] 이벤트 로그를 완성된 문장 대신 (코드, 파라미터, 대사 번호)로 기록하고 읽을 때 렌더링.
+
+- 기록: msg('train_success') → EventMessage. 대사는 번호만 뽑는다
+  (RNG.randrange(len) = 이전 RNG.choice와 같은 난수 소비 → 같은 시드면 같은 대사)
+- 저장: event_logs.code / params(짧은 JSON, 없으면 NULL) / line, message는 빈 문자열
+- 렌더링: 문장 틀은 app/lang/{lang}.json의 'event.<코드>' 키, 대사는 대사 테이블에서 번호로
+  → 보는 사람의 언어로 표시 (틱은 요청 밖이라 이전에는 항상 ko 문장이 저장됐음)
+  (코드, 파라미터, 번호, 언어) 단위로 메모이즈
+- 코드가 없는 행(이전 기록, 행동 결과처럼 자유 문장으로 남기는 이벤트)은 message를 그대로 표시
+"""
+import json
+from collections import namedtuple
+from functools import lru_cache
+
+from app.config import GameConfig as GC
+from app import dialogues as DLG
+from app import rng as RNG
+from app.i18n import get_text
+
+# 이벤트 코드 → (대사 키, {파라미터: 대사 키}) - 파라미터 대사도 번호로 저장
+EVENTS = {
+    # 식량
+    'food_trash_only': ('FOOD_TRASH_ONLY', None),
+    'starving': ('FOOD_STARVING', None),
+    'starve_death': ('FOOD_STARVING', {'death': 'FOOD_DEATH'}),
+    'starve_gameover': (None, None),
+    # 카니발리즘
+    'cannibal_predation': ('CANNIBALISM_GUARD_PREDATION', None),
+    'cannibal_witness': ('CANNIBALISM_WITNESS', None),
+    # 건설/훈련/성장
+    'build_complete': ('BUILD_COMPLETE', None),
+    'train_success': ('TRAIN_SUCCESS', None),
+    'train_fail': ('TRAIN_FAIL', None),
+    'growth': (None, None),
+    'breeding': (None, None),
+    'overcrowd': ('OVERCROWDED', None),
+    # 재해
+    'disaster_rain': ('DISASTER_RAIN', None),
+    'disaster_cold': ('DISASTER_COLD', None),
+    'disaster_pesticide': ('DISASTER_PESTICIDE', None),
+    'disaster_rats': ('DISASTER_RATS', None),
+    'disaster_cat': ('DISASTER_CAT', None),
+    'disaster_dump': ('DISASTER_DUMP_REMOVAL', None),
+    # 질병
+    'disease_progress': ('DISEASE_PROGRESS', None),
+    'disease_end': (None, None),
+    'disease_outbreak': ('DISEASE_OUTBREAK', None),
+    # 인간 이벤트
+    'human_abuser': ('HUMAN_ABUSER', None),
+    'human_experiment': ('HUMAN_EXPERIMENT', None),
+    'human_kids_house': ('HUMAN_KIDS', None),
+    'human_kids_splash': ('HUMAN_KIDS', None),
+    'human_kindness': ('HUMAN_KINDNESS', None),
+    'human_petshop': ('HUMAN_PETSHOP', None),
+    # 반란/중독
+    'rebellion_desertion': ('REBELLION_DESERTION', None),
+    'rebellion_strike': ('REBELLION_STRIKE', None),
+    'rebellion_coup': ('REBELLION_GUARD_COUP', None),
+    'coup_gameover': (None, None),
+    'addiction_onset': ('ADDICTION_ONSET', None),
+    'addiction_withdrawal': ('ADDICTION_WITHDRAWAL', None),
+    'addiction_cured': ('ADDICTION_CURED', None),
+    # 밀사
+    'spy_detected': ('SPY_DETECTED', None),
+    'spy_enemy_detected': ('SPY_ENEMY_DETECTED', None),
+    'spy_success': ('SPY_SUCCESS', None),
+    'spy_sabotaged': (None, None),
+    # 전투
+    'battle_win': (None, None),
+    'battle_win_boss': (None, None),
+    'battle_lose': (None, None),
+    'battle_lose_boss': (None, None),
+    'battle_invaded': (None, None),
+    'battle_defended': ('BATTLE_DEFEND_WIN', None),
+}
+
+# 건물 종류 → 이름 번역 키 (대시보드 표기와 동일)
+_BUILDING_KEYS = {
+    'cardboard_house': 'dash.houses',
+    'unchi_hole': 'dash.burrows',
+    'storage_hole': 'dash.storage',
+    'wall': 'dash.walls',
+    'watchtower': 'dash.watchtower',
+}
+
+EventMessage = namedtuple('EventMessage', 'code params line')
+
+
+def msg(code, **params):
+    """
+    이벤트 메시지 생성 (add_event / 벡터 엔진 이벤트 싱크에 message 대신 전달).
+    대사 번호는 기본 언어 테이블 길이로 뽑는다 (언어별 대사 수는 같음, 렌더링 시 나머지 연산으로 보정).
+    """
+    line_key, param_lines = EVENTS[code]
+    dlg = DLG.table(DLG.DEFAULT_LANG)
+    line = _pick(dlg.get(line_key)) if line_key else None
+    if param_lines:
+        for name, key in param_lines.items():
+            params[name] = _pick(dlg.get(key))
+    return EventMessage(code, params, line)
+
+
+def _pick(lines):
+    return RNG.randrange(len(lines)) if lines else None
+
+
+def encode_params(params):
+    """파라미터 dict → 저장용 짧은 JSON (없으면 None)"""
+    if not params:
+        return None
+    return json.dumps(params, ensure_ascii=False, separators=(',', ':'), sort_keys=True)
+
+
+def render(code, params, line, message, lang=None):
+    """저장된 이벤트 → 표시 문장 (code가 없으면 message 그대로)"""
+    if not code:
+        return message
+    if lang is None:
+        lang = DLG.current_lang()
+    return _render(code, params, line, lang)
+
+
+def render_row(row, lang=None):
+    """code/params/line/message 속성을 가진 행(EventLog, Row) 렌더링"""
+    return render(row.code, row.params, row.line, row.message, lang)
+
+
+@lru_cache(maxsize=GC.EVENT_RENDER_CACHE_SIZE)
+def _render(code, params_json, line, lang):
+    """(코드, 파라미터 JSON, 대사 번호, 언어) → 문장 (같은 이벤트 반복 표시 시 재계산 없음)"""
+    params = json.loads(params_json) if params_json else {}
+    line_key, param_lines = EVENTS.get(code, (None, None))
+    dlg = DLG.table(lang)
+    values = dict(params, line=_line(dlg, line_key, line))
+    for name, key in (param_lines or {}).items():
+        values[name] = _line(dlg, key, params.get(name))
+    if 'building' in params:
+        values['building'] = _building_name(params['building'], lang)
+
+    text = get_text(f'event.{code}', lang=lang, **values)
+    count = params.get('x')
+    return f"{text} (×{count})" if count else text
+
+
+def _line(dlg, key, index):
+    """대사 번호 → 해당 언어 대사 (번호가 없으면 빈 문자열)"""
+    lines = dlg.get(key) if key else ()
+    if index is None or not lines:
+        return ''
+    return lines[index % len(lines)]
+
+
+def _building_name(btype, lang):
+    key = _BUILDING_KEYS.get(btype)
+    if key:
+        return get_text(key, lang=lang)
+    bldg = GC.BUILDINGS.get(btype, {})
+    return f"{bldg.get('emoji', '🏗️')}{bldg.get('name', btype)}"
+
+
+def cache_info():
+    """렌더링 메모이즈 적중 통계 (/debug/profile)"""
+    info = _render.cache_info()
+    return {'hits': info.hits, 'misses': info.misses, 'size': info.currsize}
@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+"""
+실장석 공원 제국 - 화면 조각 캐시 (fragment_cache.py)
+[v1.7.0] 렌더링한 HTML 조각을 프로세스 메모리에 보관 (대시보드 본문/다른 공원 목록).
+
+- 슬롯 = (조각 종류, 공원 id), 슬롯마다 최신 (키, HTML) 1개만 보관
+  키에 상태 버전·언어 등이 들어가므로 명시적 무효화가 필요 없다 (상태가 바뀌면 키가 달라져 다시 렌더링)
+- 슬롯 수는 FRAGMENT_CACHE_SIZE로 제한 (LRU)
+- 프로세스별 캐시 → 워커가 여럿이면 워커마다 1회씩 렌더링
+"""
+import threading
+from collections import OrderedDict
+
+from app.config import GameConfig as GC
+
+_slots = OrderedDict()   # (종류, 공원 id) → (키, HTML)
+_lock = threading.Lock()
+_stats = {'hits': 0, 'misses': 0}
+
+
+def get_or_render(kind, park_id, key, render):
+    """슬롯의 키가 같으면 캐시된 HTML, 아니면 render()로 만들어 저장 후 반환"""
+    slot = (kind, park_id)
+    with _lock:
+        cached = _slots.get(slot)
+        if cached is not None and cached[0] == key:
+            _slots.move_to_end(slot)
+            _stats['hits'] += 1
+            return cached[1]
+        _stats['misses'] += 1
+
+    html = render()
+    with _lock:
+        _slots[slot] = (key, html)
+        _slots.move_to_end(slot)
+        while len(_slots) > GC.FRAGMENT_CACHE_SIZE:
+            _slots.popitem(last=False)
+    return html
+
+
+def discard(park_id):
+    """공원의 모든 조각 제거 (공원 삭제/재시작 시)"""
+    with _lock:
+        for slot in [s for s in _slots if s[1] == park_id]:
+            del _slots[slot]
+
+
+def get_stats():
+    """적중/미스 횟수와 현재 슬롯 수"""
+    with _lock:
+        return dict(_stats, slots=len(_slots))
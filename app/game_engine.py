@@ -6,13 +6,18 @@
 모든 행동은 이 엔진을 통해 처리되며,
 결과와 함께 랜덤 대사를 반환한다.
 """
-import random
 import math
 from datetime import datetime, timedelta
 
-from app.models import db, Park, BuildQueue, TrainQueue, EventLog, SpyMission
+from sqlalchemy.sql import ColumnElement
+
+from app.models import db, Park, BuildQueue, TrainQueue, SpyMission
 from app.config import GameConfig as GC
 from app import dialogues as DLG
+from app import unit_of_work as UOW
+from app import event_buffer
+from app import event_text
+from app import rng as RNG
 
 
 # ========================================
@@ -32,7 +37,7 @@ def recharge_turns(park):
     # 마지막 충전 시각이 없으면 현재로 설정
     if park.last_turn_regen_at is None:
         park.last_turn_regen_at = now
-        db.session.commit()
+        UOW.commit()
         return 0
 
     elapsed = (now - park.last_turn_regen_at).total_seconds()
@@ -49,14 +54,15 @@ def recharge_turns(park):
     # 충전된 만큼의 시간만 소비 (나머지는 보존)
     park.last_turn_regen_at += timedelta(seconds=new_turns * GC.TURN_REGEN_SECONDS)
 
-    db.session.commit()
+    UOW.commit()
     return charged
 
 
 def get_turn_info(park):
     """
     [v1.2.0] 프론트엔드 표시용 턴 정보 반환.
-    반환: dict {quota, max, next_regen_seconds, is_full}
+    반환: dict {quota, max, next_regen_seconds, next_regen_at, is_full}
+    [v1.7.0] next_regen_at: 다음 충전 시각 (UTC epoch 초) - 캐시된 화면에서도 남은 시간을 계산할 수 있도록
     """
     now = datetime.utcnow()
     if park.last_turn_regen_at is None:
@@ -64,11 +70,13 @@ def get_turn_info(park):
 
     elapsed = (now - park.last_turn_regen_at).total_seconds()
     next_secs = max(0, int(GC.TURN_REGEN_SECONDS - elapsed))
+    next_at = int((park.last_turn_regen_at - datetime(1970, 1, 1)).total_seconds()) + GC.TURN_REGEN_SECONDS
 
     return {
         'quota': park.turn_quota,
         'max': GC.TURN_QUOTA_MAX,
         'next_regen_seconds': next_secs if park.turn_quota < GC.TURN_QUOTA_MAX else 0,
+        'next_regen_at': next_at,
         'is_full': park.turn_quota >= GC.TURN_QUOTA_MAX,
     }
 
@@ -102,10 +110,14 @@ def consume_turn(park, ap_cost=1):
         process_turn(park)
 
         # NPC 동기 처리 (플레이어가 턴 소비할 때만 NPC도 진행)
+        # [v1.7.0] 비동기 모드: 빚만 기록하고 스케줄러 워커가 NPC 틱을 대신 실행
         if GC.TURN_NPC_SYNC:
-            _sync_npc_turns()
+            if GC.NPC_SYNC_ASYNC:
+                add_npc_turn_debt(park)
+            else:
+                _sync_npc_turns()
 
-        db.session.commit()
+        UOW.commit()
 
     # AP가 여전히 부족하면 (리셋 후에도 비용이 큰 경우)
     if park.action_points < ap_cost:
@@ -119,10 +131,50 @@ def consume_turn(park, ap_cost=1):
 def _sync_npc_turns():
     """[v1.2.0] NPC 공원 동기 턴 처리 (플레이어 턴 소비 시 호출)"""
     from app.npc_engine import process_npc_turn
-    npc_parks = Park.query.filter_by(is_npc=True, is_destroyed=False).all()
-    for npc_park in npc_parks:
-        process_turn(npc_park)
-        process_npc_turn(npc_park)
+    from app import target_index
+    # [v1.7.0] NPC 행 잠금 (PostgreSQL): 여러 워커가 같은 NPC 틱을 겹쳐 실행해 결과를 덮어쓰지 않도록
+    npc_parks = (Park.query.filter_by(is_npc=True, is_destroyed=False)
+                 .order_by(Park.id).with_for_update().all())
+    # [v1.7.0] NPC 전체 1틱 동안 공격 대상 인덱스 공유
+    with target_index.activate():
+        for npc_park in npc_parks:
+            process_turn(npc_park)
+            target_index.touch(npc_park)
+            process_npc_turn(npc_park)
+
+
+def add_npc_turn_debt(park, turns=1):
+    """
+    [v1.7.0] NPC 턴 빚 기록.
+    SQL 표현식으로 증가시켜 워커의 동시 차감과 경합해도 값이 유실되지 않는다.
+    flush 전에 다시 호출되면 대기 중인 증가식에 이어 붙인다 (덮어쓰면 앞선 증가가 사라짐).
+    """
+    pending = park.__dict__.get('npc_turn_debt')
+    if isinstance(pending, ColumnElement):
+        park.npc_turn_debt = pending + turns
+    else:
+        park.npc_turn_debt = Park.npc_turn_debt + turns
+
+
+def claim_npc_turn_debt():
+    """
+    [v1.7.0] NPC 턴 빚 1단위를 원자적으로 차감 (UPDATE-WHERE).
+    반환: 차감 성공 여부 (빚이 없으면 False)
+    호출자가 같은 트랜잭션에서 NPC 틱을 실행하고 커밋해야 한다 (실패 시 빚도 롤백).
+    [v1.7.0] PostgreSQL: SKIP LOCKED - 다른 트랜잭션이 잡고 있는 공원(빚을 쌓는 중인 플레이어 요청,
+    다른 워커가 상환 중인 공원)은 기다리지 않고 다음 빚 공원을 고른다 (SQLite에서는 구문 생략)
+    """
+    debtor_id = db.session.query(Park.id).filter(
+        Park.npc_turn_debt > 0
+    ).order_by(Park.id).limit(1).with_for_update(skip_locked=True).scalar()
+    if debtor_id is None:
+        return False
+
+    updated = Park.query.filter(
+        Park.id == debtor_id, Park.npc_turn_debt > 0
+    ).update({Park.npc_turn_debt: Park.npc_turn_debt - 1,
+              Park.state_version: Park.state_version + 1}, synchronize_session=False)
+    return updated > 0
 
 
 # ========================================
@@ -141,6 +193,12 @@ def is_protected(park):
             park.adult_count < GC.PROTECT_ADULT_MIN)
 
 
+def not_protected_expr():
+    """[v1.7.0] is_protected()의 부정을 SQL 조건으로 (파괴되지 않은 공원 기준)"""
+    return ((Park.guard_count >= GC.PROTECT_GUARD_MIN) &
+            (Park.adult_count >= GC.PROTECT_ADULT_MIN))
+
+
 def check_and_enter_protection(park):
     """
     [v1.3.0] 보호 모드 진입 체크 + 자원 리셋.
@@ -189,7 +247,7 @@ def check_and_enter_protection(park):
         add_event(park, 'protect',
                   f'🛡️ 보호 모드 발동! 자원과 실장석이 재배치되었는 데스! '
                   f'(경호 {GC.PROTECT_GUARD_MIN}↑ \u0026 성체 {GC.PROTECT_ADULT_MIN}↑ 시 해제)')
-        db.session.commit()
+        UOW.commit()
 
     return reset_applied
 
@@ -214,24 +272,22 @@ def get_protection_info(park):
 
 
 def add_event(park, event_type, message, turn=None):
-    """이벤트 로그를 공원에 추가"""
-    log = EventLog(
-        park_id=park.id,
-        event_type=event_type,
-        message=message,
-        turn_number=turn or park.turn_count,
-    )
-    db.session.add(log)
+    """
+    이벤트 로그를 공원에 추가
+    [v1.7.0] ORM 객체 대신 세션 버퍼에 적재 → 커밋 시 bulk INSERT (app/event_buffer.py)
+    """
+    event_buffer.add(park.id, event_type, message, turn or park.turn_count)
 
 
 # ========================================
 # 채집 행동 (1 AP)
 # ========================================
-def action_gather(park, num_adults=0, num_children=0):
+def action_gather(park, num_adults=0, num_children=0, lang=None):
     """
     채집 실행. 성체/자실장을 채집에 보내 쓰레기·콘페이토·자재를 획득.
     반환: (성공여부, 결과 딕셔너리, 대사 리스트)
     """
+    dlg = DLG.table(lang)
     messages = []
 
     # [v1.6.0] AP 체크/소비는 consume_turn(ap_cost=1)에서 처리됨
@@ -253,27 +309,12 @@ def action_gather(park, num_adults=0, num_children=0):
 
     # 출발 대사
     if num_adults > 0:
-        messages.append(DLG.get_random_dialogue(DLG.GATHER_DEPART['adult']))
+        messages.append(DLG.get_random_dialogue(dlg.GATHER_DEPART['adult']))
     if num_children > 0:
-        messages.append(DLG.get_random_dialogue(DLG.GATHER_DEPART['child']))
+        messages.append(DLG.get_random_dialogue(dlg.GATHER_DEPART['child']))
 
     # === 수확 계산 ===
-    result = {'trash': 0, 'konpeito': 0, 'material': 0, 'events': []}
-
-    # 성체실장 채집
-    for _ in range(num_adults):
-        result['trash'] += random.randint(*GC.GATHER_TRASH_ADULT)
-        result['material'] += random.randint(*GC.GATHER_MAT_ADULT)
-        # 콘페이토 발견 확률
-        if random.random() < GC.GATHER_KONPEITO_ADULT_CHANCE:
-            result['konpeito'] += 1
-
-    # 자실장 채집
-    for _ in range(num_children):
-        result['trash'] += random.randint(*GC.GATHER_TRASH_CHILD)
-        result['material'] += random.randint(*GC.GATHER_MAT_CHILD)
-        if random.random() < GC.GATHER_KONPEITO_CHILD_CHANCE:
-            result['konpeito'] += 1
+    result = _gather_yield(num_adults, num_children)
 
     # [v1.1.0] 쓰레기장 철거 패널티 (수확 50% 감소)
     if park.gather_penalty_turns > 0:
@@ -291,27 +332,27 @@ def action_gather(park, num_adults=0, num_children=0):
     total_gatherers = num_adults + num_children
 
     # 이벤트 1: 쓰레기통 대박 (쓰레기 ×3)
-    if random.random() < GC.GATHER_EVT_JACKPOT_CHANCE:
+    if RNG.random() < GC.GATHER_EVT_JACKPOT_CHANCE:
         result['trash'] *= 3
         result['events'].append('jackpot')
-        messages.extend(DLG.get_random_dialogues(DLG.GATHER_EVT_JACKPOT, 2))
+        messages.extend(DLG.get_random_dialogues(dlg.GATHER_EVT_JACKPOT, 2))
 
     # 이벤트 2: 야생 실장석 발견
-    if random.random() < GC.GATHER_EVT_WILDLING_CHANCE:
+    if RNG.random() < GC.GATHER_EVT_WILDLING_CHANCE:
         # 야생 자실장 또는 저실장 포획
-        if random.random() < 0.5:
+        if RNG.random() < 0.5:
             park.child_count += 1
             result['events'].append('wildling_child')
         else:
             park.baby_count += 1
             result['events'].append('wildling_baby')
-        messages.extend(DLG.get_random_dialogues(DLG.GATHER_EVT_WILDLING, 2))
+        messages.extend(DLG.get_random_dialogues(dlg.GATHER_EVT_WILDLING, 2))
 
     # 이벤트 3: 까마귀 습격 (자실장 사망 위험)
-    if num_children > 0 and random.random() < GC.GATHER_EVT_PREDATOR_CHANCE:
+    if num_children > 0 and RNG.random() < GC.GATHER_EVT_PREDATOR_CHANCE:
         park.child_count = max(0, park.child_count - 1)
         result['events'].append('predator')
-        messages.extend(DLG.get_random_dialogues(DLG.GATHER_EVT_PREDATOR, 2))
+        messages.extend(DLG.get_random_dialogues(dlg.GATHER_EVT_PREDATOR, 2))
 
     # === 자원 적용 (상한 제한) ===
     park.trash_food = min(park.trash_food + result['trash'], park.trash_food_cap)
@@ -320,26 +361,46 @@ def action_gather(park, num_adults=0, num_children=0):
 
     # 성공 대사
     if result['konpeito'] > 0:
-        messages.append(DLG.get_random_dialogue(DLG.GATHER_KONPEITO_FOUND))
+        messages.append(DLG.get_random_dialogue(dlg.GATHER_KONPEITO_FOUND))
 
     if result['trash'] >= total_gatherers * 8:
-        messages.extend(DLG.get_random_dialogues(DLG.GATHER_SUCCESS_BIG, 1))
+        messages.extend(DLG.get_random_dialogues(dlg.GATHER_SUCCESS_BIG, 1))
     else:
-        messages.append(DLG.get_random_dialogue(DLG.GATHER_SUCCESS_SMALL))
+        messages.append(DLG.get_random_dialogue(dlg.GATHER_SUCCESS_SMALL))
 
     # 이벤트 로그 저장
     summary = (f"🌿 채집 완료! 🗑️음쓰 +{result['trash']} "
                f"🍬콘페이토 +{result['konpeito']} 🧱자재 +{result['material']}")
     add_event(park, 'gather', summary)
 
-    db.session.commit()
+    UOW.commit()
     return True, result, messages
 
 
+def _gather_yield(num_adults, num_children):
+    """
+    [v1.7.0] 채집 수확량 (이벤트/패널티 적용 전).
+    인원별 반복 대신 집계 추출 (분포 동일, 비용은 채집 인원과 무관)
+    """
+    result = {'trash': 0, 'konpeito': 0, 'material': 0, 'events': []}
+
+    # 성체실장 채집
+    result['trash'] += RNG.randint_sum(num_adults, *GC.GATHER_TRASH_ADULT)
+    result['material'] += RNG.randint_sum(num_adults, *GC.GATHER_MAT_ADULT)
+    # 콘페이토 발견 확률
+    result['konpeito'] += RNG.binomial(num_adults, GC.GATHER_KONPEITO_ADULT_CHANCE)
+
+    # 자실장 채집
+    result['trash'] += RNG.randint_sum(num_children, *GC.GATHER_TRASH_CHILD)
+    result['material'] += RNG.randint_sum(num_children, *GC.GATHER_MAT_CHILD)
+    result['konpeito'] += RNG.binomial(num_children, GC.GATHER_KONPEITO_CHILD_CHANCE)
+    return result
+
+
 # ========================================
 # 솎아내기 (도살) 행동 (0 AP)
 # ========================================
-def action_cull(park, target_type, convert_to, count=1):
+def action_cull(park, target_type, convert_to, count=1, lang=None):
     """
     솎아내기 (도살) 실행.
     target_type: 'baby' (저실장) 또는 'child' (자실장)
@@ -347,6 +408,7 @@ def action_cull(park, target_type, convert_to, count=1):
     count: 도살할 마리 수
     반환: (성공여부, 결과, 대사 리스트)
     """
+    dlg = DLG.table(lang)
     messages = []
 
     # 대상 확인
@@ -365,30 +427,30 @@ def action_cull(park, target_type, convert_to, count=1):
         if target_type == 'baby':
             park.baby_count -= 1
             # 희생자 대사
-            messages.append(DLG.get_random_dialogue(DLG.CULL_BABY_VICTIM))
+            messages.append(DLG.get_random_dialogue(dlg.CULL_BABY_VICTIM))
 
             if convert_to == 'food':
                 park.meat_stock += 1  # 저실장 고기 1개 (5NP)
                 result['food'] += GC.CULL_BABY_FOOD
-                messages.append(DLG.get_random_dialogue(DLG.CULL_BABY_EXECUTOR))
+                messages.append(DLG.get_random_dialogue(dlg.CULL_BABY_EXECUTOR))
             else:
                 park.material = min(park.material + GC.CULL_BABY_MAT, park.material_cap)
                 result['material'] += GC.CULL_BABY_MAT
-                messages.append(DLG.get_random_dialogue(DLG.CULL_BABY_TO_MAT))
+                messages.append(DLG.get_random_dialogue(dlg.CULL_BABY_TO_MAT))
 
         elif target_type == 'child':
             park.child_count -= 1
             # 자실장 희생자의 비참한 대사
-            messages.append(DLG.get_random_dialogue(DLG.CULL_CHILD_VICTIM))
+            messages.append(DLG.get_random_dialogue(dlg.CULL_CHILD_VICTIM))
 
             if convert_to == 'food':
                 park.meat_stock += 2  # 자실장 고기 2개 (10NP)
                 result['food'] += GC.CULL_CHILD_FOOD
-                messages.append(DLG.get_random_dialogue(DLG.CULL_CHILD_EXECUTOR))
+                messages.append(DLG.get_random_dialogue(dlg.CULL_CHILD_EXECUTOR))
             else:
                 park.material = min(park.material + GC.CULL_CHILD_MAT, park.material_cap)
                 result['material'] += GC.CULL_CHILD_MAT
-                messages.append(DLG.get_random_dialogue(DLG.CULL_CHILD_TO_MAT))
+                messages.append(DLG.get_random_dialogue(dlg.CULL_CHILD_TO_MAT))
 
     # 이벤트 로그
     emoji = '🐛' if target_type == 'baby' else '👶'
@@ -396,20 +458,21 @@ def action_cull(park, target_type, convert_to, count=1):
     what = f"식량 {result['food']}NP" if convert_to == 'food' else f"자재 {result['material']}"
     add_event(park, 'cull', f"🔪 {emoji}{name} {count}마리 솎아내기 → {what}")
 
-    db.session.commit()
+    UOW.commit()
     return True, result, messages
 
 
 # ========================================
 # 출산 행동 (2 AP)
 # ========================================
-def action_birth(park):
+def action_birth(park, lang=None):
     """
     출산 실행. 성체실장 1마리가 자실장/저실장을 낳는다.
     비용: 2 AP + 30 NP
     [v1.1.0] 출산 잔혹 이벤트 추가: 사산, 기형, 대량출산, 모체 사망, 포식
     반환: (성공여부, 결과, 대사 리스트)
     """
+    dlg = DLG.table(lang)
     messages = []
 
     # [v1.6.0] AP 체크/소비는 consume_turn(ap_cost=2)에서 처리됨
@@ -425,28 +488,28 @@ def action_birth(park):
     _consume_np(park, GC.BIRTH_NP_COST)
 
     # [v1.1.0] 사산 판정 (5%)
-    if random.random() < GC.BIRTH_STILLBORN_CHANCE:
-        messages.append(DLG.get_random_dialogue(DLG.BIRTH_STILLBORN))
+    if RNG.random() < GC.BIRTH_STILLBORN_CHANCE:
+        messages.append(DLG.get_random_dialogue(dlg.BIRTH_STILLBORN))
         add_event(park, 'birth_fail', '🐣💀 사산... 식량만 소비되었는 데스...')
         park.morale = max(0, park.morale - 5)
-        db.session.commit()
+        UOW.commit()
         return True, {'children': 0, 'babies': 0, 'event': 'stillborn'}, messages
 
     # 출산 결과
-    new_children = random.randint(*GC.BIRTH_CHILDREN)
-    new_babies = random.randint(*GC.BIRTH_BABIES)
+    new_children = RNG.randint(*GC.BIRTH_CHILDREN)
+    new_babies = RNG.randint(*GC.BIRTH_BABIES)
 
     # [v1.1.0] 대량 출산 (8%)
-    if random.random() < GC.BIRTH_MASSIVE_CHANCE:
-        new_children = random.randint(8, 12)
-        messages.append(DLG.get_random_dialogue(DLG.BIRTH_MASSIVE))
+    if RNG.random() < GC.BIRTH_MASSIVE_CHANCE:
+        new_children = RNG.randint(8, 12)
+        messages.append(DLG.get_random_dialogue(dlg.BIRTH_MASSIVE))
 
     # [v1.1.0] 기형 출산 (10%) - 저실장 1마리가 사용 불가
     deform_count = 0
-    if random.random() < GC.BIRTH_DEFORM_CHANCE and new_babies > 0:
+    if RNG.random() < GC.BIRTH_DEFORM_CHANCE and new_babies > 0:
         deform_count = 1
         new_babies = max(0, new_babies - 1)  # 기형 1마리는 바로 사망 처리
-        messages.append(DLG.get_random_dialogue(DLG.BIRTH_DEFORM))
+        messages.append(DLG.get_random_dialogue(dlg.BIRTH_DEFORM))
         park.morale = max(0, park.morale - 3)
 
     # 인구 상한 확인 (자실장 — population_cap 기준)
@@ -466,29 +529,29 @@ def action_birth(park):
     result = {'children': new_children, 'babies': new_babies}
 
     # 대사
-    messages.extend(DLG.get_random_dialogues(DLG.BIRTH_NORMAL, 2))
+    messages.extend(DLG.get_random_dialogues(dlg.BIRTH_NORMAL, 2))
     if new_babies > 0:
-        messages.append(DLG.get_random_dialogue(DLG.BIRTH_WITH_BABY))
+        messages.append(DLG.get_random_dialogue(dlg.BIRTH_WITH_BABY))
     if new_children >= 5:
-        messages.append(DLG.get_random_dialogue(DLG.BIRTH_MANY))
+        messages.append(DLG.get_random_dialogue(dlg.BIRTH_MANY))
 
     # [v1.1.0] 모체 사망 (2%)
-    if random.random() < GC.BIRTH_MOTHER_DEATH_CHANCE and park.adult_count > 1:
+    if RNG.random() < GC.BIRTH_MOTHER_DEATH_CHANCE and park.adult_count > 1:
         park.adult_count -= 1
-        messages.append(DLG.get_random_dialogue(DLG.BIRTH_MOTHER_DEATH))
+        messages.append(DLG.get_random_dialogue(dlg.BIRTH_MOTHER_DEATH))
         add_event(park, 'birth_death', '🐣💀 출산 중 성체 1마리 사망...')
         park.morale = max(0, park.morale - 10)
         result['mother_died'] = True
 
     # [v1.1.0] 기아 상태 출산 시 포식 (3%)
     if (park.total_np_available <= 0 and
-            random.random() < GC.BIRTH_CANNIBALISM_CHANCE and
+            RNG.random() < GC.BIRTH_CANNIBALISM_CHANCE and
             new_children > 0 and park.adult_count > 1):
         eaten = min(2, new_children)
         park.child_count -= eaten
         park.meat_stock += eaten  # 고기로 전환
         new_children -= eaten
-        messages.append(DLG.get_random_dialogue(DLG.BIRTH_CANNIBALISM_EVENT))
+        messages.append(DLG.get_random_dialogue(dlg.BIRTH_CANNIBALISM_EVENT))
         add_event(park, 'cannibalism', f'🐣🩸 배고픈 성체가 갓난 자실장 {eaten}마리를 포식!')
         park.morale = max(0, park.morale + GC.CANNIBALISM_MORALE_PENALTY)
         result['eaten'] = eaten
@@ -499,18 +562,19 @@ def action_birth(park):
         event_msg += f" (기형 {deform_count})"
     add_event(park, 'birth', event_msg)
 
-    db.session.commit()
+    UOW.commit()
     return True, result, messages
 
 
 # ========================================
 # 건설 행동 (1 AP)
 # ========================================
-def action_build(park, building_type):
+def action_build(park, building_type, lang=None):
     """
     건설 시작. 자재를 소비하고 건설 대기열에 추가.
     반환: (성공여부, 결과, 대사 리스트)
     """
+    dlg = DLG.table(lang)
     messages = []
 
     # [v1.6.0] AP 체크/소비는 consume_turn(ap_cost=1)에서 처리됨
@@ -540,25 +604,26 @@ def action_build(park, building_type):
     db.session.add(build)
 
     # 대사
-    build_dialogues = DLG.BUILD_START.get(building_type, DLG.BUILD_START['default'])
+    build_dialogues = dlg.BUILD_START.get(building_type, dlg.BUILD_START['default'])
     messages.extend(DLG.get_random_dialogues(build_dialogues, 2))
 
     # 이벤트 로그
     add_event(park, 'build',
               f"🔨 {bldg['emoji']}{bldg['name']} 건설 시작! ({bldg['turns']}턴 소요)")
 
-    db.session.commit()
+    UOW.commit()
     return True, {'building': building_type, 'turns': bldg['turns']}, messages
 
 
 # ========================================
 # 훈련 행동 (1 AP)
 # ========================================
-def action_train(park):
+def action_train(park, lang=None):
     """
     경호실장 훈련 시작. 성체실장 1마리를 훈련에 투입.
     반환: (성공여부, 결과, 대사 리스트)
     """
+    dlg = DLG.table(lang)
     messages = []
 
     # [v1.6.0] AP 체크/소비는 consume_turn(ap_cost=1)에서 처리됨
@@ -580,21 +645,24 @@ def action_train(park):
     )
     db.session.add(train)
 
-    messages.extend(DLG.get_random_dialogues(DLG.TRAIN_START, 2))
+    messages.extend(DLG.get_random_dialogues(dlg.TRAIN_START, 2))
     add_event(park, 'train', f"📖 경호실장 훈련 시작! ({GC.TRAIN_TURNS}턴 소요)")
 
-    db.session.commit()
+    UOW.commit()
     return True, {'turns': GC.TRAIN_TURNS}, messages
 
 
 # ========================================
 # 턴 처리 (스케줄러에서 호출)
 # ========================================
-def process_turn(park):
+def process_turn(park, spy_missions=None, local_only=False):
     """
     1턴 처리. 매 턴 자동으로 실행되는 로직.
     [v1.1.0] 순서: AP → 식량 → 카니발리즘 → 건설 → 훈련 → 성장 → 운치굴 →
                    재해 → 질병 → NPC악행 → 반란 → 중독 → 밀사 → 수용초과
+    [v1.7.0] spy_missions: 배치 틱에서 미리 로드한 진행 중 밀사 목록 (None이면 직접 조회)
+    [v1.7.0] local_only: 다른 공원을 건드리는 단계(밀사)를 건너뜀 → 샤딩 틱의 직렬 단계에서 처리
+             (진행 중 밀사가 있으면 수용 초과 판정도 함께 미룸)
     """
     park.turn_count += 1
     park.action_points = GC.ACTION_POINTS_PER_TURN
@@ -605,44 +673,69 @@ def process_turn(park):
     park.defending_guards = min(park.defending_guards, park.guard_count)
     park.defending_adults = min(park.defending_adults, park.adult_count)
 
+    # [v1.7.0] 단계별 결정적 난수 스트림 (공원, 턴, 단계)
+    turn = park.turn_count
+
     # 1. 식량 소비
-    _process_food_consumption(park)
+    with RNG.stream(park.id, turn, 'food_consumption'):
+        _process_food_consumption(park)
 
     # 2. [v1.1.0] 자동 카니발리즘 (기아 시 경호 포식)
-    _process_cannibalism(park)
+    with RNG.stream(park.id, turn, 'cannibalism'):
+        _process_cannibalism(park)
 
     # 3. 건설 진행
-    _process_building(park)
+    with RNG.stream(park.id, turn, 'building'):
+        _process_building(park)
 
     # 4. 훈련 진행
-    _process_training(park)
+    with RNG.stream(park.id, turn, 'training'):
+        _process_training(park)
 
     # 5. 성장 판정 (자실장 → 성체실장)
-    _process_growth(park)
+    with RNG.stream(park.id, turn, 'growth'):
+        _process_growth(park)
 
     # 6. 운치굴 저실장 증가
-    _process_unchi_breeding(park)
+    with RNG.stream(park.id, turn, 'unchi_breeding'):
+        _process_unchi_breeding(park)
 
     # 7. [v1.1.0] 재해 & 환경 이벤트
-    _process_disasters(park)
+    with RNG.stream(park.id, turn, 'disasters'):
+        _process_disasters(park)
 
     # 8. [v1.1.0] 질병 시스템
-    _process_disease(park)
+    with RNG.stream(park.id, turn, 'disease'):
+        _process_disease(park)
 
     # 9. [v1.1.0] NPC 악행 이벤트
-    _process_human_events(park)
+    with RNG.stream(park.id, turn, 'human_events'):
+        _process_human_events(park)
 
     # 10. [v1.1.0] 반란 & 태업
-    _process_rebellion(park)
+    with RNG.stream(park.id, turn, 'rebellion'):
+        _process_rebellion(park)
 
     # 11. [v1.1.0] 콘페이토 중독 판정
-    _process_addiction(park)
+    with RNG.stream(park.id, turn, 'addiction'):
+        _process_addiction(park)
 
     # 12. [v1.1.0] 밀사 임무 진행
-    _process_spy_missions(park)
+    # [v1.7.0] local_only: 진행 중 밀사가 있는 공원은 12~13단계를 직렬 단계(process_spy_stage)로 미룸
+    #          → 밀사로 복귀한 성체까지 포함해 수용 초과 판정 (단계 순서 유지)
+    if local_only:
+        if spy_missions is None:
+            spy_missions = SpyMission.query.filter_by(sender_id=park.id, status='active').all()
+        spy_deferred = bool(spy_missions)
+    else:
+        with RNG.stream(park.id, turn, 'spy_missions'):
+            _process_spy_missions(park, spy_missions)
+        spy_deferred = False
 
     # 13. 수용 인원 초과 판정
-    _process_overcrowding(park)
+    if not spy_deferred:
+        with RNG.stream(park.id, turn, 'overcrowding'):
+            _process_overcrowding(park)
 
     # 채집 패널티 턴 감소
     if park.gather_penalty_turns > 0:
@@ -652,7 +745,20 @@ def process_turn(park):
     if park.strike_turns > 0:
         park.strike_turns -= 1
 
-    db.session.commit()
+    UOW.commit()
+
+
+def process_spy_stage(park, spy_missions=None):
+    """
+    [v1.7.0] 12~13단계 (밀사 → 수용 초과)만 처리.
+    공원 내부 단계를 따로 끝낸 엔진(벡터/샤딩)이 진행 중 밀사가 있는 공원에 대해 직렬 단계에서 호출
+    → 밀사로 복귀한 성체까지 포함해 수용 초과를 판정 (process_turn과 같은 단계 순서)
+    """
+    turn = park.turn_count
+    with RNG.stream(park.id, turn, 'spy_missions'):
+        _process_spy_missions(park, spy_missions)
+    with RNG.stream(park.id, turn, 'overcrowding'):
+        _process_overcrowding(park)
 
 
 def _consume_np(park, np_needed):
@@ -699,8 +805,7 @@ def _process_food_consumption(park):
     # 사기 조정
     if park.consecutive_trash_turns >= 3:
         park.morale = max(0, park.morale + GC.MORALE_TRASH_PENALTY)
-        add_event(park, 'morale',
-                  DLG.get_random_dialogue(DLG.FOOD_TRASH_ONLY))
+        add_event(park, 'morale', event_text.msg('food_trash_only'))
 
     # 기아 판정 (식량 부족 시)
     if shortage > 0:
@@ -708,30 +813,37 @@ def _process_food_consumption(park):
 
 
 def _process_starvation(park, shortage):
-    """기아 처리: 식량 부족 시 약한 개체부터 사망"""
-    add_event(park, 'starve', DLG.get_random_dialogue(DLG.FOOD_STARVING))
+    """
+    기아 처리: 식량 부족 시 약한 개체부터 사망
+    [v1.7.0] 1마리씩 반복하던 계산을 종류별 산술로 대체 (결과 동일, 인구와 무관하게 O(1)).
+    사망자는 개체마다 이벤트를 남기지 않고 요약 이벤트 1건으로 기록.
+    """
+    # 부족한 NP만큼 개체 사망 (약한 순서: 저실장(1NP) → 자실장(2NP) → 성체(5NP))
+    dead_baby = min(park.baby_count, math.ceil(shortage))
+    shortage -= dead_baby
+    dead_child = min(park.child_count, math.ceil(shortage / 2)) if shortage > 0 else 0
+    shortage -= dead_child * 2
+    dead_adult = min(park.adult_count, math.ceil(shortage / 5)) if shortage > 0 else 0
+    shortage -= dead_adult * 5
+
+    park.baby_count -= dead_baby
+    park.child_count -= dead_child
+    park.adult_count -= dead_adult
+    add_event(park, 'starve', _starvation_summary(dead_baby, dead_child, dead_adult))
+
+    # 모든 실장석이 죽어도 부족하면 보스에게 피해
+    if shortage > 0:
+        park.boss_hp -= 10
+        if park.boss_hp <= 0:
+            park.is_destroyed = True
+            add_event(park, 'gameover', event_text.msg('starve_gameover'))
 
-    # 부족한 NP만큼 개체 사망 (약한 순서: 저실장 → 자실장 → 성체)
-    while shortage > 0:
-        if park.baby_count > 0:
-            park.baby_count -= 1
-            shortage -= 1
-        elif park.child_count > 0:
-            park.child_count -= 1
-            shortage -= 2
-            add_event(park, 'starve', DLG.get_random_dialogue(DLG.FOOD_DEATH))
-        elif park.adult_count > 0:
-            park.adult_count -= 1
-            shortage -= 5
-            add_event(park, 'starve', DLG.get_random_dialogue(DLG.FOOD_DEATH))
-        else:
-            # 모든 실장석이 죽으면 보스에게 피해
-            park.boss_hp -= 10
-            shortage = 0
-            if park.boss_hp <= 0:
-                park.is_destroyed = True
-                add_event(park, 'gameover',
-                          "👑 보스실장이... 굶어서... 죽었는 데스... 공원은 끝난 데스...")
+
+def _starvation_summary(dead_baby, dead_child, dead_adult):
+    """[v1.7.0] 기아 요약 이벤트 메시지 (벡터 엔진과 공용)"""
+    if dead_baby or dead_child or dead_adult:
+        return event_text.msg('starve_death', baby=dead_baby, child=dead_child, adult=dead_adult)
+    return event_text.msg('starving')
 
 
 def _process_building(park):
@@ -759,9 +871,7 @@ def _process_building(park):
             elif btype == 'watchtower':
                 park.watchtowers += 1
 
-            add_event(park, 'build',
-                      f"🔨 {bldg.get('emoji', '🏗️')}{bldg.get('name', btype)} 완성! "
-                      + DLG.get_random_dialogue(DLG.BUILD_COMPLETE))
+            add_event(park, 'build', event_text.msg('build_complete', building=btype))
             db.session.delete(build)
 
 
@@ -771,15 +881,13 @@ def _process_training(park):
         train.turns_remaining -= 1
         if train.turns_remaining <= 0:
             # 훈련 완료 - 성공/실패 판정
-            if random.random() < GC.TRAIN_SUCCESS_RATE:
+            if RNG.random() < GC.TRAIN_SUCCESS_RATE:
                 park.guard_count += 1
-                add_event(park, 'train',
-                          f"⚔️ 훈련 성공! " + DLG.get_random_dialogue(DLG.TRAIN_SUCCESS))
+                add_event(park, 'train', event_text.msg('train_success'))
             else:
                 # 실패 시 성체실장으로 복귀
                 park.adult_count += 1
-                add_event(park, 'train',
-                          f"📖 훈련 실패... " + DLG.get_random_dialogue(DLG.TRAIN_FAIL))
+                add_event(park, 'train', event_text.msg('train_fail'))
             db.session.delete(train)
 
 
@@ -789,7 +897,7 @@ def _process_growth(park):
     remaining_children = park.child_count
 
     for _ in range(park.child_count):
-        if random.random() < GC.CHILD_TO_ADULT_CHANCE:
+        if RNG.random() < GC.CHILD_TO_ADULT_CHANCE:
             # 인구 상한 확인
             if park.total_population < park.population_cap:
                 new_adults += 1
@@ -798,8 +906,7 @@ def _process_growth(park):
     if new_adults > 0:
         park.child_count = remaining_children
         park.adult_count += new_adults
-        add_event(park, 'growth',
-                  f"🐣 자실장 {new_adults}마리가 성체실장으로 성장한 데스!")
+        add_event(park, 'growth', event_text.msg('growth', n=new_adults))
 
 
 def _process_unchi_breeding(park):
@@ -809,7 +916,7 @@ def _process_unchi_breeding(park):
 
     new_babies = 0
     for _ in range(park.unchi_holes):
-        new_babies += random.randint(1, 2)
+        new_babies += RNG.randint(1, 2)
 
     # 운치굴 수용 한도 확인
     baby_cap = park.baby_cap
@@ -818,8 +925,7 @@ def _process_unchi_breeding(park):
 
     if actual_new > 0:
         park.baby_count += actual_new
-        add_event(park, 'breeding',
-                  f"🕳️ 운치굴에서 저실장 {actual_new}마리가 자란 데스!")
+        add_event(park, 'breeding', event_text.msg('breeding', n=actual_new))
 
 
 def _process_overcrowding(park):
@@ -836,9 +942,7 @@ def _process_overcrowding(park):
         fled += 1
 
     if fled > 0:
-        add_event(park, 'overcrowd',
-                  f"🏠 수용 초과! 자실장 {fled}마리가 탈주! "
-                  + DLG.get_random_dialogue(DLG.OVERCROWDED))
+        add_event(park, 'overcrowd', event_text.msg('overcrowd', n=fled))
 
 
 # ============================================================
@@ -851,15 +955,13 @@ def _process_disasters(park):
         return
 
     # 1. 폭우 - 골판지집 1동 파괴
-    if random.random() < GC.DISASTER_RAIN_CHANCE and park.cardboard_houses > 0:
+    if RNG.random() < GC.DISASTER_RAIN_CHANCE and park.cardboard_houses > 0:
         park.cardboard_houses -= 1
         park.population_cap = max(5, park.population_cap - 15)
-        add_event(park, 'disaster',
-                  f"🌧️ 폭우! 골판지집 1동 파괴! (수용 -15) "
-                  + DLG.get_random_dialogue(DLG.DISASTER_RAIN))
+        add_event(park, 'disaster', event_text.msg('disaster_rain'))
 
     # 2. 한파 - 저실장/자실장 동사
-    if random.random() < GC.DISASTER_COLD_CHANCE:
+    if RNG.random() < GC.DISASTER_COLD_CHANCE:
         baby_dead = int(park.baby_count * 0.3)
         child_dead = int(park.child_count * 0.1)
         # 방벽이 있으면 피해 50% 감소
@@ -870,43 +972,35 @@ def _process_disasters(park):
         park.child_count = max(0, park.child_count - child_dead)
         if baby_dead + child_dead > 0:
             add_event(park, 'disaster',
-                      f"❄️ 한파! 🐛저실장 -{baby_dead}, 👶자실장 -{child_dead} 동사! "
-                      + DLG.get_random_dialogue(DLG.DISASTER_COLD))
+                      event_text.msg('disaster_cold', baby=baby_dead, child=child_dead))
 
     # 3. 살충제 - 운치굴 저실장 50% 사망
-    if random.random() < GC.DISASTER_PESTICIDE_CHANCE and park.unchi_holes > 0:
+    if RNG.random() < GC.DISASTER_PESTICIDE_CHANCE and park.unchi_holes > 0:
         baby_dead = int(park.baby_count * 0.5)
         park.baby_count = max(0, park.baby_count - baby_dead)
         if baby_dead > 0:
-            add_event(park, 'disaster',
-                      f"☠️ 살충제! 🐛저실장 -{baby_dead} 사망! "
-                      + DLG.get_random_dialogue(DLG.DISASTER_PESTICIDE))
+            add_event(park, 'disaster', event_text.msg('disaster_pesticide', baby=baby_dead))
 
     # 4. 쥐떼 - 식량30% + 저실장20%
-    if random.random() < GC.DISASTER_RATS_CHANCE:
+    if RNG.random() < GC.DISASTER_RATS_CHANCE:
         food_lost = int(park.trash_food * 0.3)
         baby_dead = int(park.baby_count * 0.2)
         park.trash_food = max(0, park.trash_food - food_lost)
         park.baby_count = max(0, park.baby_count - baby_dead)
         if food_lost + baby_dead > 0:
             add_event(park, 'disaster',
-                      f"🐀 쥐떼! 🗑️음쓰 -{food_lost}, 🐛저실장 -{baby_dead}! "
-                      + DLG.get_random_dialogue(DLG.DISASTER_RATS))
+                      event_text.msg('disaster_rats', food=food_lost, baby=baby_dead))
 
     # 5. 고양이 - 자실장 1~3마리 사망
-    if random.random() < GC.DISASTER_CAT_CHANCE and park.child_count > 0:
-        killed = min(random.randint(1, 3), park.child_count)
+    if RNG.random() < GC.DISASTER_CAT_CHANCE and park.child_count > 0:
+        killed = min(RNG.randint(1, 3), park.child_count)
         park.child_count -= killed
-        add_event(park, 'disaster',
-                  f"🐱 고양이 습격! 👶자실장 -{killed} 사망! "
-                  + DLG.get_random_dialogue(DLG.DISASTER_CAT))
+        add_event(park, 'disaster', event_text.msg('disaster_cat', child=killed))
 
     # 6. 쓰레기장 철거 - 3턴 동안 채집 -50%
-    if random.random() < GC.DISASTER_DUMP_REMOVAL_CHANCE and park.gather_penalty_turns <= 0:
+    if RNG.random() < GC.DISASTER_DUMP_REMOVAL_CHANCE and park.gather_penalty_turns <= 0:
         park.gather_penalty_turns = 3
-        add_event(park, 'disaster',
-                  "🚛 쓰레기장 철거! 3턴간 채집 수확 50% 감소! "
-                  + DLG.get_random_dialogue(DLG.DISASTER_DUMP_REMOVAL))
+        add_event(park, 'disaster', event_text.msg('disaster_dump'))
 
 
 def _process_cannibalism(park):
@@ -919,20 +1013,17 @@ def _process_cannibalism(park):
         return
 
     # 경호실장의 자실장 강제 포식 (경호 1마리당 20% 확률)
-    eaten = 0
-    for _ in range(park.guard_count):
-        if random.random() < GC.CANNIBALISM_GUARD_FEED_CHANCE and park.child_count > 0:
-            park.child_count -= 1
-            park.meat_stock += 1  # 고기로 전환
-            eaten += 1
+    # [v1.7.0] 경호마다 판정하던 반복 → 이항분포 1회 추출 (같은 분포, 자실장 수로 상한)
+    eaten = min(RNG.binomial(park.guard_count, GC.CANNIBALISM_GUARD_FEED_CHANCE),
+                park.child_count)
+    park.child_count -= eaten
+    park.meat_stock += eaten  # 고기로 전환
 
     if eaten > 0:
-        add_event(park, 'cannibalism',
-                  f"🩸 경호실장이 자실장 {eaten}마리를 강제 포식! "
-                  + DLG.get_random_dialogue(DLG.CANNIBALISM_GUARD_PREDATION))
+        add_event(park, 'cannibalism', event_text.msg('cannibal_predation', n=eaten))
         # 목격 사기 감소
         park.morale = max(0, park.morale + GC.CANNIBALISM_MORALE_PENALTY)
-        add_event(park, 'morale', DLG.get_random_dialogue(DLG.CANNIBALISM_WITNESS))
+        add_event(park, 'morale', event_text.msg('cannibal_witness'))
 
 
 def _process_disease(park):
@@ -950,11 +1041,10 @@ def _process_disease(park):
         park.child_count = max(0, park.child_count - child_dead)
         if park.disease_turns > 0:
             add_event(park, 'disease',
-                      f"🤢 전염병 진행 중! 🐛-{baby_dead} 👶-{child_dead} (남은 {park.disease_turns}턴) "
-                      + DLG.get_random_dialogue(DLG.DISEASE_PROGRESS))
+                      event_text.msg('disease_progress', baby=baby_dead, child=child_dead,
+                                     turns=park.disease_turns))
         else:
-            add_event(park, 'disease',
-                      "🤢 전염병이 자연 소멸... 많은 피해를 입은 데스...")
+            add_event(park, 'disease', event_text.msg('disease_end'))
         return
 
     # 새 질병 발생 판정: 수용 90% 초과 + 운치굴 3개 이상
@@ -962,11 +1052,9 @@ def _process_disease(park):
         return
     occupancy = park.total_population / max(1, park.population_cap)
     if occupancy >= GC.DISEASE_OVERCROWD_THRESHOLD and park.unchi_holes >= 3:
-        if random.random() < GC.DISEASE_CHANCE_PER_TURN:
-            park.disease_turns = random.randint(*GC.DISEASE_DURATION)
-            add_event(park, 'disease',
-                      f"🤢 전염병 발생! {park.disease_turns}턴 동안 지속! "
-                      + DLG.get_random_dialogue(DLG.DISEASE_OUTBREAK))
+        if RNG.random() < GC.DISEASE_CHANCE_PER_TURN:
+            park.disease_turns = RNG.randint(*GC.DISEASE_DURATION)
+            add_event(park, 'disease', event_text.msg('disease_outbreak', turns=park.disease_turns))
 
 
 def _process_human_events(park):
@@ -975,58 +1063,47 @@ def _process_human_events(park):
         return
 
     # 1. 학대자 인간 (2%) - 자실장 3~5 납치
-    if random.random() < GC.NPC_EVENT_ABUSER_CHANCE and park.child_count > 0:
-        taken = min(random.randint(3, 5), park.child_count)
+    if RNG.random() < GC.NPC_EVENT_ABUSER_CHANCE and park.child_count > 0:
+        taken = min(RNG.randint(3, 5), park.child_count)
         park.child_count -= taken
         park.morale = max(0, park.morale - 8)
-        add_event(park, 'human_evil',
-                  f"😈 학대자 출현! 👶자실장 {taken}마리 납치! "
-                  + DLG.get_random_dialogue(DLG.HUMAN_ABUSER))
+        add_event(park, 'human_evil', event_text.msg('human_abuser', n=taken))
         return  # 한 턴에 인간 이벤트 1회만
 
     # 2. 실험체 포획 (1%) - 성체 1마리
-    if random.random() < GC.NPC_EVENT_EXPERIMENT_CHANCE and park.adult_count > 1:
+    if RNG.random() < GC.NPC_EVENT_EXPERIMENT_CHANCE and park.adult_count > 1:
         park.adult_count -= 1
         park.morale = max(0, park.morale - 10)
-        add_event(park, 'human_evil',
-                  "🔬 실험체 포획! 🧑성체 1마리 사라짐! "
-                  + DLG.get_random_dialogue(DLG.HUMAN_EXPERIMENT))
+        add_event(park, 'human_evil', event_text.msg('human_experiment'))
         return
 
     # 3. 어린이 장난 (4%) - 골판지집 피해
-    if random.random() < GC.NPC_EVENT_KIDS_CHANCE and park.cardboard_houses > 0:
+    if RNG.random() < GC.NPC_EVENT_KIDS_CHANCE and park.cardboard_houses > 0:
         # 50% 확률로 골판지집 파괴, 50%는 피해만
-        if random.random() < 0.5:
+        if RNG.random() < 0.5:
             park.cardboard_houses -= 1
             park.population_cap = max(5, park.population_cap - 15)
-            add_event(park, 'human_evil',
-                      "👦💦 어린이 장난! 골판지집 1동 파괴! "
-                      + DLG.get_random_dialogue(DLG.HUMAN_KIDS))
+            add_event(park, 'human_evil', event_text.msg('human_kids_house'))
         else:
             park.morale = max(0, park.morale - 5)
-            add_event(park, 'human_evil',
-                      "👦💦 어린이 장난! 물벼락으로 사기 하락! "
-                      + DLG.get_random_dialogue(DLG.HUMAN_KIDS))
+            add_event(park, 'human_evil', event_text.msg('human_kids_splash'))
         return
 
     # 4. 착한 인간 (5%) - 선물!
-    if random.random() < GC.NPC_EVENT_KINDNESS_CHANCE:
-        gift_konpeito = random.randint(3, 5)
-        gift_trash = random.randint(10, 20)
+    if RNG.random() < GC.NPC_EVENT_KINDNESS_CHANCE:
+        gift_konpeito = RNG.randint(3, 5)
+        gift_trash = RNG.randint(10, 20)
         park.konpeito = min(park.konpeito_cap, park.konpeito + gift_konpeito)
         park.trash_food = min(park.trash_food_cap, park.trash_food + gift_trash)
         park.morale = min(100, park.morale + 10)
         add_event(park, 'human_good',
-                  f"😇 착한 인간! 🍬+{gift_konpeito} 🗑️+{gift_trash}! "
-                  + DLG.get_random_dialogue(DLG.HUMAN_KINDNESS))
+                  event_text.msg('human_kindness', konpeito=gift_konpeito, trash=gift_trash))
         return
 
     # 5. 펫샵 포획 (1%) - 자실장 2마리
-    if random.random() < GC.NPC_EVENT_PETSHOP_CHANCE and park.child_count >= 2:
+    if RNG.random() < GC.NPC_EVENT_PETSHOP_CHANCE and park.child_count >= 2:
         park.child_count -= 2
-        add_event(park, 'human_evil',
-                  "🏪 펫샵 포획! 👶자실장 2마리 납치! "
-                  + DLG.get_random_dialogue(DLG.HUMAN_PETSHOP))
+        add_event(park, 'human_evil', event_text.msg('human_petshop'))
 
 
 def _process_rebellion(park):
@@ -1036,40 +1113,34 @@ def _process_rebellion(park):
 
     # 1. 자실장 탈주 (사기 20 이하)
     if park.morale <= GC.REBELLION_MORALE_THRESHOLD:
-        if random.random() < GC.REBELLION_CHANCE:
+        if RNG.random() < GC.REBELLION_CHANCE:
             fled = max(1, int(park.child_count * GC.REBELLION_DESERTION_RATE))
             fled = min(fled, park.child_count)
             if fled > 0:
                 park.child_count -= fled
-                add_event(park, 'rebellion',
-                          f"🏃 자실장 {fled}마리 탈주! "
-                          + DLG.get_random_dialogue(DLG.REBELLION_DESERTION))
+                add_event(park, 'rebellion', event_text.msg('rebellion_desertion', n=fled))
 
     # 2. 성체 태업 (사기 30 이하)
     if park.morale <= 30 and park.strike_turns <= 0:
-        if random.random() < GC.REBELLION_ADULT_STRIKE_CHANCE:
+        if RNG.random() < GC.REBELLION_ADULT_STRIKE_CHANCE:
             park.strike_turns = 2  # 2턴 동안 채집/건설 불가
-            add_event(park, 'rebellion',
-                      "✊ 성체 태업 발생! 2턴간 행동 제한! "
-                      + DLG.get_random_dialogue(DLG.REBELLION_STRIKE))
+            add_event(park, 'rebellion', event_text.msg('rebellion_strike'))
 
     # 3. 경호 쿠데타 (사기 20 이하 + 보스 HP 30 이하)
     if (park.morale <= GC.REBELLION_MORALE_THRESHOLD and
             park.boss_hp <= GC.REBELLION_BOSS_HP_THRESHOLD and
             park.guard_count > 0):
-        if random.random() < GC.REBELLION_GUARD_COUP_CHANCE:
+        if RNG.random() < GC.REBELLION_GUARD_COUP_CHANCE:
             park.boss_hp = max(0, park.boss_hp - GC.REBELLION_GUARD_COUP_DAMAGE)
             # 쿠데타 참여 경호 50% 이탈
             coup_guards = max(1, park.guard_count // 2)
             park.guard_count -= coup_guards
             add_event(park, 'rebellion',
-                      f"⚔️💀 쿠데타! 보스HP -{GC.REBELLION_GUARD_COUP_DAMAGE}, "
-                      f"경호 {coup_guards}마리 이탈! "
-                      + DLG.get_random_dialogue(DLG.REBELLION_GUARD_COUP))
+                      event_text.msg('rebellion_coup', damage=GC.REBELLION_GUARD_COUP_DAMAGE,
+                                     guards=coup_guards))
             if park.boss_hp <= 0:
                 park.is_destroyed = True
-                add_event(park, 'gameover',
-                          '👑💀 쿠데타로 보스실장 사망! 공원 멸망!')
+                add_event(park, 'gameover', event_text.msg('coup_gameover'))
 
 
 def _process_addiction(park):
@@ -1096,38 +1167,37 @@ def _process_addiction(park):
     if park.konpeito_consecutive >= GC.ADDICTION_TRIGGER_TURNS and not park.is_addicted:
         park.is_addicted = True
         park.addiction_clean_turns = 0
-        add_event(park, 'addiction',
-                  DLG.get_random_dialogue(DLG.ADDICTION_ONSET))
+        add_event(park, 'addiction', event_text.msg('addiction_onset'))
 
     # 중독 상태에서 콘페이토 없으면 사기 대폭 하락
     if park.is_addicted and park.konpeito <= 0:
         park.morale = max(0, park.morale + GC.ADDICTION_MORALE_PENALTY)
-        add_event(park, 'addiction',
-                  DLG.get_random_dialogue(DLG.ADDICTION_WITHDRAWAL))
+        add_event(park, 'addiction', event_text.msg('addiction_withdrawal'))
 
     # 해독 (3턴 연속 콘페이토 미섭취)
     if park.is_addicted and park.addiction_clean_turns >= GC.ADDICTION_CURE_TURNS:
         park.is_addicted = False
         park.addiction_clean_turns = 0
         park.konpeito_consecutive = 0
-        add_event(park, 'addiction',
-                  DLG.get_random_dialogue(DLG.ADDICTION_CURED))
+        add_event(park, 'addiction', event_text.msg('addiction_cured'))
 
 
-def _process_spy_missions(park):
+def _process_spy_missions(park, active_missions=None):
     """[v1.1.0] 밀사 임무 진행 (해당 공원이 보낸 밀사 처리)"""
     if park.is_destroyed:
         return
 
-    active_missions = SpyMission.query.filter_by(
-        sender_id=park.id, status='active'
-    ).all()
+    # [v1.7.0] 배치 틱에서는 청크 단위로 미리 로드한 목록을 사용
+    if active_missions is None:
+        active_missions = SpyMission.query.filter_by(
+            sender_id=park.id, status='active'
+        ).all()
 
     for mission in active_missions:
         mission.turns_remaining -= 1
 
         if mission.turns_remaining <= 0:
-            target = Park.query.get(mission.target_id)
+            target = db.session.get(Park, mission.target_id)
             if not target or target.is_destroyed:
                 mission.status = 'returned'
                 mission.result_message = '대상 공원이 멸망한 데스...'
@@ -1138,19 +1208,16 @@ def _process_spy_missions(park):
             if target.watchtowers > 0:
                 detect_chance += GC.SPY_WATCHTOWER_DETECT_BONUS
 
-            if random.random() < detect_chance:
+            if RNG.random() < detect_chance:
                 # 밀사 발각 → 성체 1마리 손실 (이미 파견 시 차감했으므로 추가 손실 없음)
                 mission.status = 'detected'
                 mission.result_message = '밀사가 발각되어 처형당했는 데스...'
-                add_event(park, 'spy',
-                          f"🕵️❌ {target.name}에 보낸 밀사 발각! "
-                          + DLG.get_random_dialogue(DLG.SPY_DETECTED))
+                add_event(park, 'spy', event_text.msg('spy_detected', target=target.name))
                 # 적 공원에도 알림
-                add_event(target, 'spy',
-                          DLG.get_random_dialogue(DLG.SPY_ENEMY_DETECTED))
+                add_event(target, 'spy', event_text.msg('spy_enemy_detected'))
             else:
                 # 사보타주 성공
-                food_ratio = random.uniform(*GC.SPY_SABOTAGE_FOOD_RATIO)
+                food_ratio = RNG.uniform(*GC.SPY_SABOTAGE_FOOD_RATIO)
                 food_destroyed = int(target.trash_food * food_ratio)
                 baby_killed = min(GC.SPY_SABOTAGE_BABY_KILL, target.baby_count)
                 target.trash_food = max(0, target.trash_food - food_destroyed)
@@ -1162,16 +1229,15 @@ def _process_spy_missions(park):
                 )
                 # 성체 1마리 복귀
                 park.adult_count += 1
-                add_event(park, 'spy',
-                          f"🕵️✅ {target.name} 사보타주 성공! "
-                          f"🗑️-{food_destroyed} 🐛-{baby_killed}! "
-                          + DLG.get_random_dialogue(DLG.SPY_SUCCESS))
+                add_event(park, 'spy', event_text.msg('spy_success', target=target.name,
+                                                      food=food_destroyed, baby=baby_killed))
                 add_event(target, 'sabotage',
-                          f"🕵️ 밀사 사보타주 피해! 🗑️-{food_destroyed} 🐛-{baby_killed}!")
+                          event_text.msg('spy_sabotaged', food=food_destroyed, baby=baby_killed))
 
 
-def action_cure_disease(park):
+def action_cure_disease(park, lang=None):
     """[v1.1.0] 질병 치료 행동 (콘페이토 5개 소비)"""
+    dlg = DLG.table(lang)
     if park.disease_turns <= 0:
         return False, {}, ['질병이 없는 데스!']
 
@@ -1180,21 +1246,22 @@ def action_cure_disease(park):
 
     park.konpeito -= GC.DISEASE_CURE_KONPEITO
     park.disease_turns = 0
-    messages = DLG.get_random_dialogues(DLG.DISEASE_CURED, 1)
+    messages = DLG.get_random_dialogues(dlg.DISEASE_CURED, 1)
     add_event(park, 'disease', '💊 콘페이토 치료! 전염병 종료!')
-    db.session.commit()
+    UOW.commit()
     return True, {'cured': True}, messages
 
 
-def action_spy(park, target_id):
+def action_spy(park, target_id, lang=None):
     """[v1.1.0] 밀사 파견 행동 (1AP + 성체 1마리)"""
+    dlg = DLG.table(lang)
     if park.action_points < GC.SPY_AP_COST:
         return False, {}, ['행동 포인트가 부족한 데스!']
 
     if park.adult_count < 2:  # 최소 1마리는 남겨야 함
         return False, {}, ['성체가 부족한 데스! 최소 2마리 이상 필요한 데스!']
 
-    target = Park.query.get(target_id)
+    target = db.session.get(Park, target_id)
     if not target or target.is_destroyed or target.id == park.id:
         return False, {}, ['유효하지 않은 대상인 데스!']
 
@@ -1209,9 +1276,9 @@ def action_spy(park, target_id):
     )
     db.session.add(mission)
 
-    messages = DLG.get_random_dialogues(DLG.SPY_DEPART, 1)
+    messages = DLG.get_random_dialogues(dlg.SPY_DEPART, 1)
     add_event(park, 'spy',
               f'🕵️ {target.name}에 밀사 파견! ({GC.SPY_RETURN_TURNS}턴 후 귀환)')
 
-    db.session.commit()
+    UOW.commit()
     return True, {'target': target.name, 'turns': GC.SPY_RETURN_TURNS}, messages
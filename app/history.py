@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+"""
+실장석 공원 제국 - 기록 조회 (history.py)
+[v1.7.0] 전투 기록/이벤트 로그 키셋 페이지네이션.
+
+- 정렬: (created_at, id) 내림차순. 커서 = 이전 페이지 마지막 행의 (created_at, id)
+  → WHERE (created_at, id) < 커서 ORDER BY ... LIMIT n: 몇 페이지 뒤든 인덱스 범위 탐색 1회
+  (OFFSET은 건너뛴 행을 모두 읽으므로 깊은 페이지일수록 느려짐)
+- 조건이 OR/IN이면(공격 또는 방어, 이벤트 타입 여러 개) 갈래마다 인덱스 순서대로 n+1개씩 읽어 병합
+  (한 쿼리에 OR로 묶으면 정렬용 임시 B-tree가 생겨 전체 기록 수에 비례)
+- 전투 로그 본문(log_text)은 deferred 컬럼 → 목록에서는 읽지 않고 상세 조회에서만 로드
+
+갈래별 인덱스 (app/models.py __table_args__):
+  전투: (attacker_id, created_at, id) / (defender_id, created_at, id) / 상대 지정 시 (attacker_id, defender_id, created_at, id)
+  이벤트: (park_id, created_at) / 타입 지정 시 (park_id, event_type, created_at, id)
+"""
+import base64
+import heapq
+from datetime import datetime
+from itertools import islice
+
+from sqlalchemy import tuple_
+
+from app.models import BattleLog, EventLog
+from app.config import GameConfig as GC
+
+
+class InvalidCursor(ValueError):
+    """해석할 수 없는 커서"""
+
+
+def encode_cursor(row):
+    """행의 (created_at, id) → URL에 그대로 쓸 수 있는 커서 문자열"""
+    raw = f"{row.created_at.isoformat()}|{row.id}"
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor):
+    """커서 문자열 → (created_at, id). 비어 있으면 None (첫 페이지)"""
+    if not cursor:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)).decode('utf-8')
+        created_at, row_id = raw.split('|')
+        return datetime.fromisoformat(created_at), int(row_id)
+    except ValueError as e:  # binascii.Error, UnicodeDecodeError 포함
+        raise InvalidCursor(cursor) from e
+
+
+def page_size(requested):
+    """요청한 페이지 크기를 [1, HISTORY_MAX_PAGE_SIZE]로 제한 (없으면 기본값)"""
+    if not requested:
+        return GC.HISTORY_PAGE_SIZE
+    return max(1, min(requested, GC.HISTORY_MAX_PAGE_SIZE))
+
+
+def _page(model, branches, cursor, limit, options=()):
+    """
+    갈래(조건 묶음)마다 키셋 조회 후 (created_at, id) 내림차순 병합.
+    반환: (행 리스트, 다음 페이지 커서 또는 None)
+    """
+    after = decode_cursor(cursor)
+    streams = []
+    for conditions in branches:
+        query = model.query.options(*options).filter(*conditions)
+        if after is not None:
+            query = query.filter(tuple_(model.created_at, model.id) < tuple_(*after))
+        streams.append(query.order_by(model.created_at.desc(), model.id.desc())
+                       .limit(limit + 1).all())
+
+    merged = heapq.merge(*streams, key=lambda r: (r.created_at, r.id), reverse=True)
+    rows = list(islice(merged, limit + 1))
+    if len(rows) > limit:
+        return rows[:limit], encode_cursor(rows[limit - 1])
+    return rows, None
+
+
+def battle_page(park_id, cursor=None, limit=None, opponent_id=None, options=()):
+    """공원이 공격자 또는 방어자인 전투 기록 1페이지 (opponent_id가 있으면 그 상대와의 전투만)"""
+    if opponent_id:
+        branches = [
+            (BattleLog.attacker_id == park_id, BattleLog.defender_id == opponent_id),
+            (BattleLog.attacker_id == opponent_id, BattleLog.defender_id == park_id),
+        ]
+    else:
+        branches = [(BattleLog.attacker_id == park_id,), (BattleLog.defender_id == park_id,)]
+    return _page(BattleLog, branches, cursor, page_size(limit), options)
+
+
+def event_page(park_id, cursor=None, limit=None, event_types=None):
+    """공원 이벤트 로그 1페이지 (event_types가 있으면 해당 타입만)"""
+    if event_types:
+        branches = [(EventLog.park_id == park_id, EventLog.event_type == t)
+                    for t in dict.fromkeys(event_types)]
+    else:
+        branches = [(EventLog.park_id == park_id,)]
+    return _page(EventLog, branches, cursor, page_size(limit))
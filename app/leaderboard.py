@@ -0,0 +1,148 @@
+# -*- coding: utf-8 -*-
+"""
+실장석 공원 제국 - 랭킹 스냅샷 (leaderboard.py)
+[v1.7.0] /ranking 요청마다 공원별 BattleLog count 4회(4N+1 쿼리) + 파이썬 정렬을 하던 방식을 대체.
+
+- 쿼리 1회: 전투력/인구/NP는 Park hybrid의 SQL 표현식, 승/패는 park_stats 카운터 (battle_logs 집계 불필요)
+- 월드 틱마다 1회 갱신한 스냅샷을 메모리에서 제공 (정렬 기준별 순서 미리 계산)
+- 내 순위는 정렬 키 리스트에서 이분 탐색 (O(log n))
+"""
+import threading
+import time
+from bisect import bisect_left
+
+from sqlalchemy import select, func
+
+from app.models import db, User, Park, ParkStats
+from app.config import GameConfig as GC
+
+# NPC 성격 이모지
+PERSONALITY_EMOJIS = {
+    'aggressive': '🗡️',
+    'defensive': '🛡️',
+    'peaceful': '🌿',
+    'cunning': '🎭',
+    'berserk': '💀',
+}
+
+# 정렬 기준 → 스냅샷 항목의 값
+SORT_KEYS = {
+    'power': lambda e: e['park'].total_combat_power,
+    'population': lambda e: e['park'].total_population,
+    'wins': lambda e: e['wins'],
+    'resources': lambda e: e['park'].total_np_available,
+}
+DEFAULT_SORT = 'power'
+
+# 현재 스냅샷 (갱신 시 참조만 교체 → 읽는 쪽은 잠금 불필요)
+_snapshot = None
+_refresh_lock = threading.Lock()
+
+
+# ========================================
+# 스냅샷
+# ========================================
+
+class RankedPark:
+    """
+    스냅샷용 공원 행 (세션과 무관한 읽기 전용 값 객체).
+    템플릿의 item.park.* 접근과 호환되는 속성만 가진다.
+    """
+    __slots__ = ('id', 'name', 'is_npc', 'npc_personality', 'owner_name',
+                 'total_combat_power', 'total_population', 'total_np_available')
+
+    def __init__(self, **values):
+        for key in self.__slots__:
+            setattr(self, key, values[key])
+
+
+class LeaderboardSnapshot:
+    """갱신 시점의 랭킹 (정렬 기준별 순서 + 이분 탐색용 키 리스트)"""
+
+    def __init__(self, entries):
+        self.created_at = time.time()
+        # [v1.7.0] 스냅샷 식별자 (대시보드 다른 공원 목록 캐시/ETag 키)
+        self.generation = int(self.created_at * 1000)
+        self.total = len(entries)
+        self.by_park_id = {e['park'].id: e for e in entries}
+        self.orders = {}
+        self._rank_keys = {}
+        for sort_by, key_fn in SORT_KEYS.items():
+            # 값 내림차순, 동점은 id 오름차순 (결정적 순서)
+            keys = sorted((-key_fn(e), e['park'].id) for e in entries)
+            self._rank_keys[sort_by] = keys
+            self.orders[sort_by] = [self.by_park_id[pid] for _, pid in keys]
+
+    def ordered(self, sort_by):
+        """정렬 기준별 랭킹 리스트 (알 수 없는 기준이면 전투력)"""
+        return self.orders.get(sort_by, self.orders[DEFAULT_SORT])
+
+    def rank_of(self, park_id, sort_by):
+        """내 순위 (1부터). 스냅샷에 없는 공원이면 0"""
+        entry = self.by_park_id.get(park_id)
+        if entry is None:
+            return 0
+        if sort_by not in SORT_KEYS:
+            sort_by = DEFAULT_SORT
+        keys = self._rank_keys[sort_by]
+        return bisect_left(keys, (-SORT_KEYS[sort_by](entry), park_id)) + 1
+
+    def parks_except(self, park_id):
+        """[v1.7.0] 자신을 뺀 공원 목록 (id 순) - 대시보드 다른 공원 목록"""
+        return sorted((e['park'] for pid, e in self.by_park_id.items() if pid != park_id),
+                      key=lambda p: p.id)
+
+    def record_of(self, park_id):
+        """(승, 패). 스냅샷에 없으면 (0, 0)"""
+        entry = self.by_park_id.get(park_id)
+        return (entry['wins'], entry['losses']) if entry else (0, 0)
+
+
+def build_snapshot():
+    """랭킹 스냅샷 생성 (쿼리 1회)"""
+    # Park 파생 값 hybrid의 SQL 표현식 사용
+    power = Park.total_combat_power.label('total_combat_power')
+    population = Park.total_population.label('total_population')
+    np_available = Park.total_np_available.label('total_np_available')
+
+    stmt = (select(Park.id, Park.name, Park.is_npc, Park.npc_personality, User.username,
+                   power, population, np_available,
+                   func.coalesce(ParkStats.wins, 0),
+                   func.coalesce(ParkStats.losses, 0))
+            .outerjoin(User, User.id == Park.user_id)
+            .outerjoin(ParkStats, ParkStats.park_id == Park.id)
+            .where(Park.is_destroyed == False))
+
+    entries = []
+    for row in db.session.execute(stmt):
+        pid, name, is_npc, personality, owner_name, pw, pop, np_avail, wins, losses = row
+        entries.append({
+            'park': RankedPark(id=pid, name=name, is_npc=bool(is_npc),
+                               npc_personality=personality, owner_name=owner_name,
+                               total_combat_power=int(pw or 0),
+                               total_population=int(pop or 0),
+                               total_np_available=int(np_avail or 0)),
+            'wins': int(wins),
+            'losses': int(losses),
+            'personality_emoji': PERSONALITY_EMOJIS.get(personality, ''),
+        })
+    return LeaderboardSnapshot(entries)
+
+
+def refresh():
+    """스냅샷 재생성 (월드 틱 종료 시 호출)"""
+    global _snapshot
+    with _refresh_lock:
+        _snapshot = build_snapshot()
+    return _snapshot
+
+
+def get_snapshot():
+    """
+    현재 스냅샷 반환.
+    없거나 LEADERBOARD_MAX_AGE초보다 오래됐으면 갱신 (스케줄러가 없는 프로세스 대비).
+    """
+    snap = _snapshot
+    if snap is None or time.time() - snap.created_at > GC.LEADERBOARD_MAX_AGE:
+        snap = refresh()
+    return snap
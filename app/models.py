@@ -14,12 +14,38 @@
 from datetime import datetime
 from flask_sqlalchemy import SQLAlchemy
 from flask_login import UserMixin
+from sqlalchemy import event, Integer
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.ext.hybrid import hybrid_property
+from sqlalchemy.orm import deferred
+from sqlalchemy.sql.functions import FunctionElement
 from werkzeug.security import generate_password_hash, check_password_hash
 
+from app.config import GameConfig as GC
+
 # SQLAlchemy 인스턴스 (앱 팩토리에서 init_app으로 초기화)
 db = SQLAlchemy()
 
 
+class _trunc_int(FunctionElement):
+    """[v1.7.0] int()와 같은 0 방향 절사 정수 변환 (hybrid 표현식용)"""
+    type = Integer()
+    name = 'trunc_int'
+    inherit_cache = True
+
+
+@compiles(_trunc_int)
+def _compile_trunc_int(element, compiler, **kw):
+    # SQLite: CAST(REAL AS INTEGER)는 0 방향 절사
+    return 'CAST(%s AS INTEGER)' % compiler.process(element.clauses, **kw)
+
+
+@compiles(_trunc_int, 'postgresql')
+def _compile_trunc_int_pg(element, compiler, **kw):
+    # PostgreSQL: CAST(numeric AS INTEGER)는 반올림이므로 trunc 먼저
+    return 'CAST(trunc(%s) AS INTEGER)' % compiler.process(element.clauses, **kw)
+
+
 class User(UserMixin, db.Model):
     """사용자 계정 모델"""
     __tablename__ = 'users'
@@ -49,6 +75,9 @@ class Park(db.Model):
     플레이어와 NPC 모두 이 모델을 사용한다.
     """
     __tablename__ = 'parks'
+    __table_args__ = (
+        db.Index('ix_parks_user', 'user_id'),  # [v1.7.0] 대시보드 공원 조회 (current_user.park)
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=True)
@@ -99,6 +128,10 @@ class Park(db.Model):
     # [v1.2.0] 모바일 턴 쿼터 시스템
     turn_quota = db.Column(db.Integer, default=3)          # 현재 보유 턴 (최대 15)
     last_turn_regen_at = db.Column(db.DateTime, default=datetime.utcnow)  # 마지막 턴 충전 시각
+    # [v1.7.0] 이 플레이어가 턴을 소비해 NPC에게 빚진 턴 수 (백그라운드 워커가 상환)
+    npc_turn_debt = db.Column(db.Integer, default=0, nullable=False)
+    # [v1.7.0] 공원 행이나 소속 대기열/이벤트 행이 바뀔 때마다 +1 (app/state_version.py) - 대시보드 캐시/ETag 키
+    state_version = db.Column(db.Integer, default=0, nullable=False)
 
     # 채집에 배치된 인원 (턴 처리용)
     gathering_adults = db.Column(db.Integer, default=0)
@@ -125,10 +158,18 @@ class Park(db.Model):
                   'boss_hp', 'morale', 'action_points', 'turn_quota')
     def _clamp_non_negative(self, key, value):
         """음수 값이 설정되면 0으로 클램핑 (DB 무결성 보호)"""
+        self._invalidate_derived()  # [v1.7.0] 파생 값 캐시 무효화
         if value is not None and value < 0:
             return 0
         return value
 
+    # [v1.7.0] 클램핑 대상이 아닌 파생 값 의존 컬럼
+    @db.validates('unchi_holes', 'walls', 'defending_guards', 'defending_adults')
+    def _track_derived_inputs(self, key, value):
+        """값 변경 시 파생 값 캐시 무효화"""
+        self._invalidate_derived()
+        return value
+
     # 관계 설정
     build_queue = db.relationship('BuildQueue', backref='park',
                                   cascade='all, delete-orphan')
@@ -137,55 +178,115 @@ class Park(db.Model):
     event_logs = db.relationship('EventLog', backref='park',
                                  cascade='all, delete-orphan',
                                  order_by='EventLog.created_at.desc()')
-
-    @property
+    # [v1.7.0] 전투 통계 카운터 (1:1)
+    stats = db.relationship('ParkStats', backref='park', uselist=False,
+                            cascade='all, delete-orphan')
+
+    # ========================================
+    # [v1.7.0] 파생 값 (hybrid: 인스턴스는 캐시, 클래스는 SQL 표현식)
+    # 캐시는 의존 컬럼 변경(validates)·expire·refresh 시 버려지고 다음 접근에서 1회 재계산.
+    # 클래스 접근(Park.total_combat_power)은 SQL 식 → 필터/정렬을 DB에서 처리
+    # ========================================
+
+    def _derived(self, name, compute):
+        """파생 값 캐시 조회 (없으면 계산 후 저장)"""
+        cache = self.__dict__.get('_derived_cache')
+        if cache is None:
+            cache = self.__dict__['_derived_cache'] = {}
+        if name not in cache:
+            cache[name] = compute()
+        return cache[name]
+
+    def _invalidate_derived(self):
+        self.__dict__.pop('_derived_cache', None)
+
+    @hybrid_property
     def total_population(self):
         """총 인구 (저실장 제외 - 저실장은 운치굴 별도 관리)"""
-        return self.guard_count + self.adult_count + self.child_count
+        return self._derived('total_population', lambda: (
+            self.guard_count + self.adult_count + self.child_count))
 
-    @property
+    @total_population.expression
+    def total_population(cls):
+        return cls.guard_count + cls.adult_count + cls.child_count
+
+    @hybrid_property
     def baby_cap(self):
         """저실장 수용 한도 (운치굴 수 × 10)"""
-        return self.unchi_holes * 10
+        return self._derived('baby_cap', lambda: self.unchi_holes * 10)
 
-    @property
+    @baby_cap.expression
+    def baby_cap(cls):
+        return cls.unchi_holes * 10
+
+    @hybrid_property
     def total_combat_power(self):
         """총 전투력 (사기 보정 포함)"""
-        from app.config import GameConfig as GC
+        def compute():
+            base = (GC.POWER_BOSS +
+                    self.guard_count * GC.POWER_GUARD +
+                    self.adult_count * GC.POWER_ADULT +
+                    self.child_count * GC.POWER_CHILD)
+            # 사기 보정: 사기/100을 곱함 (사기 50이면 ×1.0, 100이면 ×1.1)
+            morale_mult = 1.0 + (self.morale - 50) * GC.MORALE_COMBAT_EFFECT / 50
+            return int(base * morale_mult)
+        return self._derived('total_combat_power', compute)
+
+    @total_combat_power.expression
+    def total_combat_power(cls):
         base = (GC.POWER_BOSS +
-                self.guard_count * GC.POWER_GUARD +
-                self.adult_count * GC.POWER_ADULT +
-                self.child_count * GC.POWER_CHILD)
-        # 사기 보정: 사기/100을 곱함 (사기 50이면 ×1.0, 100이면 ×1.1)
-        morale_mult = 1.0 + (self.morale - 50) * GC.MORALE_COMBAT_EFFECT / 50
-        return int(base * morale_mult)
+                cls.guard_count * GC.POWER_GUARD +
+                cls.adult_count * GC.POWER_ADULT +
+                cls.child_count * GC.POWER_CHILD)
+        morale_mult = 1.0 + (cls.morale - 50) * GC.MORALE_COMBAT_EFFECT / 50
+        return _trunc_int(base * morale_mult)
 
-    @property
+    @hybrid_property
     def defense_power(self):
         """방어 전투력 (방벽 보너스 포함)"""
-        from app.config import GameConfig as GC
-        base = (self.defending_guards * GC.POWER_GUARD +
-                self.defending_adults * GC.POWER_ADULT)
-        # 방벽 보너스
-        wall_bonus = 1.0 + self.walls * 0.2
-        return int(base * wall_bonus)
-
-    @property
+        def compute():
+            base = (self.defending_guards * GC.POWER_GUARD +
+                    self.defending_adults * GC.POWER_ADULT)
+            # 방벽 보너스
+            wall_bonus = 1.0 + self.walls * 0.2
+            return int(base * wall_bonus)
+        return self._derived('defense_power', compute)
+
+    @defense_power.expression
+    def defense_power(cls):
+        base = (cls.defending_guards * GC.POWER_GUARD +
+                cls.defending_adults * GC.POWER_ADULT)
+        return _trunc_int(base * (1.0 + cls.walls * 0.2))
+
+    @hybrid_property
     def total_np_per_turn(self):
         """턴 당 총 영양 포인트(NP) 소비량"""
-        from app.config import GameConfig as GC
-        return (self.guard_count * GC.NP_PER_GUARD +
-                self.adult_count * GC.NP_PER_ADULT +
-                self.child_count * GC.NP_PER_CHILD +
-                self.baby_count * GC.NP_PER_BABY)
-
-    @property
+        return self._derived('total_np_per_turn', lambda: (
+            self.guard_count * GC.NP_PER_GUARD +
+            self.adult_count * GC.NP_PER_ADULT +
+            self.child_count * GC.NP_PER_CHILD +
+            self.baby_count * GC.NP_PER_BABY))
+
+    @total_np_per_turn.expression
+    def total_np_per_turn(cls):
+        return (cls.guard_count * GC.NP_PER_GUARD +
+                cls.adult_count * GC.NP_PER_ADULT +
+                cls.child_count * GC.NP_PER_CHILD +
+                cls.baby_count * GC.NP_PER_BABY)
+
+    @hybrid_property
     def total_np_available(self):
         """현재 보유 총 영양 포인트"""
-        from app.config import GameConfig as GC
-        return (self.konpeito * GC.NP_KONPEITO +
-                self.trash_food * GC.NP_TRASH_FOOD +
-                self.meat_stock * GC.NP_MEAT)
+        return self._derived('total_np_available', lambda: (
+            self.konpeito * GC.NP_KONPEITO +
+            self.trash_food * GC.NP_TRASH_FOOD +
+            self.meat_stock * GC.NP_MEAT))
+
+    @total_np_available.expression
+    def total_np_available(cls):
+        return (cls.konpeito * GC.NP_KONPEITO +
+                cls.trash_food * GC.NP_TRASH_FOOD +
+                cls.meat_stock * GC.NP_MEAT)
 
     def to_dict(self):
         """공원 상태를 딕셔너리로 반환 (API/템플릿용)"""
@@ -223,9 +324,27 @@ class Park(db.Model):
         }
 
 
+
+# [v1.7.0] 컬럼 값이 DB에서 다시 로드되면 파생 값 캐시도 무효화
+# (커밋 후 expire, session.refresh, 벡터 엔진 Core UPDATE 뒤 expire_all 등 validates를 거치지 않는 경로)
+@event.listens_for(Park, 'expire')
+def _park_expired(target, attrs):
+    # 커밋 후 일괄 expire 시점에 이미 가비지 컬렉션된 객체는 None으로 넘어온다
+    if target is not None:
+        target._invalidate_derived()
+
+
+@event.listens_for(Park, 'refresh')
+def _park_refreshed(target, context, attrs):
+    target._invalidate_derived()
+
+
 class BuildQueue(db.Model):
     """건설 대기열 - 건설 중인 시설 추적"""
     __tablename__ = 'build_queue'
+    __table_args__ = (
+        db.Index('ix_build_queue_park', 'park_id'),  # [v1.7.0] 대기열 일괄 로드
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     park_id = db.Column(db.Integer, db.ForeignKey('parks.id'), nullable=False)
@@ -238,6 +357,9 @@ class BuildQueue(db.Model):
 class TrainQueue(db.Model):
     """훈련 대기열 - 경호실장 훈련 중인 성체실장 추적"""
     __tablename__ = 'train_queue'
+    __table_args__ = (
+        db.Index('ix_train_queue_park', 'park_id'),  # [v1.7.0] 대기열 일괄 로드
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     park_id = db.Column(db.Integer, db.ForeignKey('parks.id'), nullable=False)
@@ -248,37 +370,100 @@ class TrainQueue(db.Model):
 class BattleLog(db.Model):
     """전투 기록"""
     __tablename__ = 'battle_logs'
+    # [v1.7.0] 공격/방어 측별 전적 조회
+    __table_args__ = (
+        db.Index('ix_battle_logs_attacker_result', 'attacker_id', 'result'),
+        db.Index('ix_battle_logs_defender_result', 'defender_id', 'result'),
+        # [v1.7.0] 키셋 페이지네이션 (app/history.py) - 측별/상대별 (created_at, id) 순서
+        db.Index('ix_battle_logs_attacker_created', 'attacker_id', 'created_at', 'id'),
+        db.Index('ix_battle_logs_defender_created', 'defender_id', 'created_at', 'id'),
+        db.Index('ix_battle_logs_pair_created', 'attacker_id', 'defender_id', 'created_at', 'id'),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     attacker_id = db.Column(db.Integer, db.ForeignKey('parks.id'), nullable=False)
     defender_id = db.Column(db.Integer, db.ForeignKey('parks.id'), nullable=False)
     result = db.Column(db.String(20), nullable=False)  # 'win' / 'lose'
-    log_text = db.Column(db.Text, nullable=False)      # 전투 로그 텍스트
+    # 전투 로그 텍스트 [v1.7.0] deferred: 목록 조회에서는 읽지 않음 (상세/undefer 시 로드)
+    # [v1.7.0] 변환하지 못한 이전 기록만 보관, 새 기록은 빈 문자열 → text()가 아래 숫자 컬럼에서 생성
+    log_text = deferred(db.Column(db.Text, nullable=False, default=''))
     loot_konpeito = db.Column(db.Integer, default=0)
     loot_trash = db.Column(db.Integer, default=0)
     loot_material = db.Column(db.Integer, default=0)
     loot_babies = db.Column(db.Integer, default=0)
     loot_children = db.Column(db.Integer, default=0)
-    attacker_losses = db.Column(db.Text, default='{}')  # JSON
-    defender_losses = db.Column(db.Text, default='{}')  # JSON
+    # [v1.7.0] 출정 편성 + 양측 피해 (이전 attacker_losses/defender_losses JSON 대체)
+    sent_guards = db.Column(db.Integer, nullable=False, default=0)
+    sent_adults = db.Column(db.Integer, nullable=False, default=0)
+    boss_joined = db.Column(db.Boolean, nullable=False, default=False)
+    atk_lost_guards = db.Column(db.Integer, nullable=False, default=0)
+    atk_lost_adults = db.Column(db.Integer, nullable=False, default=0)
+    def_lost_guards = db.Column(db.Integer, nullable=False, default=0)
+    def_lost_adults = db.Column(db.Integer, nullable=False, default=0)
+    def_lost_children = db.Column(db.Integer, nullable=False, default=0)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
     attacker = db.relationship('Park', foreign_keys=[attacker_id])
     defender = db.relationship('Park', foreign_keys=[defender_id])
 
+    @property
+    def attacker_losses(self):
+        """공격자 피해 {'guards', 'adults', 'children'} (이전 JSON과 같은 모양)"""
+        return {'guards': self.atk_lost_guards, 'adults': self.atk_lost_adults, 'children': 0}
+
+    @property
+    def defender_losses(self):
+        """방어자 피해 {'guards', 'adults', 'children'}"""
+        return {'guards': self.def_lost_guards, 'adults': self.def_lost_adults,
+                'children': self.def_lost_children}
+
+    @property
+    def loot(self):
+        return {'konpeito': self.loot_konpeito, 'trash': self.loot_trash,
+                'material': self.loot_material, 'babies': self.loot_babies,
+                'children': self.loot_children}
+
+    def text(self):
+        """[v1.7.0] 전투 로그 본문 (이전 기록은 저장된 문장, 새 기록은 숫자 컬럼에서 생성)"""
+        if self.log_text:
+            return self.log_text
+        from app.battle_engine import format_battle_log
+        return format_battle_log(
+            self.attacker.name if self.attacker else '???',
+            self.defender.name if self.defender else '???',
+            self.result == 'win', self.attacker_losses, self.defender_losses, self.loot,
+            self.sent_guards, self.sent_adults, self.boss_joined)
+
 
 class EventLog(db.Model):
     """이벤트 로그 - 공원에서 발생한 모든 이벤트 기록"""
     __tablename__ = 'event_logs'
+    # [v1.7.0] 대시보드 최근 이벤트 / 알림 API (타입 필터 + id 이후)
+    __table_args__ = (
+        db.Index('ix_event_logs_park_created', 'park_id', 'created_at'),
+        db.Index('ix_event_logs_park_type_id', 'park_id', 'event_type', 'id'),
+        # [v1.7.0] 타입별 기록 키셋 페이지네이션 (app/history.py)
+        db.Index('ix_event_logs_park_type_created', 'park_id', 'event_type', 'created_at', 'id'),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     park_id = db.Column(db.Integer, db.ForeignKey('parks.id'), nullable=False)
     event_type = db.Column(db.String(50), nullable=False)
     # 이벤트 타입: gather, build, birth, cull, battle, starve, train, npc, trade, diplomacy 등
-    message = db.Column(db.Text, nullable=False)
+    # 자유 문장 이벤트의 본문 ([v1.7.0] code로 기록한 이벤트는 빈 문자열)
+    message = db.Column(db.Text, nullable=False, default='')
+    # [v1.7.0] 코드 기록 이벤트 (app/event_text.py): 읽을 때 보는 사람의 언어로 렌더링
+    code = db.Column(db.String(32))       # 이벤트 코드 (없으면 message 그대로 표시)
+    params = db.Column(db.Text)           # 파라미터 JSON (없으면 NULL)
+    line = db.Column(db.SmallInteger)     # 대사 번호
     turn_number = db.Column(db.Integer, default=0)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
+    def text(self, lang=None):
+        """[v1.7.0] 표시 문장 (lang이 None이면 요청 세션 언어)"""
+        from app import event_text
+        return event_text.render_row(self, lang)
+
 
 # === [v0.4.0] Phase 5: 교역 시스템 모델 ===
 class TradeOffer(db.Model):
@@ -288,6 +473,11 @@ class TradeOffer(db.Model):
     상태: pending(대기) → accepted(수락) / rejected(거절) / expired(만료) / cancelled(취소)
     """
     __tablename__ = 'trade_offers'
+    # [v1.7.0] 공개/수신 교역 목록, 보낸 교역 목록·개수 제한
+    __table_args__ = (
+        db.Index('ix_trade_offers_status_receiver', 'status', 'receiver_id'),
+        db.Index('ix_trade_offers_sender_status', 'sender_id', 'status'),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     # 제안 공원 (보내는 쪽)
@@ -328,6 +518,13 @@ class Diplomacy(db.Model):
     적대: 침공 시 약탈 +20% 보너스
     """
     __tablename__ = 'diplomacies'
+    # [v1.7.0] 양방향 관계 조회 ((a, b) OR (b, a)) - 방향별 인덱스 1개씩
+    __table_args__ = (
+        db.Index('ix_diplomacies_a_b_type_status',
+                 'park_a_id', 'park_b_id', 'relation_type', 'status'),
+        db.Index('ix_diplomacies_b_a_type_status',
+                 'park_b_id', 'park_a_id', 'relation_type', 'status'),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     # 요청/선언 공원
@@ -355,6 +552,11 @@ class SpyMission(db.Model):
     상태: active(진행 중) → success(성공) / detected(발각) / returned(귀환)
     """
     __tablename__ = 'spy_missions'
+    # [v1.7.0] 공원별 진행 중 밀사 / 월드 틱의 진행 중 밀사 발송자 목록
+    # (status, sender_id) 하나로 두 조건 모두 커버
+    __table_args__ = (
+        db.Index('ix_spy_missions_status_sender', 'status', 'sender_id'),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     sender_id = db.Column(db.Integer, db.ForeignKey('parks.id'), nullable=False)
@@ -367,3 +569,21 @@ class SpyMission(db.Model):
 
     sender = db.relationship('Park', foreign_keys=[sender_id])
     target = db.relationship('Park', foreign_keys=[target_id])
+
+
+# === [v1.7.0] 전투 통계 카운터 ===
+class ParkStats(db.Model):
+    """
+    공원별 전투 통계 - battle_logs를 매번 집계하지 않도록 누적 카운터로 보관.
+    execute_battle이 BattleLog INSERT와 같은 트랜잭션에서 갱신한다.
+    약탈량은 5종(콘페이토/음쓰/자재/저실장/자실장) 수량 합계.
+    """
+    __tablename__ = 'park_stats'
+
+    park_id = db.Column(db.Integer, db.ForeignKey('parks.id'), primary_key=True)
+    wins = db.Column(db.Integer, default=0, nullable=False)          # 승리 (공격 승 + 방어 승)
+    losses = db.Column(db.Integer, default=0, nullable=False)        # 패배 (공격 패 + 방어 패)
+    battles = db.Column(db.Integer, default=0, nullable=False)       # 참여 전투 수
+    loot_taken = db.Column(db.Integer, default=0, nullable=False)    # 약탈한 총량
+    loot_lost = db.Column(db.Integer, default=0, nullable=False)     # 약탈당한 총량
+    last_battle_at = db.Column(db.DateTime, nullable=True)           # 마지막 전투 시각
@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+"""
+실장석 공원 제국 - 알림 허브 (notify_hub.py)
+[v1.7.0] 프로세스 내 pub/sub. 알림 대상 이벤트(NOTIFY_TYPES)가 커밋되면 해당 공원 구독자를 깨운다.
+
+- 구독: 공원별 채널(Condition + 버전 번호)을 만들어 대기 → 이벤트가 없으면 스레드가 잠만 잔다
+- 발행: event_buffer가 알림 대상 행을 기록하면 공원 id를 세션에 적어 두고,
+        커밋 후(after_commit)에만 발행 → 구독자가 깨어나 조회할 때 행이 반드시 보인다
+- 다른 프로세스에서 커밋된 이벤트는 발행되지 않으므로, 구독자는 대기 시간 초과 시에도 DB를 한 번 확인한다
+
+배포 조건: 웹 요청과 스케줄러가 같은 프로세스 1개 (gunicorn --workers 1 --worker-class gthread, BUILD_GUIDE.md).
+알림 이벤트(전투/교역/외교)는 요청 스레드나 스케줄러의 직렬 단계(밀사/NPC 침공)에서만 커밋되므로 모두 발행된다.
+
+한계: gthread에서는 대기 중인 연결(SSE/롱폴링) 1개가 요청 스레드 1개를 연결이 끝날 때까지 점유한다.
+그래서 구독 수를 limit(NOTIFY_MAX_WAITERS)으로 막아 나머지 스레드를 일반 요청용으로 남기고,
+자리가 없으면 구독하지 않는다(None) → 라우트가 즉시 응답하고 클라이언트는 주기 폴링으로 내려간다.
+"""
+import threading
+from contextlib import contextmanager
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+_PENDING_KEY = 'notify_parks'
+
+
+class _Channel:
+    """공원 1개의 알림 채널"""
+    __slots__ = ('cond', 'version', 'waiters')
+
+    def __init__(self):
+        self.cond = threading.Condition()
+        self.version = 0
+        self.waiters = 0
+
+    def wait(self, seen_version, timeout):
+        """버전이 seen_version에서 바뀔 때까지 최대 timeout초 대기. 반환: 현재 버전"""
+        with self.cond:
+            if self.version == seen_version:
+                self.cond.wait(timeout)
+            return self.version
+
+
+_channels = {}
+_channels_lock = threading.Lock()
+_subscribers = 0   # 전체 구독 수 (= 알림 대기로 점유된 요청 스레드 수)
+
+
+def subscribe(park_id, limit=0):
+    """
+    공원 채널 구독. 반환: 채널, 전체 구독 수가 limit에 도달했으면 None (limit 0 = 제한 없음).
+    해제는 unsubscribe - 응답 수명에 묶을 때(SSE) 사용, 그 외에는 subscription 블록을 쓴다.
+    """
+    global _subscribers
+    with _channels_lock:
+        if limit and _subscribers >= limit:
+            return None
+        ch = _channels.get(park_id)
+        if ch is None:
+            ch = _channels[park_id] = _Channel()
+        ch.waiters += 1
+        _subscribers += 1
+        return ch
+
+
+def unsubscribe(park_id, ch):
+    """구독 해제 (구독자가 없으면 채널 삭제)"""
+    global _subscribers
+    with _channels_lock:
+        ch.waiters -= 1
+        _subscribers -= 1
+        if ch.waiters <= 0 and _channels.get(park_id) is ch:
+            del _channels[park_id]
+
+
+@contextmanager
+def subscription(park_id, limit=0):
+    """
+    공원 채널 구독 (블록을 벗어나면 해제). 자리가 없으면 None을 넘긴다 (subscribe 참고).
+    사용 순서: ch.version 기억 → DB 조회 → ch.wait(기억한 버전)
+    (조회와 대기 사이에 발행된 알림도 버전 차이로 놓치지 않음)
+    """
+    ch = subscribe(park_id, limit)
+    try:
+        yield ch
+    finally:
+        if ch is not None:
+            unsubscribe(park_id, ch)
+
+
+def publish(park_id):
+    """공원 구독자 깨우기 (구독자가 없으면 아무것도 안 함)"""
+    ch = _channels.get(park_id)
+    if ch is None:
+        return
+    with ch.cond:
+        ch.version += 1
+        ch.cond.notify_all()
+
+
+def subscriber_count():
+    """현재 대기 중인 구독 수 (모니터링용)"""
+    return _subscribers
+
+
+def stage(session, park_ids):
+    """커밋 후 발행할 공원 id 기록 (event_buffer.flush에서 호출)"""
+    if park_ids:
+        session.info.setdefault(_PENDING_KEY, set()).update(park_ids)
+
+
+@event.listens_for(Session, 'after_commit')
+def _publish_after_commit(session):
+    for park_id in session.info.pop(_PENDING_KEY, ()):
+        publish(park_id)
+
+
+@event.listens_for(Session, 'after_soft_rollback')
+def _discard_on_rollback(session, previous_transaction):
+    if previous_transaction.parent is None:
+        session.info.pop(_PENDING_KEY, None)
@@ -12,12 +12,14 @@
 
 각 행동은 game_engine 함수를 그대로 호출한다.
 """
-import random
 
 from app.models import db, Park
 from app.config import GameConfig as GC
 from app import game_engine
 from app import dialogues as DLG
+from app import target_index
+from app import rng as RNG
+from app import battle_sim
 
 
 def process_npc_turn(park):
@@ -30,19 +32,24 @@ def process_npc_turn(park):
 
     personality = park.npc_personality or 'peaceful'
 
-    # NPC 자원 소규모 자연 성장 (밸런스용 - 플레이어와의 격차 방지)
-    _npc_passive_growth(park)
+    # [v1.7.0] (공원, 턴, 'npc') 결정적 난수 스트림
+    with RNG.stream(park.id, park.turn_count, 'npc'):
+        # NPC 자원 소규모 자연 성장 (밸런스용 - 플레이어와의 격차 방지)
+        _npc_passive_growth(park)
 
-    # AP가 있는 한 행동 실행
-    actions = _get_action_priority(personality, park)
+        # AP가 있는 한 행동 실행
+        actions = _get_action_priority(personality, park)
 
-    for action_func in actions:
-        if park.action_points <= 0:
-            break
-        try:
-            action_func(park)
-        except Exception:
-            continue  # NPC 행동 실패 시 무시
+        for action_func in actions:
+            if park.action_points <= 0:
+                break
+            try:
+                action_func(park)
+            except Exception:
+                continue  # NPC 행동 실패 시 무시
+
+    # [v1.7.0] 행동(훈련/솎아내기 등) 결과를 대상 인덱스에 반영
+    target_index.touch(park)
 
 
 def _npc_passive_growth(park):
@@ -50,28 +57,28 @@ def _npc_passive_growth(park):
     personality = park.npc_personality or 'peaceful'
 
     # 기본 쓰레기 자연 증가
-    base_trash = random.randint(5, 12)
+    base_trash = RNG.randint(5, 12)
     park.trash_food = min(park.trash_food + base_trash, park.trash_food_cap)
 
     # 자재 소량 증가
-    park.material = min(park.material + random.randint(2, 4), park.material_cap)
+    park.material = min(park.material + RNG.randint(2, 4), park.material_cap)
 
     # 성격별 추가 성장
     if personality == 'peaceful':
         # 목장형: 인구 번식 보너스 (저실장 +1~2)
-        if random.random() < 0.3:
-            park.baby_count += random.randint(1, 2)
+        if RNG.random() < 0.3:
+            park.baby_count += RNG.randint(1, 2)
     elif personality == 'aggressive' or personality == 'berserk':
         # 야만/광폭: 경호실장 소량 자연 증가 (10% 확률)
-        if random.random() < 0.1 and park.adult_count > 2:
+        if RNG.random() < 0.1 and park.adult_count > 2:
             park.guard_count += 1
             park.adult_count -= 1  # 성체 → 경호 자연 전환
     elif personality == 'defensive':
         # 요새형: 방벽 자비 + 자재 추가
-        park.material = min(park.material + random.randint(1, 3), park.material_cap)
+        park.material = min(park.material + RNG.randint(1, 3), park.material_cap)
     elif personality == 'cunning':
         # 교활형: 콘페이토 소량 획득 (3% 확률)
-        if random.random() < 0.03:
+        if RNG.random() < 0.03:
             park.konpeito = min(park.konpeito + 1, park.konpeito_cap)
 
 
@@ -182,22 +189,12 @@ def _npc_attack(park):
     if park.guard_count < 1 and park.adult_count < 3:
         return  # 전투 인원 부족
 
-    # 공격 대상 찾기 (자기 제외, 머망 제외)
-    targets = Park.query.filter(
-        Park.id != park.id,
-        Park.is_destroyed == False
-    ).all()
-
-    # [v1.3.0] 보호 모드 대상 제외
-    from app.game_engine import is_protected
-    targets = [t for t in targets if not is_protected(t)]
-
-    if not targets:
+    # 공격 대상 찾기 (자기 제외, 머망 제외, [v1.3.0] 보호 모드 제외)
+    # [v1.7.0] 월드 틱 중에는 대상 인덱스에서 추출
+    target = _find_target(park)
+    if target is None:
         return
 
-    # 랜덤 타겟 선택
-    target = random.choice(targets)
-
     # [v0.3.0] NPC도 유닛 선택해서 출정 (방어 인원 제외)
     avail_guards = max(0, park.guard_count - park.defending_guards)
     avail_adults = max(0, park.adult_count - park.defending_adults)
@@ -212,6 +209,43 @@ def _npc_attack(park):
     park.action_points -= 2
 
 
+def _find_target(park, power_limit=None):
+    """
+    [v1.7.0] 공격 대상 선택 (자기 제외, 멸망/보호 모드 제외, power_limit가 있으면 전투력 미만만).
+    활성 대상 인덱스가 있으면 O(log N) 추출 후 현재 상태로 재확인
+    (같은 틱에서 다른 경로로 바뀐 공원이면 인덱스를 고치고 다시 추출).
+    인덱스가 없으면 조건을 SQL로 걸어 조회.
+    """
+    from app.game_engine import is_protected, not_protected_expr
+
+    index = target_index.current()
+    if index is None:
+        query = Park.query.filter(
+            Park.id != park.id,
+            Park.is_destroyed == False,
+            not_protected_expr())
+        if power_limit is not None:
+            query = query.filter(Park.total_combat_power < power_limit)
+        targets = query.all()
+        return RNG.choice(targets) if targets else None
+
+    for _ in range(len(index)):
+        target_id = (index.pick_any(park.id) if power_limit is None
+                     else index.pick_weaker(power_limit, park.id))
+        if target_id is None:
+            return None
+        target = db.session.get(Park, target_id)
+        if target is None:
+            index.discard(target_id)
+            continue
+        if (target.is_destroyed or is_protected(target) or
+                (power_limit is not None and target.total_combat_power >= power_limit)):
+            index.update(target)
+            continue
+        return target
+    return None
+
+
 def _npc_cunning_attack(park):
     """NPC 교활 공격: 자기보다 약한 공원만 공격 [v0.3.0] 유닛 선택 추가"""
     if park.action_points < 2:
@@ -219,30 +253,53 @@ def _npc_cunning_attack(park):
     if park.guard_count < 1:
         return
 
-    targets = Park.query.filter(
-        Park.id != park.id,
-        Park.is_destroyed == False
-    ).all()
-
-    # 자기보다 약한 공원만 필터링 + [v1.3.0] 보호 모드 제외
-    from app.game_engine import is_protected
-    weak_targets = [t for t in targets
-                    if t.total_combat_power < park.total_combat_power * 0.7
-                    and not is_protected(t)]
-
-    if not weak_targets:
-        return  # 약한 상대 없으면 안 싸움 (교활!)
-
-    target = random.choice(weak_targets)
-
     # [v0.3.0] 교활형은 켄수를 써서 반만만 보냄 (피해 최소화)
     avail_guards = max(0, park.guard_count - park.defending_guards)
     send_g = max(1, avail_guards // 2)
     send_a = 0  # 성체는 되도록 안 보냄
 
+    # 자기보다 약한 공원만 필터링 + [v1.3.0] 보호 모드 제외
+    # [v1.7.0] 후보 몇 곳을 전투 예측으로 비교해 이길 만한 곳만 고름
+    target = _pick_cunning_target(park, send_g)
+    if target is None:
+        return  # 약한 상대 없으면 안 싸움 (교활!)
+
     from app.battle_engine import execute_battle
     execute_battle(park, target,
                    send_guards=send_g,
                    send_adults=send_a,
                    boss_joins=False)
     park.action_points -= 2
+
+
+def _pick_cunning_target(park, send_guards):
+    """
+    [v1.7.0] 교활 NPC 대상 선택: 전투력 70% 미만 후보를 NPC_FORECAST_CANDIDATES곳까지 뽑아
+    battle_sim 예측 승률이 NPC_CUNNING_MIN_WIN 이상인 곳 중 기대 약탈량이 가장 큰 공원.
+    예측은 (공원, 턴, 'forecast', 대상) 스트림을 써서 틱 재현성 유지. numpy가 없으면 기존처럼 후보 1곳.
+    """
+    power_limit = park.total_combat_power * 0.7
+    try:
+        import numpy  # battle_sim.simulate에 필요
+    except ImportError:
+        return _find_target(park, power_limit=power_limit)
+
+    best, best_value = None, -1.0
+    seen = set()
+    for _ in range(GC.NPC_FORECAST_CANDIDATES):
+        target = _find_target(park, power_limit=power_limit)
+        if target is None:
+            break
+        if target.id in seen:
+            continue
+        seen.add(target.id)
+
+        result = battle_sim.forecast(
+            park, target, send_guards=send_guards, send_adults=0,
+            samples=GC.NPC_FORECAST_SAMPLES,
+            rng=RNG.numpy_generator(park.id, park.turn_count, 'forecast', target.id))
+        if result is None or result['win_probability'] < GC.NPC_CUNNING_MIN_WIN:
+            continue
+        if result['expected_loot_total'] > best_value:
+            best, best_value = target, result['expected_loot_total']
+    return best
@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+"""
+실장석 공원 제국 - 전투 통계 카운터 (park_stats.py)
+[v1.7.0] 승/패·약탈량을 ParkStats에 누적해 랭킹 등이 O(1)로 읽도록 한다.
+
+- record_battle(): execute_battle에서 BattleLog INSERT와 같은 트랜잭션으로 갱신
+- add_loot(): 전투 후 추가 약탈(적대 보너스 등) 반영
+- 재계산(백필/정합성 복구): python migrate_v1_7.py --rebuild-stats
+"""
+from datetime import datetime
+
+from sqlalchemy import update
+from sqlalchemy.dialects import postgresql, sqlite
+
+from app.models import db, ParkStats
+
+
+def _ensure_rows(*park_ids):
+    """
+    통계 행이 없으면 0으로 생성.
+    INSERT ... ON CONFLICT DO NOTHING: 동시 전투가 통계 행 없는 같은 공원을 만나도 PK 충돌 없음
+    (조회 후 INSERT는 PostgreSQL에서 한쪽이 IntegrityError)
+    """
+    dialect = db.session.get_bind().dialect.name
+    insert = postgresql.insert if dialect == 'postgresql' else sqlite.insert
+    rows = [dict(park_id=park_id, wins=0, losses=0, battles=0, loot_taken=0, loot_lost=0)
+            for park_id in sorted(set(park_ids))]
+    db.session.execute(insert(ParkStats).values(rows)
+                       .on_conflict_do_nothing(index_elements=[ParkStats.park_id]))
+
+
+def _increment(changes):
+    """{park_id: {컬럼: 값/SQL 표현식}} → 공원 id 순서로 UPDATE (잠금 순서 고정)"""
+    for park_id in sorted(changes):
+        db.session.execute(update(ParkStats).where(ParkStats.park_id == park_id)
+                           .values(**changes[park_id]))
+
+
+def record_battle(attacker_id, defender_id, attacker_wins, loot_total, when=None):
+    """
+    전투 1건 반영. 커밋은 호출자 몫.
+    증감은 SQL 표현식으로 기록해 동시 전투가 같은 공원을 갱신해도 유실되지 않는다.
+    """
+    when = when or datetime.utcnow()
+    winner_id, loser_id = ((attacker_id, defender_id) if attacker_wins
+                           else (defender_id, attacker_id))
+
+    _ensure_rows(winner_id, loser_id)
+    winner = dict(wins=ParkStats.wins + 1, battles=ParkStats.battles + 1, last_battle_at=when)
+    loser = dict(losses=ParkStats.losses + 1, battles=ParkStats.battles + 1, last_battle_at=when)
+    # 약탈은 공격자가 이겼을 때만 발생 (승자 = 공격자, 패자 = 방어자)
+    if attacker_wins and loot_total > 0:
+        winner['loot_taken'] = ParkStats.loot_taken + loot_total
+        loser['loot_lost'] = ParkStats.loot_lost + loot_total
+    _increment({winner_id: winner, loser_id: loser})
+
+
+def add_loot(attacker_id, defender_id, amount):
+    """약탈량 누적 (공격자 +, 방어자 -)"""
+    if amount <= 0:
+        return
+    _ensure_rows(attacker_id, defender_id)
+    _increment({attacker_id: dict(loot_taken=ParkStats.loot_taken + amount),
+                defender_id: dict(loot_lost=ParkStats.loot_lost + amount)})
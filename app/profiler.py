@@ -0,0 +1,239 @@
+# -*- coding: utf-8 -*-
+"""
+실장석 공원 제국 - SQL 프로파일러 (profiler.py)
+[v1.7.0] 요청별 SQL 실행 수/시간, ORM 로드 객체 수, 느린 쿼리를 계측한다.
+
+- 엔진 이벤트(before/after_cursor_execute)로 문장 수와 실행 시간 측정
+- ORM 'load' 이벤트로 요청 중 로드된 모델 객체 수 측정
+- 커밋 수는 unit_of_work의 요청별 카운터(g._uow_commits)를 재사용
+- 엔드포인트별 누적 통계 + 최근 느린 쿼리 로그 → /game/debug/profile (DEBUG 전용)
+- PROFILER_HEADER=1이면 응답에 X-Query-Count / X-SQL-Time 헤더 추가
+
+쿼리 예산:
+  @query_budget(10)을 붙인 라우트가 예산을 넘으면 경고 로그를 남기고,
+  PROFILER_STRICT=1(테스트/CI)이면 QueryBudgetExceeded를 발생시켜 요청을 실패시킨다.
+  요청 밖(스크립트 등)에서는 count_queries() 블록으로 측정할 수 있다.
+"""
+import heapq
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from functools import wraps
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.models import db
+
+# 요청당 보관할 느린 문장 수 / 전역 느린 쿼리 로그 길이 / 파라미터 표시 길이
+TOP_STATEMENTS = 5
+SLOW_LOG_SIZE = 50
+PARAM_REPR_MAX = 200
+
+
+class QueryBudgetExceeded(RuntimeError):
+    """@query_budget으로 선언한 쿼리 수를 초과 (PROFILER_STRICT 모드)"""
+
+
+# 엔드포인트별 누적 통계 / 최근 느린 쿼리
+_endpoint_stats = {}
+_slow_log = deque(maxlen=SLOW_LOG_SIZE)
+_stats_lock = threading.Lock()
+
+# 요청 밖 측정용 (count_queries) 스레드별 카운터 스택
+_local = threading.local()
+
+
+class _Counter:
+    """측정 구간 1개의 누적값"""
+    __slots__ = ('queries', 'sql_ms', 'objects', 'top')
+
+    def __init__(self):
+        self.queries = 0
+        self.sql_ms = 0.0
+        self.objects = 0
+        self.top = []   # (ms, 순번, sql, params) 최소 힙 - 가장 느린 TOP_STATEMENTS개 유지
+
+    def add_statement(self, ms, statement, parameters):
+        self.queries += 1
+        self.sql_ms += ms
+        entry = (ms, self.queries, statement, parameters)
+        if len(self.top) < TOP_STATEMENTS:
+            heapq.heappush(self.top, entry)
+        elif ms > self.top[0][0]:
+            heapq.heapreplace(self.top, entry)
+
+    def slowest(self):
+        """느린 순 문장 목록 (파라미터는 문자열로 축약)"""
+        return [{'ms': round(ms, 2), 'sql': sql, 'params': _short_repr(params)}
+                for ms, _, sql, params in sorted(self.top, reverse=True)]
+
+
+def _short_repr(value):
+    text = repr(value)
+    return text if len(text) <= PARAM_REPR_MAX else text[:PARAM_REPR_MAX] + '...'
+
+
+def _active_counters():
+    """현재 스레드에서 집계 중인 카운터들 (요청 카운터 + count_queries 블록)"""
+    from flask import g, has_request_context
+    counters = list(getattr(_local, 'stack', ()))
+    if has_request_context():
+        counter = g.get('_prof')
+        if counter is not None:
+            counters.append(counter)
+    return counters
+
+
+# ========================================
+# SQLAlchemy 이벤트 리스너
+# ========================================
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault('_prof_start', []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    starts = conn.info.get('_prof_start')
+    if not starts:
+        return
+    ms = (time.perf_counter() - starts.pop()) * 1000
+    counters = _active_counters()
+    for counter in counters:
+        counter.add_statement(ms, statement, parameters)
+
+    slow_ms = _slow_threshold()
+    if slow_ms is not None and ms >= slow_ms:
+        from flask import has_request_context, request
+        with _stats_lock:
+            _slow_log.append({
+                'endpoint': request.endpoint if has_request_context() else None,
+                'ms': round(ms, 2),
+                'sql': statement,
+                'params': _short_repr(parameters),
+                'at': time.strftime('%Y-%m-%d %H:%M:%S'),
+            })
+
+
+def _on_load(target, context):
+    for counter in _active_counters():
+        counter.objects += 1
+
+
+def _slow_threshold():
+    from flask import current_app, has_app_context
+    if not has_app_context():
+        return None
+    return current_app.config.get('PROFILER_SLOW_MS') or None   # 0이면 느린 쿼리 로그 끔
+
+
+# ========================================
+# 공개 API
+# ========================================
+
+@contextmanager
+def count_queries():
+    """
+    블록 안의 SQL 실행을 측정 (요청 밖 스크립트/테스트용).
+    예) with count_queries() as c: ...  →  c.queries, c.sql_ms, c.objects
+    """
+    stack = getattr(_local, 'stack', None)
+    if stack is None:
+        stack = _local.stack = []
+    counter = _Counter()
+    stack.append(counter)
+    try:
+        yield counter
+    finally:
+        stack.remove(counter)
+
+
+def query_budget(max_queries):
+    """라우트의 요청당 SQL 실행 수 상한 선언 (after_request에서 검사)"""
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            from flask import g
+            g._query_budget = max_queries
+            return view(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def get_profile_stats():
+    """엔드포인트별 통계 (평균 쿼리 수 내림차순) + 최근 느린 쿼리"""
+    with _stats_lock:
+        items = [(ep, dict(st)) for ep, st in _endpoint_stats.items()]
+        slow = list(_slow_log)
+    for _, st in items:
+        n = st['requests'] or 1
+        st['avg_queries'] = round(st['queries'] / n, 2)
+        st['avg_sql_ms'] = round(st['sql_ms'] / n, 2)
+        st['avg_objects'] = round(st['objects'] / n, 2)
+        st['sql_ms'] = round(st['sql_ms'], 2)
+    items.sort(key=lambda x: x[1]['avg_queries'], reverse=True)
+    return {'endpoints': dict(items), 'slow_queries': slow[::-1]}
+
+
+def reset_profile_stats():
+    """누적 통계 초기화"""
+    with _stats_lock:
+        _endpoint_stats.clear()
+        _slow_log.clear()
+
+
+def init_profiler(app):
+    """
+    [v1.7.0] Flask 앱에 프로파일러 연결 (PROFILER_ENABLED=0이면 비활성).
+    요청 시작 시 카운터를 만들고, 응답 시 엔드포인트별 통계 누적 + 예산 검사.
+    """
+    from flask import g, request
+
+    if not app.config.get('PROFILER_ENABLED', True):
+        return
+
+    if not event.contains(Engine, 'before_cursor_execute', _before_cursor_execute):
+        event.listen(Engine, 'before_cursor_execute', _before_cursor_execute)
+        event.listen(Engine, 'after_cursor_execute', _after_cursor_execute)
+        event.listen(db.Model, 'load', _on_load, propagate=True)
+
+    @app.before_request
+    def start_profile():
+        g._prof = _Counter()
+
+    @app.after_request
+    def record_profile(response):
+        counter = g.pop('_prof', None)
+        if counter is None:
+            return response
+
+        endpoint = request.endpoint or 'unknown'
+        commits = g.get('_uow_commits', 0)
+        with _stats_lock:
+            st = _endpoint_stats.setdefault(endpoint, {
+                'requests': 0, 'queries': 0, 'max_queries': 0, 'sql_ms': 0.0,
+                'objects': 0, 'commits': 0, 'slowest': [],
+            })
+            st['requests'] += 1
+            st['queries'] += counter.queries
+            st['max_queries'] = max(st['max_queries'], counter.queries)
+            st['sql_ms'] += counter.sql_ms
+            st['objects'] += counter.objects
+            st['commits'] += commits
+            # 최대 쿼리 요청의 느린 문장 목록 유지
+            if counter.queries >= st['max_queries']:
+                st['slowest'] = counter.slowest()
+
+        if app.config.get('PROFILER_HEADER'):
+            response.headers['X-Query-Count'] = str(counter.queries)
+            response.headers['X-SQL-Time'] = f'{counter.sql_ms:.2f}ms'
+
+        budget = g.get('_query_budget')
+        if budget is not None and counter.queries > budget:
+            message = (f"[쿼리 예산 초과] {endpoint}: {counter.queries}회 > 예산 {budget}회 "
+                       f"(SQL {counter.sql_ms:.1f}ms)")
+            if app.config.get('PROFILER_STRICT'):
+                raise QueryBudgetExceeded(message)
+            app.logger.warning(message)
+        return response
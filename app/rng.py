@@ -0,0 +1,160 @@
+# -*- coding: utf-8 -*-
+"""
+실장석 공원 제국 - 난수 서비스 (rng.py)
+[v1.7.0] 게임 로직의 모든 난수를 이 모듈로 통일 (전역 random 모듈 직접 사용 금지).
+
+스트림 = (월드 시드, 공원 id, 턴 번호, 단계[, 추가 키...])에서 유도한 독립 생성기.
+  with RNG.stream(park.id, park.turn_count, 'food'):
+      RNG.randint(1, 6)   # 이 블록 안의 호출은 해당 스트림에서 추출
+
+- 같은 키 → 같은 난수열: 턴 재현(리플레이), 스칼라/벡터 엔진 비교, 병렬 틱 결과 검증이 가능
+- 단계별로 스트림이 분리돼 한 단계의 난수 사용량이 바뀌어도 다른 단계 결과는 그대로
+- 스트림은 스레드별 스택으로 관리 (잠금 없음), 첫 추출 시에만 생성 (난수를 안 쓰는 단계는 비용 0)
+- 활성 스트림이 없으면(요청 중 행동 등) 스레드별 비결정 생성기 사용
+
+월드 시드: WORLD_SEED 환경변수. 비어 있으면 프로세스 시작 시 무작위 시드
+(공개 저장소의 고정 시드로 결과를 예측할 수 없도록 기본값은 비결정).
+"""
+import hashlib
+import os
+import random as _random
+import threading
+from contextlib import contextmanager
+
+from app.config import GameConfig as GC
+
+_world_seed = GC.WORLD_SEED or os.urandom(16).hex()
+_local = threading.local()
+
+
+def derive_seed(*key):
+    """(월드 시드, *key) → 64비트 정수 시드 (blake2b)"""
+    material = '|'.join(str(k) for k in (_world_seed,) + key).encode('utf-8')
+    return int.from_bytes(hashlib.blake2b(material, digest_size=8).digest(), 'little')
+
+
+def set_world_seed(seed):
+    """월드 시드 교체 (리플레이/검증 스크립트용). None이면 새 무작위 시드"""
+    global _world_seed
+    _world_seed = str(seed) if seed is not None else os.urandom(16).hex()
+
+
+class _LazyStream:
+    """키만 들고 있다가 첫 추출 때 생성기를 만든다"""
+    __slots__ = ('key', '_gen')
+
+    def __init__(self, key):
+        self.key = key
+        self._gen = None
+
+    def generator(self):
+        if self._gen is None:
+            self._gen = _random.Random(derive_seed(*self.key))
+        return self._gen
+
+
+@contextmanager
+def stream(*key):
+    """블록 동안 현재 스레드의 난수를 key로 유도한 스트림에서 추출 (중첩 가능)"""
+    stack = _local.__dict__.setdefault('stack', [])
+    entry = _LazyStream(key)
+    stack.append(entry)
+    try:
+        yield entry
+    finally:
+        stack.pop()
+
+
+def _current():
+    stack = getattr(_local, 'stack', None)
+    if stack:
+        return stack[-1].generator()
+    default = getattr(_local, 'default', None)
+    if default is None:
+        default = _local.default = _random.Random()
+    return default
+
+
+# ========================================
+# random 모듈 호환 함수 (현재 스트림에서 추출)
+# ========================================
+
+def random():
+    return _current().random()
+
+
+def randint(a, b):
+    return _current().randint(a, b)
+
+
+def randrange(*args):
+    return _current().randrange(*args)
+
+
+def uniform(a, b):
+    return _current().uniform(a, b)
+
+
+def choice(seq):
+    return _current().choice(seq)
+
+
+def sample(population, k):
+    return _current().sample(population, k)
+
+
+def shuffle(x):
+    _current().shuffle(x)
+
+
+# 이 수 이하의 시행은 그대로 반복하는 편이 집계 추출보다 빠르다 (결과 분포는 어느 쪽이든 동일)
+_SMALL_N = 16
+
+
+def binomial(n, p):
+    """이항분포 B(n, p) 1회 추출 (random() < p 를 n번 세는 것과 같은 분포, 비용은 n과 무관)"""
+    if n <= 0 or p <= 0:
+        return 0
+    if p >= 1:
+        return n
+    gen = _current()
+    if n <= _SMALL_N:
+        return sum(1 for _ in range(n) if gen.random() < p)
+    if hasattr(gen, 'binomialvariate'):  # Python 3.12+
+        return gen.binomialvariate(n, p)
+    import numpy as np
+    return int(np.random.default_rng(gen.getrandbits(64)).binomial(n, p))
+
+
+def randint_sum(n, a, b):
+    """
+    randint(a, b)를 n번 더한 값과 같은 분포.
+    값마다 나온 횟수를 조건부 이항분포로 차례로 추출 (다항분포) → 비용 O(b - a), n과 무관.
+    """
+    if n <= 0:
+        return 0
+    if n <= _SMALL_N:
+        gen = _current()
+        return sum(gen.randint(a, b) for _ in range(n))
+
+    total = 0
+    remaining = n
+    slots = b - a + 1
+    for value in range(a, b + 1):
+        count = remaining if slots == 1 else binomial(remaining, 1 / slots)
+        total += value * count
+        remaining -= count
+        slots -= 1
+        if remaining == 0:
+            break
+    return total
+
+
+# ========================================
+# NumPy (벡터 엔진용)
+# ========================================
+
+def numpy_generator(*key):
+    """key로 유도한 카운터 기반 NumPy 생성기 (Philox)"""
+    import numpy as np
+    return np.random.Generator(np.random.Philox(key=derive_seed(*key)))
@@ -3,20 +3,36 @@
 실장석 공원 제국 - 게임 라우트 (game_routes.py)
 [v0.1.0] 대시보드, 채집, 건설, 출산, 솎아내기, 훈련 등 게임 행동 처리.
 """
-from flask import Blueprint, render_template, redirect, url_for, flash, request, jsonify
+import hashlib
+import time
+
+from flask import (Blueprint, render_template, redirect, url_for, flash, request, jsonify,
+                   session, current_app, make_response)
+from markupsafe import Markup
 from flask_login import login_required, current_user
+from flask_wtf.csrf import generate_csrf
 
 from app.models import db, Park, EventLog
 from app.config import GameConfig as GC
 from app import game_engine
 from app import dialogues as DLG
-from app.i18n import get_text
+from app import unit_of_work as UOW
+from app import profiler
+from app import event_buffer
+from app import leaderboard
+from app import fragment_cache
+from app import event_text
+from app import db_profile
+from app import row_lock
+from app.i18n import get_text, get_current_lang
 
 game_bp = Blueprint('game', __name__, url_prefix='/game')
 
 
 @game_bp.route('/dashboard')
 @login_required
+@profiler.query_budget(12)
+@UOW.transactional
 def dashboard():
     """메인 대시보드 - 공원 현황 표시"""
     park = current_user.park
@@ -43,38 +59,104 @@ def dashboard():
     # [v1.3.0] 보호 모드 정보
     protect_info = game_engine.get_protection_info(park)
 
-    # 최근 이벤트 로그 (최신 10개)
-    recent_logs = EventLog.query.filter_by(park_id=park.id) \
-        .order_by(EventLog.created_at.desc()).limit(10).all()
+    # [v1.7.0] 이번 요청에서 공원이 바뀌었으면(충전/보호 리셋) 아직 커밋 전이므로 캐시를 쓰지 않는다
+    changed = bool(db.session.new or db.session.dirty or event_buffer.pending_count())
+
+    # [v1.7.0] 다른 공원 목록은 랭킹 스냅샷 기준 (월드 틱마다 갱신, 공원 전체 조회 없음)
+    snapshot = leaderboard.get_snapshot()
+    lang = get_current_lang()
+    etag = None
+    if not changed:
+        etag = _dashboard_etag(park, lang, snapshot)
+        # 보여줄 플래시 메시지가 없을 때만 304 (브라우저가 가진 화면을 그대로 사용)
+        if not session.get('_flashes') and request.if_none_match.contains(etag):
+            response = current_app.response_class(status=304)
+            return _with_etag(response, etag)
+
+    can_attack = not (park.action_points < 2 and park.turn_quota < 1)
+    show_power = park.watchtowers > 0
+
+    def render_parks():
+        return render_template('dashboard_parks.html',
+                               other_parks=snapshot.parks_except(park.id),
+                               show_power=show_power,
+                               attack_disabled=not can_attack)
+
+    def render_body():
+        # 최근 이벤트 로그 (최신 10개)
+        recent_logs = EventLog.query.filter_by(park_id=park.id) \
+            .order_by(EventLog.created_at.desc()).limit(10).all()
+
+        # 건설/훈련 대기열
+        building_queue = park.build_queue
+        training_queue = park.train_queue
+
+        # 인사말
+        greeting = DLG.get_random_dialogue(DLG.table(lang).DASHBOARD_GREETING)
+
+        # NPC 공원 목록 (전투/정찰용) [v1.7.0] 별도 조각
+        if changed:
+            parks_html = render_parks()
+        else:
+            parks_html = fragment_cache.get_or_render(
+                'dashboard_parks', park.id,
+                (snapshot.generation, lang, show_power, can_attack), render_parks)
+
+        return render_template('dashboard_body.html',
+                               park=park,
+                               turn_info=turn_info,
+                               protect_info=protect_info,
+                               recent_logs=recent_logs,
+                               building_queue=building_queue,
+                               training_queue=training_queue,
+                               greeting=greeting,
+                               parks_html=Markup(parks_html),
+                               buildings=GC.BUILDINGS,
+                               GC=GC)
+
+    if changed:
+        body_html = render_body()
+    else:
+        body_html = fragment_cache.get_or_render(
+            'dashboard', park.id, _dashboard_key(park, lang, snapshot), render_body)
 
-    # 건설/훈련 대기열
-    building_queue = park.build_queue
-    training_queue = park.train_queue
+    response = make_response(render_template('dashboard.html', park=park,
+                                             body_html=Markup(body_html)))
+    if etag is not None:
+        _with_etag(response, etag)
+    return response
 
-    # 인사말
-    greeting = DLG.get_random_dialogue(DLG.DASHBOARD_GREETING)
 
-    # NPC 공원 목록 (전투/정찰용)
-    other_parks = Park.query.filter(
-        Park.id != park.id,
-        Park.is_destroyed == False
-    ).all()
+def _dashboard_key(park, lang, snapshot):
+    """[v1.7.0] 대시보드 본문 캐시 키 (공원 생성 시각: 재시작으로 id가 재사용돼도 구분)"""
+    return (park.created_at, park.state_version, lang, snapshot.generation)
+
+
+def _dashboard_etag(park, lang, snapshot):
+    """
+    [v1.7.0] 대시보드 ETag: 본문 키 + 페이지 틀(base.html)에 들어가는 세션별 값.
+    CSRF 토큰은 세션별이고 만료 시간이 있으므로, 세션 토큰과 만료 시간 절반 단위 시간 구간을 포함해
+    만료된 토큰이 든 화면이 304로 재사용되지 않게 한다.
+    세션 토큰은 먼저 만들어 둔다 (첫 방문에서 렌더링 중 생기면 다음 요청의 ETag와 어긋남).
+    """
+    generate_csrf()
+    time_limit = current_app.config.get('WTF_CSRF_TIME_LIMIT', 3600)
+    window = int(time.time() // max(1, time_limit // 2)) if time_limit else 0
+    raw = '|'.join(str(v) for v in (park.id, *_dashboard_key(park, lang, snapshot),
+                                    session.get('csrf_token', ''), window))
+    return hashlib.blake2b(raw.encode('utf-8'), digest_size=12).hexdigest()
 
-    return render_template('dashboard.html',
-                           park=park,
-                           turn_info=turn_info,
-                           protect_info=protect_info,
-                           recent_logs=recent_logs,
-                           building_queue=building_queue,
-                           training_queue=training_queue,
-                           greeting=greeting,
-                           other_parks=other_parks,
-                           buildings=GC.BUILDINGS,
-                           GC=GC)
+
+def _with_etag(response, etag):
+    """ETag + 매번 재검증 (private: 공유 캐시 저장 금지)"""
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'private, no-cache'
+    return response
 
 
 @game_bp.route('/gather', methods=['POST'])
 @login_required
+@UOW.transactional
 def gather():
     """채집 행동 실행 [v1.2.0] 턴 1개 소비"""
     park = current_user.park
@@ -107,6 +189,7 @@ def gather():
 
 @game_bp.route('/cull', methods=['POST'])
 @login_required
+@UOW.transactional
 def cull():
     """솎아내기 (도살) 행동"""
     park = current_user.park
@@ -126,6 +209,7 @@ def cull():
 
 @game_bp.route('/birth', methods=['POST'])
 @login_required
+@UOW.transactional
 def birth():
     """출산 행동 [v1.2.0] 턴 1개 소비"""
     park = current_user.park
@@ -152,6 +236,7 @@ def birth():
 
 @game_bp.route('/build', methods=['POST'])
 @login_required
+@UOW.transactional
 def build():
     """건설 행동 [v1.2.0] 턴 1개 소비"""
     park = current_user.park
@@ -174,6 +259,7 @@ def build():
 
 @game_bp.route('/train', methods=['POST'])
 @login_required
+@UOW.transactional
 def train():
     """훈련 행동 [v1.2.0] 턴 1개 소비"""
     park = current_user.park
@@ -195,10 +281,14 @@ def train():
 
 @game_bp.route('/attack', methods=['POST'])
 @login_required
+@UOW.transactional
 def attack():
     """침공 행동 [v1.2.0] 턴 1개 소비 [v0.4.0] 동맹 차단 + 적대 약탈 보너스"""
     park = current_user.park
 
+    # [v1.7.0] 내 공원과 대상 공원 행 잠금 (AP 차감부터 약탈까지 한 트랜잭션, PostgreSQL)
+    row_lock.lock_parks(park.id, request.form.get('target_id', 0, type=int))
+
     # [v1.6.0] AP 소비 + 필요 시 턴 자동 진행 (침공=2AP)
     turn_ok, turn_msgs = game_engine.consume_turn(park, ap_cost=2)
     if not turn_ok:
@@ -248,6 +338,7 @@ def attack():
     # [v1.6.0] AP는 consume_turn에서 이미 차감됨
 
     from app.battle_engine import execute_battle
+    from app import park_stats
     won, loot, messages = execute_battle(park, target,
                                           send_guards=send_guards,
                                           send_adults=send_adults,
@@ -276,7 +367,8 @@ def attack():
             target.konpeito = max(0, target.konpeito - bonus_k)
             target.trash_food = max(0, target.trash_food - bonus_t)
             target.material = max(0, target.material - bonus_m)
-            db.session.commit()
+            park_stats.add_loot(park.id, target.id, bonus_k + bonus_t + bonus_m)
+            UOW.commit()
             messages.append(get_text('flash.enemy_bonus', k=bonus_k, t=bonus_t, m=bonus_m))
 
     for msg in messages:
@@ -294,6 +386,7 @@ def attack():
 
 @game_bp.route('/defend', methods=['POST'])
 @login_required
+@UOW.transactional
 def defend():
     """방어 배치 행동 (1 AP)"""
     park = current_user.park
@@ -312,7 +405,7 @@ def defend():
     park.action_points -= 1
     park.defending_guards = num_guards
     park.defending_adults = num_adults
-    db.session.commit()
+    UOW.commit()
 
     flash(get_text('flash.defend_deploy', guards=num_guards, adults=num_adults), 'success')
     return redirect(url_for('game.dashboard'))
@@ -321,15 +414,141 @@ def defend():
 @game_bp.route('/battle-logs')
 @login_required
 def battle_logs():
-    """전투 기록 조회"""
+    """
+    전투 기록 조회
+    [v1.7.0] 키셋 페이지네이션 (?cursor=, ?opponent=상대 공원 id) - 페이지 깊이와 무관하게 인덱스 범위 탐색
+    """
+    from sqlalchemy.orm import joinedload, undefer
+    from app.models import BattleLog
+    from app import history
+
+    park = current_user.park
+    opponent_id = request.args.get('opponent', type=int)
+    options = (undefer(BattleLog.log_text),
+               joinedload(BattleLog.attacker).load_only(Park.id, Park.name),
+               joinedload(BattleLog.defender).load_only(Park.id, Park.name))
+    try:
+        logs, next_cursor = history.battle_page(park.id, request.args.get('cursor'),
+                                                opponent_id=opponent_id, options=options)
+    except history.InvalidCursor:
+        # 잘못된/오래된 링크 → 첫 페이지
+        logs, next_cursor = history.battle_page(park.id, opponent_id=opponent_id, options=options)
+
+    return render_template('battle_logs.html', park=park, logs=logs,
+                           next_cursor=next_cursor, opponent_id=opponent_id)
+
+
+def _park_names(park_ids):
+    """공원 id → 이름 (1회 조회, 삭제된 공원은 빠짐)"""
+    if not park_ids:
+        return {}
+    return dict(db.session.query(Park.id, Park.name).filter(Park.id.in_(park_ids)).all())
+
+
+def _battle_log_item(log, park_id, names):
+    """전투 기록 목록 항목 (본문 log_text 제외 - /api/battle-logs/<id>에서 조회)"""
+    is_attacker = log.attacker_id == park_id
+    opponent_id = log.defender_id if is_attacker else log.attacker_id
+    return {
+        'id': log.id,
+        'created_at': log.created_at.isoformat(),
+        'role': 'attacker' if is_attacker else 'defender',
+        'opponent_id': opponent_id,
+        'opponent_name': names.get(opponent_id),
+        'result': log.result,
+        'won': (log.result == 'win') == is_attacker,
+        'loot': log.loot,
+        'attacker_losses': log.attacker_losses,
+        'defender_losses': log.defender_losses,
+    }
+
+
+@game_bp.route('/api/battle-logs')
+@login_required
+def api_battle_logs():
+    """
+    [v1.7.0] 전투 기록 API (키셋 페이지네이션).
+    ?cursor= (이전 응답의 next_cursor) &limit= (기본 HISTORY_PAGE_SIZE) &opponent=상대 공원 id
+    응답: {'items': [...], 'next_cursor': 다음 페이지 커서 또는 null}
+    """
+    from app import history
+
     park = current_user.park
+    if not park:
+        return jsonify({'error': get_text('flash.no_park')}), 404
+
+    try:
+        logs, next_cursor = history.battle_page(
+            park.id, request.args.get('cursor'),
+            limit=request.args.get('limit', type=int),
+            opponent_id=request.args.get('opponent', type=int))
+    except history.InvalidCursor:
+        return jsonify({'error': 'invalid cursor'}), 400
+
+    names = _park_names({log.attacker_id for log in logs} | {log.defender_id for log in logs})
+    return jsonify({
+        'items': [_battle_log_item(log, park.id, names) for log in logs],
+        'next_cursor': next_cursor,
+    })
+
+
+@game_bp.route('/api/battle-logs/<int:log_id>')
+@login_required
+def api_battle_log_detail(log_id):
+    """[v1.7.0] 전투 기록 상세 (본문 포함) - 공격자/방어자 본인만"""
+    from sqlalchemy.orm import joinedload, undefer
     from app.models import BattleLog
 
-    logs = BattleLog.query.filter(
-        db.or_(BattleLog.attacker_id == park.id, BattleLog.defender_id == park.id)
-    ).order_by(BattleLog.created_at.desc()).limit(20).all()
+    park = current_user.park
+    log = BattleLog.query.options(
+        undefer(BattleLog.log_text),
+        joinedload(BattleLog.attacker).load_only(Park.id, Park.name),
+        joinedload(BattleLog.defender).load_only(Park.id, Park.name)).get(log_id)
+    if not park or not log or park.id not in (log.attacker_id, log.defender_id):
+        return jsonify({'error': 'not found'}), 404
+
+    names = {p.id: p.name for p in (log.attacker, log.defender) if p is not None}
+    item = _battle_log_item(log, park.id, names)
+    item['log_text'] = log.text()
+    return jsonify(item)
+
+
+@game_bp.route('/api/events')
+@login_required
+def api_events():
+    """
+    [v1.7.0] 이벤트 기록 API (키셋 페이지네이션).
+    ?cursor= &limit= &type=battle&type=trade (또는 type=battle,trade, 최대 HISTORY_MAX_EVENT_TYPES개)
+    """
+    from app import history
+
+    park = current_user.park
+    if not park:
+        return jsonify({'error': get_text('flash.no_park')}), 404
+
+    event_types = [t for arg in request.args.getlist('type') for t in arg.split(',') if t]
+    if len(event_types) > GC.HISTORY_MAX_EVENT_TYPES:
+        return jsonify({'error': f'too many types (max {GC.HISTORY_MAX_EVENT_TYPES})'}), 400
+
+    try:
+        events, next_cursor = history.event_page(
+            park.id, request.args.get('cursor'),
+            limit=request.args.get('limit', type=int),
+            event_types=event_types)
+    except history.InvalidCursor:
+        return jsonify({'error': 'invalid cursor'}), 400
 
-    return render_template('battle_logs.html', park=park, logs=logs)
+    lang = get_current_lang()
+    return jsonify({
+        'items': [{
+            'id': evt.id,
+            'type': evt.event_type,
+            'message': evt.text(lang),
+            'turn': evt.turn_number,
+            'created_at': evt.created_at.isoformat(),
+        } for evt in events],
+        'next_cursor': next_cursor,
+    })
 
 
 @game_bp.route('/debug/next-turn', methods=['POST'])
@@ -345,11 +564,42 @@ def debug_next_turn():
         return redirect(url_for('game.dashboard'))
 
     park = current_user.park
-    force_process_turn(current_app._get_current_object(), park.id)
+    park_id = park.id
+    # [v1.7.0] 턴 처리는 별도 앱 컨텍스트(세션)에서 실행 → 요청 트랜잭션(BEGIN IMMEDIATE 쓰기 락)을 먼저 끝낸다
+    db.session.commit()
+    force_process_turn(current_app._get_current_object(), park_id)
     flash(get_text('flash.debug_turn', turn=park.turn_count), 'info')
     return redirect(url_for('game.dashboard'))
 
 
+@game_bp.route('/debug/commit-stats')
+@login_required
+def debug_commit_stats():
+    """[v1.7.0] 디버그: 엔드포인트별 요청당 커밋 횟수 통계 (DEBUG 모드 전용)"""
+    from flask import current_app
+
+    if not current_app.config.get('DEBUG', False):
+        return jsonify({'error': 'debug mode only'}), 404
+    return jsonify(UOW.get_commit_stats())
+
+
+@game_bp.route('/debug/profile')
+@login_required
+def debug_profile():
+    """[v1.7.0] 디버그: 엔드포인트별 SQL 실행 수/시간/로드 객체 수 + 느린 쿼리 (DEBUG 모드 전용)"""
+    from flask import current_app
+
+    if not current_app.config.get('DEBUG', False):
+        return jsonify({'error': 'debug mode only'}), 404
+    if request.args.get('reset'):
+        profiler.reset_profile_stats()
+    stats = profiler.get_profile_stats()
+    stats['fragment_cache'] = fragment_cache.get_stats()  # [v1.7.0] 대시보드 조각 캐시 적중률
+    stats['event_text'] = event_text.cache_info()        # [v1.7.0] 이벤트 문장 렌더링 메모이즈
+    stats['db'] = db_profile.describe()                   # [v1.7.0] DB 엔진 프로필
+    return jsonify(stats)
+
+
 @game_bp.route('/restart', methods=['POST'])
 @login_required
 def restart():
@@ -362,10 +612,12 @@ def restart():
 
     # 기존 공원의 정보 보존
     old_name = park.name
+    old_id = park.id
 
     # 기존 공원 삭제 (cascade로 큐/이벤트 같이 삭제됨)
     db.session.delete(park)
     db.session.commit()
+    fragment_cache.discard(old_id)  # [v1.7.0] 옛 공원 화면 조각 정리
 
     # 새 공원 생성 (Park 모델의 default 값이 자동 적용됨)
     new_park = Park(
@@ -389,6 +641,56 @@ def park_status():
     return jsonify(park.to_dict())
 
 
+@game_bp.route('/api/battle-forecast')
+@login_required
+def battle_forecast():
+    """
+    [v1.7.0] 전투 예측 API (몬테카를로, 상태 변경·AP 소비 없음).
+    ?target_id=3&target_id=7 (여러 개 가능) &send_guards=&send_adults= (생략 시 가용 전원)
+    &boss_joins=1 &samples= (기본 FORECAST_SAMPLES)
+    상대 병력 구성이 결과에 드러나므로 정찰 상세 정보와 같이 감시탑이 있어야 사용 가능.
+    """
+    park = current_user.park
+    if not park:
+        return jsonify({'error': get_text('flash.no_park')}), 404
+    if park.watchtowers <= 0:
+        return jsonify({'error': '🗼 감시탑이 있어야 전투를 예측할 수 있는 데스!'}), 403
+
+    try:
+        import numpy  # battle_sim.simulate에 필요
+    except ImportError:
+        return jsonify({'error': 'battle forecast unavailable (numpy required)'}), 503
+    from app import battle_sim
+
+    target_ids = request.args.getlist('target_id', type=int)[:GC.FORECAST_MAX_TARGETS]
+    send_guards = request.args.get('send_guards', type=int)
+    send_adults = request.args.get('send_adults', type=int)
+    boss_joins = request.args.get('boss_joins') in ('1', 'on', 'true')
+    samples = request.args.get('samples', GC.FORECAST_SAMPLES, type=int)
+    samples = max(1, min(samples, GC.FORECAST_MAX_SAMPLES))
+
+    targets = {}
+    if target_ids:
+        targets = {t.id: t for t in Park.query.filter(Park.id.in_(target_ids)).all()}
+
+    forecasts = []
+    for target_id in target_ids:
+        target = targets.get(target_id)
+        if not target or target.is_destroyed or target.id == park.id:
+            forecasts.append({'target_id': target_id, 'error': get_text('flash.invalid_target')})
+            continue
+        result = battle_sim.forecast(park, target, send_guards, send_adults, boss_joins,
+                                     samples=samples)
+        if result is None:
+            forecasts.append({'target_id': target_id, 'error': get_text('flash.attack_min_unit')})
+            continue
+        result['target_id'] = target_id
+        result['protected'] = game_engine.is_protected(target)
+        forecasts.append(result)
+
+    return jsonify({'forecasts': forecasts})
+
+
 # ============================================================
 # [v0.4.0] Phase 5: 실시간 알림 API
 # ============================================================
@@ -399,39 +701,118 @@ def notifications():
     """
     알림 API - 최근 이벤트 중 중요 알림(침공, 교역, 외교) 반환.
     클라이언트가 last_id를 전달하면 그 이후의 알림만 반환.
+    [v1.7.0] wait=초 를 주면 롱폴링: 새 알림이 없을 때 알림 허브에서 대기 후 응답
+    (최대 NOTIFY_WAIT_SECONDS, 대기 중 DB 조회 없음)
+    대기 연결이 NOTIFY_MAX_WAITERS개 차 있으면 기다리지 않고 바로 응답하며,
+    retry(초)와 Retry-After로 다음 폴링 간격을 알린다 (요청 스레드를 일반 요청용으로 남김)
     """
     park = current_user.park
     if not park:
         return jsonify({'notifications': []})
 
+    park_id = park.id
     last_id = request.args.get('last_id', 0, type=int)
+    wait = min(max(request.args.get('wait', 0, type=int), 0), GC.NOTIFY_WAIT_SECONDS)
+
+    if not wait:
+        return jsonify({'notifications': _fetch_notifications(park_id, last_id)})
+
+    from app import notify_hub
+    with notify_hub.subscription(park_id, GC.NOTIFY_MAX_WAITERS) as channel:
+        if channel is None:
+            response = jsonify({'notifications': _fetch_notifications(park_id, last_id),
+                                'retry': GC.NOTIFY_POLL_SECONDS})
+            response.headers['Retry-After'] = str(GC.NOTIFY_POLL_SECONDS)
+            return response
+        seen = channel.version
+        result = _fetch_notifications(park_id, last_id)
+        if not result:
+            # 대기 중에는 DB 커넥션/읽기 트랜잭션을 잡고 있지 않는다
+            db.session.close()
+            channel.wait(seen, wait)
+            result = _fetch_notifications(park_id, last_id)
+
+    return jsonify({'notifications': result})
+
+
+@game_bp.route('/api/notifications/stream')
+@login_required
+def notifications_stream():
+    """
+    [v1.7.0] 알림 SSE 스트림 (text/event-stream).
+    알림 허브에서 대기하다 깨어났을 때만 DB를 조회해 이벤트를 보낸다.
+    유휴 상태에서는 NOTIFY_WAIT_SECONDS마다 keepalive 주석만 전송하고,
+    NOTIFY_STREAM_SECONDS가 지나면 연결을 닫는다 (EventSource가 Last-Event-ID로 자동 재연결).
+    대기 연결이 NOTIFY_MAX_WAITERS개 차 있으면 204 (EventSource는 재연결하지 않음 → 대시보드가 폴링으로 전환).
+    구독은 응답이 닫힐 때 해제한다 (제너레이터가 시작되기 전에 연결이 끊겨도 자리가 남지 않도록).
+    """
+    from flask import Response, stream_with_context
+    import json
+    import time
+    from app import notify_hub
 
-    # 중요 이벤트 타입만 필터 (battle, trade, diplomacy)
-    important_types = ['battle', 'trade', 'diplomacy']
+    park = current_user.park
+    if not park:
+        return Response(status=204)
+
+    park_id = park.id
+    last_id = request.headers.get('Last-Event-ID', type=int) \
+        or request.args.get('last_id', 0, type=int)
+    lang = get_current_lang()
+    db.session.close()
+
+    channel = notify_hub.subscribe(park_id, GC.NOTIFY_MAX_WAITERS)
+    if channel is None:
+        return Response(status=204, headers={'Retry-After': str(GC.NOTIFY_POLL_SECONDS)})
+
+    def generate():
+        cursor = last_id
+        deadline = time.monotonic() + GC.NOTIFY_STREAM_SECONDS
+        # 재연결 간격 안내 (ms)
+        yield 'retry: 3000\n\n'
+        while time.monotonic() < deadline:
+            seen = channel.version
+            for notif in _fetch_notifications(park_id, cursor, lang=lang):
+                cursor = notif['id']
+                yield f"id: {cursor}\ndata: {json.dumps(notif, ensure_ascii=False)}\n\n"
+            db.session.close()
+            if channel.wait(seen, GC.NOTIFY_WAIT_SECONDS) == seen:
+                yield ': keepalive\n\n'
+
+    response = Response(stream_with_context(generate()), mimetype='text/event-stream',
+                        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+    response.call_on_close(lambda: notify_hub.unsubscribe(park_id, channel))
+    return response
+
+
+def _fetch_notifications(park_id, last_id, limit=10, lang=None):
+    """
+    last_id 이후 중요 알림 조회 (ix_event_logs_park_type_id 사용)
+    [v1.7.0] 메시지는 lang으로 렌더링 (app/event_text.py)
+    """
     events = EventLog.query.filter(
-        EventLog.park_id == park.id,
+        EventLog.park_id == park_id,
         EventLog.id > last_id,
-        EventLog.event_type.in_(important_types)
-    ).order_by(EventLog.id.asc()).limit(10).all()
-
-    notifications = []
-    for evt in events:
-        notifications.append({
-            'id': evt.id,
-            'type': evt.event_type,
-            'message': evt.message,
-            'turn': evt.turn_number,
-        })
+        EventLog.event_type.in_(GC.NOTIFY_TYPES)
+    ).order_by(EventLog.id.asc()).limit(limit).all()
 
-    return jsonify({'notifications': notifications})
+    return [{
+        'id': evt.id,
+        'type': evt.event_type,
+        'message': evt.text(lang),
+        'turn': evt.turn_number,
+    } for evt in events]
 
 
 @game_bp.route('/ranking')
 @login_required
+@profiler.query_budget(10)
 def ranking():
-    """랭킹 페이지 - 전투력/인구/승수/자원 순위"""
-    from app.models import BattleLog
-    from sqlalchemy import func
+    """
+    랭킹 페이지 - 전투력/인구/승수/자원 순위
+    [v1.7.0] 월드 틱마다 갱신되는 메모리 스냅샷에서 제공 (요청당 쿼리 0~1회)
+    """
+    from app import leaderboard
 
     park = current_user.park
     sort_by = request.args.get('sort', 'power')
@@ -445,66 +826,20 @@ def ranking():
     }
     sort_label = sort_labels.get(sort_by, '⚔️ 전투력')
 
-    # 모든 비멸망 공원 조회
-    all_parks = Park.query.filter_by(is_destroyed=False).all()
-
-    # 각 공원의 승/패 수 계산
-    win_counts = {}
-    loss_counts = {}
-    for p in all_parks:
-        wins = BattleLog.query.filter_by(attacker_id=p.id, result='win').count()
-        wins += BattleLog.query.filter_by(defender_id=p.id, result='lose').count()
-        losses = BattleLog.query.filter_by(attacker_id=p.id, result='lose').count()
-        losses += BattleLog.query.filter_by(defender_id=p.id, result='win').count()
-        win_counts[p.id] = wins
-        loss_counts[p.id] = losses
-
-    # NPC 성격 이모지
-    personality_emojis = {
-        'aggressive': '🗡️',
-        'defensive': '🛡️',
-        'peaceful': '🌿',
-        'cunning': '🎭',
-        'berserk': '💀',
-    }
-
-    # 랭킹 데이터 조립
-    rankings = []
-    for p in all_parks:
-        rankings.append({
-            'park': p,
-            'wins': win_counts.get(p.id, 0),
-            'losses': loss_counts.get(p.id, 0),
-            'personality_emoji': personality_emojis.get(p.npc_personality, ''),
-        })
-
-    # 정렬
-    if sort_by == 'power':
-        rankings.sort(key=lambda x: x['park'].total_combat_power, reverse=True)
-    elif sort_by == 'population':
-        rankings.sort(key=lambda x: x['park'].total_population, reverse=True)
-    elif sort_by == 'wins':
-        rankings.sort(key=lambda x: x['wins'], reverse=True)
-    elif sort_by == 'resources':
-        rankings.sort(key=lambda x: x['park'].total_np_available, reverse=True)
-
-    # 내 공원 순위 계산
-    power_sorted = sorted(all_parks, key=lambda p: p.total_combat_power, reverse=True)
-    pop_sorted = sorted(all_parks, key=lambda p: p.total_population, reverse=True)
-    my_power_rank = next((i+1 for i, p in enumerate(power_sorted) if p.id == park.id), 0)
-    my_pop_rank = next((i+1 for i, p in enumerate(pop_sorted) if p.id == park.id), 0)
+    snapshot = leaderboard.get_snapshot()
+    my_wins, my_losses = snapshot.record_of(park.id)
 
     return render_template('ranking.html',
                            park=park,
-                           rankings=rankings,
+                           rankings=snapshot.ordered(sort_by),
                            sort_by=sort_by,
                            sort_label=sort_label,
                            my_park_id=park.id,
-                           total_parks=len(all_parks),
-                           my_power_rank=my_power_rank,
-                           my_pop_rank=my_pop_rank,
-                           my_wins=win_counts.get(park.id, 0),
-                           my_losses=loss_counts.get(park.id, 0))
+                           total_parks=snapshot.total,
+                           my_power_rank=snapshot.rank_of(park.id, 'power'),
+                           my_pop_rank=snapshot.rank_of(park.id, 'population'),
+                           my_wins=my_wins,
+                           my_losses=my_losses)
 
 
 @game_bp.route('/scout/<int:target_id>')
@@ -556,6 +891,7 @@ def scout(target_id):
 
 @game_bp.route('/trade')
 @login_required
+@profiler.query_budget(10)
 def trade_market():
     """교역 시장 - 공개 교역 목록 및 내게 온 제안 표시"""
     from app.models import TradeOffer, Diplomacy
@@ -629,6 +965,9 @@ def trade_create():
     if not park or park.is_destroyed:
         return redirect(url_for('game.dashboard'))
 
+    # [v1.7.0] 내 공원 행 잠금: 동시 등록 요청이 아래 개수 제한을 함께 통과하지 않도록 (PostgreSQL)
+    row_lock.lock_parks(park.id)
+
     # [v1.6.2] 유저당 동시 교역 제한 — 교역 스팸 DoS 방지
     pending_count = TradeOffer.query.filter_by(
         sender_id=park.id, status='pending'
@@ -659,8 +998,13 @@ def trade_create():
     request_babies = max(0, request_babies)
 
     # [v1.5.1] 교역 메시지 XSS 방지 — HTML 특수문자 이스케이프
+    # [v1.7.0] 이스케이프 후에도 컬럼 길이(200) 이내 (PostgreSQL은 초과 시 INSERT 실패)
     import html as html_lib
-    msg = html_lib.escape(request.form.get('trade_message', '')[:200])
+    raw_msg = request.form.get('trade_message', '')[:200]
+    msg = html_lib.escape(raw_msg)
+    while len(msg) > 200:
+        raw_msg = raw_msg[:-1]
+        msg = html_lib.escape(raw_msg)
 
     # 검증: 최소 하나는 제안하고, 최소 하나는 요청해야 함
     total_offer = offer_konpeito + offer_trash + offer_material + offer_babies
@@ -729,6 +1073,7 @@ def trade_accept(trade_id):
     # [v1.5.0] Double Spend 방지: 원자적 UPDATE-WHERE로 동시 수락 차단
     # SQLite 파일 락이 UPDATE 문 단위로 걸리므로, WHERE 조건에 status를 넣으면
     # 경쟁 조건(Race Condition)이 DB 레벨에서 차단됨
+    # [v1.7.0] PostgreSQL: UPDATE가 교역 행을 잠그고, 뒤따른 요청은 대기 후 WHERE를 다시 평가 → 0건
     updated = TradeOffer.query.filter_by(
         id=trade_id, status='pending'
     ).update({'status': 'processing'})
@@ -741,6 +1086,9 @@ def trade_accept(trade_id):
 
     trade = TradeOffer.query.get(trade_id)
 
+    # [v1.7.0] 수락자/발송자 공원 행 잠금 (교역 행 다음, id 순서) - 보유량 확인과 교환을 최신 값으로
+    row_lock.lock_parks(park.id, trade.sender_id)
+
     # 자기 자신의 제안은 수락 불가
     if trade.sender_id == park.id:
         trade.status = 'pending'  # 원복
@@ -816,13 +1164,15 @@ def trade_reject(trade_id):
     from app.models import TradeOffer
     from datetime import datetime
     park = current_user.park
-    trade = TradeOffer.query.get(trade_id)
+    # [v1.7.0] 교역 행 잠금 후 상태 확인 (동시 수락/취소와의 중복 환불 방지, PostgreSQL)
+    trade = row_lock.lock_trade(trade_id)
     if not trade or trade.status != 'pending':
         flash(get_text('flash.trade_already'), 'error')
         return redirect(url_for('game.trade_market'))
 
     # [v1.6.3] 에스크로 환불: 거절 시 발송자에게 자원 반환
     # 이전 버전에서 누락 → 거절 = 자원 소멸 (합법적 경제 테러)
+    row_lock.lock_parks(trade.sender_id)
     sender = Park.query.get(trade.sender_id)
     if sender and not sender.is_destroyed:
         sender.konpeito = min(sender.konpeito + trade.offer_konpeito, sender.konpeito_cap)
@@ -858,6 +1208,8 @@ def trade_cancel(trade_id):
         return redirect(url_for('game.trade_market'))
 
     # 원자적 업데이트 성공 후 환불 (1번만 실행됨)
+    # [v1.7.0] 환불 전 내 공원 행 잠금 (같은 공원의 다른 쓰기와 덮어쓰기 방지, PostgreSQL)
+    row_lock.lock_parks(park.id)
     trade = TradeOffer.query.get(trade_id)
     park.konpeito = min(park.konpeito + trade.offer_konpeito, park.konpeito_cap)
     park.trash_food = min(park.trash_food + trade.offer_trash, park.trash_food_cap)
@@ -956,6 +1308,7 @@ def diplomacy_reject(diplo_id):
 
 @game_bp.route('/diplomacy/enemy/<int:target_id>', methods=['POST'])
 @login_required
+@UOW.transactional
 def diplomacy_enemy(target_id):
     """적대 선언 (일방적, 즉시 활성) [v1.6.1] 1AP 비용 추가"""
     from app.models import Diplomacy
@@ -1000,7 +1353,7 @@ def diplomacy_enemy(target_id):
     db.session.add(diplo)
     add_event(park, 'diplomacy', f'⚔️ {target.name}에 적대를 선언했는 데스!!')
     add_event(target, 'diplomacy', f'⚔️ {park.name}이 적대를 선언했는 데스!! 경계하라 데스!')
-    db.session.commit()
+    UOW.commit()
 
     flash(get_text('flash.diplo_enemy_sent', name=target.name), 'warning')
     return redirect(url_for('game.trade_market'))
@@ -1008,6 +1361,7 @@ def diplomacy_enemy(target_id):
 
 @game_bp.route('/diplomacy/dissolve/<int:diplo_id>', methods=['POST'])
 @login_required
+@UOW.transactional
 def diplomacy_dissolve(diplo_id):
     """외교 관계 해제 (동맹 파기 / 적대 종료) [v1.6.3] consume_turn 적용"""
     from app.models import Diplomacy
@@ -1038,7 +1392,7 @@ def diplomacy_dissolve(diplo_id):
     add_event(park, 'diplomacy', f'📜 {other.name}과(와)의 {diplo.relation_type} 관계를 해제했는 데스.')
     if not other.is_destroyed:
         add_event(other, 'diplomacy', f'📜 {park.name}이 {diplo.relation_type} 관계를 해제했는 데스.')
-    db.session.commit()
+    UOW.commit()
 
     flash(get_text('flash.diplo_break'), 'info')
     return redirect(url_for('game.trade_market'))
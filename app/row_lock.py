@@ -0,0 +1,38 @@
+# -*- coding: utf-8 -*-
+"""
+실장석 공원 제국 - 행 잠금 (row_lock.py)
+[v1.7.0] 교역/전투에서 함께 바뀌는 공원·교역 행을 SELECT ... FOR UPDATE로 잠근다.
+
+- PostgreSQL: 잠근 행에 대한 다른 트랜잭션의 쓰기만 커밋까지 대기
+  → 서로 다른 공원을 다루는 요청은 병렬로 진행 (이전: SQLite 파일 락 하나 뒤에 줄을 섬)
+- SQLite: FOR UPDATE 구문이 없다. 쓰기 트랜잭션이 데이터베이스 전체를 잠그므로
+  (BEGIN IMMEDIATE, app/db_profile.py) 잠금 조회를 생략 → 쿼리 수/동작이 이전과 동일
+- 잠금 순서: 교역 행 → 공원 행(id 오름차순). 모든 경로가 같은 순서로 잡아 교착을 피한다
+- populate_existing: 잠근 뒤 최신 값으로 세션 객체를 다시 채움 (요청 초반에 읽은 값으로 계산하지 않도록)
+  조회 전에 autoflush가 실행되므로 세션에 쌓인 변경은 잃지 않는다
+"""
+from app.models import Park, TradeOffer
+from app import db_profile
+
+
+def lock_parks(*park_ids):
+    """
+    공원 행 잠금 (트랜잭션 종료까지). 0/None은 무시.
+    반환: 잠근 Park 리스트 (SQLite에서는 빈 리스트 - 잠금이 필요 없음)
+    """
+    ids = sorted({pid for pid in park_ids if pid})
+    if not ids or not db_profile.row_locks():
+        return []
+    return (Park.query.filter(Park.id.in_(ids))
+            .order_by(Park.id)
+            .with_for_update()
+            .populate_existing()
+            .all())
+
+
+def lock_trade(trade_id):
+    """교역 행 잠금 후 최신 상태로 반환 (없으면 None)"""
+    query = TradeOffer.query.filter(TradeOffer.id == trade_id)
+    if db_profile.row_locks():
+        query = query.with_for_update().populate_existing()
+    return query.first()
@@ -0,0 +1,182 @@
+# -*- coding: utf-8 -*-
+"""
+실장석 공원 제국 - 샤딩 월드 틱 (sharded_tick.py)
+[v1.7.0] 월드 틱을 여러 프로세스로 나눠 처리 (GIL 우회, TICK_ENGINE='sharded').
+
+1단계 (병렬): 활성 공원을 id 구간 TICK_WORKERS개로 나눠 ProcessPoolExecutor 워커에 배분.
+    워커는 자체 앱/DB 세션으로 공원 내부 단계만 처리한다 (process_turn(local_only=True):
+    식량·카니발리즘·건설·훈련·성장·운치굴·재해·질병·NPC악행·반란·중독·수용초과).
+    진행 중 밀사가 있는 공원은 수용 초과 판정을 2단계로 미룬다.
+    청크(TICK_CHUNK_SIZE)당 커밋 1회, 공원별 오류 격리는 스칼라 배치 틱과 동일.
+2단계 (직렬, 스케줄러 프로세스): 다른 공원을 건드리는 단계를 id 순서로 처리 (단일 트랜잭션).
+    밀사 임무 → 수용 초과 (process_spy_stage) → NPC AI 행동(침공 포함, 대상 인덱스 사용)
+
+단계 순서는 벡터 엔진과 같다 (공원 내부 단계 전체 → 밀사 → 밀사 보낸 공원의 수용 초과 → NPC AI).
+워커 프로세스는 스케줄러를 띄우지 않는다 (_init_worker, create_app의 자식 프로세스 검사).
+SQLite에서는 쓰기가 직렬화되므로 병렬화 이득은 계산 부분에서 나온다 (커밋은 짧은 청크 단위로 번갈아 진행).
+PostgreSQL에서는 워커 구간이 겹치지 않으므로 커밋도 병렬로 진행된다 (행 단위 잠금).
+"""
+import atexit
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from sqlalchemy import select
+
+from app.models import db, Park, SpyMission
+from app.config import GameConfig as GC
+
+# 프로세스 풀 (첫 틱에서 생성 후 재사용 - spawn 비용은 1회만)
+_executor = None
+# 워커 프로세스의 Flask 앱 (스케줄러 없이 생성)
+_worker_app = None
+
+
+def _get_executor():
+    global _executor
+    if _executor is None:
+        # spawn: 스케줄러 스레드와 열린 DB 커넥션을 fork로 복제하지 않는다
+        _executor = ProcessPoolExecutor(
+            max_workers=GC.TICK_WORKERS,
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=_init_worker,
+        )
+        atexit.register(shutdown)
+    return _executor
+
+
+def shutdown():
+    """프로세스 풀 종료 (다음 틱에서 다시 생성)"""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+
+
+def _init_worker():
+    """
+    워커 프로세스 초기화: 스케줄러 없는 앱 생성.
+    __main__ 모듈 재import 등으로 이 프로세스에 스케줄러가 떠 있으면 정지 (틱 중복 실행 방지)
+    """
+    global _worker_app
+    from app import create_app
+    from app.turn_scheduler import scheduler
+    if scheduler.running:
+        scheduler.shutdown(wait=False)
+    _worker_app = create_app(start_scheduler=False)
+
+
+def plan_shards(worker_count):
+    """
+    활성 공원을 공원 수 기준으로 균등한 id 구간으로 분할.
+    반환: [(after_id, upto_id)] - after_id < id <= upto_id
+    """
+    ids = db.session.execute(
+        select(Park.id).where(Park.is_destroyed == False).order_by(Park.id)
+    ).scalars().all()
+    if not ids:
+        return []
+
+    size = -(-len(ids) // max(1, worker_count))  # 올림 나눗셈
+    shards = []
+    after_id = 0
+    for start in range(0, len(ids), size):
+        upto_id = ids[min(start + size, len(ids)) - 1]
+        shards.append((after_id, upto_id))
+        after_id = upto_id
+    return shards
+
+
+def _run_shard(after_id, upto_id):
+    """워커: 맡은 id 구간의 공원 내부 단계 처리. 반환: {'player', 'npc', 'failed'}"""
+    from app.turn_scheduler import _load_chunk, _process_chunk
+
+    app = _worker_app
+    totals = {'player': 0, 'npc': 0, 'failed': 0}
+    with app.app_context():
+        try:
+            last_id = after_id
+            while True:
+                chunk = _load_chunk(last_id, GC.TICK_CHUNK_SIZE, upto_id)
+                if not chunk:
+                    break
+                last_id = chunk[-1].id
+
+                counts = _process_chunk(app, chunk, local_only=True)
+                for key in totals:
+                    totals[key] += counts.get(key, 0)
+                db.session.expunge_all()
+        finally:
+            db.session.remove()
+    return totals
+
+
+def run_cross_park_phase():
+    """
+    2단계: 공원 간 상호작용 (커밋은 호출자 몫).
+    밀사를 보낸 공원은 밀사 → 수용 초과 순서로 처리 (1단계 워커가 미뤄 둔 수용 초과 판정)
+    반환: 처리한 NPC 수
+    """
+    from app.game_engine import process_spy_stage
+    from app.npc_engine import process_npc_turn
+    from app import target_index
+
+    sender_ids = db.session.execute(
+        select(SpyMission.sender_id)
+        .join(Park, Park.id == SpyMission.sender_id)
+        .where(SpyMission.status == 'active', Park.is_destroyed == False)
+        .distinct().order_by(SpyMission.sender_id)
+    ).scalars().all()
+    for park_id in sender_ids:
+        process_spy_stage(db.session.get(Park, park_id))
+
+    npc_parks = (Park.query.filter_by(is_npc=True, is_destroyed=False)
+                 .order_by(Park.id).all())
+    with target_index.activate():
+        for park in npc_parks:
+            process_npc_turn(park)
+    return len(npc_parks)
+
+
+def process_world_turn(app):
+    """
+    샤딩 틱 1회 실행.
+    프로세스 풀을 만들 수 없으면 예외가 그대로 올라간다 (아직 아무것도 커밋되지 않음 → 호출자가 폴백 가능).
+    워커 일부가 실패하면 그 구간의 나머지 공원만 이번 틱에서 빠진다 (다른 구간은 이미 커밋됨).
+    반환: {'player', 'npc', 'failed', 'shards'}
+    """
+    from app import unit_of_work as UOW
+
+    shards = plan_shards(GC.TICK_WORKERS)
+    # 워커가 쓰는 동안 이 프로세스가 읽기 트랜잭션을 잡고 있지 않도록
+    db.session.close()
+
+    executor = _get_executor()
+    futures = [executor.submit(_run_shard, after_id, upto_id) for after_id, upto_id in shards]
+
+    totals = {'player': 0, 'npc': 0, 'failed': 0, 'shards': len(shards)}
+    for (after_id, upto_id), future in zip(shards, futures):
+        try:
+            counts = future.result()
+        except BrokenProcessPool as e:
+            app.logger.error(f"[샤딩 틱 오류] 워커 풀 중단 (구간 {after_id + 1}~{upto_id}): {e}")
+            shutdown()
+            totals['failed'] += 1
+            continue
+        except Exception as e:
+            app.logger.error(f"[샤딩 틱 오류] 구간 {after_id + 1}~{upto_id}: {e}")
+            totals['failed'] += 1
+            continue
+        for key in ('player', 'npc', 'failed'):
+            totals[key] += counts.get(key, 0)
+
+    # 2단계: 워커들이 커밋한 결과를 보고 직렬 처리
+    try:
+        with UOW.deferred_commit():
+            run_cross_park_phase()
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        app.logger.error(f"[샤딩 틱 오류] 밀사/NPC 단계 실패: {e}")
+
+    return totals
@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+"""
+실장석 공원 제국 - 공원 상태 버전 (state_version.py)
+[v1.7.0] 공원 상태가 바뀔 때마다 parks.state_version을 1 올린다.
+버전이 같으면 대시보드 본문도 같다 → 조각 캐시/ETag 키로 사용 (app/fragment_cache.py).
+
+올리는 경로:
+- ORM flush (before_flush): 변경된 Park + 추가/변경/삭제된 대기열·이벤트 행의 소속 공원
+- Core 쓰기: 이벤트 버퍼 bulk INSERT(touch 호출), 벡터 엔진 executemany UPDATE·NPC 턴 빚 UPDATE(증가 식 포함)
+증가는 SQL 식(state_version + 1) → 동시 트랜잭션끼리 값을 잃지 않고, 파이썬 쪽에서 현재 값을 읽을 필요도 없음.
+"""
+from sqlalchemy import event, update
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.elements import ClauseElement
+
+from app.models import Park, BuildQueue, TrainQueue, EventLog
+
+# 대시보드에 표시되는 자식 행 (park_id로 소속 공원 식별)
+_TRACKED_CHILDREN = (BuildQueue, TrainQueue, EventLog)
+# Core UPDATE 1회당 공원 id 수 (SQLite 바인드 변수 한도 대비)
+_CHUNK = 500
+
+
+def _bump(park):
+    """세션에 로드된 공원: 다음 flush에서 증가 식으로 UPDATE (같은 flush 안에서는 1회만)"""
+    if not isinstance(park.__dict__.get('state_version'), ClauseElement):
+        park.state_version = Park.state_version + 1
+
+
+def touch(session, park_ids):
+    """
+    공원들의 상태 버전 증가.
+    세션에 로드된 공원은 속성에 증가 식을 걸고(다음 flush에 반영), 나머지는 Core UPDATE로 처리.
+    """
+    pending = []
+    for park_id in park_ids:
+        park = session.identity_map.get(Session.identity_key(Park, park_id))
+        if park is None:
+            pending.append(park_id)
+        elif park not in session.deleted:
+            _bump(park)
+
+    table = Park.__table__
+    for start in range(0, len(pending), _CHUNK):
+        session.execute(
+            update(table)
+            .where(table.c.id.in_(pending[start:start + _CHUNK]))
+            .values(state_version=table.c.state_version + 1))
+
+
+def _owner_id(child):
+    """자식 행의 소속 공원 id (관계로만 연결돼 park_id가 아직 없으면 관계에서)"""
+    if child.park_id is not None:
+        return child.park_id
+    park = child.__dict__.get('park')
+    return park.id if park is not None else None
+
+
+@event.listens_for(Session, 'before_flush')
+def _bump_on_flush(session, flush_context, instances):
+    """flush 직전 변경분을 보고 소속 공원 버전 증가"""
+    park_ids = set()
+    for obj in session.dirty:
+        if isinstance(obj, Park):
+            if session.is_modified(obj):
+                _bump(obj)
+        elif isinstance(obj, _TRACKED_CHILDREN) and session.is_modified(obj):
+            park_ids.add(_owner_id(obj))
+    for obj in list(session.new) + list(session.deleted):
+        if isinstance(obj, _TRACKED_CHILDREN):
+            park_ids.add(_owner_id(obj))
+
+    park_ids.discard(None)
+    if park_ids:
+        touch(session, park_ids)
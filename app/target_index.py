@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+"""
+실장석 공원 제국 - NPC 공격 대상 인덱스 (target_index.py)
+[v1.7.0] NPC마다 전 공원을 로드해 파이썬으로 거르던 대상 선택(틱당 O(N²))을 대체.
+
+- 틱 시작 시 쿼리 1회로 생성: 보호 모드가 아닌 활성 공원만 (전투력, id) 정렬 리스트에 보관
+  (보호 중/멸망 공원은 리스트에서 빠짐 = 보호/비보호 분할)
+- 무작위 대상: 리스트에서 균등 추출 O(1)
+- "내 전투력 × 0.7 미만" 대상: bisect로 경계를 찾아 그 앞 구간에서 균등 추출 O(log N)
+- 전투·턴 처리로 공원 상태가 바뀌면 update()로 해당 공원 항목만 갱신
+
+인덱스는 activate() 블록 동안 현재 스레드에만 보인다 (스케줄러/워커 스레드 간 간섭 없음).
+블록 밖(요청 중 단발 호출 등)에서는 current()가 None → 호출자가 SQL 조회로 처리한다.
+"""
+import threading
+from bisect import bisect_left, insort
+from contextlib import contextmanager
+
+from sqlalchemy import select
+
+from app.models import db, Park
+from app import rng as RNG
+
+_local = threading.local()
+
+
+class TargetIndex:
+    """월드 틱 1회 동안 쓰는 공격 대상 인덱스"""
+
+    def __init__(self, rows):
+        """rows: (공원 id, 전투력, 보호 중 여부) 반복자"""
+        self._power = {}    # 비보호 활성 공원 id → 인덱스에 들어간 전투력
+        keys = []
+        for park_id, power, protected in rows:
+            if not protected:
+                self._power[park_id] = power
+                keys.append((power, park_id))
+        keys.sort()
+        self._keys = keys   # (전투력, id) 오름차순
+
+    def __len__(self):
+        return len(self._keys)
+
+    def pick_any(self, exclude_id):
+        """자신을 제외한 비보호 공원 id 1개 (없으면 None)"""
+        return self._pick(len(self._keys), exclude_id)
+
+    def pick_weaker(self, power_limit, exclude_id):
+        """전투력 < power_limit인 비보호 공원 id 1개 (없으면 None)"""
+        # (power_limit, -1)보다 앞 = 전투력이 power_limit 미만인 항목
+        return self._pick(bisect_left(self._keys, (power_limit, -1)), exclude_id)
+
+    def update(self, park):
+        """공원 상태 변경 반영 (전투력/보호 여부 재계산, 멸망·보호 중이면 제외)"""
+        from app.game_engine import is_protected
+
+        self.discard(park.id)
+        if park.is_destroyed or is_protected(park):
+            return
+        power = park.total_combat_power
+        self._power[park.id] = power
+        insort(self._keys, (power, park.id))
+
+    def discard(self, park_id):
+        """공원을 대상 후보에서 제외"""
+        power = self._power.pop(park_id, None)
+        if power is None:
+            return
+        pos = bisect_left(self._keys, (power, park_id))
+        del self._keys[pos]
+
+    def _pick(self, count, exclude_id):
+        """앞쪽 count개 항목 중 exclude_id를 뺀 나머지에서 균등 추출"""
+        own = self._power.get(exclude_id)
+        own_pos = bisect_left(self._keys, (own, exclude_id)) if own is not None else count
+        skip = 1 if own_pos < count else 0
+        if count - skip <= 0:
+            return None
+        i = RNG.randrange(count - skip)
+        if skip and i >= own_pos:
+            i += 1
+        return self._keys[i][1]
+
+
+def build():
+    """활성 공원 전체로 인덱스 생성 (쿼리 1회, 전투력/보호 판정은 SQL)"""
+    from app.game_engine import not_protected_expr
+
+    stmt = (select(Park.id, Park.total_combat_power, not_protected_expr())
+            .where(Park.is_destroyed == False))
+    return TargetIndex((pid, int(power or 0), not unprotected)
+                       for pid, power, unprotected in db.session.execute(stmt))
+
+
+@contextmanager
+def activate(index=None):
+    """블록 동안 현재 스레드의 대상 인덱스 설정 (index가 없으면 새로 생성)"""
+    previous = getattr(_local, 'index', None)
+    _local.index = index if index is not None else build()
+    try:
+        yield _local.index
+    finally:
+        _local.index = previous
+
+
+def current():
+    """현재 스레드의 활성 인덱스 (없으면 None)"""
+    return getattr(_local, 'index', None)
+
+
+def touch(*parks):
+    """활성 인덱스가 있으면 공원 상태 변경 반영 (없으면 무시)"""
+    index = current()
+    if index is not None:
+        for park in parks:
+            index.update(park)
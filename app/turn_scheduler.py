@@ -32,6 +32,33 @@ def init_scheduler(app):
         kwargs={'app': app},
     )
 
+    # [v1.7.0] NPC 턴 빚 상환 워커 (플레이어 요청 경로에서 분리된 NPC 동기 처리)
+    # 간격 내에 쌓인 여러 동기 요청을 실행 1회로 합친다 (coalesce + 단일 인스턴스)
+    if GC.TURN_NPC_SYNC and GC.NPC_SYNC_ASYNC:
+        scheduler.add_job(
+            func=_process_npc_debt,
+            trigger=IntervalTrigger(seconds=GC.NPC_SYNC_INTERVAL),
+            id='npc_debt_worker',
+            name='NPC 턴 빚 상환 데스!',
+            replace_existing=True,
+            coalesce=True,
+            max_instances=1,
+            kwargs={'app': app},
+        )
+
+    # [v1.7.0] 이벤트 로그 보존/아카이브 (작은 배치로 자주)
+    if GC.EVENT_RETENTION_ENABLED:
+        scheduler.add_job(
+            func=_process_event_retention,
+            trigger=IntervalTrigger(seconds=GC.EVENT_RETENTION_INTERVAL),
+            id='event_retention',
+            name='이벤트 로그 정리 데스!',
+            replace_existing=True,
+            coalesce=True,
+            max_instances=1,
+            kwargs={'app': app},
+        )
+
     scheduler.start()
     app.logger.info(f"[스케줄러] 턴 처리 시작! 간격: {GC.TURN_INTERVAL}초")
 
@@ -40,39 +67,307 @@ def _process_all_turns(app):
     """
     모든 활성 공원의 턴을 일괄 처리.
     Flask 앱 컨텍스트 내에서 실행해야 DB 접근 가능.
+    [v1.7.0] 배치 틱: 공원을 TICK_CHUNK_SIZE개씩 청크로 나눠 청크당 트랜잭션 1개로 처리.
+    (이전: 공원마다 process_turn/행동 함수가 각자 커밋 → 틱 1회에 수천 번 fsync)
+    [v1.7.0] TICK_ENGINE='columnar'이면 NumPy 벡터 엔진으로 전 공원을 한 번에 처리.
+    [v1.7.0] TICK_ENGINE='sharded'이면 공원 id 구간별 멀티프로세스로 처리.
     """
     with app.app_context():
-        from app.models import db, Park
-        from app.game_engine import process_turn
-        from app.npc_engine import process_npc_turn
+        from app.models import db
+        from app.config import GameConfig as GC
 
-        # 멸망하지 않은 모든 공원
-        active_parks = Park.query.filter_by(is_destroyed=False).all()
+        if GC.TICK_ENGINE == 'columnar' and _process_columnar(app):
+            _refresh_leaderboard(app)
+            return
+        if GC.TICK_ENGINE == 'sharded' and _process_sharded(app):
+            _refresh_leaderboard(app)
+            return
 
-        player_count = 0
-        npc_count = 0
+        from app import target_index
 
-        for park in active_parks:
-            try:
-                # 공통 턴 처리 (식량 소비, 건설, 훈련, 성장 등)
-                process_turn(park)
+        totals = {'player': 0, 'npc': 0, 'failed': 0}
+        last_id = 0
+
+        # [v1.7.0] NPC 공격 대상 인덱스는 틱 시작 시 1회 생성 후 공원별 처리 결과로 갱신
+        with target_index.activate():
+            while True:
+                chunk = _load_chunk(last_id, GC.TICK_CHUNK_SIZE)
+                if not chunk:
+                    break
+                last_id = chunk[-1].id
+
+                counts = _process_chunk(app, chunk)
+                for key in totals:
+                    totals[key] += counts.get(key, 0)
+
+                # 처리가 끝난 청크는 세션에서 분리 (identity map 메모리 상한 유지)
+                db.session.expunge_all()
+
+        app.logger.info(
+            f"[턴 완료] 플레이어 {totals['player']}개, NPC {totals['npc']}개 공원 처리 완료"
+            + (f" (오류 {totals['failed']}개)" if totals['failed'] else "")
+        )
+
+        _refresh_leaderboard(app)
+
+
+def _refresh_leaderboard(app):
+    """[v1.7.0] 틱 종료 후 랭킹 스냅샷 갱신 (실패해도 틱 결과에는 영향 없음)"""
+    from app import leaderboard
+    try:
+        leaderboard.refresh()
+    except Exception as e:
+        app.logger.error(f"[랭킹 갱신 오류] {e}")
+
+
+def _process_columnar(app):
+    """
+    [v1.7.0] 벡터 엔진으로 월드 틱 1회 처리 (단일 트랜잭션).
+    실패하면 롤백 후 False를 반환 → 호출자가 스칼라 청크 방식으로 다시 처리한다.
+    """
+    from app.models import db
+    from app import unit_of_work as UOW
+
+    try:
+        from app.columnar_engine import process_world_turn
+    except ImportError as e:
+        app.logger.error(f"[턴 처리] 벡터 엔진 사용 불가 (numpy 필요), 스칼라 처리로 전환: {e}")
+        return False
+
+    try:
+        with UOW.deferred_commit():
+            counts = process_world_turn()
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        app.logger.error(f"[턴 처리 오류] 벡터 엔진 실패, 스칼라 처리로 전환: {e}")
+        return False
+
+    app.logger.info(
+        f"[턴 완료] 플레이어 {counts['player']}개, NPC {counts['npc']}개 공원 처리 완료 (벡터 엔진)"
+    )
+    return True
+
+
+def _process_sharded(app):
+    """
+    [v1.7.0] 샤딩 틱 (공원 내부 단계는 워커 프로세스 병렬, 공원 간 단계는 직렬).
+    프로세스 풀을 시작하지 못하면 False → 호출자가 스칼라 청크 방식으로 처리한다.
+    """
+    from app.models import db
+    from app import sharded_tick
+
+    try:
+        counts = sharded_tick.process_world_turn(app)
+    except Exception as e:
+        db.session.rollback()
+        app.logger.error(f"[턴 처리] 샤딩 틱 시작 실패, 스칼라 처리로 전환: {e}")
+        return False
+
+    app.logger.info(
+        f"[턴 완료] 플레이어 {counts['player']}개, NPC {counts['npc']}개 공원 처리 완료 "
+        f"(샤딩 틱, 구간 {counts['shards']}개)"
+        + (f" (오류 {counts['failed']}개)" if counts['failed'] else "")
+    )
+    return True
+
+
+class _ParkTurnError(Exception):
+    """[v1.7.0] 청크 처리 중 특정 공원에서 발생한 오류 (공원별 격리용)"""
+
+    def __init__(self, park_id, park_name):
+        super().__init__(park_name)
+        self.park_id = park_id
+        self.park_name = park_name
+
+
+def _load_chunk(after_id, size, upto_id=None):
+    """
+    [v1.7.0] id 키셋 방식으로 다음 청크 로드 (건설/훈련 대기열 일괄 선로딩)
+    upto_id: id 상한 (샤딩 틱 워커가 맡은 구간까지만)
+    """
+    from sqlalchemy.orm import selectinload
+    from app.models import Park
+
+    query = Park.query.filter(Park.is_destroyed == False, Park.id > after_id)
+    if upto_id is not None:
+        query = query.filter(Park.id <= upto_id)
+    return (query
+            .order_by(Park.id)
+            .options(selectinload(Park.build_queue),
+                     selectinload(Park.train_queue))
+            .limit(size)
+            .all())
 
-                # NPC 공원은 추가로 AI 행동 실행
-                if park.is_npc:
+
+def _preload_spy_missions(chunk):
+    """
+    [v1.7.0] 청크 전체의 진행 중 밀사를 쿼리 1회로 로드.
+    반환: ({sender_id: [SpyMission, ...]}, 밀사 대상 공원 리스트)
+    대상 공원도 미리 로드해 두면 Park.query.get()이 identity map에서 바로 반환된다.
+    (세션 identity map은 약한 참조이므로 호출자가 반환값을 붙잡고 있어야 함)
+    """
+    from app.models import Park, SpyMission
+
+    park_ids = [p.id for p in chunk]
+    by_sender = {pid: [] for pid in park_ids}
+
+    missions = SpyMission.query.filter(
+        SpyMission.sender_id.in_(park_ids),
+        SpyMission.status == 'active'
+    ).all()
+    for mission in missions:
+        by_sender[mission.sender_id].append(mission)
+
+    target_ids = {m.target_id for m in missions} - set(park_ids)
+    targets = Park.query.filter(Park.id.in_(target_ids)).all() if target_ids else []
+
+    return by_sender, targets
+
+
+def _process_chunk(app, chunk, local_only=False):
+    """
+    [v1.7.0] 청크 1개를 단일 트랜잭션으로 처리.
+    공원별 오류 격리: 특정 공원에서 예외가 나면 청크를 롤백하고
+    그 공원만 제외한 채 다시 처리한다 (커밋 전이므로 중복 반영 없음).
+    커밋 자체가 실패하면 공원별 개별 커밋 방식으로 재처리한다.
+    local_only: 공원 내부 단계만 처리 (밀사·NPC AI 제외 - 샤딩 틱 워커용)
+                밀사 목록은 진행 중 밀사가 있는 공원의 수용 초과 판정을 미루는 데만 쓴다
+    반환: {'player': n, 'npc': n, 'failed': n}
+    """
+    from sqlalchemy.exc import SQLAlchemyError
+    from app.models import db
+    from app import unit_of_work as UOW
+
+    missions, _targets = _preload_spy_missions(chunk)
+    failed_ids = set()
+
+    while True:
+        try:
+            with UOW.deferred_commit():
+                counts = _run_chunk(chunk, missions, failed_ids, local_only)
+            db.session.commit()
+            counts['failed'] = len(failed_ids)
+            return counts
+        except _ParkTurnError as e:
+            db.session.rollback()
+            app.logger.error(f"[턴 처리 오류] 공원 '{e.park_name}': {e.__cause__}")
+            failed_ids.add(e.park_id)
+            if isinstance(e.__cause__, SQLAlchemyError):
+                # DB 레벨 오류는 원인 공원을 특정할 수 없음 → 개별 커밋으로 전환
+                return _run_chunk_per_park(app, chunk, failed_ids, local_only)
+        except Exception as e:
+            db.session.rollback()
+            app.logger.error(f"[턴 처리 오류] 청크 커밋 실패, 공원별 처리로 전환: {e}")
+            return _run_chunk_per_park(app, chunk, failed_ids, local_only)
+
+
+def _run_chunk(chunk, missions, skip_ids, local_only=False):
+    """[v1.7.0] 청크 내 공원들의 턴 처리 (커밋 없음)"""
+    from app.game_engine import process_turn
+    from app.npc_engine import process_npc_turn
+    from app import target_index
+
+    counts = {'player': 0, 'npc': 0}
+    for park in chunk:
+        park_id, park_name = park.id, park.name
+        if park_id in skip_ids:
+            continue
+        try:
+            # 공통 턴 처리 (식량 소비, 건설, 훈련, 성장 등)
+            process_turn(park, spy_missions=missions.get(park_id, []), local_only=local_only)
+            target_index.touch(park)
+
+            # NPC 공원은 추가로 AI 행동 실행 (local_only면 직렬 단계로 미룸)
+            if park.is_npc:
+                if not local_only:
+                    process_npc_turn(park)
+                counts['npc'] += 1
+            else:
+                counts['player'] += 1
+        except Exception as e:
+            raise _ParkTurnError(park_id, park_name) from e
+    return counts
+
+
+def _run_chunk_per_park(app, chunk, failed_ids, local_only=False):
+    """[v1.7.0] 폴백: 공원마다 개별 커밋 (이전 방식과 동일한 격리 수준)"""
+    from app.models import db
+    from app.game_engine import process_turn
+    from app.npc_engine import process_npc_turn
+
+    counts = {'player': 0, 'npc': 0}
+    for park in chunk:
+        park_id, park_name = park.id, park.name
+        if park_id in failed_ids:
+            continue
+        try:
+            process_turn(park, local_only=local_only)
+            if park.is_npc:
+                if not local_only:
                     process_npc_turn(park)
-                    npc_count += 1
-                else:
-                    player_count += 1
+                counts['npc'] += 1
+            else:
+                counts['player'] += 1
+            db.session.commit()
+        except Exception as e:
+            app.logger.error(f"[턴 처리 오류] 공원 '{park_name}': {e}")
+            db.session.rollback()
+            failed_ids.add(park_id)
+
+    counts['failed'] = len(failed_ids)
+    return counts
+
+
+def _process_npc_debt(app):
+    """
+    [v1.7.0] 플레이어들이 쌓은 NPC 턴 빚을 상환.
+    빚 1단위 = NPC 전체 1틱 (이전 _sync_npc_turns 1회와 동일한 게임 규칙).
+    빚 차감과 NPC 틱을 같은 트랜잭션으로 커밋 → 실패 시 빚이 남아 다음 실행에서 재시도.
+    실행 1회당 NPC_SYNC_MAX_TICKS틱까지만 처리 (남은 빚은 다음 실행으로 이월).
+    """
+    with app.app_context():
+        from app.models import db
+        from app.config import GameConfig as GC
+        from app.game_engine import claim_npc_turn_debt, _sync_npc_turns
+        from app import unit_of_work as UOW
 
+        ticks = 0
+        while ticks < GC.NPC_SYNC_MAX_TICKS:
+            try:
+                with UOW.deferred_commit():
+                    if not claim_npc_turn_debt():
+                        break
+                    _sync_npc_turns()
+                db.session.commit()
             except Exception as e:
-                app.logger.error(f"[턴 처리 오류] 공원 '{park.name}': {e}")
                 db.session.rollback()
-                continue
+                app.logger.error(f"[NPC 빚 상환 오류] {e}")
+                break
+            finally:
+                db.session.expunge_all()
+            ticks += 1
 
-        db.session.commit()
-        app.logger.info(
-            f"[턴 완료] 플레이어 {player_count}개, NPC {npc_count}개 공원 처리 완료"
-        )
+        if ticks:
+            app.logger.info(f"[NPC 빚 상환] NPC {ticks}틱 처리 완료")
+
+
+def _process_event_retention(app):
+    """[v1.7.0] 이벤트 로그 TTL/보존 개수 초과분 아카이브 후 삭제"""
+    with app.app_context():
+        from app.event_retention import run_retention
+
+        try:
+            stats = run_retention()
+        except Exception as e:
+            app.logger.error(f"[이벤트 정리 오류] {e}")
+            return
+
+        if stats['ttl'] or stats['cap']:
+            app.logger.info(
+                f"[이벤트 정리] TTL {stats['ttl']}개, 보존 한도 초과 {stats['cap']}개 "
+                f"아카이브 ({stats['batches']}배치)"
+            )
 
 
 def force_process_turn(app, park_id):
@@ -0,0 +1,136 @@
+# -*- coding: utf-8 -*-
+"""
+실장석 공원 제국 - 트랜잭션 경계 관리 (unit_of_work.py)
+[v1.7.0] 엔진 함수의 개별 커밋을 호출자 단위로 묶는다.
+
+엔진 함수(process_turn, action_*, execute_battle 등)는 db.session.commit()을
+직접 호출하지 않고 UOW.commit()을 호출한다.
+- 평소: 즉시 커밋 (기존 동작 그대로)
+- deferred_commit() 블록 안: 커밋 생략 → 블록을 연 호출자가 한 번에 커밋
+
+[v1.7.0] 요청 단위 트랜잭션 경계
+- unit_of_work(): 블록 안의 엔진 호출을 모아 성공 시 1회 커밋, 예외 시 롤백
+- @transactional: 라우트 전체를 unit_of_work()로 감싸는 데코레이터 (메서드와 무관하게 쓰기 라우트로 표시)
+- 요청별 커밋 횟수를 X-Commit-Count 헤더와 엔드포인트별 통계로 노출
+"""
+import threading
+from contextlib import contextmanager
+from functools import wraps
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.models import db
+
+# 스레드별 커밋 유예 깊이 (스케줄러 스레드와 요청 스레드가 서로 간섭하지 않도록)
+_state = threading.local()
+
+
+def is_deferred():
+    """현재 스레드가 커밋 유예 블록 안에 있는지 여부"""
+    return getattr(_state, 'depth', 0) > 0
+
+
+@contextmanager
+def deferred_commit():
+    """
+    블록 안에서 UOW.commit() 호출을 무시한다 (중첩 가능).
+    커밋/롤백은 블록을 연 호출자의 책임이다.
+    """
+    _state.depth = getattr(_state, 'depth', 0) + 1
+    try:
+        yield
+    finally:
+        _state.depth -= 1
+
+
+def commit():
+    """엔진용 커밋: 유예 블록 밖에서만 실제로 커밋한다"""
+    if is_deferred():
+        return
+    db.session.commit()
+
+
+@contextmanager
+def unit_of_work():
+    """
+    [v1.7.0] 트랜잭션 경계: 블록이 정상 종료되면 정확히 1회 커밋, 예외 시 롤백.
+    이미 바깥 경계 안이면 그 경계에 합류한다 (커밋은 가장 바깥 블록만).
+    """
+    if is_deferred():
+        yield
+        return
+
+    try:
+        with deferred_commit():
+            yield
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+
+
+def transactional(view):
+    """
+    [v1.7.0] 라우트 데코레이터: 요청 처리 전체를 unit_of_work()로 감싼다.
+    @login_required 아래에 붙인다 (인증 실패 시 트랜잭션을 열 필요 없음).
+    writes_db 표시: GET 라우트(대시보드 턴 처리 등)도 쓰기 트랜잭션(BEGIN IMMEDIATE)으로 시작
+    (app/db_profile.py, 바깥 데코레이터가 functools.wraps를 쓰면 표시가 그대로 전달됨)
+    """
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        with unit_of_work():
+            return view(*args, **kwargs)
+    wrapper.writes_db = True
+    return wrapper
+
+
+# ========================================
+# [v1.7.0] 요청별 커밋 횟수 측정
+# ========================================
+
+# 엔드포인트별 누적 통계 {endpoint: {'requests': n, 'commits': n, 'max': n}}
+_commit_stats = {}
+_stats_lock = threading.Lock()
+
+
+def _count_commit(session):
+    """Session after_commit 리스너: 요청 컨텍스트 안의 커밋만 집계"""
+    from flask import g, has_request_context
+    if has_request_context():
+        g._uow_commits = g.get('_uow_commits', 0) + 1
+
+
+def get_commit_stats():
+    """엔드포인트별 커밋 통계 스냅샷 (평균 포함, 평균 내림차순)"""
+    with _stats_lock:
+        items = [(ep, dict(st)) for ep, st in _commit_stats.items()]
+    for _, st in items:
+        st['avg'] = round(st['commits'] / st['requests'], 2) if st['requests'] else 0
+    items.sort(key=lambda x: x[1]['avg'], reverse=True)
+    return dict(items)
+
+
+def init_unit_of_work(app):
+    """
+    [v1.7.0] Flask 앱에 커밋 계측 연결.
+    - 모든 응답에 X-Commit-Count 헤더 추가
+    - 엔드포인트별 요청 수/커밋 수/최대 커밋 수 누적
+    """
+    from flask import g, request
+
+    if not event.contains(Session, 'after_commit', _count_commit):
+        event.listen(Session, 'after_commit', _count_commit)
+
+    @app.after_request
+    def record_commit_count(response):
+        commits = g.get('_uow_commits', 0)
+        response.headers['X-Commit-Count'] = str(commits)
+
+        endpoint = request.endpoint or 'unknown'
+        with _stats_lock:
+            st = _commit_stats.setdefault(endpoint, {'requests': 0, 'commits': 0, 'max': 0})
+            st['requests'] += 1
+            st['commits'] += commits
+            st['max'] = max(st['max'], commits)
+        return response
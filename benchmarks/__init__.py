@@ -0,0 +1,11 @@
+# -*- coding: utf-8 -*-
+"""
+[v1.7.0] 성능 벤치마크 스크립트 (저장소 루트에서 python -m benchmarks.<이름>)
+
+- tick_scaling: 월드 틱 벽시계 시간 ↔ 샤딩 틱 워커 수
+- gather_yield: 채집 수확량 계산 호출당 시간 ↔ 채집 인원 (이전 반복 구현과 비교)
+- starvation_scaling: 기아/카니발리즘 호출당 시간 ↔ 인구 (이전 반복 구현과 비교)
+- dialogue_pick: 대사 1회 선택 비용 ↔ 조회 경로 (테이블 유지 / 모듈 속성)
+- battle_log_storage: 전투 기록 건당 저장 크기·삽입 처리량 (이전 JSON + 본문 형식과 비교)
+- request_concurrency: 동시 요청 처리량·잠금 오류 ↔ 스레드 수 ↔ DB 프로필
+"""
@@ -0,0 +1,166 @@
+# -*- coding: utf-8 -*-
+"""
+[v1.7.0] 전투 기록 저장 크기·삽입 처리량 (benchmarks/battle_log_storage.py)
+
+같은 합성 전투 N건을 두 형식으로 저장해 비교한다.
+- 이전 형식: 피해를 JSON 텍스트(attacker_losses/defender_losses)로, 본문(log_text)을 완성된 문장으로 저장
+- 현재 형식: 출정 편성·피해를 정수 컬럼으로 저장, 본문은 조회 시 BattleLog.text()가 생성
+삽입 시간에는 행 만들기(이전 형식은 format_battle_log + json.dumps)가 포함된다. 인덱스는 두 형식 동일.
+크기: SQLite는 dbstat(없으면 DB 페이지 수 증가분), PostgreSQL은 pg_relation_size/pg_total_relation_size.
+
+    python -m benchmarks.battle_log_storage --battles 20000 --batch 500
+"""
+import json
+import random
+import time
+from datetime import datetime
+
+from benchmarks import common
+
+LOOT_KEYS = ('konpeito', 'trash', 'material', 'babies', 'children')
+
+
+def _battles(count, park_ids):
+    """시드 고정 합성 전투 결과"""
+    rand = random.Random(common.BENCH_SEED)
+    battles = []
+    for _ in range(count):
+        attacker_id, defender_id = rand.sample(park_ids, 2)
+        wins = rand.random() < 0.5
+        battles.append(dict(
+            attacker_id=attacker_id, defender_id=defender_id, wins=wins,
+            send_guards=rand.randint(1, 30), send_adults=rand.randint(0, 40),
+            boss_joins=rand.random() < 0.2,
+            atk_losses={'guards': rand.randint(0, 10), 'adults': rand.randint(0, 15), 'children': 0},
+            def_losses={'guards': rand.randint(0, 10), 'adults': rand.randint(0, 15),
+                        'children': rand.randint(0, 20)},
+            loot={'konpeito': rand.randint(0, 50) * wins, 'trash': rand.randint(0, 300) * wins,
+                  'material': rand.randint(0, 100) * wins, 'babies': rand.randint(0, 10) * wins,
+                  'children': rand.randint(0, 5) * wins},
+        ))
+    return battles
+
+
+def _legacy_table(db):
+    """이전 형식 battle_logs (v1.6 컬럼, 인덱스는 현재 모델과 같게)"""
+    from app.models import BattleLog
+    table = db.Table(
+        'legacy_battle_logs', db.MetaData(),
+        db.Column('id', db.Integer, primary_key=True),
+        db.Column('attacker_id', db.Integer, nullable=False),
+        db.Column('defender_id', db.Integer, nullable=False),
+        db.Column('result', db.String(20), nullable=False),
+        db.Column('log_text', db.Text, nullable=False),
+        db.Column('attacker_losses', db.Text),
+        db.Column('defender_losses', db.Text),
+        *[db.Column(f'loot_{k}', db.Integer) for k in LOOT_KEYS],
+        db.Column('created_at', db.DateTime),
+    )
+    for index in BattleLog.__table__.indexes:
+        db.Index(f'legacy_{index.name}', *[table.c[c.name] for c in index.columns])
+    table.create(db.engine)
+    return table
+
+
+def _legacy_row(battle, names):
+    from app.battle_engine import format_battle_log
+    return dict(
+        attacker_id=battle['attacker_id'], defender_id=battle['defender_id'],
+        result='win' if battle['wins'] else 'lose',
+        log_text=format_battle_log(
+            names[battle['attacker_id']], names[battle['defender_id']], battle['wins'],
+            battle['atk_losses'], battle['def_losses'], battle['loot'],
+            battle['send_guards'], battle['send_adults'], battle['boss_joins']),
+        attacker_losses=json.dumps(battle['atk_losses']),
+        defender_losses=json.dumps(battle['def_losses']),
+        created_at=datetime.utcnow(),
+        **{f'loot_{k}': v for k, v in battle['loot'].items()},
+    )
+
+
+def _current_row(battle, names):
+    atk, dfn = battle['atk_losses'], battle['def_losses']
+    return dict(
+        attacker_id=battle['attacker_id'], defender_id=battle['defender_id'],
+        result='win' if battle['wins'] else 'lose', log_text='',
+        sent_guards=battle['send_guards'], sent_adults=battle['send_adults'],
+        boss_joined=battle['boss_joins'],
+        atk_lost_guards=atk['guards'], atk_lost_adults=atk['adults'],
+        def_lost_guards=dfn['guards'], def_lost_adults=dfn['adults'],
+        def_lost_children=dfn['children'],
+        created_at=datetime.utcnow(),
+        **{f'loot_{k}': v for k, v in battle['loot'].items()},
+    )
+
+
+def _insert(table, make_row, battles, names, batch):
+    """batch건씩 행을 만들어 삽입·커밋. 반환: 걸린 초"""
+    from app.models import db
+    start = time.perf_counter()
+    for i in range(0, len(battles), batch):
+        db.session.execute(table.insert(), [make_row(b, names) for b in battles[i:i + batch]])
+        db.session.commit()
+    return time.perf_counter() - start
+
+
+def _sizes(table_name):
+    """(테이블 bytes, 인덱스 포함 bytes)"""
+    from app.models import db
+    if db.engine.dialect.name == 'postgresql':
+        return db.session.execute(db.text(
+            "SELECT pg_relation_size(:t), pg_total_relation_size(:t)"), {'t': table_name}).one()
+    names = [table_name] + [name for (name,) in db.session.execute(db.text(
+        "SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = :t"), {'t': table_name})]
+    sizes = dict(db.session.execute(db.text(
+        "SELECT name, SUM(pgsize) FROM dbstat GROUP BY name")).all())
+    return sizes.get(table_name, 0), sum(sizes.get(name, 0) for name in names)
+
+
+def _db_pages_bytes():
+    from app.models import db
+    page_count = db.session.execute(db.text('PRAGMA page_count')).scalar()
+    return page_count * db.session.execute(db.text('PRAGMA page_size')).scalar()
+
+
+def main():
+    p = common.parser(__doc__.strip().splitlines()[0])
+    p.add_argument('--battles', type=int, default=20000)
+    p.add_argument('--batch', type=int, default=500, help='커밋 1회당 삽입 건수')
+    args = p.parse_args()
+    common.setup_env(args.database_url)
+
+    from sqlalchemy.exc import OperationalError
+    from app.models import db, Park, BattleLog
+
+    rows = []
+    with common.bench_app():
+        park_ids = common.make_parks(50)
+        names = dict(db.session.query(Park.id, Park.name))
+        db.session.commit()
+        battles = _battles(args.battles, park_ids)
+
+        legacy = _legacy_table(db)
+        for label, table, make_row in (('이전 (JSON + 본문)', legacy, _legacy_row),
+                                       ('현재 (정수 컬럼)', BattleLog.__table__, _current_row)):
+            before = _db_pages_bytes() if db.engine.dialect.name == 'sqlite' else 0
+            seconds = _insert(table, make_row, battles, names, args.batch)
+            try:
+                table_bytes, total_bytes = _sizes(table.name)
+            except OperationalError:   # dbstat 없이 빌드된 SQLite → DB 파일 증가분 (인덱스 포함)
+                db.session.rollback()
+                table_bytes = total_bytes = _db_pages_bytes() - before
+            rows.append([label, f'{table_bytes / args.battles:.0f}', f'{total_bytes / args.battles:.0f}',
+                         f'{args.battles / seconds:,.0f}'])
+
+        # 현재 형식은 조회 때 본문을 만든다: 상세 1건당 생성 비용
+        logs = BattleLog.query.limit(1000).all()
+        render, _ = common.measure(lambda: [log.text() for log in logs], repeat=5)
+        db.session.rollback()
+        legacy.drop(db.engine)
+
+    common.print_table(['형식', '행 bytes/건', '인덱스 포함 bytes/건', '삽입 건/초'], rows)
+    print(f'\n현재 형식 본문 생성 (BattleLog.text): {render / len(logs) * 1e6:.1f}us/건')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+"""
+[v1.7.0] 벤치마크 공용 함수 (benchmarks/common.py)
+
+- 대상 DB: --database-url (기본: 임시 SQLite 파일). 벤치마크가 테이블을 지우고 다시 만든다
+- Config/GameConfig는 import 시점에 환경 변수를 읽으므로 app 패키지보다 setup_env()를 먼저 호출
+  (샤딩 틱 워커 프로세스도 같은 환경 변수로 같은 DB에 붙는다)
+- 실행: 저장소 루트에서 python -m benchmarks.<이름> --help
+"""
+import argparse
+import logging
+import os
+import statistics
+import tempfile
+import time
+import unicodedata
+from contextlib import contextmanager
+
+BENCH_SEED = 'jissou-bench'
+
+
+def parser(description):
+    """공통 인자(--database-url)가 들어간 ArgumentParser"""
+    p = argparse.ArgumentParser(description=description)
+    p.add_argument('--database-url', help='대상 DB URL (기본: 임시 SQLite 파일, 테이블을 지우고 다시 만듦)')
+    return p
+
+
+def setup_env(database_url=None):
+    """app import 전에 호출: DB URL/월드 시드/NPC 초기 공원 수 환경 변수 설정. 반환: DB URL"""
+    if not database_url:
+        database_url = f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='jissou-bench-'), 'bench.db')}"
+    os.environ['DATABASE_URL'] = database_url
+    os.environ['NPC_INITIAL_COUNT'] = '0'
+    os.environ.setdefault('WORLD_SEED', BENCH_SEED)
+    os.environ.setdefault('PROFILER_ENABLED', '0')
+    return database_url
+
+
+@contextmanager
+def bench_app():
+    """스케줄러 없는 앱 + 앱 컨텍스트 (빈 테이블로 시작)"""
+    from app import create_app
+    from app.models import db
+
+    app = create_app(start_scheduler=False)
+    app.logger.setLevel(logging.WARNING)   # 틱마다 남는 [턴 완료] 로그 생략
+    with app.app_context():
+        reset_db()
+        try:
+            yield app
+        finally:
+            db.session.remove()
+            db.engine.dispose()
+
+
+def reset_db():
+    """모든 테이블을 지우고 다시 생성"""
+    from app.models import db
+    db.session.remove()
+    db.drop_all()
+    db.create_all()
+
+
+def make_parks(count, **fields):
+    """초기 자원으로 공원 count개 생성 (필드는 키워드로 덮어쓴다). 반환: id 리스트"""
+    from app.config import GameConfig as GC
+    from app.models import db, Park
+
+    values = dict(
+        is_npc=False, boss_hp=GC.INITIAL_BOSS_HP,
+        guard_count=GC.INITIAL_GUARDS, adult_count=GC.INITIAL_ADULTS,
+        child_count=GC.INITIAL_CHILDREN, baby_count=GC.INITIAL_BABIES,
+        konpeito=GC.INITIAL_KONPEITO, trash_food=GC.INITIAL_TRASH_FOOD,
+        meat_stock=GC.INITIAL_MEAT_STOCK, material=GC.INITIAL_MATERIAL,
+        konpeito_cap=GC.INITIAL_KONPEITO_CAP, trash_food_cap=GC.INITIAL_TRASH_FOOD_CAP,
+        material_cap=GC.INITIAL_MATERIAL_CAP, population_cap=GC.INITIAL_POP_CAP,
+        morale=GC.INITIAL_MORALE, action_points=GC.ACTION_POINTS_PER_TURN,
+    )
+    values.update(fields)
+    start = db.session.query(db.func.count(Park.id)).scalar()
+    db.session.execute(Park.__table__.insert(),
+                       [dict(values, name=f'bench{start + i}') for i in range(count)])
+    ids = [pid for (pid,) in db.session.query(Park.id).order_by(Park.id)]
+    # 틱/요청은 별도 세션에서 쓰므로 트랜잭션을 열어 둔 채 돌려주지 않는다 (SQLite 쓰기 잠금)
+    db.session.commit()
+    return ids
+
+
+def measure(fn, repeat=5, warmup=1):
+    """fn()을 warmup회 버리고 repeat회 실행. 반환: (중앙값 초, 최소 초)"""
+    for _ in range(warmup):
+        fn()
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return statistics.median(times), min(times)
+
+
+def _width(text):
+    """터미널 표시 폭 (한글 등 전각 문자는 2칸)"""
+    return sum(2 if unicodedata.east_asian_width(ch) in 'WF' else 1 for ch in text)
+
+
+def _pad(text, width):
+    return text + ' ' * (width - _width(text))
+
+
+def print_table(headers, rows):
+    """고정폭 표 출력"""
+    rows = [[str(cell) for cell in row] for row in rows]
+    widths = [max([_width(h)] + [_width(r[i]) for r in rows]) for i, h in enumerate(headers)]
+    print('  '.join(_pad(h, w) for h, w in zip(headers, widths)))
+    print('  '.join('-' * w for w in widths))
+    for row in rows:
+        print('  '.join(_pad(cell, w) for cell, w in zip(row, widths)))
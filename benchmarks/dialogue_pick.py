@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+"""
+[v1.7.0] 대사 1회 선택 비용 (benchmarks/dialogue_pick.py)
+
+같은 대사(GATHER_DEPART['adult'])를 고르는 호출당 시간을 조회 경로별로 비교한다.
+- 테이블 유지: 턴 단계처럼 DLG.table(lang)을 한 번 받아 두고 선택
+- table(lang) 매번: 선택마다 언어 테이블 조회
+- 모듈 속성(틱): 요청 컨텍스트 밖 DLG.X (모듈 __getattr__ → 기본 언어)
+- 모듈 속성(요청): 요청 컨텍스트 안 DLG.X (세션 언어 조회 포함)
+- 키 문자열: get_random_dialogue('GATHER_SUCCESS_BIG', lang) 처럼 키로 조회
+DB를 쓰지 않는다.
+
+    python -m benchmarks.dialogue_pick --picks 100000
+"""
+from benchmarks import common
+
+
+def main():
+    p = common.parser(__doc__.strip().splitlines()[0])
+    p.add_argument('--picks', type=int, default=100000)
+    p.add_argument('--repeat', type=int, default=5)
+    p.add_argument('--lang', default='ja')
+    args = p.parse_args()
+    common.setup_env(args.database_url)
+
+    from flask import session
+    from app import dialogues as DLG
+    from app import rng as RNG
+
+    picks, lang = range(args.picks), args.lang
+    held = DLG.table(lang)
+
+    def held_table():
+        for _ in picks:
+            DLG.get_random_dialogue(held.GATHER_DEPART['adult'])
+
+    def table_each():
+        for _ in picks:
+            DLG.get_random_dialogue(DLG.table(lang).GATHER_DEPART['adult'])
+
+    def module_attr():
+        for _ in picks:
+            DLG.get_random_dialogue(DLG.GATHER_DEPART['adult'])
+
+    def key_string():
+        for _ in picks:
+            DLG.get_random_dialogue('GATHER_SUCCESS_BIG', lang)
+
+    def bare_choice():
+        choices = held.GATHER_DEPART['adult']
+        for _ in picks:
+            RNG.choice(choices)
+
+    cases = [('RNG.choice만 (기준)', bare_choice), ('테이블 유지', held_table),
+             ('table(lang) 매번', table_each), ('키 문자열', key_string),
+             ('모듈 속성(틱)', module_attr)]
+
+    rows = []
+    with common.bench_app() as app, RNG.stream('bench', 'dialogue'):
+        for label, fn in cases:
+            median, _ = common.measure(fn, repeat=args.repeat)
+            rows.append([label, f'{median / args.picks * 1e9:.0f}'])
+        with app.test_request_context('/'):
+            session['lang'] = lang
+            median, _ = common.measure(module_attr, repeat=args.repeat)
+            rows.append(['모듈 속성(요청)', f'{median / args.picks * 1e9:.0f}'])
+
+    base = float(rows[0][1])
+    for row in rows:
+        row.append(f'+{float(row[1]) - base:.0f}')
+    common.print_table(['조회 경로', 'ns/회', '선택 외 오버헤드 ns'], rows)
+
+
+if __name__ == '__main__':
+    main()
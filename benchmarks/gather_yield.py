@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+"""
+[v1.7.0] 채집 수확량 계산 시간 ↔ 채집 인원 (benchmarks/gather_yield.py)
+
+_gather_yield(randint_sum/binomial 집계 추출)와 이전 인원별 반복(randint·random() 1회씩)의
+호출당 시간을 비교한다. 성체:자실장 = 1:1. DB를 쓰지 않는 순수 계산 측정.
+
+    python -m benchmarks.gather_yield --sizes 10 100 1000 10000 100000
+"""
+from benchmarks import common
+
+
+def _gather_loop(num_adults, num_children):
+    """이전 구현 (채집 인원마다 추출)"""
+    from app.config import GameConfig as GC
+    from app import rng as RNG
+    result = {'trash': 0, 'konpeito': 0, 'material': 0}
+    for count, trash, mat, chance in (
+            (num_adults, GC.GATHER_TRASH_ADULT, GC.GATHER_MAT_ADULT, GC.GATHER_KONPEITO_ADULT_CHANCE),
+            (num_children, GC.GATHER_TRASH_CHILD, GC.GATHER_MAT_CHILD, GC.GATHER_KONPEITO_CHILD_CHANCE)):
+        for _ in range(count):
+            result['trash'] += RNG.randint(*trash)
+            result['material'] += RNG.randint(*mat)
+            if RNG.random() < chance:
+                result['konpeito'] += 1
+    return result
+
+
+def main():
+    p = common.parser(__doc__.strip().splitlines()[0])
+    p.add_argument('--sizes', type=int, nargs='+', default=[10, 100, 1000, 10000, 100000])
+    p.add_argument('--repeat', type=int, default=20)
+    args = p.parse_args()
+    common.setup_env(args.database_url)
+
+    from app import game_engine
+    from app import rng as RNG
+
+    rows = []
+    for gatherers in args.sizes:
+        adults, children = gatherers // 2, gatherers - gatherers // 2
+
+        def aggregate():
+            with RNG.stream('bench', 'gather', gatherers):
+                game_engine._gather_yield(adults, children)
+
+        def loop():
+            with RNG.stream('bench', 'gather', gatherers):
+                _gather_loop(adults, children)
+
+        new, _ = common.measure(aggregate, repeat=args.repeat)
+        old, _ = common.measure(loop, repeat=max(3, args.repeat // 4))
+        rows.append([gatherers, f'{new * 1e6:.1f}', f'{old * 1e6:.1f}', f'{old / new:.1f}x'])
+
+    common.print_table(['채집 인원', '집계 us', '반복 us', '배속'], rows)
+
+
+if __name__ == '__main__':
+    main()
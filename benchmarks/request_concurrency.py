@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+"""
+[v1.7.0] 동시 요청 처리량 ↔ 스레드 수 ↔ DB 프로필 (benchmarks/request_concurrency.py)
+
+플레이어마다 스레드 1개(gunicorn gthread와 같은 단일 프로세스 스레드 모델)가 측정 시간 동안
+대시보드 GET과 채집 POST를 번갈아 보낸다. 대시보드도 매번 턴 충전으로 쓰도록 충전 간격을 줄인다.
+- production: WAL + 쓰기 요청 BEGIN IMMEDIATE (@UOW.transactional GET 포함)
+- production(표시 없음): 대시보드의 writes_db 표시를 지운 이전 동작 (GET은 DEFERRED로 시작해 쓰기로 올라감)
+- legacy: 롤백 저널 + 드라이버 기본 트랜잭션
+요청/초와 실패 요청 수("database is locked" 따로)를 출력한다. SQLite 전용 비교 (PostgreSQL은 행 잠금).
+
+    python -m benchmarks.request_concurrency --threads 1 2 4 8 --seconds 3
+"""
+import logging
+import threading
+import time
+
+from benchmarks import common
+
+PASSWORD = 'bench1234'
+VARIANTS = ('production', 'production(표시 없음)', 'legacy')
+
+
+def _make_players(count):
+    """로그인 가능한 플레이어 공원 count개. 반환: 사용자 이름 리스트"""
+    from app.models import db, User, Park
+    ids = common.make_parks(count)
+    names = []
+    for park_id in ids:
+        user = User(username=f'player{park_id}')
+        user.set_password(PASSWORD)
+        db.session.add(user)
+        db.session.flush()
+        db.session.get(Park, park_id).user_id = user.id
+        names.append(user.username)
+    db.session.commit()
+    db.session.remove()
+    return names
+
+
+def _player(app, username, deadline, counts, lock):
+    client = app.test_client()
+    client.post('/login', data={'username': username, 'password': PASSWORD})
+    done = failed = 0
+    while time.perf_counter() < deadline:
+        if done % 2:
+            response = client.post('/game/gather', data={'num_adults': 1, 'num_children': 0})
+        else:
+            response = client.get('/game/dashboard')
+        done += 1
+        failed += response.status_code >= 500
+    with lock:
+        counts['requests'] += done
+        counts['failed'] += failed
+
+
+def _run(variant, threads, seconds):
+    """variant 프로필 앱에서 threads개 스레드로 seconds초. 반환: (요청/초, 실패 수, 잠금 오류 수)"""
+    from flask import got_request_exception
+    from app.config import Config
+
+    Config.DB_PROFILE = 'legacy' if variant == 'legacy' else 'production'
+    with common.bench_app() as app:
+        app.config.update(WTF_CSRF_ENABLED=False, PROPAGATE_EXCEPTIONS=False)   # 예외는 500 응답으로
+        app.logger.setLevel(logging.CRITICAL)   # 500 응답의 스택 트레이스 생략 (아래에서 센다)
+        if variant == 'production(표시 없음)':
+            app.view_functions['game.dashboard'].writes_db = False
+        names = _make_players(threads)
+
+        counts = {'requests': 0, 'failed': 0, 'locked': 0}
+        lock = threading.Lock()
+
+        def on_exception(sender, exception, **extra):
+            if 'database is locked' in str(exception):
+                with lock:
+                    counts['locked'] += 1
+
+        got_request_exception.connect(on_exception, app)
+        deadline = time.perf_counter() + seconds
+        workers = [threading.Thread(target=_player, args=(app, name, deadline, counts, lock))
+                   for name in names]
+        start = time.perf_counter()
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        elapsed = time.perf_counter() - start
+        got_request_exception.disconnect(on_exception, app)
+    return counts['requests'] / elapsed, counts['failed'], counts['locked']
+
+
+def main():
+    p = common.parser(__doc__.strip().splitlines()[0])
+    p.add_argument('--threads', type=int, nargs='+', default=[1, 2, 4, 8])
+    p.add_argument('--seconds', type=float, default=3.0)
+    p.add_argument('--variants', nargs='+', choices=VARIANTS, default=list(VARIANTS))
+    args = p.parse_args()
+    common.setup_env(args.database_url)
+
+    from app.config import GameConfig as GC
+    GC.TURN_REGEN_SECONDS = 0.001   # 대시보드 GET마다 턴 충전 → 쓰기
+
+    rows = []
+    for variant in args.variants:
+        for threads in args.threads:
+            rate, failed, locked = _run(variant, threads, args.seconds)
+            rows.append([variant, threads, f'{rate:.0f}', failed, locked])
+
+    common.print_table(['프로필', '스레드', '요청/초', '실패(5xx)', 'database is locked'], rows)
+
+
+if __name__ == '__main__':
+    main()
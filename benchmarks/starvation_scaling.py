@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+"""
+[v1.7.0] 기아/카니발리즘 계산 시간 ↔ 인구 (benchmarks/starvation_scaling.py)
+
+인구 10^3 ~ 10^6에서 _process_starvation(종류별 산술)과 _process_cannibalism(이항분포 1회)의
+호출당 시간을 이전 1마리씩 반복 구현과 비교한다. 현재 구현은 인구와 무관하게 일정해야 한다.
+
+    python -m benchmarks.starvation_scaling --sizes 1000 100000 1000000
+"""
+from types import SimpleNamespace
+
+from benchmarks import common
+
+
+def _park(population):
+    return SimpleNamespace(id=1, turn_count=1, is_destroyed=False, boss_hp=100, morale=50,
+                           guard_count=population, adult_count=population,
+                           child_count=population, baby_count=population,
+                           trash_food=0, meat_stock=0, konpeito=0)
+
+
+def _starvation_loop(park, shortage):
+    """이전 구현 (1마리씩 사망)"""
+    while shortage > 0:
+        if park.baby_count > 0:
+            park.baby_count -= 1
+            shortage -= 1
+        elif park.child_count > 0:
+            park.child_count -= 1
+            shortage -= 2
+        elif park.adult_count > 0:
+            park.adult_count -= 1
+            shortage -= 5
+        else:
+            park.boss_hp -= 10
+            shortage = 0
+
+
+def _cannibalism_loop(park):
+    """이전 구현 (경호마다 판정)"""
+    from app.config import GameConfig as GC
+    from app import rng as RNG
+    for _ in range(park.guard_count):
+        if RNG.random() < GC.CANNIBALISM_GUARD_FEED_CHANCE and park.child_count > 0:
+            park.child_count -= 1
+            park.meat_stock += 1
+
+
+def _time(fn, population, repeat):
+    """새 공원으로 fn(park)을 반복 실행. 반환: 호출당 중앙값 (마이크로초)"""
+    from app import rng as RNG
+
+    def run():
+        with RNG.stream('bench', population):
+            fn(_park(population))
+    median, _ = common.measure(run, repeat=repeat)
+    return median * 1e6
+
+
+def main():
+    p = common.parser(__doc__.strip().splitlines()[0])
+    p.add_argument('--sizes', type=int, nargs='+', default=[10 ** 3, 10 ** 4, 10 ** 5, 10 ** 6])
+    p.add_argument('--repeat', type=int, default=5)
+    args = p.parse_args()
+    common.setup_env(args.database_url)
+
+    from app import game_engine
+    from app.models import db
+
+    rows = []
+    with common.bench_app():
+        for population in args.sizes:
+            # 저실장·자실장을 모두 잃고 성체 일부까지 죽는 부족분
+            shortage = population * 3 + 50
+            rows.append([
+                population,
+                f'{_time(lambda park: game_engine._process_starvation(park, shortage), population, args.repeat):.1f}',
+                f'{_time(lambda park: _starvation_loop(park, shortage), population, args.repeat):.1f}',
+                f'{_time(game_engine._process_cannibalism, population, args.repeat):.1f}',
+                f'{_time(_cannibalism_loop, population, args.repeat):.1f}',
+            ])
+            db.session.rollback()   # 쌓인 이벤트 버퍼 버림
+
+    common.print_table(['인구(종류별)', '기아 us', '기아(반복) us', '카니발 us', '카니발(반복) us'], rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+"""
+[v1.7.0] 월드 틱 벽시계 시간 ↔ 워커 수 (benchmarks/tick_scaling.py)
+
+같은 월드를 스칼라 틱(TICK_ENGINE='scalar')과 샤딩 틱(TICK_ENGINE='sharded', 워커 1/2/4…)으로 처리해
+틱당 시간과 스칼라 대비 배속을 출력한다. 워커 풀 생성(spawn)은 예열 틱에서 끝나므로 측정에서 빠진다.
+배속은 CPU 코어 수를 넘지 못한다 (코어보다 많은 워커는 표에 * 표시).
+SQLite는 쓰기가 직렬화되므로 PostgreSQL(--database-url)에서 더 잘 늘어난다.
+
+    python -m benchmarks.tick_scaling --parks 5000 --workers 1 2 4
+"""
+import os
+
+from benchmarks import common
+
+
+def _run_config(app, engine, workers, parks, ticks):
+    from app.config import GameConfig as GC
+    from app import sharded_tick
+    from app.turn_scheduler import _process_all_turns
+
+    sharded_tick.shutdown()
+    common.reset_db()
+    common.make_parks(parks)
+    GC.TICK_ENGINE = engine
+    GC.TICK_WORKERS = workers
+    median, best = common.measure(lambda: _process_all_turns(app), repeat=ticks)
+    sharded_tick.shutdown()
+    return median, best
+
+
+def main():
+    p = common.parser(__doc__.strip().splitlines()[0])
+    p.add_argument('--parks', type=int, default=3000)
+    p.add_argument('--ticks', type=int, default=3, help='측정 틱 수 (예열 1틱 별도)')
+    p.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4])
+    args = p.parse_args()
+    common.setup_env(args.database_url)
+
+    cores = os.cpu_count() or 1
+    rows = []
+    with common.bench_app() as app:
+        scalar, _ = _run_config(app, 'scalar', 1, args.parks, args.ticks)
+        rows.append(['scalar', '-', f'{scalar:.3f}', '1.00x', f'{args.parks / scalar:.0f}'])
+        for workers in args.workers:
+            median, _ = _run_config(app, 'sharded', workers, args.parks, args.ticks)
+            label = f'{workers}*' if workers > cores else str(workers)
+            rows.append(['sharded', label, f'{median:.3f}', f'{scalar / median:.2f}x',
+                         f'{args.parks / median:.0f}'])
+
+    print(f"공원 {args.parks}개, 측정 {args.ticks}틱, CPU 코어 {cores}개, DB {os.environ['DATABASE_URL']}")
+    common.print_table(['엔진', '워커', '틱당 초(중앙값)', '배속', '공원/초'], rows)
+
+
+if __name__ == '__main__':
+    main()
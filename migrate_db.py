@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+"""
+[v1.7.0] 마이그레이션 공용 DB 연결 (SQLite / PostgreSQL)
+migrate_v1_*.py가 sqlite3 모듈 대신 SQLAlchemy 엔진으로 실행 → 같은 스크립트가 두 DB에서 동작.
+
+- 대상 DB: DATABASE_URL 환경 변수 (앱과 같은 규칙, app/config.py), 없으면 instance/game.db
+- 컬럼/인덱스 확인: SQLAlchemy inspect (PRAGMA table_info, sqlite_master 대신)
+- 컬럼 DDL은 두 DB 공통 형식으로 적는다 (BOOLEAN 기본값은 FALSE/TRUE, 날짜는 TIMESTAMP)
+- 새 테이블은 app/models.py 정의로 생성 (방언별 자동 증가 키/타입)
+"""
+import os
+
+from sqlalchemy import create_engine, inspect
+
+from app.config import _database_url
+
+SQLITE_PATH = os.path.join(os.path.dirname(__file__), 'instance', 'game.db')
+
+
+def database_url():
+    """마이그레이션 대상 DB URL"""
+    url = os.environ.get('DATABASE_URL')
+    if url:
+        return _database_url(url)
+    return f"sqlite:///{SQLITE_PATH}"
+
+
+def connect():
+    """
+    대상 DB 엔진 (SQLite 파일이 없으면 오류 출력 후 None).
+    사용: with engine.begin() as conn: ... (블록 끝에서 커밋)
+    """
+    url = database_url()
+    if url.startswith('sqlite') and not os.environ.get('DATABASE_URL') \
+            and not os.path.exists(SQLITE_PATH):
+        print(f"[오류] DB 파일을 찾을 수 없습니다: {SQLITE_PATH}")
+        return None
+    return create_engine(url)
+
+
+def existing_columns(conn, table):
+    """테이블의 컬럼 이름 리스트 (테이블이 없으면 빈 리스트)"""
+    inspector = inspect(conn)
+    if not inspector.has_table(table):
+        return []
+    return [col['name'] for col in inspector.get_columns(table)]
+
+
+def add_columns(conn, table, new_columns):
+    """테이블에 없는 컬럼만 추가"""
+    existing = existing_columns(conn, table)
+
+    for col_name, col_def in new_columns:
+        if col_name not in existing:
+            conn.exec_driver_sql(f"ALTER TABLE {table} ADD COLUMN {col_name} {col_def}")
+            print(f"  [추가] {table}.{col_name} ({col_def})")
+        else:
+            print(f"  [존재] {table}.{col_name} - 이미 있음, 스킵")
+
+
+def create_table(conn, model):
+    """모델 테이블이 없으면 생성"""
+    table = model.__table__
+    if inspect(conn).has_table(table.name):
+        print(f"  [존재] {table.name} 테이블 - 이미 있음, 스킵")
+        return False
+    table.create(conn)
+    print(f"  [추가] {table.name} 테이블")
+    return True
@@ -0,0 +1,258 @@
+# -*- coding: utf-8 -*-
+"""
+[v1.7.0] DB 마이그레이션 - 성능 개선 필드 추가
+- parks 테이블에 npc_turn_debt 컬럼 추가 (NPC 동기 처리 비동기화)
+- parks 테이블에 state_version 컬럼 추가 (대시보드 캐시/ETag)
+- event_logs 테이블에 code/params/line 컬럼 추가 (이벤트 메시지 지연 렌더링)
+- battle_logs 피해 JSON → 정수 컬럼 변환, 다시 만들 수 있는 본문(log_text)은 비움 (조회 시 생성)
+- park_stats 테이블 생성 + battle_logs에서 백필 (전투 통계 카운터)
+- 핫 쿼리용 복합 인덱스 생성 (실행 계획 점검은 tests/test_query_plans.py)
+- SQLite/PostgreSQL 공용 (migrate_db, 대상은 DATABASE_URL 또는 instance/game.db)
+
+사용법:
+  python migrate_v1_7.py                  # 마이그레이션
+  python migrate_v1_7.py --rebuild-stats  # park_stats를 battle_logs에서 다시 계산
+"""
+import json
+import re
+import sys
+
+from sqlalchemy import inspect, text
+
+import migrate_db
+from app.models import ParkStats
+
+# 복합 인덱스 (app/models.py의 __table_args__와 동일하게 유지)
+INDEXES = [
+    ('ix_parks_user', 'parks', 'user_id'),
+    ('ix_build_queue_park', 'build_queue', 'park_id'),
+    ('ix_train_queue_park', 'train_queue', 'park_id'),
+    ('ix_battle_logs_attacker_result', 'battle_logs', 'attacker_id, result'),
+    ('ix_battle_logs_defender_result', 'battle_logs', 'defender_id, result'),
+    ('ix_battle_logs_attacker_created', 'battle_logs', 'attacker_id, created_at, id'),
+    ('ix_battle_logs_defender_created', 'battle_logs', 'defender_id, created_at, id'),
+    ('ix_battle_logs_pair_created', 'battle_logs', 'attacker_id, defender_id, created_at, id'),
+    ('ix_event_logs_park_created', 'event_logs', 'park_id, created_at'),
+    ('ix_event_logs_park_type_id', 'event_logs', 'park_id, event_type, id'),
+    ('ix_event_logs_park_type_created', 'event_logs', 'park_id, event_type, created_at, id'),
+    ('ix_trade_offers_status_receiver', 'trade_offers', 'status, receiver_id'),
+    ('ix_trade_offers_sender_status', 'trade_offers', 'sender_id, status'),
+    ('ix_diplomacies_a_b_type_status', 'diplomacies', 'park_a_id, park_b_id, relation_type, status'),
+    ('ix_diplomacies_b_a_type_status', 'diplomacies', 'park_b_id, park_a_id, relation_type, status'),
+    ('ix_spy_missions_status_sender', 'spy_missions', 'status, sender_id'),
+]
+
+# 전투 로그 본문 [출정 편성] 줄 (app/battle_engine.py format_battle_log)
+_FORMATION = re.compile(r"\[출정 편성\] ⚔️경호 (\d+) \+ 🧑성체 (\d+)( \+ 👑보스)?")
+_LOOT_KEYS = ('konpeito', 'trash', 'material', 'babies', 'children')
+
+
+def _battle_text(attacker_name, defender_name, attacker_wins, atk_losses, def_losses, loot,
+                 send_guards, send_adults, boss_joins):
+    """전투 로그 본문 (app/battle_engine.py의 format_battle_log와 동일하게 유지 - 변환 검증용)"""
+    lines = [f"⚔️ {attacker_name} vs {defender_name}",
+             f"결과: {'🏆 공격자 승리!' if attacker_wins else '🛡️ 방어자 승리!'}",
+             "",
+             f"[출정 편성] ⚔️경호 {send_guards} + 🧑성체 {send_adults}{' + 👑보스' if boss_joins else ''}",
+             "",
+             "[공격자 피해]",
+             f"  ⚔️경호 -{atk_losses.get('guards', 0)}, 🧑성체 -{atk_losses.get('adults', 0)}",
+             "[방어자 피해]",
+             f"  ⚔️경호 -{def_losses.get('guards', 0)}, 🧑성체 -{def_losses.get('adults', 0)}, "
+             f"👶자실장 -{def_losses.get('children', 0)}"]
+    if attacker_wins:
+        lines += ["", "[약탈 내역]",
+                  f"  🍬콘페이토: {loot['konpeito']}",
+                  f"  🗑️음쓰: {loot['trash']}",
+                  f"  🧱자재: {loot['material']}",
+                  f"  🐛저실장: {loot['babies']}마리 포획",
+                  f"  👶자실장: {loot['children']}마리 포획"]
+    return "\n".join(lines)
+
+
+def convert_battle_logs(conn, batch=1000):
+    """
+    battle_logs 피해 JSON(attacker_losses/defender_losses) → 정수 컬럼.
+    - 출정 편성은 본문의 [출정 편성] 줄에서 읽는다
+    - 현재 공원 이름으로 다시 만든 본문이 저장된 본문과 같으면 log_text를 비운다 (조회 시 생성)
+      다르면(삭제된 공원, 편성 줄이 없는 옛 형식 등) 본문을 그대로 둔다
+    - 변환한 행의 JSON은 NULL → 중단돼도 다시 실행하면 이어서 처리
+    """
+    if 'attacker_losses' not in migrate_db.existing_columns(conn, 'battle_logs'):
+        print("  [존재] battle_logs - 피해 JSON 컬럼 없음, 변환 스킵")
+        return
+
+    converted = compacted = 0
+    last_id = 0
+    while True:
+        rows = conn.execute(text('''
+            SELECT b.id, b.result, b.log_text, b.attacker_losses, b.defender_losses,
+                   b.loot_konpeito, b.loot_trash, b.loot_material, b.loot_babies, b.loot_children,
+                   a.name, d.name
+            FROM battle_logs b
+            LEFT JOIN parks a ON a.id = b.attacker_id
+            LEFT JOIN parks d ON d.id = b.defender_id
+            WHERE b.id > :last_id AND b.attacker_losses IS NOT NULL
+            ORDER BY b.id LIMIT :batch'''), {'last_id': last_id, 'batch': batch}).all()
+        if not rows:
+            break
+
+        updates = []
+        for row in rows:
+            log_id, result, log_text, atk_json, def_json = row[:5]
+            loot = dict(zip(_LOOT_KEYS, (v or 0 for v in row[5:10])))
+            attacker_name, defender_name = row[10:]
+            atk = json.loads(atk_json or '{}')
+            dfn = json.loads(def_json or '{}')
+
+            formation = _FORMATION.search(log_text or '')
+            if formation:
+                send_guards, send_adults = int(formation.group(1)), int(formation.group(2))
+                boss_joins = bool(formation.group(3))
+            else:
+                send_guards = send_adults = 0
+                boss_joins = False
+
+            if (formation and attacker_name is not None and defender_name is not None
+                    and log_text == _battle_text(attacker_name, defender_name, result == 'win',
+                                                 atk, dfn, loot, send_guards, send_adults,
+                                                 boss_joins)):
+                log_text = ''
+                compacted += 1
+
+            updates.append({
+                'sent_guards': send_guards, 'sent_adults': send_adults, 'boss_joined': boss_joins,
+                'atk_lost_guards': atk.get('guards', 0), 'atk_lost_adults': atk.get('adults', 0),
+                'def_lost_guards': dfn.get('guards', 0), 'def_lost_adults': dfn.get('adults', 0),
+                'def_lost_children': dfn.get('children', 0),
+                'log_text': log_text, 'id': log_id,
+            })
+
+        conn.execute(text('''
+            UPDATE battle_logs
+            SET sent_guards = :sent_guards, sent_adults = :sent_adults, boss_joined = :boss_joined,
+                atk_lost_guards = :atk_lost_guards, atk_lost_adults = :atk_lost_adults,
+                def_lost_guards = :def_lost_guards, def_lost_adults = :def_lost_adults,
+                def_lost_children = :def_lost_children,
+                log_text = :log_text, attacker_losses = NULL, defender_losses = NULL
+            WHERE id = :id'''), updates)
+        converted += len(rows)
+        last_id = rows[-1][0]
+
+    print(f"  [변환] battle_logs {converted}건 (본문 비움 {compacted}건, "
+          f"디스크 회수는 VACUUM 실행 시)")
+
+
+def rebuild_park_stats(conn):
+    """
+    battle_logs 전체에서 park_stats 재계산.
+    공격자/방어자 관점을 UNION ALL로 펼친 뒤 공원별 조건부 합계 (약탈량 = 5종 수량 합계).
+    """
+    loot_sum = ("COALESCE(loot_konpeito, 0) + COALESCE(loot_trash, 0) + "
+                "COALESCE(loot_material, 0) + COALESCE(loot_babies, 0) + "
+                "COALESCE(loot_children, 0)")
+    conn.execute(text("DELETE FROM park_stats"))
+    result = conn.execute(text(f'''
+        INSERT INTO park_stats (park_id, wins, losses, battles, loot_taken, loot_lost, last_battle_at)
+        SELECT park_id, SUM(win), SUM(loss), COUNT(*), SUM(taken), SUM(lost), MAX(at)
+        FROM (
+            SELECT attacker_id AS park_id,
+                   CASE WHEN result = 'win' THEN 1 ELSE 0 END AS win,
+                   CASE WHEN result = 'win' THEN 0 ELSE 1 END AS loss,
+                   CASE WHEN result = 'win' THEN {loot_sum} ELSE 0 END AS taken,
+                   0 AS lost,
+                   created_at AS at
+            FROM battle_logs
+            UNION ALL
+            SELECT defender_id,
+                   CASE WHEN result = 'win' THEN 0 ELSE 1 END,
+                   CASE WHEN result = 'win' THEN 1 ELSE 0 END,
+                   0,
+                   CASE WHEN result = 'win' THEN {loot_sum} ELSE 0 END,
+                   created_at
+            FROM battle_logs
+        ) AS sides
+        GROUP BY park_id
+    '''))
+    print(f"  [백필] park_stats {result.rowcount}개 공원 재계산")
+
+
+def create_indexes(conn):
+    """복합 인덱스 생성 (이미 있으면 스킵)"""
+    inspector = inspect(conn)
+    existing = {index['name']
+                for table in {table for _, table, _ in INDEXES}
+                for index in inspector.get_indexes(table)}
+    for name, table, columns in INDEXES:
+        conn.exec_driver_sql(f"CREATE INDEX IF NOT EXISTS {name} ON {table} ({columns})")
+        status = "[존재]" if name in existing else "[추가]"
+        print(f"  {status} {name} ON {table} ({columns})")
+    conn.exec_driver_sql("ANALYZE")
+
+
+def migrate():
+    """v1.7.0 마이그레이션 실행"""
+    engine = migrate_db.connect()
+    if engine is None:
+        return
+
+    with engine.begin() as conn:
+        # NPC 턴 빚 (플레이어 턴 소비 → 백그라운드 NPC 틱)
+        migrate_db.add_columns(conn, 'parks', [
+            ("npc_turn_debt", "INTEGER NOT NULL DEFAULT 0"),
+            # 상태 버전 (대시보드 조각 캐시/ETag 키)
+            ("state_version", "INTEGER NOT NULL DEFAULT 0"),
+        ])
+
+        # 코드 기록 이벤트 (읽을 때 렌더링, app/event_text.py) - 기존 행은 code가 NULL → message 그대로 표시
+        migrate_db.add_columns(conn, 'event_logs', [
+            ("code", "VARCHAR(32)"),
+            ("params", "TEXT"),
+            ("line", "SMALLINT"),
+        ])
+
+        # 전투 기록 압축 저장 (출정 편성 + 양측 피해 정수 컬럼, 본문은 조회 시 생성)
+        migrate_db.add_columns(conn, 'battle_logs', [
+            ("sent_guards", "INTEGER NOT NULL DEFAULT 0"),
+            ("sent_adults", "INTEGER NOT NULL DEFAULT 0"),
+            ("boss_joined", "BOOLEAN NOT NULL DEFAULT FALSE"),
+            ("atk_lost_guards", "INTEGER NOT NULL DEFAULT 0"),
+            ("atk_lost_adults", "INTEGER NOT NULL DEFAULT 0"),
+            ("def_lost_guards", "INTEGER NOT NULL DEFAULT 0"),
+            ("def_lost_adults", "INTEGER NOT NULL DEFAULT 0"),
+            ("def_lost_children", "INTEGER NOT NULL DEFAULT 0"),
+        ])
+        convert_battle_logs(conn)
+
+        # 전투 통계 카운터 (비어 있을 때만 백필 - 앱의 create_all()이 빈 테이블을 먼저 만들 수 있음)
+        migrate_db.create_table(conn, ParkStats)
+        if conn.execute(text("SELECT COUNT(*) FROM park_stats")).scalar() == 0:
+            rebuild_park_stats(conn)
+        else:
+            print("  [존재] park_stats - 이미 집계됨, 스킵 (재계산: --rebuild-stats)")
+
+        # 핫 쿼리 복합 인덱스
+        create_indexes(conn)
+
+    print("\n[완료] v1.7.0 마이그레이션 성공!")
+
+
+def rebuild():
+    """--rebuild-stats: park_stats만 다시 계산"""
+    engine = migrate_db.connect()
+    if engine is None:
+        return
+
+    with engine.begin() as conn:
+        rebuild_park_stats(conn)
+    print("\n[완료] park_stats 재계산 성공!")
+
+
+if __name__ == '__main__':
+    print("=" * 50)
+    print("  v1.7.0 DB 마이그레이션 - 성능 개선")
+    print("=" * 50)
+    if '--rebuild-stats' in sys.argv:
+        rebuild()
+    else:
+        migrate()
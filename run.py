@@ -1,11 +1,13 @@
 # -*- coding: utf-8 -*-
 """
 실장석 공원 제국 - 서버 실행 진입점 (run.py)
-[v1.0.0] 개발 서버 실행. Gunicorn에서도 app 객체 직접 사용 가능.
+[v1.0.0] 개발 서버 실행.
+[v1.7.0] 앱은 __main__에서만 생성한다. 샤딩 틱 워커(spawn)가 이 모듈을 __mp_main__으로
+다시 import해도 앱/스케줄러가 생기지 않도록. Gunicorn은 앱 팩토리를 직접 호출한다.
 
 사용법:
-    python run.py                           # 개발 서버
-    gunicorn --bind 0.0.0.0:8000 "run:app"  # 프로덕션 서버
+    python run.py                                     # 개발 서버
+    gunicorn --bind 0.0.0.0:8000 "app:create_app()"   # 프로덕션 서버
 """
 import os
 import sys
@@ -18,9 +20,8 @@ if sys.platform == 'win32':
 
 from app import create_app
 
-app = create_app()
-
 if __name__ == '__main__':
+    app = create_app()
     print("=" * 60)
     print("  Jissou Park Empire v0.1.0")
     print("  http://localhost:5000")
@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+"""
+테스트 공용 픽스처 (conftest.py)
+[v1.7.0] 테스트마다 임시 SQLite 파일 DB로 앱을 만든다 (스케줄러 없음, 월드 시드 고정).
+
+- TEST_DATABASE_URL을 주면 그 DB에서 실행 (예: PostgreSQL - 테스트가 끝나면 테이블 삭제)
+- NPC 초기 공원은 만들지 않는다 (테스트가 필요한 공원만 make_park로 생성)
+"""
+import os
+from collections import OrderedDict
+
+import pytest
+
+from app import create_app, leaderboard, fragment_cache
+from app import rng as RNG
+from app.config import Config, GameConfig as GC, _database_url
+from app.models import db, User, Park
+
+TEST_SEED = 'jissou-test'
+
+
+@pytest.fixture
+def app(tmp_path, monkeypatch):
+    """앱 + 앱 컨텍스트 (테스트 동안 유지)"""
+    url = os.environ.get('TEST_DATABASE_URL')
+    monkeypatch.setattr(Config, 'SQLALCHEMY_DATABASE_URI',
+                        _database_url(url) if url else f"sqlite:///{tmp_path / 'game.db'}")
+    monkeypatch.setattr(Config, 'WTF_CSRF_ENABLED', False, raising=False)
+    monkeypatch.setattr(Config, 'TESTING', True, raising=False)
+    monkeypatch.setattr(GC, 'NPC_INITIAL_COUNT', 0)
+
+    # 프로세스 전역 캐시는 테스트 사이에 공유되지 않도록 비운다
+    monkeypatch.setattr(leaderboard, '_snapshot', None)
+    monkeypatch.setattr(fragment_cache, '_slots', OrderedDict())
+    RNG.set_world_seed(TEST_SEED)
+
+    app = create_app(start_scheduler=False)
+    with app.app_context():
+        yield app
+        db.session.remove()
+        if url:
+            db.drop_all()
+        db.engine.dispose()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def make_park(app):
+    """공원 생성 함수 (초기 자원 기본값, 필드는 키워드로 덮어쓴다). 커밋까지 한다"""
+    counter = {'n': 0}
+
+    def factory(name=None, user=False, **fields):
+        counter['n'] += 1
+        name = name or f'park{counter["n"]}'
+        values = dict(
+            name=name, is_npc=False, boss_hp=GC.INITIAL_BOSS_HP,
+            guard_count=GC.INITIAL_GUARDS, adult_count=GC.INITIAL_ADULTS,
+            child_count=GC.INITIAL_CHILDREN, baby_count=GC.INITIAL_BABIES,
+            konpeito=GC.INITIAL_KONPEITO, trash_food=GC.INITIAL_TRASH_FOOD,
+            meat_stock=GC.INITIAL_MEAT_STOCK, material=GC.INITIAL_MATERIAL,
+            konpeito_cap=GC.INITIAL_KONPEITO_CAP, trash_food_cap=GC.INITIAL_TRASH_FOOD_CAP,
+            material_cap=GC.INITIAL_MATERIAL_CAP, population_cap=GC.INITIAL_POP_CAP,
+            morale=GC.INITIAL_MORALE, action_points=GC.ACTION_POINTS_PER_TURN,
+        )
+        values.update(fields)
+        if user:
+            account = User(username=name)
+            account.set_password('pass1234')
+            db.session.add(account)
+            db.session.flush()
+            values['user_id'] = account.id
+        park = Park(**values)
+        db.session.add(park)
+        db.session.commit()
+        return park
+
+    return factory
+
+
+@pytest.fixture
+def login(client):
+    """make_park(user=True)로 만든 계정으로 테스트 클라이언트 로그인"""
+    def do_login(username, password='pass1234'):
+        return client.post('/login', data={'username': username, 'password': password})
+    return do_login
@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+"""
+[v1.7.0] 전투 예측(battle_sim.forecast) ↔ 실제 전투(battle_engine.execute_battle) 분포 비교.
+
+같은 두 공원 상태에서 실제 전투를 시드만 바꿔 반복(매번 롤백)하고, 예측 표본과
+승패·양측 피해·약탈·보스 피해의 평균·분산이 허용 오차(표준오차 5배) 안인지 본다.
+"""
+import math
+
+import pytest
+
+from app import battle_engine, battle_sim
+from app import rng as RNG
+from app import unit_of_work as UOW
+from app.models import db, Park, BattleLog
+
+BATTLES = 600
+FORECAST_SAMPLES = 4000
+SEND_GUARDS, SEND_ADULTS = 10, 20
+METRICS = ('win', 'atk_lost_guards', 'atk_lost_adults', 'def_lost_guards', 'def_lost_adults',
+           'def_lost_children', 'loot', 'atk_boss_damage', 'def_boss_damage')
+
+
+def _moments(values):
+    n = len(values)
+    mean = sum(values) / n
+    var = sum((x - mean) ** 2 for x in values) / (n - 1)
+    m4 = sum((x - mean) ** 4 for x in values) / n
+    return n, mean, var, m4
+
+
+def _assert_same_moments(label, a, b):
+    """두 표본의 평균·분산 비교 (분산의 표준오차는 4차 모멘트로 추정)"""
+    na, mean_a, var_a, m4_a = _moments(a)
+    nb, mean_b, var_b, m4_b = _moments(b)
+    assert abs(mean_a - mean_b) <= 5 * math.sqrt(var_a / na + var_b / nb) + 1e-9, \
+        f"{label}: battle mean {mean_a:.3f} vs forecast mean {mean_b:.3f}"
+    se_var = math.sqrt(max(0.0, m4_a - var_a ** 2) / na + max(0.0, m4_b - var_b ** 2) / nb)
+    assert abs(var_a - var_b) <= 5 * se_var + 1e-9, \
+        f"{label}: battle var {var_a:.3f} vs forecast var {var_b:.3f}"
+
+
+@pytest.fixture
+def parks(make_park):
+    attacker = make_park('attacker', guard_count=12, adult_count=25, morale=55)
+    defender = make_park('defender', guard_count=8, adult_count=15, child_count=20,
+                         baby_count=10, walls=1, konpeito=30, trash_food=120, material=60)
+    return attacker.id, defender.id
+
+
+def _battle_samples(attacker_id, defender_id):
+    samples = {name: [] for name in METRICS}
+    for i in range(BATTLES):
+        RNG.set_world_seed(f'battle-{i}')
+        attacker = db.session.get(Park, attacker_id)
+        defender = db.session.get(Park, defender_id)
+        atk_boss, def_boss = attacker.boss_hp, defender.boss_hp
+        with UOW.deferred_commit():
+            wins, loot, _ = battle_engine.execute_battle(
+                attacker, defender, SEND_GUARDS, SEND_ADULTS, lang='ko')
+        log = BattleLog.query.filter_by(attacker_id=attacker_id).one()   # 롤백 전이라 이번 전투 1건
+        values = dict(
+            win=int(wins), loot=sum(loot.values()),
+            atk_lost_guards=log.atk_lost_guards, atk_lost_adults=log.atk_lost_adults,
+            def_lost_guards=log.def_lost_guards, def_lost_adults=log.def_lost_adults,
+            def_lost_children=log.def_lost_children,
+            atk_boss_damage=atk_boss - attacker.boss_hp,
+            def_boss_damage=def_boss - defender.boss_hp,
+        )
+        for name in METRICS:
+            samples[name].append(values[name])
+        db.session.rollback()   # 다음 전투도 같은 초기 상태에서
+    return samples
+
+
+def _forecast_samples(attacker_id, defender_id):
+    """samples=1 예측을 반복 → 예측 분포의 개별 표본"""
+    attacker = db.session.get(Park, attacker_id)
+    defender = db.session.get(Park, defender_id)
+    gen = RNG.numpy_generator('test', 'forecast')
+    samples = {name: [] for name in METRICS}
+    for _ in range(FORECAST_SAMPLES):
+        r = battle_sim.forecast(attacker, defender, SEND_GUARDS, SEND_ADULTS, samples=1, rng=gen)
+        values = dict(
+            win=r['win_probability'], loot=r['expected_loot_total'],
+            atk_lost_guards=r['attacker_losses']['guards']['mean'],
+            atk_lost_adults=r['attacker_losses']['adults']['mean'],
+            def_lost_guards=r['defender_losses']['guards']['mean'],
+            def_lost_adults=r['defender_losses']['adults']['mean'],
+            def_lost_children=r['defender_losses']['children']['mean'],
+            atk_boss_damage=r['attacker_boss_damage']['mean'],
+            def_boss_damage=r['defender_boss_damage']['mean'],
+        )
+        for name in METRICS:
+            samples[name].append(values[name])
+    return samples
+
+
+def test_forecast_matches_execute_battle_distribution(app, parks):
+    pytest.importorskip('numpy')
+    battles = _battle_samples(*parks)
+    forecasts = _forecast_samples(*parks)
+
+    win_rate = sum(battles['win']) / BATTLES
+    assert 0.1 < win_rate < 0.9, f'승패가 한쪽으로 치우친 대진 ({win_rate:.2f})'
+    for name in METRICS:
+        _assert_same_moments(name, battles[name], forecasts[name])
+
+
+def test_forecast_does_not_change_state(app, parks):
+    pytest.importorskip('numpy')
+    attacker = db.session.get(Park, parks[0])
+    before = battle_sim.snapshot(attacker)
+    battle_sim.forecast(attacker, db.session.get(Park, parks[1]), samples=100)
+    assert battle_sim.snapshot(attacker) == before
+    assert not db.session.dirty and not db.session.new
@@ -0,0 +1,160 @@
+# -*- coding: utf-8 -*-
+"""
+[v1.7.0] 벡터 엔진(columnar_engine) ↔ 스칼라 엔진(process_turn) 동등성 테스트.
+
+같은 월드를 두 엔진으로 각각 틱하고 공원 유형별 컬럼 평균/이벤트 수를 비교한다.
+난수 소비 순서가 달라 값 단위로는 일치하지 않으므로, 평균 차이가 표준오차의 4배 안인지 본다
+(월드 시드 고정 → 결과는 매번 같음).
+"""
+import math
+from collections import Counter
+
+import pytest
+from sqlalchemy import func
+
+from app.config import GameConfig as GC
+from app.models import db, Park, BuildQueue, TrainQueue, SpyMission, EventLog
+from app.turn_scheduler import _process_all_turns
+
+PARKS_PER_PROFILE = 300
+COLUMNS = (
+    'turn_count', 'guard_count', 'adult_count', 'child_count', 'baby_count',
+    'konpeito', 'trash_food', 'meat_stock', 'material', 'morale', 'boss_hp',
+    'population_cap', 'cardboard_houses', 'unchi_holes', 'walls', 'disease_turns',
+    'is_addicted', 'konpeito_consecutive', 'strike_turns', 'gather_penalty_turns',
+    'consecutive_trash_turns', 'is_destroyed',
+)
+
+# 공원 유형 (이름 접두어 → 초기 상태)
+PROFILES = {
+    # 식량 충분, 운치굴/건설/훈련 대기열 → 성장·번식·재해·질병·건설·훈련 단계
+    'fed': dict(guard_count=3, adult_count=10, child_count=20, baby_count=12,
+                konpeito=20, trash_food=150, meat_stock=5, population_cap=45,
+                cardboard_houses=2, unchi_holes=3, walls=1, morale=55),
+    # 식량 부족, 사기 낮음 → 기아·카니발리즘·반란·중독 단계
+    'starving': dict(guard_count=4, adult_count=5, child_count=12, baby_count=10,
+                     konpeito=3, trash_food=0, meat_stock=0, population_cap=30,
+                     morale=15, boss_hp=15, konpeito_consecutive=2),
+    # 수용 인원이 꽉 찬 상태에서 밀사 귀환 → 밀사(12) 다음 수용 초과(13) 판정 순서
+    'spy': dict(guard_count=0, adult_count=5, child_count=15, baby_count=0,
+                trash_food=200, population_cap=20, cardboard_houses=0, morale=50),
+}
+
+
+def _build_world():
+    """유형별 공원 + 대기열 + 이번 틱에 귀환하는 밀사 (매번 같은 id로 생성)"""
+    target = Park(name='target', boss_hp=100, trash_food=500, baby_count=50)
+    db.session.add(target)
+    db.session.flush()
+
+    for prefix, fields in PROFILES.items():
+        for i in range(PARKS_PER_PROFILE):
+            values = dict(name=f'{prefix}-{i}', boss_hp=100, konpeito_cap=50,
+                          trash_food_cap=200, material_cap=100, material=40)
+            values.update(fields)
+            park = Park(**values)
+            db.session.add(park)
+            db.session.flush()
+            if prefix == 'fed':
+                db.session.add(BuildQueue(park_id=park.id, building_type='cardboard_house',
+                                          turns_remaining=1))
+                db.session.add(TrainQueue(park_id=park.id, turns_remaining=1))
+            elif prefix == 'spy':
+                db.session.add(SpyMission(sender_id=park.id, target_id=target.id,
+                                          turns_remaining=1, status='active'))
+    db.session.commit()
+
+
+def _snapshot():
+    """유형별 컬럼 값 리스트 + 이벤트 타입별 수"""
+    columns = {prefix: {name: [] for name in COLUMNS} for prefix in PROFILES}
+    prefixes = {}
+    for park in Park.query.filter(Park.name != 'target').order_by(Park.id):
+        prefix = park.name.split('-')[0]
+        prefixes[park.id] = prefix
+        for name in COLUMNS:
+            columns[prefix][name].append(float(getattr(park, name)))
+
+    events = {prefix: Counter() for prefix in PROFILES}
+    rows = db.session.query(EventLog.park_id, EventLog.event_type, func.count()) \
+        .group_by(EventLog.park_id, EventLog.event_type).all()
+    for park_id, event_type, count in rows:
+        if park_id in prefixes:
+            events[prefixes[park_id]][event_type] += count
+    db.session.remove()
+    return columns, events
+
+
+def _run(app, engine, ticks, monkeypatch):
+    """월드를 새로 만들고 engine으로 틱 실행. 반환: 틱별 스냅샷 리스트"""
+    monkeypatch.setattr(GC, 'TICK_ENGINE', engine)
+    db.drop_all()
+    db.create_all()
+    _build_world()
+
+    snapshots = []
+    for _ in range(ticks):
+        _process_all_turns(app)
+        snapshots.append(_snapshot())
+    return snapshots
+
+
+def _assert_same_distribution(label, a, b):
+    n_a, n_b = len(a), len(b)
+    mean_a, mean_b = sum(a) / n_a, sum(b) / n_b
+    var_a = sum((x - mean_a) ** 2 for x in a) / max(1, n_a - 1)
+    var_b = sum((x - mean_b) ** 2 for x in b) / max(1, n_b - 1)
+    se = math.sqrt(var_a / n_a + var_b / n_b)
+    assert abs(mean_a - mean_b) <= 4 * se + 1e-9, \
+        f"{label}: scalar mean {mean_a:.3f} vs columnar mean {mean_b:.3f} (se {se:.3f})"
+
+
+@pytest.fixture
+def no_spy_detection(monkeypatch):
+    # 밀사가 항상 귀환하도록 (수용 초과 판정 순서를 결정적으로 검사)
+    monkeypatch.setattr(GC, 'SPY_DETECTION_CHANCE', 0.0)
+
+
+def test_columnar_matches_scalar_distributions(app, monkeypatch, no_spy_detection):
+    pytest.importorskip('numpy')
+    scalar = _run(app, 'scalar', 3, monkeypatch)
+    columnar = _run(app, 'columnar', 3, monkeypatch)
+
+    for tick, ((s_cols, s_events), (c_cols, c_events)) in enumerate(zip(scalar, columnar), 1):
+        for prefix in PROFILES:
+            for name in COLUMNS:
+                _assert_same_distribution(f"tick {tick} {prefix}.{name}",
+                                          s_cols[prefix][name], c_cols[prefix][name])
+            for event_type in set(s_events[prefix]) | set(c_events[prefix]):
+                a, b = s_events[prefix][event_type], c_events[prefix][event_type]
+                assert abs(a - b) <= 4 * math.sqrt(a + b) + 1, \
+                    f"tick {tick} {prefix} '{event_type}' events: scalar {a} vs columnar {b}"
+
+
+@pytest.fixture
+def sharded_workers(app, monkeypatch):
+    """샤딩 틱 워커(spawn)가 같은 테스트 DB/시드로 앱을 만들도록 환경 변수 전달, 끝나면 풀 종료"""
+    from app import sharded_tick
+    from tests.conftest import TEST_SEED
+    monkeypatch.setenv('DATABASE_URL', app.config['SQLALCHEMY_DATABASE_URI'])
+    monkeypatch.setenv('NPC_INITIAL_COUNT', '0')
+    monkeypatch.setenv('WORLD_SEED', TEST_SEED)
+    monkeypatch.setattr(GC, 'TICK_WORKERS', 2)
+    yield
+    sharded_tick.shutdown()
+
+
+def test_columnar_checks_overcrowding_after_spy_return(app, monkeypatch, no_spy_detection,
+                                                       sharded_workers, caplog):
+    """밀사로 복귀한 성체까지 포함해 수용 초과를 판정 (스칼라 엔진과 같은 단계 순서)"""
+    pytest.importorskip('numpy')
+    for engine in ('scalar', 'columnar', 'sharded'):
+        (columns, events), = _run(app, engine, 1, monkeypatch)
+        spy = columns['spy']
+        # 초과 인원은 자실장이 남아 있는 한 모두 탈주
+        for guards, adults, children, cap in zip(spy['guard_count'], spy['adult_count'],
+                                                 spy['child_count'], spy['population_cap']):
+            assert guards + adults + children <= cap or children == 0, engine
+        assert events['spy']['spy'] == PARKS_PER_PROFILE, engine
+        assert events['spy']['overcrowd'] > 0, engine
+    assert '스칼라 처리로 전환' not in caplog.text   # 샤딩 틱이 폴백 없이 실행됨
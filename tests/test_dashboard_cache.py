@@ -0,0 +1,142 @@
+# -*- coding: utf-8 -*-
+"""
+[v1.7.0] 대시보드 조각 캐시/ETag ↔ 공원 상태 버전 테스트 (app/state_version.py, app/fragment_cache.py).
+
+아무것도 바뀌지 않으면 ETag가 같고 304, 쓰기 경로마다 상태 버전이 올라 ETag가 바뀐다:
+ORM flush(Park·대기열·이벤트 행), 이벤트 버퍼 Core INSERT, 벡터 엔진 executemany UPDATE, NPC 턴 빚 차감.
+"""
+from datetime import datetime
+
+import pytest
+from flask import g
+
+from app import event_buffer, fragment_cache, game_engine, state_version
+from app import unit_of_work as UOW
+from app.event_text import EventMessage
+from app.models import db, Park, BuildQueue, TrainQueue, EventLog
+
+
+@pytest.fixture
+def player(client, make_park, login):
+    # 보호 모드가 아닌 공원 (보호 중이면 틱 뒤 대시보드 접속이 자원을 보충하며 쓴다)
+    park = make_park('player', user=True, guard_count=20, adult_count=40,
+                     last_turn_regen_at=datetime.utcnow())
+    login('player')
+    db.session.commit()   # 로그인 요청까지의 트랜잭션 종료
+    return park.id
+
+
+@pytest.fixture
+def etag(client, player):
+    """대시보드 ETag 조회 (요청 트랜잭션은 커밋해 끝낸다)"""
+    def fetch():
+        response = client.get('/game/dashboard')
+        assert response.status_code == 200
+        db.session.commit()
+        return response.headers['ETag']
+    return fetch
+
+
+def _version(park_id):
+    return db.session.get(Park, park_id, populate_existing=True).state_version
+
+
+def _detach():
+    """세션에서 공원을 내려 Core UPDATE 경로를 타게 한다 (다음 요청은 로그인 사용자를 다시 로드)"""
+    g.pop('_login_user', None)
+    db.session.expunge_all()
+
+
+def test_unchanged_dashboard_is_304(client, etag):
+    first = etag()
+    hits = fragment_cache.get_stats()['hits']
+    assert etag() == first
+    assert fragment_cache.get_stats()['hits'] > hits, '두 번째 요청은 캐시된 본문 사용'
+
+    response = client.get('/game/dashboard', headers={'If-None-Match': first})
+    assert response.status_code == 304
+    assert response.headers['ETag'] == first
+
+
+def test_orm_park_write_changes_etag(player, etag):
+    before, version = etag(), _version(player)
+    db.session.get(Park, player).konpeito += 1
+    db.session.commit()
+    assert _version(player) == version + 1
+    assert etag() != before
+
+
+@pytest.mark.parametrize('model', [BuildQueue, TrainQueue])
+def test_orm_queue_writes_change_etag(player, etag, model):
+    fields = {'building_type': 'cardboard_house'} if model is BuildQueue else {}
+    tags = [etag()]
+
+    row = model(park_id=player, turns_remaining=3, **fields)
+    db.session.add(row)
+    db.session.commit()
+    tags.append(etag())
+
+    row.turns_remaining = 2
+    db.session.commit()
+    tags.append(etag())
+
+    db.session.delete(row)
+    db.session.commit()
+    tags.append(etag())
+    assert len(set(tags)) == 4, tags
+
+
+def test_orm_event_row_write_changes_etag(player, etag):
+    event_buffer.add(player, 'build', '건설 완료', 1)
+    db.session.commit()
+    before = etag()
+
+    row = EventLog.query.filter_by(park_id=player, message='건설 완료').one()
+    row.message = '건설 완료!'
+    db.session.commit()
+    edited = etag()
+    assert edited != before
+
+    db.session.delete(row)
+    db.session.commit()
+    assert etag() not in (before, edited)
+
+
+@pytest.mark.parametrize('loaded', [True, False], ids=['park-in-session', 'core-update'])
+def test_event_buffer_insert_changes_etag(player, etag, loaded):
+    before, version = etag(), _version(player)
+    if not loaded:
+        _detach()
+    event_buffer.add(player, 'battle', EventMessage('battle_defense_win', {}, 0), 1)
+    db.session.commit()
+    assert _version(player) == version + 1
+    assert etag() != before
+
+
+def test_columnar_executemany_changes_etag(player, etag, monkeypatch):
+    """벡터 엔진 UPDATE의 state_version 증가식만으로도 바뀐다 (이벤트 버퍼/flush의 touch는 끔)"""
+    pytest.importorskip('numpy')
+    from app.columnar_engine import process_world_turn
+
+    before, version = etag(), _version(player)
+    monkeypatch.setattr(state_version, 'touch', lambda session, park_ids: None)
+    _detach()
+    with UOW.deferred_commit():
+        process_world_turn()
+    db.session.commit()
+    monkeypatch.undo()
+
+    assert _version(player) == version + 1
+    assert etag() != before
+
+
+def test_npc_debt_claim_changes_etag(player, etag):
+    db.session.get(Park, player).npc_turn_debt = 1
+    db.session.commit()
+    before, version = etag(), _version(player)
+
+    _detach()
+    assert game_engine.claim_npc_turn_debt()
+    db.session.commit()
+    assert _version(player) == version + 1
+    assert etag() != before
@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+"""
+[v1.7.0] DB 엔진 프로필 트랜잭션 시작 테스트 (app/db_profile.py).
+
+SQLite production 프로필: 쓰기 요청은 BEGIN IMMEDIATE, 읽기 요청은 BEGIN (DEFERRED).
+GET이라도 @UOW.transactional 뷰(대시보드 턴 처리)는 쓰기로 본다 - DEFERRED로 읽다가 쓰기로
+올라가면 그 사이 다른 쓰기가 커밋된 경우 busy_timeout 대기 없이 "database is locked".
+"""
+import pytest
+from sqlalchemy import event
+
+from app import unit_of_work as UOW
+from app.models import db
+
+
+@pytest.fixture
+def begins(app, make_park, login):
+    """로그인한 뒤 풀에서 꺼낸 연결의 BEGIN 문 기록"""
+    if db.engine.dialect.name != 'sqlite':
+        pytest.skip('BEGIN IMMEDIATE는 SQLite production 프로필 전용')
+    make_park('player', user=True)
+    login('player')
+    db.session.commit()   # 로그인 요청까지의 트랜잭션을 끝내고 연결 반납
+
+    statements = []
+
+    def trace(dbapi_connection, connection_record, connection_proxy):
+        dbapi_connection.set_trace_callback(
+            lambda sql: statements.append(sql) if sql.startswith('BEGIN') else None)
+
+    event.listen(db.engine.pool, 'checkout', trace)
+    yield statements
+    event.remove(db.engine.pool, 'checkout', trace)
+
+
+def test_transactional_get_begins_immediate(client, begins):
+    response = client.get('/game/dashboard')
+    assert response.status_code == 200
+    assert begins and set(begins) == {'BEGIN IMMEDIATE'}, begins
+
+
+def test_read_only_get_begins_deferred(client, begins):
+    response = client.get('/game/ranking')
+    assert response.status_code == 200
+    assert begins and set(begins) == {'BEGIN'}, begins
+
+
+def test_transactional_mark_survives_outer_decorators(app):
+    assert UOW.transactional(lambda: None).writes_db
+    assert getattr(app.view_functions['game.dashboard'], 'writes_db', False)
+    assert not getattr(app.view_functions['game.ranking'], 'writes_db', False)
@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+"""
+[v1.7.0] 이벤트 로그 버퍼 테스트 (app/event_buffer.py).
+
+커밋 직전 Core INSERT 1회, 롤백 시 폐기, 같은 트랜잭션의 EventLog 조회 전 기록,
+병합 모드(EVENT_COALESCE_TYPES)에서 같은 이벤트만 합치고 내용이 다른 이벤트는 따로 기록.
+"""
+import json
+
+import pytest
+from sqlalchemy import event, text
+
+from app.config import GameConfig as GC
+from app import event_buffer
+from app.event_text import EventMessage
+from app.models import db, EventLog
+
+
+def _stored_count():
+    """버퍼를 거치지 않는 원시 SQL로 센 event_logs 행 수 (ORM 조회 flush가 끼지 않도록)"""
+    return db.session.execute(text('SELECT COUNT(*) FROM event_logs')).scalar()
+
+
+@pytest.fixture
+def park_id(make_park):
+    return make_park().id
+
+
+@pytest.fixture
+def event_inserts(app):
+    """event_logs INSERT 문 실행 횟수 기록 (executemany/여러 행 VALUES 모두 1회)"""
+    calls = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith('INSERT INTO EVENT_LOGS'):
+            calls.append(statement)
+
+    event.listen(db.engine, 'before_cursor_execute', record)
+    yield calls
+    event.remove(db.engine, 'before_cursor_execute', record)
+
+
+def test_commit_writes_buffer_with_one_insert(park_id, event_inserts):
+    for i in range(5):
+        event_buffer.add(park_id, 'gather', f'채집 {i}', 1)
+    assert event_buffer.pending_count() == 5
+    assert _stored_count() == 0 and not event_inserts
+
+    db.session.commit()
+    assert len(event_inserts) == 1
+    assert event_buffer.pending_count() == 0
+    assert [e.message for e in EventLog.query.order_by(EventLog.id)] == [f'채집 {i}' for i in range(5)]
+
+
+def test_rollback_discards_buffer(park_id):
+    event_buffer.add(park_id, 'gather', '버려질 이벤트', 1)
+    db.session.rollback()
+    assert event_buffer.pending_count() == 0
+    db.session.commit()
+    assert _stored_count() == 0
+
+
+def test_event_read_flushes_buffer_first(park_id, event_inserts):
+    event_buffer.add(park_id, 'build', '건설 완료', 1)
+    assert _stored_count() == 0
+
+    events = EventLog.query.filter_by(park_id=park_id).all()
+    assert [e.message for e in events] == ['건설 완료']
+    assert event_buffer.pending_count() == 0 and len(event_inserts) == 1
+    db.session.commit()   # 이미 기록됨 → 다시 INSERT하지 않음
+    assert len(event_inserts) == 1 and _stored_count() == 1
+
+
+@pytest.fixture
+def coalesce(monkeypatch):
+    monkeypatch.setattr(GC, 'EVENT_COALESCE_TYPES', frozenset(('starve', 'disaster')))
+
+
+def test_coalesce_merges_identical_events(park_id, coalesce):
+    for _ in range(3):
+        event_buffer.add(park_id, 'starve', '배고픈 데스...', 4)
+    starve = EventMessage('starve_death', {'baby': 2, 'child': 0, 'adult': 0}, 0)
+    for _ in range(2):
+        event_buffer.add(park_id, 'starve', EventMessage(*starve), 4)
+    assert event_buffer.pending_count() == 2
+    db.session.commit()
+
+    plain, coded = EventLog.query.filter_by(park_id=park_id).order_by(EventLog.id).all()
+    assert plain.message == '배고픈 데스... (×3)'
+    assert json.loads(coded.params) == {'baby': 2, 'child': 0, 'adult': 0, 'x': 2}
+
+
+def test_coalesce_keeps_different_events_apart(park_id, coalesce):
+    event_buffer.add(park_id, 'disaster', EventMessage('disaster_rain', {}, 0), 4)
+    event_buffer.add(park_id, 'disaster', EventMessage('disaster_cold', {}, 0), 4)
+    event_buffer.add(park_id, 'starve', EventMessage('starve_death', {'baby': 2}, 0), 4)
+    event_buffer.add(park_id, 'starve', EventMessage('starve_death', {'baby': 5}, 0), 4)
+    event_buffer.add(park_id, 'starve', '배고픈 데스...', 4)
+    event_buffer.add(park_id, 'starve', '더 배고픈 데스...', 4)
+    event_buffer.add(park_id, 'starve', '배고픈 데스...', 5)   # 다른 턴
+    db.session.commit()
+
+    rows = [(e.code, json.loads(e.params) if e.params else None, e.message, e.turn_number)
+            for e in EventLog.query.filter_by(park_id=park_id).order_by(EventLog.id)]
+    assert rows == [
+        ('disaster_rain', None, '', 4),
+        ('disaster_cold', None, '', 4),
+        ('starve_death', {'baby': 2}, '', 4),
+        ('starve_death', {'baby': 5}, '', 4),
+        (None, None, '배고픈 데스...', 4),
+        (None, None, '더 배고픈 데스...', 4),
+        (None, None, '배고픈 데스...', 5),
+    ]
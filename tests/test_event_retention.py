@@ -0,0 +1,136 @@
+# -*- coding: utf-8 -*-
+"""
+[v1.7.0] 이벤트 로그 보존/아카이브 테스트 (app/event_retention.py).
+
+타입 그룹별 TTL, 공원별 보존 개수 초과분 퇴출, gzip JSONL 아카이브에 삭제한 행이 정확히 한 번씩 들어가는지 본다.
+"""
+import gzip
+import json
+import os
+from collections import namedtuple
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.config import GameConfig as GC
+from app import dialogues as DLG
+from app import event_retention
+from app.event_text import encode_params
+from app.models import db, EventLog
+
+NOW = datetime(2026, 3, 10, 12, 0, 0)
+
+# 퇴출(커밋) 뒤에도 비교할 수 있도록 기록 직후의 값을 복사해 둔다
+Stored = namedtuple('Stored', 'id park_id event_type turn_number code params line message created_at text')
+
+
+@pytest.fixture
+def retention(monkeypatch, tmp_path):
+    """작은 TTL 표 + 보존 개수 넉넉히. 반환: 아카이브 경로로 1회 실행하는 함수"""
+    monkeypatch.setattr(GC, 'EVENT_TTL_DAYS', {'gather': 1, 'build': 1, 'battle': 30})
+    monkeypatch.setattr(GC, 'EVENT_TTL_DEFAULT_DAYS', 7)
+    monkeypatch.setattr(GC, 'EVENT_KEEP_LAST_PER_PARK', 1000)
+    monkeypatch.setitem(event_retention._park_cursor, 'last_id', 0)
+    archive_dir = str(tmp_path / 'archive')
+
+    def run():
+        stats = event_retention.run_retention(archive_dir=archive_dir, now=NOW)
+        db.session.expire_all()
+        return stats
+    run.archive_dir = archive_dir
+    return run
+
+
+def _add_events(specs, **fields):
+    """
+    (공원 id, 타입, 며칠 전) 목록을 오래된 것부터 기록 (id가 시간순으로 증가하도록).
+    fields는 모든 행에 덮어쓸 컬럼. 반환: Stored 리스트
+    """
+    rows = [EventLog(**dict(dict(park_id=park_id, event_type=event_type, turn_number=1,
+                                 message=f'{event_type} {days_ago}일 전',
+                                 created_at=NOW - timedelta(days=days_ago)), **fields))
+            for park_id, event_type, days_ago in sorted(specs, key=lambda s: -s[2])]
+    db.session.add_all(rows)
+    db.session.commit()
+    return [Stored(*(getattr(r, name) for name in Stored._fields[:-1]), r.text(DLG.DEFAULT_LANG))
+            for r in rows]
+
+
+def _remaining_ids():
+    return {row_id for (row_id,) in db.session.query(EventLog.id)}
+
+
+def _archived(archive_dir):
+    """아카이브 전체 (파일 경로 → 행 dict 리스트)"""
+    found = {}
+    for root, _, files in os.walk(archive_dir):
+        for name in files:
+            with gzip.open(os.path.join(root, name), 'rt', encoding='utf-8') as f:
+                found[os.path.relpath(os.path.join(root, name), archive_dir)] = \
+                    [json.loads(line) for line in f if line.strip()]
+    return found
+
+
+def test_ttl_per_type_group(make_park, retention):
+    park_id = make_park().id
+    rows = _add_events([
+        (park_id, 'gather', 1.5), (park_id, 'gather', 0.5),       # 1일
+        (park_id, 'build', 2), (park_id, 'build', 0.9),
+        (park_id, 'battle', 31), (park_id, 'battle', 29),         # 30일
+        (park_id, 'disaster', 8), (park_id, 'disaster', 6),       # 목록에 없음 → 기본 7일
+        (park_id, 'spy', 7.5),
+    ])
+    expired = {r.id for r in rows if r.message in (
+        'gather 1.5일 전', 'build 2일 전', 'battle 31일 전', 'disaster 8일 전', 'spy 7.5일 전')}
+
+    stats = retention()
+    assert stats['ttl'] == len(expired) and stats['cap'] == 0
+    assert _remaining_ids() == {r.id for r in rows} - expired
+    assert retention()['ttl'] == 0, '두 번째 실행은 퇴출할 행 없음'
+
+
+@pytest.mark.parametrize('batch', [500, 2])
+def test_per_park_cap_keeps_newest(make_park, retention, monkeypatch, batch):
+    monkeypatch.setattr(GC, 'EVENT_KEEP_LAST_PER_PARK', 3)
+    monkeypatch.setattr(GC, 'EVENT_RETENTION_BATCH', batch)
+    busy, quiet = make_park().id, make_park().id
+    busy_rows = _add_events([(busy, 'battle', d / 10) for d in range(8)])
+    quiet_rows = _add_events([(quiet, 'battle', d / 10) for d in range(2)])
+    # 같은 시각 행: id가 큰 쪽이 최신
+    tied = _add_events([(busy, 'trade', 0), (busy, 'trade', 0)])
+
+    stats = retention()
+    assert stats['cap'] == 8 + 2 - 3 and stats['ttl'] == 0
+    newest = sorted(busy_rows + tied, key=lambda r: (r.created_at, r.id))[-3:]
+    assert _remaining_ids() == {r.id for r in newest} | {r.id for r in quiet_rows}
+
+
+def test_archive_contains_exactly_deleted_rows(make_park, retention, monkeypatch):
+    monkeypatch.setattr(GC, 'EVENT_KEEP_LAST_PER_PARK', 2)
+    first, second = make_park().id, make_park().id
+    rows = _add_events([(first, 'gather', 3), (first, 'battle', 40), (first, 'battle', 0.2),
+                        (first, 'battle', 0.1), (first, 'battle', 0.05), (second, 'build', 1.2),
+                        (second, 'disaster', 0)])
+    coded, = _add_events([(first, 'starve', 2)], turn_number=4, code='starve_death', line=0,
+                         params=encode_params({'baby': 2, 'child': 0, 'adult': 1}), message='')
+    before = {r.id: r for r in rows + [coded]}
+
+    retention()
+    deleted = set(before) - _remaining_ids()
+    # TTL: gather 3일·battle 40일·build 1.2일 / 보존 개수 2: battle 0.2일·starve 2일
+    assert sorted(before[i].message for i in deleted) == sorted([
+        'gather 3일 전', 'battle 40일 전', 'build 1.2일 전', 'battle 0.2일 전', ''])
+
+    archived = _archived(retention.archive_dir)
+    items = [item for lines in archived.values() for item in lines]
+    assert sorted(item['id'] for item in items) == sorted(deleted), '삭제한 행만, 한 번씩'
+    for path, lines in archived.items():
+        for item in lines:
+            row = before[item['id']]
+            assert path == os.path.join(str(row.park_id), row.created_at.strftime('%Y-%m-%d') + '.jsonl.gz')
+            assert (item['type'], item['turn'], item['code'], item['params'], item['line']) == \
+                (row.event_type, row.turn_number, row.code, row.params, row.line)
+            assert item['message'] == row.text
+            assert item['created_at'] == row.created_at.isoformat()
+    assert event_retention.read_archive(
+        first, coded.created_at.strftime('%Y-%m-%d'), retention.archive_dir)[0]['code'] == 'starve_death'
@@ -0,0 +1,165 @@
+# -*- coding: utf-8 -*-
+"""
+[v1.7.0] 턴 단계 계산 테스트 (app/game_engine.py).
+
+1마리씩 반복하던 계산을 산술/집계 추출로 바꾼 단계가 이전 반복과 같은 결과(또는 같은 분포)인지 본다.
+반복 구현은 비교용으로 이 파일에 남겨 둔다.
+"""
+import random
+from types import SimpleNamespace
+
+import pytest
+
+from app.config import GameConfig as GC
+from app import game_engine
+from app import rng as RNG
+from app.models import db, Park, EventLog, SpyMission
+from app.turn_scheduler import _process_all_turns
+
+from tests.test_rng import SAMPLES, assert_moments, uniform_moments
+
+
+def _park(**fields):
+    values = dict(id=1, turn_count=1, is_destroyed=False, boss_hp=100, guard_count=0,
+                  adult_count=0, child_count=0, baby_count=0, trash_food=0, meat_stock=0,
+                  konpeito=0, morale=50)
+    values.update(fields)
+    return SimpleNamespace(**values)
+
+
+def _starvation_loop(park, shortage):
+    """이전 구현: 1마리씩 사망 (저실장 1NP → 자실장 2NP → 성체 5NP → 보스 피해)"""
+    while shortage > 0:
+        if park.baby_count > 0:
+            park.baby_count -= 1
+            shortage -= 1
+        elif park.child_count > 0:
+            park.child_count -= 1
+            shortage -= 2
+        elif park.adult_count > 0:
+            park.adult_count -= 1
+            shortage -= 5
+        else:
+            park.boss_hp -= 10
+            shortage = 0
+            if park.boss_hp <= 0:
+                park.is_destroyed = True
+
+
+def _state(park):
+    return (park.baby_count, park.child_count, park.adult_count, park.boss_hp, park.is_destroyed)
+
+
+def test_starvation_matches_per_unit_loop(app):
+    cases = random.Random('starvation')
+    for _ in range(5000):
+        fields = dict(baby_count=cases.randint(0, 30), child_count=cases.randint(0, 30),
+                      adult_count=cases.randint(0, 30), boss_hp=cases.choice([5, 10, 15, 100]))
+        shortage = cases.choice([cases.randint(1, 300), cases.uniform(0.1, 300)])
+        closed, loop = _park(**fields), _park(**fields)
+        game_engine._process_starvation(closed, shortage)
+        _starvation_loop(loop, shortage)
+        assert _state(closed) == _state(loop), (fields, shortage)
+
+
+def test_starvation_is_constant_in_population(app):
+    """인구 100만에서도 반복 없이 한 번에 계산"""
+    park = _park(baby_count=10 ** 6, child_count=10 ** 6, adult_count=10 ** 6)
+    game_engine._process_starvation(park, 10 ** 6 + 2 * 10 ** 6 + 5 * 10)
+    assert _state(park) == (0, 0, 10 ** 6 - 10, 100, False)
+
+
+def _cannibalism_eaten(guards, children, key):
+    park = _park(guard_count=guards, child_count=children)
+    with RNG.stream('test', 'cannibalism', key):
+        game_engine._process_cannibalism(park)
+    assert park.meat_stock == children - park.child_count
+    return children - park.child_count
+
+
+def test_cannibalism_matches_per_guard_binomial(app):
+    """경호마다 20% 판정하던 반복과 같은 B(경호 수, 0.2) 분포"""
+    guards, p = 50, GC.CANNIBALISM_GUARD_FEED_CHANCE
+    eaten = [_cannibalism_eaten(guards, 1000, i) for i in range(SAMPLES // 4)]
+    assert_moments(eaten, guards * p, guards * p * (1 - p), 'cannibalism')
+
+
+def test_cannibalism_capped_by_children(app):
+    assert all(_cannibalism_eaten(1000, 3, i) == 3 for i in range(20))
+    assert _cannibalism_eaten(1000, 0, 0) == 0
+
+
+def _gather_loop(num_adults, num_children, rng):
+    """이전 구현: 채집 인원마다 randint/random() 추출"""
+    result = {'trash': 0, 'konpeito': 0, 'material': 0}
+    for count, trash, mat, chance in (
+            (num_adults, GC.GATHER_TRASH_ADULT, GC.GATHER_MAT_ADULT, GC.GATHER_KONPEITO_ADULT_CHANCE),
+            (num_children, GC.GATHER_TRASH_CHILD, GC.GATHER_MAT_CHILD, GC.GATHER_KONPEITO_CHILD_CHANCE)):
+        for _ in range(count):
+            result['trash'] += rng.randint(*trash)
+            result['material'] += rng.randint(*mat)
+            if rng.random() < chance:
+                result['konpeito'] += 1
+    return result
+
+
+def test_gather_yield_matches_per_unit_loop():
+    """집계 추출 수확량 ↔ 인원별 반복: 자원별 평균·분산이 이론값과 일치"""
+    adults, children = 40, 30
+    with RNG.stream('test', 'gather'):
+        aggregate = [game_engine._gather_yield(adults, children) for _ in range(SAMPLES // 4)]
+    loop_rng = random.Random('gather-loop')
+    loop = [_gather_loop(adults, children, loop_rng) for _ in range(SAMPLES // 4)]
+
+    expected = {}
+    for resource, adult_range, child_range in (
+            ('trash', GC.GATHER_TRASH_ADULT, GC.GATHER_TRASH_CHILD),
+            ('material', GC.GATHER_MAT_ADULT, GC.GATHER_MAT_CHILD)):
+        (am, av), (cm, cv) = uniform_moments(*adult_range), uniform_moments(*child_range)
+        expected[resource] = (adults * am + children * cm, adults * av + children * cv)
+    pa, pc = GC.GATHER_KONPEITO_ADULT_CHANCE, GC.GATHER_KONPEITO_CHILD_CHANCE
+    expected['konpeito'] = (adults * pa + children * pc,
+                            adults * pa * (1 - pa) + children * pc * (1 - pc))
+
+    for resource, (mean, var) in expected.items():
+        assert_moments([r[resource] for r in aggregate], mean, var, f'gather {resource}')
+        assert_moments([r[resource] for r in loop], mean, var, f'loop {resource}')
+
+
+@pytest.mark.parametrize('engine', ['scalar', 'columnar'])
+def test_starvation_turn(app, make_park, monkeypatch, engine):
+    """식량이 바닥난 공원의 월드 틱: 약한 개체부터 아사, 요약 이벤트가 모든 언어로 표시"""
+    if engine == 'columnar':
+        pytest.importorskip('numpy')
+    monkeypatch.setattr(GC, 'TICK_ENGINE', engine)
+    park = make_park(guard_count=0, adult_count=6, child_count=10, baby_count=4,
+                     trash_food=0, konpeito=0, meat_stock=0)
+    park_id = park.id
+    db.session.remove()   # 틱은 자체 세션으로 쓴다 (SQLite 쓰기 잠금을 쥐고 있지 않도록)
+    _process_all_turns(app)
+
+    park = db.session.get(Park, park_id)
+    assert park.baby_count == 0
+    assert park.child_count < 10
+    events = EventLog.query.filter_by(park_id=park_id, event_type='starve').all()
+    assert len(events) == 1
+    for lang in ('ko', 'ja', 'en', 'zh_cn', 'zh_tw'):
+        text = events[0].text(lang)
+        assert text and '{' not in text, (lang, text)
+        assert f'{10 - park.child_count}' in text, (lang, text)
+
+
+@pytest.mark.filterwarnings('error::sqlalchemy.exc.LegacyAPIWarning')
+def test_spy_missions_resolve_with_session_get(make_park):
+    """귀환하는 밀사의 대상 조회 (Query.get 레거시 API 경고 없이), 멸망한 대상은 그냥 귀환"""
+    sender = make_park('sender')
+    target = make_park('target', baby_count=5, trash_food=100)
+    ruined = make_park('ruined', is_destroyed=True)
+    missions = [SpyMission(sender_id=sender.id, target_id=t.id, turns_remaining=1, status='active')
+                for t in (target, ruined)]
+    db.session.add_all(missions)
+    db.session.commit()
+
+    game_engine._process_spy_missions(sender)
+    assert missions[0].status in ('success', 'detected')
+    assert (missions[1].status, missions[1].result_message) == ('returned', '대상 공원이 멸망한 데스...')
@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+"""
+[v1.7.0] 기록 키셋 페이지네이션 테스트 (app/history.py, /game/api/battle-logs, /game/api/events).
+
+created_at이 같은 행이 많아도 (created_at, id) 커서로 페이지가 겹치거나 빠지지 않는지,
+공격/방어(이벤트 타입별) 갈래 병합에 중복이 없는지, 잘못된 커서가 InvalidCursor → 400인지 본다.
+"""
+import base64
+from datetime import datetime, timedelta
+
+import pytest
+
+from app import history
+from app.models import db, BattleLog, EventLog
+
+T0 = datetime(2026, 1, 1, 12, 0, 0)
+
+
+def _walk(fetch, limit):
+    """next_cursor가 없을 때까지 페이지를 넘기며 행을 모은다. 반환: 페이지별 행 리스트"""
+    pages, cursor = [], None
+    while True:
+        rows, cursor = fetch(cursor, limit)
+        pages.append(rows)
+        assert len(rows) <= limit
+        if cursor is None:
+            return pages
+        assert len(rows) == limit, '다음 페이지가 있으면 꽉 찬 페이지'
+
+
+def _assert_complete(pages, expected):
+    ids = [row.id for page in pages for row in page]
+    assert len(ids) == len(set(ids)), '페이지끼리 겹침'
+    assert set(ids) == {row.id for row in expected}, '빠진 행'
+    keys = [(row.created_at, row.id) for page in pages for row in page]
+    assert keys == sorted(keys, reverse=True)
+
+
+@pytest.fixture
+def battles(make_park):
+    """내 공원이 공격/방어한 전투 - 같은 시각 묶음 여러 개 + 다른 공원끼리의 전투"""
+    me, rival, other = make_park().id, make_park().id, make_park().id
+    rows = []
+    for i in range(23):
+        at = T0 + timedelta(minutes=i // 5)   # 5건씩 같은 시각
+        attacker, defender = (me, rival) if i % 3 else (rival if i % 2 else other, me)
+        rows.append(BattleLog(attacker_id=attacker, defender_id=defender, result='win', created_at=at))
+    for i in range(4):
+        db.session.add(BattleLog(attacker_id=rival, defender_id=other, result='lose', created_at=T0))
+    db.session.add_all(rows)
+    db.session.commit()
+    return me, rival, rows
+
+
+@pytest.mark.parametrize('limit', [1, 4, 5, 7, 50])
+def test_battle_pages_disjoint_and_complete_with_tied_timestamps(battles, limit):
+    me, _, rows = battles
+    pages = _walk(lambda cursor, n: history.battle_page(me, cursor, n), limit)
+    _assert_complete(pages, rows)
+
+
+def test_battle_branches_merge_without_duplicates(battles):
+    me, rival, rows = battles
+    first, _ = history.battle_page(me, limit=50)
+    assert {r.attacker_id == me for r in first} == {True, False}, '공격·방어 갈래 모두 포함'
+
+    pages = _walk(lambda cursor, n: history.battle_page(me, cursor, n, opponent_id=rival), 3)
+    _assert_complete(pages, [r for r in rows if rival in (r.attacker_id, r.defender_id)])
+
+
+def test_event_pages_across_type_branches(make_park):
+    park_id = make_park().id
+    rows = [EventLog(park_id=park_id, event_type=('battle', 'trade', 'gather')[i % 3],
+                     message=f'이벤트 {i}', turn_number=1, created_at=T0 + timedelta(seconds=i // 4))
+            for i in range(30)]
+    db.session.add_all(rows)
+    db.session.commit()
+
+    pages = _walk(lambda cursor, n: history.event_page(park_id, cursor, n), 4)
+    _assert_complete(pages, rows)
+
+    types = ['battle', 'trade', 'battle']   # 같은 타입을 두 번 줘도 갈래는 1개
+    pages = _walk(lambda cursor, n: history.event_page(park_id, cursor, n, event_types=types), 4)
+    _assert_complete(pages, [r for r in rows if r.event_type in ('battle', 'trade')])
+
+
+def test_api_pages_follow_next_cursor(client, make_park, login):
+    me = make_park('player', user=True).id
+    rival = make_park().id
+    db.session.add_all(BattleLog(attacker_id=me, defender_id=rival, result='win', created_at=T0)
+                       for _ in range(7))
+    db.session.commit()
+    login('player')
+
+    seen, cursor = [], ''
+    while cursor is not None:
+        data = client.get(f'/game/api/battle-logs?limit=3&cursor={cursor}').get_json()
+        seen += [item['id'] for item in data['items']]
+        cursor = data['next_cursor']
+    assert len(seen) == len(set(seen)) == 7
+
+
+@pytest.mark.parametrize('cursor', [
+    'not base64!',
+    base64.urlsafe_b64encode(b'no separator').decode(),
+    base64.urlsafe_b64encode(b'2026-01-01T00:00:00|abc').decode(),
+    base64.urlsafe_b64encode(b'yesterday|3').decode(),
+    base64.urlsafe_b64encode(b'\xff\xfe|1').decode(),
+])
+def test_malformed_cursor(client, make_park, login, cursor):
+    with pytest.raises(history.InvalidCursor):
+        history.decode_cursor(cursor)
+
+    make_park('player', user=True)
+    login('player')
+    for url in ('/game/api/battle-logs', '/game/api/events'):
+        response = client.get(url, query_string={'cursor': cursor})
+        assert response.status_code == 400
+        assert response.get_json() == {'error': 'invalid cursor'}
+    # 화면은 잘못된/오래된 링크면 첫 페이지
+    assert client.get('/game/battle-logs', query_string={'cursor': cursor}).status_code == 200
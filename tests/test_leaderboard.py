@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+"""
+[v1.7.0] 랭킹 스냅샷 테스트 (app/leaderboard.py).
+
+스냅샷 순서 ↔ 이전 /ranking 구현(공원별 파이썬 프로퍼티 + BattleLog count, id 순 조회 후 안정 정렬),
+동점에서 rank_of 이분 탐색, 월드 틱(스케줄러 작업) 뒤 스냅샷 갱신을 본다.
+"""
+import pytest
+
+from app.config import GameConfig as GC
+from app import battle_engine, leaderboard
+from app import rng as RNG
+from app.leaderboard import SORT_KEYS
+from app.models import db, Park, BattleLog
+from app.turn_scheduler import _process_all_turns
+
+
+def _legacy_order(sort_by):
+    """이전 /ranking: 비멸망 공원을 id 순으로 읽어 공원별 값으로 내림차순 안정 정렬"""
+    parks = Park.query.filter_by(is_destroyed=False).order_by(Park.id).all()
+
+    def wins(p):
+        return (BattleLog.query.filter_by(attacker_id=p.id, result='win').count()
+                + BattleLog.query.filter_by(defender_id=p.id, result='lose').count())
+
+    value = {
+        'power': lambda p: p.total_combat_power,
+        'population': lambda p: p.total_population,
+        'wins': wins,
+        'resources': lambda p: p.total_np_available,
+    }[sort_by]
+    return [p.id for p in sorted(parks, key=value, reverse=True)]
+
+
+@pytest.fixture
+def world(make_park):
+    """값이 제각각인 공원 + 모든 값이 같은 공원 3개 + 멸망 공원, 실제 전투 몇 번"""
+    ids = [make_park(guard_count=5 + 3 * i, adult_count=40 - 4 * i, konpeito=10 * (i % 3),
+                     morale=40 + 5 * i).id for i in range(6)]
+    ids += [make_park(guard_count=12, adult_count=12).id for _ in range(3)]
+    make_park(is_destroyed=True, guard_count=999)
+    for i in range(8):
+        RNG.set_world_seed(f'ranking-{i}')
+        attacker, defender = db.session.get(Park, ids[i % 3]), db.session.get(Park, ids[3 + i % 4])
+        attacker.action_points = 3
+        battle_engine.execute_battle(attacker, defender, 3, 3, lang='ko')
+        db.session.commit()
+    return ids
+
+
+@pytest.mark.parametrize('sort_by', sorted(SORT_KEYS))
+def test_snapshot_order_matches_legacy_ranking(world, sort_by):
+    snapshot = leaderboard.build_snapshot()
+    assert [e['park'].id for e in snapshot.ordered(sort_by)] == _legacy_order(sort_by)
+    assert snapshot.total == len(world)
+
+
+def test_snapshot_values_match_park_properties(world):
+    snapshot = leaderboard.build_snapshot()
+    for park in Park.query.filter_by(is_destroyed=False):
+        ranked = snapshot.by_park_id[park.id]['park']
+        assert (ranked.total_combat_power, ranked.total_population, ranked.total_np_available) == \
+            (park.total_combat_power, park.total_population, park.total_np_available)
+
+
+def test_rank_of_with_tied_values(make_park):
+    strong = make_park(guard_count=50).id
+    tied = [make_park(guard_count=20).id for _ in range(3)]
+    weak = make_park(guard_count=1).id
+    snapshot = leaderboard.build_snapshot()
+
+    assert len({snapshot.by_park_id[pid]['park'].total_combat_power for pid in tied}) == 1
+    # 동점은 id 오름차순 → 이전 구현(id 순 조회 + 안정 정렬)의 순위와 같다
+    assert [snapshot.rank_of(pid, 'power') for pid in [strong, *tied, weak]] == [1, 2, 3, 4, 5]
+    for sort_by in SORT_KEYS:
+        for rank, entry in enumerate(snapshot.ordered(sort_by), 1):
+            assert snapshot.rank_of(entry['park'].id, sort_by) == rank
+    assert snapshot.rank_of(weak, 'unknown') == snapshot.rank_of(weak, 'power')
+    assert snapshot.rank_of(-1, 'power') == 0
+
+
+@pytest.mark.parametrize('engine', ['scalar', 'columnar'])
+def test_snapshot_refreshes_after_world_tick(app, make_park, monkeypatch, engine):
+    monkeypatch.setattr(GC, 'TICK_ENGINE', engine)
+    first = make_park(guard_count=30).id
+    second = make_park(guard_count=10).id
+    before = leaderboard.get_snapshot()
+    assert before.rank_of(first, 'power') == 1
+
+    db.session.get(Park, second).guard_count = 300
+    db.session.commit()
+    assert leaderboard.get_snapshot() is before, '틱 전에는 요청마다 다시 만들지 않는다'
+
+    db.session.remove()   # 틱은 자체 세션으로 쓴다
+    _process_all_turns(app)
+    after = leaderboard.get_snapshot()
+    assert after is not before
+    assert after.rank_of(second, 'power') == 1 and after.rank_of(first, 'power') == 2
@@ -0,0 +1,151 @@
+# -*- coding: utf-8 -*-
+"""
+[v1.7.0] 전투 기록 변환 마이그레이션 테스트 (migrate_v1_7.py convert_battle_logs).
+
+v1.7 이전 모양의 battle_logs(피해 JSON + 본문 저장)에 이전 버전이 남긴 행을 넣고 마이그레이션을 실행한 뒤,
+피해가 정수 컬럼으로 옮겨지고 JSON은 비워지며, 조회한 본문(BattleLog.text())이 저장돼 있던 본문과 같은지 본다.
+"""
+import json
+
+import pytest
+from sqlalchemy import text
+
+import migrate_db
+import migrate_v1_7
+from app.models import db, Park, BattleLog, ParkStats
+
+# v1.6 이전 battle_logs (app/models.py BattleLog - 피해는 JSON 문자열, 본문은 항상 저장)
+LEGACY_DDL = '''
+CREATE TABLE battle_logs (
+    id {pk},
+    attacker_id INTEGER NOT NULL REFERENCES parks (id),
+    defender_id INTEGER NOT NULL REFERENCES parks (id),
+    result VARCHAR(20) NOT NULL,
+    log_text TEXT NOT NULL,
+    loot_konpeito INTEGER, loot_trash INTEGER, loot_material INTEGER,
+    loot_babies INTEGER, loot_children INTEGER,
+    attacker_losses TEXT, defender_losses TEXT,
+    created_at TIMESTAMP
+)'''
+
+# 이전 battle_engine._format_battle_log가 남긴 본문
+WIN_TEXT = '\n'.join([
+    '⚔️ 초록공원 vs 빨강공원',
+    '결과: 🏆 공격자 승리!',
+    '',
+    '[출정 편성] ⚔️경호 4 + 🧑성체 6 + 👑보스',
+    '',
+    '[공격자 피해]',
+    '  ⚔️경호 -1, 🧑성체 -2',
+    '[방어자 피해]',
+    '  ⚔️경호 -3, 🧑성체 -5, 👶자실장 -2',
+    '',
+    '[약탈 내역]',
+    '  🍬콘페이토: 7',
+    '  🗑️음쓰: 12',
+    '  🧱자재: 3',
+    '  🐛저실장: 1마리 포획',
+    '  👶자실장: 0마리 포획',
+])
+LOSE_TEXT = '\n'.join([
+    '⚔️ 빨강공원 vs 초록공원',
+    '결과: 🛡️ 방어자 승리!',
+    '',
+    '[출정 편성] ⚔️경호 2 + 🧑성체 0',
+    '',
+    '[공격자 피해]',
+    '  ⚔️경호 -2, 🧑성체 -0',
+    '[방어자 피해]',
+    '  ⚔️경호 -0, 🧑성체 -1, 👶자실장 -0',
+])
+# 이름이 바뀌기 전 공원 (다시 만든 본문과 달라짐 → 본문 유지)
+RENAMED_TEXT = WIN_TEXT.replace('초록공원', '옛초록공원')
+# 출정 편성 줄이 생기기 전 형식 (편성은 0으로, 본문 유지)
+OLD_FORMAT_TEXT = '\n'.join([
+    '⚔️ 초록공원 vs 빨강공원',
+    '결과: 🛡️ 방어자 승리!',
+    '',
+    '[공격자 피해]',
+    '  ⚔️경호 -5, 🧑성체 -3',
+    '[방어자 피해]',
+    '  ⚔️경호 -1, 🧑성체 -0',
+])
+
+
+@pytest.fixture
+def legacy_db(app, make_park):
+    """v1.7 이전 battle_logs 테이블 + 이전 버전이 기록한 행 4개. 반환: {이름: (id, 원래 본문)}"""
+    green, red = make_park('초록공원').id, make_park('빨강공원').id
+    db.session.remove()   # 마이그레이션은 별도 연결로 쓴다
+
+    BattleLog.__table__.drop(db.engine)
+    pk = 'SERIAL PRIMARY KEY' if db.engine.dialect.name == 'postgresql' else 'INTEGER PRIMARY KEY'
+    rows = {
+        'win': (green, red, 'win', WIN_TEXT, (7, 12, 3, 1, 0),
+                {'guards': 1, 'adults': 2}, {'guards': 3, 'adults': 5, 'children': 2}),
+        'lose': (red, green, 'lose', LOSE_TEXT, (0, 0, 0, 0, 0),
+                 {'guards': 2, 'adults': 0}, {'guards': 0, 'adults': 1, 'children': 0}),
+        'renamed': (green, red, 'win', RENAMED_TEXT, (7, 12, 3, 1, 0),
+                    {'guards': 1, 'adults': 2}, {'guards': 3, 'adults': 5, 'children': 2}),
+        'old_format': (green, red, 'lose', OLD_FORMAT_TEXT, (0, 0, 0, 0, 0),
+                       {'guards': 5, 'adults': 3}, {'guards': 1, 'adults': 0}),
+    }
+    ids = {}
+    with db.engine.begin() as conn:
+        conn.exec_driver_sql(LEGACY_DDL.format(pk=pk))
+        for name, (atk, dfn, result, log_text, loot, atk_losses, def_losses) in rows.items():
+            ids[name] = (conn.execute(text('''
+                INSERT INTO battle_logs (attacker_id, defender_id, result, log_text,
+                    loot_konpeito, loot_trash, loot_material, loot_babies, loot_children,
+                    attacker_losses, defender_losses, created_at)
+                VALUES (:atk, :dfn, :result, :log_text, :k, :t, :m, :b, :c, :al, :dl, CURRENT_TIMESTAMP)
+                RETURNING id'''), dict(
+                    atk=atk, dfn=dfn, result=result, log_text=log_text,
+                    k=loot[0], t=loot[1], m=loot[2], b=loot[3], c=loot[4],
+                    al=json.dumps(atk_losses), dl=json.dumps(def_losses))).scalar(), log_text)
+    return ids
+
+
+def _migrate(monkeypatch):
+    monkeypatch.setattr(migrate_db, 'connect', lambda: db.engine)
+    migrate_v1_7.migrate()
+    db.session.remove()
+
+
+def test_convert_moves_losses_to_columns_and_keeps_text(legacy_db, monkeypatch):
+    _migrate(monkeypatch)
+
+    for name, (log_id, original) in legacy_db.items():
+        log = db.session.get(BattleLog, log_id)
+        assert log.text() == original, name
+
+    win = db.session.get(BattleLog, legacy_db['win'][0])
+    assert (win.sent_guards, win.sent_adults, win.boss_joined) == (4, 6, True)
+    assert win.attacker_losses == {'guards': 1, 'adults': 2, 'children': 0}
+    assert win.defender_losses == {'guards': 3, 'adults': 5, 'children': 2}
+    assert win.loot == {'konpeito': 7, 'trash': 12, 'material': 3, 'babies': 1, 'children': 0}
+
+    old = db.session.get(BattleLog, legacy_db['old_format'][0])
+    assert (old.sent_guards, old.sent_adults, old.boss_joined) == (0, 0, False)
+    assert (old.atk_lost_guards, old.atk_lost_adults, old.def_lost_guards) == (5, 3, 1)
+
+    stored = dict(db.session.execute(text(
+        'SELECT id, log_text FROM battle_logs WHERE attacker_losses IS NULL AND defender_losses IS NULL'
+    )).all())
+    assert set(stored) == {log_id for log_id, _ in legacy_db.values()}, '변환한 행의 JSON은 비움'
+    # 현재 이름으로 다시 만들 수 있는 본문만 비우고, 나머지는 저장된 본문 그대로
+    assert stored[legacy_db['win'][0]] == '' and stored[legacy_db['lose'][0]] == ''
+    assert stored[legacy_db['renamed'][0]] == RENAMED_TEXT
+    assert stored[legacy_db['old_format'][0]] == OLD_FORMAT_TEXT
+
+
+def test_migrate_is_rerunnable_and_backfills_stats(legacy_db, monkeypatch):
+    _migrate(monkeypatch)
+    _migrate(monkeypatch)   # 변환할 행이 없으면 그대로
+
+    assert all(db.session.get(BattleLog, log_id).text() == original
+               for log_id, original in legacy_db.values())
+    green = Park.query.filter_by(name='초록공원').one().id
+    stats = db.session.get(ParkStats, green)
+    # 초록: 공격 승 2 + 방어 승 1(빨강 공격 패배) + 공격 패 1(옛 형식)
+    assert (stats.wins, stats.losses, stats.battles, stats.loot_taken) == (3, 1, 4, 46)
@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+"""
+[v1.7.0] 알림 허브 대기 연결 상한 테스트 (app/notify_hub.py, /game/api/notifications[/stream]).
+
+대기 연결(SSE/롱폴링)은 요청 스레드를 점유하므로 NOTIFY_MAX_WAITERS개까지만 구독한다.
+상한이 차면 SSE는 204, 롱폴링은 기다리지 않고 retry 간격과 함께 바로 응답한다.
+"""
+import time
+
+import pytest
+
+from app.config import GameConfig as GC
+from app import notify_hub
+
+
+@pytest.fixture
+def player(make_park, login):
+    park = make_park('player', user=True)
+    login('player')
+    return park.id
+
+
+@pytest.fixture
+def full_hub(monkeypatch):
+    """상한 1, 다른 공원 구독 1개로 자리를 채운 상태"""
+    monkeypatch.setattr(GC, 'NOTIFY_MAX_WAITERS', 1)
+    channel = notify_hub.subscribe(-1, 1)
+    yield
+    notify_hub.unsubscribe(-1, channel)
+
+
+def test_subscribe_respects_limit():
+    first = notify_hub.subscribe(1, 2)
+    second = notify_hub.subscribe(1, 2)
+    assert first is second and notify_hub.subscriber_count() == 2
+    assert notify_hub.subscribe(2, 2) is None
+    with notify_hub.subscription(2, 2) as channel:
+        assert channel is None
+
+    notify_hub.unsubscribe(1, first)
+    with notify_hub.subscription(2, 2) as channel:
+        assert channel is not None and notify_hub.subscriber_count() == 2
+    notify_hub.unsubscribe(1, second)
+    assert notify_hub.subscriber_count() == 0 and not notify_hub._channels
+
+
+def test_stream_refused_when_full(client, player, full_hub):
+    response = client.get('/game/api/notifications/stream')
+    assert response.status_code == 204
+    assert response.headers['Retry-After'] == str(GC.NOTIFY_POLL_SECONDS)
+    assert notify_hub.subscriber_count() == 1
+
+
+def test_long_poll_answers_immediately_when_full(client, player, full_hub):
+    start = time.monotonic()
+    response = client.get(f'/game/api/notifications?wait={GC.NOTIFY_WAIT_SECONDS}')
+    assert time.monotonic() - start < 5, '자리가 없으면 대기하지 않는다'
+    assert response.get_json() == {'notifications': [], 'retry': GC.NOTIFY_POLL_SECONDS}
+    assert response.headers['Retry-After'] == str(GC.NOTIFY_POLL_SECONDS)
+
+
+def test_stream_releases_slot_on_close(client, player, monkeypatch):
+    monkeypatch.setattr(GC, 'NOTIFY_MAX_WAITERS', 1)
+    response = client.get('/game/api/notifications/stream', buffered=False)
+    assert response.status_code == 200
+    assert next(iter(response.response)) == b'retry: 3000\n\n'
+    assert notify_hub.subscriber_count() == 1
+    assert client.get('/game/api/notifications/stream').status_code == 204
+
+    response.close()
+    assert notify_hub.subscriber_count() == 0
+
+
+def test_stream_never_started_still_releases_slot(client, player):
+    """제너레이터가 한 번도 돌지 않고 연결이 닫혀도 자리가 남지 않는다"""
+    response = client.get('/game/api/notifications/stream', buffered=False)
+    assert notify_hub.subscriber_count() == 1
+    response.close()
+    assert notify_hub.subscriber_count() == 0
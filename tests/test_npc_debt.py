@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+"""
+[v1.7.0] NPC 턴 빚 테스트 (game_engine.add/claim_npc_turn_debt, turn_scheduler._process_npc_debt).
+
+플레이어 요청은 턴을 넘길 때 빚만 1 쌓고 NPC 틱은 실행하지 않는다.
+워커가 빚 1단위마다 NPC 전체 1틱을 실행하며, 빚은 0 아래로 내려가지 않는다.
+"""
+import pytest
+
+from app.config import GameConfig as GC
+from app import game_engine
+from app.models import db, Park
+from app.turn_scheduler import _process_npc_debt
+
+
+@pytest.fixture
+def async_npc(monkeypatch):
+    monkeypatch.setattr(GC, 'TURN_NPC_SYNC', True)
+    monkeypatch.setattr(GC, 'NPC_SYNC_ASYNC', True)
+
+
+def _debt(park_id):
+    return db.session.get(Park, park_id, populate_existing=True).npc_turn_debt
+
+
+def _npc_turn(npc_id):
+    return db.session.get(Park, npc_id, populate_existing=True).turn_count
+
+
+def test_player_turn_adds_debt_without_running_npcs(client, make_park, login, async_npc):
+    npc_id = make_park('npc', is_npc=True).id
+    player = make_park('player', user=True, action_points=0, turn_quota=5)
+    player_id = player.id
+    login('player')
+
+    for expected in (1, 2, 3):
+        db.session.get(Park, player_id).action_points = 0   # 다음 채집이 턴을 넘기도록
+        db.session.commit()
+        response = client.post('/game/gather', data={'num_adults': 1, 'num_children': 0})
+        assert response.status_code == 302
+        assert _debt(player_id) == expected
+    assert _npc_turn(npc_id) == 0, 'NPC 틱은 요청 안에서 실행되지 않는다'
+
+    db.session.get(Park, player_id).action_points = 3   # AP가 남으면 턴도 빚도 그대로
+    db.session.commit()
+    client.post('/game/gather', data={'num_adults': 1, 'num_children': 0})
+    assert _debt(player_id) == 3
+
+
+def test_add_debt_is_sql_increment(make_park):
+    park = make_park()
+    game_engine.add_npc_turn_debt(park)
+    game_engine.add_npc_turn_debt(park, turns=2)
+    db.session.commit()
+    assert _debt(park.id) == 3
+
+
+def test_claim_takes_one_unit_and_never_goes_negative(make_park):
+    first = make_park(npc_turn_debt=2).id
+    second = make_park(npc_turn_debt=1).id
+    make_park(npc_turn_debt=0)
+
+    claims = [game_engine.claim_npc_turn_debt() for _ in range(5)]
+    db.session.commit()
+    assert claims == [True, True, True, False, False]
+    assert (_debt(first), _debt(second)) == (0, 0)
+    assert db.session.query(db.func.min(Park.npc_turn_debt)).scalar() == 0
+
+
+def test_worker_runs_one_npc_tick_per_debt_unit(app, make_park, monkeypatch):
+    monkeypatch.setattr(GC, 'NPC_SYNC_MAX_TICKS', 10)
+    npc_id = make_park('npc', is_npc=True).id
+    player_id = make_park('player', npc_turn_debt=3).id
+    db.session.remove()   # 워커는 자체 세션으로 쓴다 (SQLite 쓰기 잠금을 쥐고 있지 않도록)
+
+    _process_npc_debt(app)
+    assert _debt(player_id) == 0
+    assert _npc_turn(npc_id) == 3
+
+
+def test_worker_caps_ticks_per_run(app, make_park, monkeypatch):
+    monkeypatch.setattr(GC, 'NPC_SYNC_MAX_TICKS', 2)
+    npc_id = make_park('npc', is_npc=True).id
+    player_id = make_park('player', npc_turn_debt=5).id
+    db.session.remove()
+
+    _process_npc_debt(app)
+    assert (_debt(player_id), _npc_turn(npc_id)) == (3, 2)
+    db.session.remove()
+    _process_npc_debt(app)
+    assert (_debt(player_id), _npc_turn(npc_id)) == (1, 4)
+
+
+def test_failed_npc_tick_keeps_debt(app, make_park, monkeypatch):
+    player_id = make_park('player', npc_turn_debt=2).id
+    db.session.remove()
+
+    def broken():
+        raise RuntimeError('npc tick failed')
+    monkeypatch.setattr(game_engine, '_sync_npc_turns', broken)
+    _process_npc_debt(app)
+    assert _debt(player_id) == 2, '빚 차감은 NPC 틱과 함께 롤백'
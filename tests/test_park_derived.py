@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+"""
+[v1.7.0] Park 파생 값(hybrid property) 캐시 테스트.
+
+인스턴스 접근은 1회 계산 후 캐시 → 의존 컬럼 변경/expire/refresh 시 무효화.
+"""
+import gc
+
+from sqlalchemy import event
+
+from app.models import db, Park, BuildQueue
+
+
+def test_derived_value_invalidated_on_column_change(make_park):
+    park = make_park(guard_count=2, adult_count=3, child_count=4)
+    assert park.total_population == 9
+    park.child_count = 10
+    assert park.total_population == 15
+
+
+def test_derived_value_invalidated_on_commit(make_park):
+    park = make_park(guard_count=2, adult_count=3, child_count=4)
+    assert park.total_population == 9
+    db.session.query(Park).filter_by(id=park.id).update({'adult_count': 13})
+    db.session.commit()
+    assert park.total_population == 19
+
+
+def test_commit_after_dropping_park_references(make_park):
+    """커밋 후 일괄 expire 도중 가비지 컬렉션된 Park가 있어도 커밋이 실패하지 않는다"""
+    for i in range(50):
+        park = make_park(f'gc{i}')
+        db.session.add(BuildQueue(park_id=park.id, building_type='wall', turns_remaining=1))
+    db.session.commit()
+    db.session.expunge_all()
+
+    # 공원 ↔ 대기열(backref) 순환 참조만 남기고 참조를 버린다 → 순환 GC로만 회수
+    gc.disable()
+    try:
+        for park in Park.query.all():
+            assert park.build_queue[0].park is park
+            assert park.total_population >= 0   # 파생 값 캐시 생성
+        del park
+        db.session.add(Park(name='after-gc'))
+
+        # 커밋의 일괄 expire 첫 호출에서 GC 실행 → 나머지 공원은 객체 없이 expire 이벤트를 받는다
+        collected = []
+
+        def collect_once(target, attrs):
+            if not collected:
+                collected.append(gc.collect())
+
+        event.listen(Park, 'expire', collect_once)
+        try:
+            db.session.commit()
+        finally:
+            event.remove(Park, 'expire', collect_once)
+    finally:
+        gc.enable()
+
+    assert collected and collected[0] > 0
+    assert Park.query.count() == 51
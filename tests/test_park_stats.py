@@ -0,0 +1,130 @@
+# -*- coding: utf-8 -*-
+"""
+[v1.7.0] 전투 통계 카운터 테스트 (app/park_stats.py, migrate_v1_7.py --rebuild-stats).
+
+record_battle/add_loot가 통계 행을 upsert(ON CONFLICT DO NOTHING)한 뒤 SQL 증감식으로 누적하는지,
+battle_logs에서 다시 계산한 값(백필)이 전투 중 누적한 카운터와 같은지 본다.
+"""
+import threading
+import time
+
+import pytest
+
+import migrate_db
+import migrate_v1_7
+from app import battle_engine, park_stats
+from app import rng as RNG
+from app.models import db, Park, ParkStats, BattleLog
+
+COUNTERS = ('wins', 'losses', 'battles', 'loot_taken', 'loot_lost')
+
+
+def _stats(park_id):
+    row = db.session.get(ParkStats, park_id, populate_existing=True)
+    return tuple(getattr(row, name) for name in COUNTERS) if row else None
+
+
+def test_record_battle_creates_rows_and_counts(make_park):
+    attacker, defender = make_park().id, make_park().id
+    assert _stats(attacker) is None and _stats(defender) is None
+
+    park_stats.record_battle(attacker, defender, True, 30)
+    db.session.commit()
+    assert _stats(attacker) == (1, 0, 1, 30, 0)
+    assert _stats(defender) == (0, 1, 1, 0, 30)
+
+    park_stats.record_battle(attacker, defender, False, 50)   # 방어 승리 → 약탈 없음
+    park_stats.record_battle(defender, attacker, True, 0)
+    db.session.commit()
+    assert _stats(attacker) == (1, 2, 3, 30, 0)
+    assert _stats(defender) == (2, 1, 3, 0, 30)
+
+
+def test_add_loot_accumulates(make_park):
+    attacker, defender = make_park().id, make_park().id
+    park_stats.add_loot(attacker, defender, 0)   # 0 이하는 무시 (행도 만들지 않음)
+    db.session.commit()
+    assert _stats(attacker) is None
+
+    park_stats.add_loot(attacker, defender, 7)
+    park_stats.add_loot(attacker, defender, 5)
+    db.session.commit()
+    assert _stats(attacker) == (0, 0, 0, 12, 0)
+    assert _stats(defender) == (0, 0, 0, 0, 12)
+
+
+def test_existing_row_is_not_reinserted(make_park):
+    """다른 트랜잭션이 먼저 만든 행이 있어도 INSERT 충돌 없이 누적"""
+    attacker, defender = make_park().id, make_park().id
+    db.session.add(ParkStats(park_id=attacker, wins=4, losses=0, battles=4, loot_taken=9, loot_lost=0))
+    db.session.commit()
+    db.session.expunge_all()
+
+    park_stats.record_battle(attacker, defender, True, 1)
+    db.session.commit()
+    assert _stats(attacker) == (5, 0, 5, 10, 0)
+
+
+def test_rebuild_stats_matches_counters(make_park, monkeypatch):
+    """실제 전투로 누적한 카운터 ↔ --rebuild-stats로 battle_logs에서 다시 계산한 값"""
+    ids = [make_park(guard_count=15, adult_count=20).id for _ in range(3)]
+    for i in range(12):
+        RNG.set_world_seed(f'stats-{i}')
+        attacker_id, defender_id = ids[i % 3], ids[(i + 1) % 3]
+        attacker, defender = db.session.get(Park, attacker_id), db.session.get(Park, defender_id)
+        attacker.action_points = 3
+        battle_engine.execute_battle(attacker, defender, 5, 5, lang='ko')
+        db.session.commit()
+    assert BattleLog.query.count() == 12
+    counted = {park_id: _stats(park_id) for park_id in ids}
+    assert sum(s[0] for s in counted.values()) == 12
+
+    db.session.query(ParkStats).delete()
+    db.session.commit()
+    db.session.remove()   # 재계산은 별도 연결로 쓴다
+    monkeypatch.setattr(migrate_db, 'connect', lambda: db.engine)
+    migrate_v1_7.rebuild()
+
+    assert {park_id: _stats(park_id) for park_id in ids} == counted
+    assert all(db.session.get(ParkStats, park_id).last_battle_at for park_id in ids)
+
+
+def test_concurrent_first_battles_do_not_conflict(app, make_park):
+    """
+    통계 행 없는 공원에 두 트랜잭션이 동시에 전투 기록 (PostgreSQL).
+    조회 후 INSERT면 늦은 쪽이 PK IntegrityError, ON CONFLICT DO NOTHING이면 먼저 커밋될 때까지 기다렸다가 누적.
+    """
+    if db.engine.dialect.name != 'postgresql':
+        pytest.skip('SQLite는 쓰기 트랜잭션이 데이터베이스 전체를 잠가 경합이 생기지 않음')
+    attacker, defender = make_park().id, make_park().id
+    db.session.remove()
+
+    first_pending = threading.Event()
+    errors = []
+
+    def first():
+        with app.app_context():
+            park_stats.record_battle(attacker, defender, True, 3)
+            first_pending.set()
+            time.sleep(0.3)   # 두 번째 트랜잭션이 같은 행에 INSERT하는 동안 커밋하지 않고 버팀
+            db.session.commit()
+
+    def second():
+        with app.app_context():
+            first_pending.wait()
+            try:
+                park_stats.record_battle(attacker, defender, True, 4)
+                db.session.commit()
+            except Exception as e:
+                errors.append(e)
+                db.session.rollback()
+
+    threads = [threading.Thread(target=first), threading.Thread(target=second)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert not errors, errors
+    assert _stats(attacker) == (2, 0, 2, 7, 0)
+    assert _stats(defender) == (0, 2, 2, 0, 7)
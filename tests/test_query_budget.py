@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+"""
+[v1.7.0] 쿼리 예산 테스트 (@profiler.query_budget).
+
+PROFILER_STRICT 모드에서 예산을 선언한 라우트를 데이터가 쌓인 월드로 호출한다
+→ N+1 등으로 쿼리 수가 예산을 넘으면 QueryBudgetExceeded로 테스트가 실패.
+"""
+import logging
+
+import pytest
+
+from app import profiler
+from app.models import db, Park, EventLog, TradeOffer, Diplomacy
+
+OTHER_PARKS = 20
+
+
+@pytest.fixture
+def strict(app):
+    app.config['PROFILER_STRICT'] = True
+
+
+@pytest.fixture
+def world(make_park, login):
+    """로그인한 공원 + 다른 공원/교역/외교/이벤트 (목록 화면이 비어 있지 않도록)"""
+    me = make_park('me', user=True)
+    others = [make_park(f'other{i}', user=i % 2 == 0) for i in range(OTHER_PARKS)]
+    for i, other in enumerate(others):
+        db.session.add(TradeOffer(sender_id=other.id, receiver_id=None if i % 2 else me.id,
+                                  offer_konpeito=1, request_trash=2, message=f'offer {i}'))
+        db.session.add(TradeOffer(sender_id=me.id, receiver_id=other.id, offer_trash=3))
+        db.session.add(EventLog(park_id=me.id, event_type='info', message=f'event {i}'))
+    db.session.add(Diplomacy(park_a_id=me.id, park_b_id=others[0].id,
+                             relation_type='ally', status='active'))
+    db.session.add(Diplomacy(park_a_id=others[1].id, park_b_id=me.id,
+                             relation_type='ally', status='pending'))
+    db.session.add(Diplomacy(park_a_id=me.id, park_b_id=others[2].id,
+                             relation_type='enemy', status='active'))
+    db.session.commit()
+    db.session.remove()
+    login('me')
+    return me
+
+
+@pytest.mark.parametrize('url', ['/game/dashboard', '/game/ranking', '/game/trade'])
+def test_route_stays_within_query_budget(client, strict, world, url):
+    for _ in range(2):   # 첫 요청(턴 충전/캐시 생성) + 캐시를 쓰는 두 번째 요청
+        response = client.get(url)
+        assert response.status_code == 200
+
+
+def _add_over_budget_route(app):
+    @profiler.query_budget(1)
+    def over_budget():
+        for _ in range(3):
+            Park.query.count()
+        return 'ok'
+    app.add_url_rule('/test/over-budget', 'over_budget', over_budget)
+
+
+def test_route_over_budget_fails_in_strict_mode(app, client, strict):
+    _add_over_budget_route(app)
+    with pytest.raises(profiler.QueryBudgetExceeded, match='over_budget'):
+        client.get('/test/over-budget')
+
+
+def test_route_over_budget_only_warns_by_default(app, client, caplog):
+    _add_over_budget_route(app)
+    with caplog.at_level(logging.WARNING):
+        response = client.get('/test/over-budget')
+    assert response.status_code == 200
+    assert '쿼리 예산 초과' in caplog.text
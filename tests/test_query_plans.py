@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+"""
+[v1.7.0] 핫 쿼리 실행 계획 테스트 (이전: migrate_v1_7.py --audit).
+
+app/models.py에 선언한 인덱스로 만든 스키마에서 핫 쿼리마다 실행 계획을 확인해
+풀 테이블 스캔이면 실패한다 (인덱스 정의나 쿼리 조건이 바뀌어 인덱스를 못 쓰게 된 경우).
+- SQLite: EXPLAIN QUERY PLAN의 'SCAN <테이블>' 단계 (인덱스 미사용)
+- PostgreSQL (TEST_DATABASE_URL): EXPLAIN의 'Seq Scan' 노드. 빈 테이블이면 인덱스가 있어도
+  순차 스캔을 고르므로 enable_seqscan=off로 점검 (그래도 Seq Scan이면 쓸 수 있는 인덱스가 없는 것)
+"""
+import pytest
+from sqlalchemy import inspect
+
+import migrate_v1_7
+from app.models import db
+
+# 핫 쿼리 (라벨, SQL) - 라우트/엔진의 실제 조건과 같은 형태로 유지
+HOT_QUERIES = [
+    ('대시보드 공원 조회',
+     "SELECT * FROM parks WHERE user_id = 1"),
+    ('대시보드 최근 이벤트',
+     "SELECT * FROM event_logs WHERE park_id = 1 ORDER BY created_at DESC LIMIT 10"),
+    ('알림 API',
+     "SELECT * FROM event_logs WHERE park_id = 1 AND id > 0 "
+     "AND event_type IN ('battle', 'trade', 'diplomacy') ORDER BY id LIMIT 10"),
+    ('전투 기록 키셋 (공격측)',
+     "SELECT id FROM battle_logs WHERE attacker_id = 1 "
+     "AND (created_at, id) < ('2030-01-01 00:00:00', 999) ORDER BY created_at DESC, id DESC LIMIT 21"),
+    ('전투 기록 키셋 (방어측)',
+     "SELECT id FROM battle_logs WHERE defender_id = 1 "
+     "AND (created_at, id) < ('2030-01-01 00:00:00', 999) ORDER BY created_at DESC, id DESC LIMIT 21"),
+    ('상대별 전투 기록 키셋',
+     "SELECT id FROM battle_logs WHERE attacker_id = 1 AND defender_id = 2 "
+     "AND (created_at, id) < ('2030-01-01 00:00:00', 999) ORDER BY created_at DESC, id DESC LIMIT 21"),
+    ('이벤트 기록 키셋',
+     "SELECT * FROM event_logs WHERE park_id = 1 "
+     "AND (created_at, id) < ('2030-01-01 00:00:00', 999) ORDER BY created_at DESC, id DESC LIMIT 21"),
+    ('타입별 이벤트 기록 키셋',
+     "SELECT * FROM event_logs WHERE park_id = 1 AND event_type = 'battle' "
+     "AND (created_at, id) < ('2030-01-01 00:00:00', 999) ORDER BY created_at DESC, id DESC LIMIT 21"),
+    ('공격 전적',
+     "SELECT COUNT(*) FROM battle_logs WHERE attacker_id = 1 AND result = 'win'"),
+    ('방어 전적',
+     "SELECT COUNT(*) FROM battle_logs WHERE defender_id = 1 AND result = 'lose'"),
+    ('공개 교역',
+     "SELECT * FROM trade_offers WHERE status = 'pending' AND sender_id != 1 "
+     "AND receiver_id IS NULL ORDER BY created_at DESC LIMIT 20"),
+    ('받은 교역',
+     "SELECT * FROM trade_offers WHERE receiver_id = 1 AND status = 'pending' "
+     "ORDER BY created_at DESC LIMIT 50"),
+    ('보낸 교역',
+     "SELECT COUNT(*) FROM trade_offers WHERE sender_id = 1 AND status = 'pending'"),
+    ('동맹/적대 쌍 조회',
+     "SELECT * FROM diplomacies WHERE ((park_a_id = 1 AND park_b_id = 2) "
+     "OR (park_a_id = 2 AND park_b_id = 1)) AND relation_type = 'ally' AND status = 'active'"),
+    ('내 외교 관계',
+     "SELECT * FROM diplomacies WHERE (park_a_id = 1 OR park_b_id = 1) "
+     "AND relation_type = 'enemy' AND status = 'active'"),
+    ('받은 동맹 요청',
+     "SELECT * FROM diplomacies WHERE park_b_id = 1 AND relation_type = 'ally' "
+     "AND status = 'pending'"),
+    ('공원별 진행 중 밀사',
+     "SELECT * FROM spy_missions WHERE sender_id = 1 AND status = 'active'"),
+    ('월드 틱 밀사 발송자',
+     "SELECT DISTINCT sender_id FROM spy_missions WHERE status = 'active'"),
+    ('건설 대기열 일괄 로드',
+     "SELECT * FROM build_queue WHERE park_id IN (1, 2, 3)"),
+    ('훈련 대기열 일괄 로드',
+     "SELECT * FROM train_queue WHERE park_id IN (1, 2, 3)"),
+]
+
+
+def _plan(conn, sql):
+    """쿼리 실행 계획 → (단계 설명 리스트, 풀 테이블 스캔 단계 리스트)"""
+    if conn.dialect.name == 'sqlite':
+        details = [row[3] for row in conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}")]
+        return details, [d for d in details if d.startswith('SCAN ') and 'INDEX' not in d]
+
+    conn.exec_driver_sql("SET LOCAL enable_seqscan = off")
+    details = [row[0].strip().lstrip('-> ').split('  (cost=')[0]
+               for row in conn.exec_driver_sql(f"EXPLAIN {sql}")]
+    details = [d for d in details if 'Scan' in d]
+    return details, [d for d in details if d.startswith('Seq Scan')]
+
+
+@pytest.mark.parametrize('label, sql', HOT_QUERIES, ids=[label for label, _ in HOT_QUERIES])
+def test_hot_query_uses_index(app, label, sql):
+    with db.engine.begin() as conn:
+        details, full_scans = _plan(conn, sql)
+    assert not full_scans, f"{label}: full table scan ({' / '.join(details)})"
+
+
+def test_migration_indexes_match_models(app):
+    """migrate_v1_7.INDEXES(기존 DB용)가 모델 선언 인덱스와 같은지"""
+    inspector = inspect(db.engine)
+    for name, table, columns in migrate_v1_7.INDEXES:
+        declared = {index['name']: index['column_names'] for index in inspector.get_indexes(table)}
+        assert name in declared, f"{name} is not declared in app/models.py"
+        assert declared[name] == [c.strip() for c in columns.split(',')], name
@@ -0,0 +1,137 @@
+# -*- coding: utf-8 -*-
+"""
+[v1.7.0] 결정적 난수 서비스(app/rng.py) 테스트.
+
+같은 월드 시드 + 같은 (공원, 턴, 단계) 키 → 같은 난수열 → 같은 턴 결과 (리플레이).
+집계 추출(binomial 등)은 1회씩 반복하는 방식과 분포(평균·분산)가 같은지 시드 고정 표본으로 비교.
+"""
+import math
+import random
+
+import pytest
+from sqlalchemy import DateTime, select
+
+from app.config import GameConfig as GC
+from app import rng as RNG
+from app.models import db, Park, BuildQueue, EventLog
+from app.turn_scheduler import _process_all_turns
+
+REPLAY_TICKS = 3
+SAMPLES = 20000
+LOOP_DRAWS = 500000   # 비교용 반복 구현의 추출 횟수 상한 (반복 방식은 n에 비례해 느림)
+
+
+def assert_moments(samples, mean, var, label=''):
+    """표본 평균·분산이 이론값과 허용 오차(표준오차 5배) 안인지"""
+    n = len(samples)
+    m = sum(samples) / n
+    s2 = sum((x - m) ** 2 for x in samples) / (n - 1)
+    assert abs(m - mean) <= 5 * math.sqrt(var / n) + 1e-9, f"{label} mean {m:.4f} vs {mean:.4f}"
+    assert abs(s2 - var) <= 5 * var * math.sqrt(2 / (n - 1)) + 1e-9, f"{label} var {s2:.4f} vs {var:.4f}"
+
+
+def _draws(*key):
+    with RNG.stream(*key):
+        return [RNG.randint(1, 1000) for _ in range(20)]
+
+
+def test_same_key_same_sequence():
+    assert _draws(7, 3, 'food_consumption') == _draws(7, 3, 'food_consumption')
+    assert _draws(7, 3, 'food_consumption') != _draws(7, 3, 'cannibalism')
+    assert _draws(7, 3, 'food_consumption') != _draws(7, 4, 'food_consumption')
+    assert _draws(7, 3, 'food_consumption') != _draws(8, 3, 'food_consumption')
+
+
+def test_nested_stream_does_not_disturb_outer():
+    with RNG.stream(1, 1, 'outer'):
+        first = RNG.random()
+        with RNG.stream(1, 1, 'inner'):
+            RNG.random()
+        second = RNG.random()
+    with RNG.stream(1, 1, 'outer'):
+        assert [RNG.random(), RNG.random()] == [first, second]
+
+
+def _build_world(make_park):
+    """난수를 쓰는 단계가 고루 실행되는 공원들 (매번 같은 id로 생성)"""
+    for i in range(10):
+        park = make_park(f'fed{i}', child_count=20, baby_count=12, unchi_holes=3,
+                         trash_food=150, konpeito=20, cardboard_houses=2)
+        db.session.add(BuildQueue(park_id=park.id, building_type='wall', turns_remaining=1))
+        make_park(f'starving{i}', trash_food=0, konpeito=3, meat_stock=0, morale=15,
+                  konpeito_consecutive=2, child_count=12, baby_count=10)
+    db.session.commit()
+
+
+def _replay(app, make_park, seed):
+    """빈 DB에 같은 월드를 만들고 seed로 REPLAY_TICKS틱 처리. 반환: (공원 행, 이벤트)"""
+    db.session.remove()
+    db.drop_all()
+    db.create_all()
+    RNG.set_world_seed(seed)
+    _build_world(make_park)
+    for _ in range(REPLAY_TICKS):
+        _process_all_turns(app)
+
+    columns = [c for c in Park.__table__.columns if not isinstance(c.type, DateTime)]   # 생성 시각 제외
+    parks = [tuple(row) for row in db.session.execute(select(*columns).order_by(Park.id)).all()]
+    events = db.session.execute(
+        select(EventLog.park_id, EventLog.event_type, EventLog.message, EventLog.code,
+               EventLog.params, EventLog.line).order_by(EventLog.id)
+    ).all()
+    db.session.remove()
+    return parks, [tuple(e) for e in events]
+
+
+@pytest.mark.parametrize('engine', ['scalar', 'columnar'])
+def test_turn_replay_reproduces_same_result(app, make_park, monkeypatch, engine):
+    """공원 컬럼 + 이벤트(코드·파라미터·대사 번호 포함)가 시드로 재현"""
+    if engine == 'columnar':
+        pytest.importorskip('numpy')
+    monkeypatch.setattr(GC, 'TICK_ENGINE', engine)
+    first = _replay(app, make_park, 'replay-seed')
+    assert first[1], '이벤트가 하나도 없으면 비교 의미가 없다'
+    assert any(e[-1] is not None for e in first[1]), '대사 번호가 있는 이벤트가 있어야 한다'
+    assert _replay(app, make_park, 'replay-seed') == first
+    assert _replay(app, make_park, 'other-seed') != first
+
+
+@pytest.mark.parametrize('n,p', [(10, 0.2), (100, 0.2), (1000, 0.05), (5000, 0.02)])
+def test_binomial_matches_per_trial_loop(n, p):
+    """RNG.binomial ↔ random() < p를 n번 센 값: 둘 다 B(n, p)의 평균·분산"""
+    with RNG.stream('test', 'binomial', n, p):
+        aggregate = [RNG.binomial(n, p) for _ in range(SAMPLES)]
+    loop_rng = random.Random(f'loop-{n}-{p}')
+    loop_samples = min(SAMPLES, max(100, LOOP_DRAWS // n))
+    loop = [sum(1 for _ in range(n) if loop_rng.random() < p) for _ in range(loop_samples)]
+
+    assert_moments(aggregate, n * p, n * p * (1 - p), 'binomial')
+    assert_moments(loop, n * p, n * p * (1 - p), 'loop')
+    assert all(0 <= x <= n for x in aggregate)
+
+
+def test_binomial_edge_cases():
+    with RNG.stream('test', 'binomial-edge'):
+        assert RNG.binomial(0, 0.5) == 0
+        assert RNG.binomial(10, 0) == 0
+        assert RNG.binomial(10, 1) == 10
+
+
+def uniform_moments(a, b):
+    """randint(a, b) 1회의 (평균, 분산)"""
+    return (a + b) / 2, ((b - a + 1) ** 2 - 1) / 12
+
+
+@pytest.mark.parametrize('n,a,b', [(5, 1, 6), (40, 8, 12), (1000, 2, 4), (10000, 1, 2)])
+def test_randint_sum_matches_per_unit_loop(n, a, b):
+    """RNG.randint_sum ↔ randint(a, b)를 n번 더한 값: 평균 n·μ, 분산 n·σ²"""
+    mean, var = uniform_moments(a, b)
+    with RNG.stream('test', 'randint_sum', n, a, b):
+        aggregate = [RNG.randint_sum(n, a, b) for _ in range(SAMPLES)]
+    loop_rng = random.Random(f'loop-{n}-{a}-{b}')
+    loop_samples = min(SAMPLES, max(100, LOOP_DRAWS // n))
+    loop = [sum(loop_rng.randint(a, b) for _ in range(n)) for _ in range(loop_samples)]
+
+    assert_moments(aggregate, n * mean, n * var, 'randint_sum')
+    assert_moments(loop, n * mean, n * var, 'loop')
+    assert all(n * a <= x <= n * b for x in aggregate)
@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+"""
+[v1.7.0] 행 잠금 테스트 (app/row_lock.py).
+
+db_profile.row_locks()를 켜서(PostgreSQL 동작) 잠금 조회 문장(id 오름차순 ORDER BY + FOR UPDATE)과
+populate_existing으로 세션의 오래된 객체가 전투/교역 계산 전에 최신 값으로 다시 채워지는지 본다.
+SQLite는 FOR UPDATE 구문을 생략하므로 문장은 PostgreSQL 방언으로 컴파일해 확인한다.
+"""
+import pytest
+from sqlalchemy import event, update
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import Session
+
+from app import battle_engine, db_profile, row_lock
+from app.models import db, Park, BattleLog, TradeOffer
+
+
+@pytest.fixture
+def locks(monkeypatch):
+    monkeypatch.setattr(db_profile, 'row_locks', lambda: True)
+
+
+@pytest.fixture
+def orm_selects():
+    """세션 ORM 조회 기록: (PostgreSQL로 컴파일한 SQL, populate_existing 여부)"""
+    calls = []
+
+    def record(state):
+        if state.is_select:
+            sql = str(state.statement.compile(dialect=postgresql.dialect()))
+            calls.append((sql, state.load_options._populate_existing))
+
+    event.listen(Session, 'do_orm_execute', record)
+    yield calls
+    event.remove(Session, 'do_orm_execute', record)
+
+
+@pytest.fixture
+def stale_session(monkeypatch):
+    """커밋해도 객체를 만료시키지 않는 세션 (요청 초반에 읽은 값을 들고 있는 상태 재현)"""
+    monkeypatch.setattr(db.session(), 'expire_on_commit', False)
+
+
+def _write_elsewhere(model, row_id, **values):
+    """다른 트랜잭션(별도 연결)에서 커밋한 쓰기"""
+    with db.engine.begin() as conn:
+        conn.execute(update(model).where(model.id == row_id).values(**values))
+
+
+def test_lock_parks_sql(make_park, locks, orm_selects):
+    first, second = make_park().id, make_park().id
+    orm_selects.clear()
+    parks = row_lock.lock_parks(second, 0, first, None, second)
+
+    assert [p.id for p in parks] == [first, second]
+    (sql, populate), = orm_selects
+    assert 'ORDER BY parks.id' in sql and sql.rstrip().endswith('FOR UPDATE')
+    assert populate
+
+
+def test_lock_trade_sql(make_park, locks, orm_selects):
+    sender = make_park().id
+    trade = TradeOffer(sender_id=sender, offer_konpeito=5, status='pending')
+    db.session.add(trade)
+    db.session.commit()
+    trade_id = trade.id
+    orm_selects.clear()
+
+    assert row_lock.lock_trade(trade_id).id == trade_id
+    (sql, populate), = orm_selects
+    assert 'WHERE trade_offers.id' in sql and sql.rstrip().endswith('FOR UPDATE')
+    assert populate
+
+
+def test_no_lock_queries_without_row_locks(make_park, orm_selects):
+    """SQLite 프로필: 공원 잠금 조회 없음, 교역은 일반 조회"""
+    park_id = make_park().id
+    if db_profile.row_locks():
+        pytest.skip('행 잠금을 쓰는 DB')
+    orm_selects.clear()
+    assert row_lock.lock_parks(park_id) == []
+    assert not orm_selects
+    row_lock.lock_trade(1)
+    assert 'FOR UPDATE' not in orm_selects[0][0]
+
+
+def test_lock_refreshes_stale_parks_before_battle(make_park, locks, stale_session):
+    attacker = make_park(guard_count=40, adult_count=40, konpeito=10, konpeito_cap=10000)
+    defender = make_park(guard_count=0, adult_count=1, konpeito=300)
+    assert (attacker.konpeito, defender.konpeito) == (10, 300)   # 세션에 읽어 둔 값
+    db.session.commit()
+
+    _write_elsewhere(Park, attacker.id, konpeito=400)
+    _write_elsewhere(Park, defender.id, konpeito=900)
+    assert attacker.konpeito == 10, '잠그기 전에는 오래된 값'
+
+    attacker.action_points = 3
+    battle_engine.execute_battle(attacker, defender, 40, 40, lang='ko')
+    db.session.commit()
+
+    log = BattleLog.query.one()
+    assert log.result == 'win' and log.loot_konpeito > 0
+    db.session.expire_all()
+    # 잠근 뒤 다시 읽은 값(400/900)에서 약탈 → 다른 트랜잭션의 쓰기를 덮어쓰지 않는다
+    assert db.session.get(Park, attacker.id).konpeito == 400 + log.loot_konpeito
+    assert db.session.get(Park, defender.id).konpeito == 900 - log.loot_konpeito
+
+
+def test_lock_refreshes_stale_trade_before_refund(client, make_park, login, locks, stale_session):
+    sender = make_park('sender', konpeito=50)
+    make_park('receiver', user=True)
+    trade = TradeOffer(sender_id=sender.id, offer_konpeito=30, status='pending')
+    db.session.add(trade)
+    db.session.commit()
+    login('receiver')
+    assert trade.status == 'pending'
+
+    _write_elsewhere(TradeOffer, trade.id, status='cancelled')   # 발송자가 먼저 취소(환불 완료)
+    response = client.post(f'/game/trade/reject/{trade.id}')
+    assert response.status_code == 302
+    db.session.expire_all()
+    assert db.session.get(TradeOffer, trade.id).status == 'cancelled'
+    assert db.session.get(Park, sender.id).konpeito == 50, '이미 취소된 교역을 다시 환불하지 않는다'
@@ -0,0 +1,35 @@
+# -*- coding: utf-8 -*-
+"""
+[v1.7.0] 샤딩 틱 워커 프로세스 테스트.
+
+워커는 spawn으로 시작되어 __main__ 모듈을 다시 import한다
+→ 워커 안에서 앱이 만들어져도 턴 스케줄러가 뜨지 않아야 한다 (월드 틱 중복 실행 방지).
+"""
+import importlib
+
+from app.config import GameConfig as GC
+from app import sharded_tick
+
+
+def _scheduler_state():
+    """워커에서 실행: 기본 인자(start_scheduler=True)로 앱을 만든 뒤 스케줄러 상태"""
+    from app import create_app
+    from app.turn_scheduler import scheduler
+    create_app()
+    return scheduler.running
+
+
+def test_worker_process_does_not_start_scheduler(app, monkeypatch):
+    monkeypatch.setenv('DATABASE_URL', app.config['SQLALCHEMY_DATABASE_URI'])
+    monkeypatch.setenv('NPC_INITIAL_COUNT', '0')
+    monkeypatch.setattr(GC, 'TICK_WORKERS', 1)
+    try:
+        assert sharded_tick._get_executor().submit(_scheduler_state).result(timeout=60) is False
+    finally:
+        sharded_tick.shutdown()
+
+
+def test_run_module_does_not_create_app_on_import():
+    """spawn 워커가 run.py를 __mp_main__으로 다시 import해도 앱/스케줄러를 만들지 않는다"""
+    run = importlib.import_module('run')
+    assert not hasattr(run, 'app')